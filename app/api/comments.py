@@ -8,8 +8,13 @@ from app.exceptions.comments import (
     CommentAccessDeniedError,
     CommentAccessDeniedHTTPError,
     CommentToDeletedPostError,
-    CommentToDeletedPostHTTPError
+    CommentToDeletedPostHTTPError,
+    CommentQueueFullError,
+    CommentQueueFullHTTPError,
+    CommentWriteTimeoutError,
+    CommentWriteTimeoutHTTPError
 )
+from app.exceptions.content_filter import BannedContentError, BannedContentHTTPError
 from app.schemes.comments import SCommentAdd, SCommentUpdate, SCommentGet, SCommentGetWithReplies
 from app.services.comments import CommentService
 
@@ -26,6 +31,12 @@ async def create_comment(
         await CommentService(db).create_comment(comment_data, current_user.id)
     except CommentToDeletedPostError:
         raise CommentToDeletedPostHTTPError
+    except CommentQueueFullError:
+        raise CommentQueueFullHTTPError
+    except CommentWriteTimeoutError:
+        raise CommentWriteTimeoutHTTPError
+    except BannedContentError as e:
+        raise BannedContentHTTPError(e.phrases)
     
     return {"status": "OK", "message": "Комментарий успешно создан"}
 
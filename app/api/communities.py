@@ -37,24 +37,19 @@ async def get_communities(
 ) -> List[SCommunityGetWithMembership]:
     service = CommunitiesService(db)
     if user_id:
-        communities_data = await service.get_communities_with_membership(
+        return await service.get_communities_with_membership(
             user_id=user_id,
             skip=skip,
             limit=limit,
             search=search
         )
-        # Преобразуем словари в объекты Pydantic
-        return [SCommunityGetWithMembership(**data) for data in communities_data]
     else:
         # Если пользователь не авторизован, возвращаем обычные сообщества без информации о членстве
         communities = await service.get_communities(skip=skip, limit=limit, search=search)
-        # Преобразуем в объекты Pydantic с is_joined=False по умолчанию
-        result = []
-        for community in communities:
-            community_dict = community.__dict__.copy()
-            community_dict['is_joined'] = False
-            result.append(SCommunityGetWithMembership(**community_dict))
-        return result
+        return [
+            SCommunityGetWithMembership.model_validate(community, from_attributes=True)
+            for community in communities
+        ]
 
 
 @router.get("/{community_id}", summary="Получение конкретного сообщества")
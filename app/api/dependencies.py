@@ -38,6 +38,17 @@ def get_current_user_id(token: str = Depends(get_token)) -> int:
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
+
+def get_optional_user_id(request: Request) -> int | None:
+    """ID пользователя из cookie, если он авторизован, иначе None (без ошибки)"""
+    token = request.cookies.get("access_token", None)
+    if token is None:
+        return None
+    try:
+        return AuthService.decode_token(token).get("user_id")
+    except (InvalidJWTTokenError, JWTTokenExpiredError):
+        return None
+
 async def get_db():
     async with DBManager(session_factory=async_session_maker) as db:
         yield db
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import ModeratorOrAdminDep
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.schemes.reports import ContentType, ReportStatus
+from app.services.export import ExportService
+
+router = APIRouter(prefix="/export", tags=["Экспорт"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _ndjson_response(filename: str, make_stream: Callable[[ExportService], AsyncIterator[str]]) -> StreamingResponse:
+    """
+    Ответ, который читает данные по мере отправки.
+
+    Сессия открывается внутри генератора, а не через DBDep: курсор должен жить,
+    пока клиент читает ответ, и закрываться сразу после последней строки.
+    """
+    async def body():
+        async with DBManager(session_factory=async_session_maker) as db:
+            async for chunk in make_stream(ExportService(db)):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/posts.ndjson", summary="Потоковая выгрузка постов (только модераторы)")
+async def export_posts(
+    current_user: ModeratorOrAdminDep,
+    community_id: Optional[int] = None,
+    theme_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Начало периода (включительно)"),
+    created_to: Optional[datetime] = Query(None, description="Конец периода (не включительно)"),
+) -> StreamingResponse:
+    return _ndjson_response(
+        "posts.ndjson",
+        lambda service: service.stream_posts(
+            community_id=community_id,
+            theme_id=theme_id,
+            user_id=user_id,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    )
+
+
+@router.get("/reports.ndjson", summary="Потоковая выгрузка жалоб (только модераторы)")
+async def export_reports(
+    current_user: ModeratorOrAdminDep,
+    status: Optional[ReportStatus] = None,
+    content_type: Optional[ContentType] = None,
+    reporter_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Начало периода (включительно)"),
+    created_to: Optional[datetime] = Query(None, description="Конец периода (не включительно)"),
+) -> StreamingResponse:
+    return _ndjson_response(
+        "reports.ndjson",
+        lambda service: service.stream_reports(
+            status=status.value if status else None,
+            content_type=content_type.value if content_type else None,
+            reporter_id=reporter_id,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    )
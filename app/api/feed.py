@@ -0,0 +1,28 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+
+from app.api.dependencies import DBDep, get_current_user_id
+from app.exceptions.posts import InvalidFeedCursorError, InvalidFeedCursorHTTPError
+from app.services.feed import FeedService
+
+router = APIRouter(prefix="/api/v2/feed", tags=["Лента"])
+
+
+@router.get("", summary="Персональная лента из сообществ пользователя")
+async def get_feed(
+    db: DBDep,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    theme_id: Optional[int] = None,
+    user_id: int = Depends(get_current_user_id),
+) -> dict:
+    """Новейшие посты из сообществ пользователя с курсорной пагинацией"""
+    try:
+        return await FeedService(db).get_feed(
+            user_id=user_id,
+            cursor=cursor,
+            limit=limit,
+            theme_id=theme_id
+        )
+    except InvalidFeedCursorError:
+        raise InvalidFeedCursorHTTPError
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Path
+from fastapi.responses import StreamingResponse
+
+from app.database.db_manager import DBManager
+from app.exceptions.communities import CommunityNotFoundHTTPError
+from app.exceptions.live import LiveConnectionsLimitError, LiveConnectionsLimitHTTPError
+from app.exceptions.posts import PostNotFoundHTTPError
+from app.services.live import live_hub, post_topic, community_topic
+
+router = APIRouter(prefix="/api/live", tags=["Живые обновления"])
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # отключаем буферизацию в nginx
+}
+
+
+def _sse_response(topic: str) -> StreamingResponse:
+    # Место занимается до ответа: параллельные подключения сверх лимита получают 503, а не обрыв потока
+    try:
+        subscription = live_hub.subscribe(topic)
+    except LiveConnectionsLimitError:
+        raise LiveConnectionsLimitHTTPError
+    return StreamingResponse(live_hub.stream(subscription), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/posts/{post_id}", summary="SSE: реакции и новые комментарии поста")
+async def live_post(
+    post_id: int = Path(..., description="ID поста"),
+) -> StreamingResponse:
+    # Проверка - в своей короткой сессии: зависимость DBDep держала бы
+    # соединение из пула, пока открыт поток
+    async with DBManager() as db:
+        exists = await db.posts.get(post_id)
+    if not exists:
+        raise PostNotFoundHTTPError
+    return _sse_response(post_topic(post_id))
+
+
+@router.get("/communities/{community_id}", summary="SSE: новые посты и активность в сообществе")
+async def live_community(
+    community_id: int = Path(..., description="ID сообщества"),
+) -> StreamingResponse:
+    async with DBManager() as db:
+        exists = await db.communities.get(community_id)
+    if not exists:
+        raise CommunityNotFoundHTTPError
+    return _sse_response(community_topic(community_id))
@@ -0,0 +1,50 @@
+from typing import List
+
+from fastapi import APIRouter, Path, Query
+
+from app.api.dependencies import DBDep, ModeratorOrAdminDep
+from app.exceptions.reports import NoPendingReportsError, NoPendingReportsHTTPError
+from app.schemes.posts import SDuplicatePost
+from app.schemes.reports import ContentType, SModerationItem, SModerationResolve
+from app.services.duplicates import DuplicatePostService
+from app.services.moderation import ModerationService
+
+router = APIRouter(prefix="/moderation", tags=["Модерация"])
+
+
+@router.get("/queue", summary="Очередь модерации: жалобы, сгруппированные по контенту")
+async def get_moderation_queue(
+    db: DBDep,
+    current_user: ModeratorOrAdminDep,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+) -> List[SModerationItem]:
+    return await ModerationService(db).get_queue(skip=skip, limit=limit)
+
+
+@router.post("/queue/{content_type}/{content_id}", summary="Решение по всем открытым жалобам на контент")
+async def resolve_moderation_item(
+    data: SModerationResolve,
+    db: DBDep,
+    current_user: ModeratorOrAdminDep,
+    content_type: ContentType = Path(..., description="Тип контента (post или comment)"),
+    content_id: int = Path(..., description="ID контента"),
+) -> dict[str, str | int]:
+    try:
+        resolved = await ModerationService(db).resolve(
+            content_type, content_id, data.status, current_user.id, data.moderator_comment
+        )
+    except NoPendingReportsError:
+        raise NoPendingReportsHTTPError
+    
+    return {"status": "OK", "resolved": resolved}
+
+
+@router.get("/duplicates", summary="Посты, похожие на более ранние (почти-дубликаты)")
+async def get_duplicate_posts(
+    db: DBDep,
+    current_user: ModeratorOrAdminDep,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+) -> List[SDuplicatePost]:
+    return await DuplicatePostService(db).get_duplicates(skip=skip, limit=limit)
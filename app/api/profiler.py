@@ -0,0 +1,39 @@
+import os
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.dependencies import AdminDep
+from app.config import settings
+from app.middleware.profiler import PROFILE_SUFFIX
+
+router = APIRouter(prefix="/admin/profiles", tags=["Мониторинг"])
+
+
+@router.get("", summary="Список сохраненных профилей запросов (только администраторы)")
+async def list_profiles(current_user: AdminDep):
+    directory = settings.PROFILER_OUTPUT_DIR
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(PROFILE_SUFFIX):
+            stat = entry.stat()
+            profiles.append({
+                "name": entry.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime),
+            })
+    return sorted(profiles, key=lambda profile: profile["name"], reverse=True)
+
+
+@router.get("/{name}", summary="Профиль в формате свернутых стеков для flamegraph (только администраторы)")
+async def get_profile(name: str, current_user: AdminDep):
+    # Только имя файла из каталога профилей, без путей
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    path = os.path.join(settings.PROFILER_OUTPUT_DIR, name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
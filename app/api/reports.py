@@ -1,5 +1,5 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
+from fastapi import APIRouter, Query, Path, HTTPException, status
 
 from app.api.dependencies import DBDep, UserDepWithRole
 from app.exceptions.reports import (
@@ -18,7 +18,9 @@ from app.schemes.reports import (
     SReportUpdate, 
     SReportGet,
     SReportStats,
-    ReportStatus
+    SReportedContent,
+    ReportStatus,
+    ContentType
 )
 from app.services.reports import ReportService
 
@@ -29,7 +31,7 @@ router = APIRouter(prefix="/reports", tags=["Жалобы"])
 async def create_report(
     report_data: SReportCreate,
     db: DBDep,
-    current_user = Depends(UserDepWithRole),
+    current_user: UserDepWithRole,
 ) -> dict[str, str]:
     try:
         await ReportService(db).create_report(report_data, current_user.id)
@@ -44,29 +46,27 @@ async def create_report(
 @router.get("/my", summary="Получение жалоб текущего пользователя")
 async def get_my_reports(
     db: DBDep,
+    current_user: UserDepWithRole,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[ReportStatus] = None,
-    current_user: dict = Depends(UserDepWithRole),
 ) -> List[SReportGet]:
-    reports = await ReportService(db).get_reports_with_details(
+    return await ReportService(db).get_reports_with_details(
         skip=skip,
         limit=limit,
-        status=status
+        status=status,
+        reporter_id=current_user.id
     )
-    # Фильтруем только жалобы текущего пользователя
-    my_reports = [r for r in reports if r["reporter_id"] == current_user.id]
-    return my_reports
 
 
 @router.get("", summary="Получение всех жалоб (только для модераторов)")
 async def get_all_reports(
     db: DBDep,
+    current_user: UserDepWithRole,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[ReportStatus] = None,
     content_type: Optional[str] = Query(None, regex="^(post|comment)$"),
-    current_user: dict = Depends(UserDepWithRole),
 ) -> List[SReportGet]:
     # Проверяем права доступа (только модераторы/админы)
     is_moderator = current_user.role.level >= 2  # Модератор или выше
@@ -79,7 +79,8 @@ async def get_all_reports(
     reports = await ReportService(db).get_reports_with_details(
         skip=skip,
         limit=limit,
-        status=status
+        status=status,
+        content_type=ContentType(content_type) if content_type else None
     )
     return reports
 
@@ -87,8 +88,8 @@ async def get_all_reports(
 @router.get("/{report_id}", summary="Получение конкретной жалобы")
 async def get_report(
     db: DBDep,
+    current_user: UserDepWithRole,
     report_id: int = Path(..., description="ID жалобы"),
-    current_user: dict = Depends(UserDepWithRole),
 ) -> SReportGet:
     report = await ReportService(db).get_report_with_details(report_id)
     if not report:
@@ -106,8 +107,8 @@ async def get_report(
 async def update_report(
     report_data: SReportUpdate,
     db: DBDep,
+    current_user: UserDepWithRole,
     report_id: int = Path(..., description="ID жалобы"),
-    current_user: dict = Depends(UserDepWithRole),
 ) -> dict[str, str]:
     # Проверяем права доступа
     is_moderator = current_user.role.level >= 2  # Модератор или выше
@@ -128,8 +129,8 @@ async def update_report(
 @router.delete("/{report_id}", summary="Удаление жалобы")
 async def delete_report(
     db: DBDep,
+    current_user: UserDepWithRole,
     report_id: int = Path(..., description="ID жалобы"),
-    current_user: dict = Depends(UserDepWithRole),
 ) -> dict[str, str]:
     try:
         is_admin = current_user.role.level >= 3  # Администратор
@@ -145,7 +146,7 @@ async def delete_report(
 @router.get("/stats/summary", summary="Статистика жалоб (только модераторы)")
 async def get_reports_stats(
     db: DBDep,
-    current_user: dict = Depends(UserDepWithRole),
+    current_user: UserDepWithRole,
 ) -> SReportStats:
     # Проверяем права доступа
     is_moderator = current_user.role.level >= 2  # Модератор или выше
@@ -159,14 +160,30 @@ async def get_reports_stats(
     return stats
 
 
+@router.get("/stats/content", summary="Контент с наибольшим числом жалоб (только модераторы)")
+async def get_most_reported_content(
+    db: DBDep,
+    current_user: UserDepWithRole,
+    limit: int = Query(20, ge=1, le=100),
+) -> List[SReportedContent]:
+    is_moderator = current_user.role.level >= 2  # Модератор или выше
+    if not is_moderator:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Только модераторы могут просматривать статистику"
+        )
+    
+    return await ReportService(db).get_most_reported_content(limit)
+
+
 @router.get("/content/{content_type}/{content_id}", summary="Получение жалоб на конкретный контент")
 async def get_reports_for_content(
     db: DBDep,
+    current_user: UserDepWithRole,
     content_type: str = Path(..., description="Тип контента (post или comment)", regex="^(post|comment)$"),
     content_id: int = Path(..., description="ID контента"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: dict = Depends(UserDepWithRole),
 ) -> List[SReportGet]:
     # Проверяем права доступа (только модераторы/админы или автор контента)
     is_moderator = current_user.role.level >= 2  # Модератор или выше
@@ -179,22 +196,9 @@ async def get_reports_for_content(
             detail="Только модераторы могут просматривать жалобы на контент"
         )
     
-    # Получаем жалобы для конкретного контента
-    from app.schemes.reports import ContentType
-    
-    reports = await ReportService(db).get_reports(
+    return await ReportService(db).get_reports_for_content(
+        ContentType(content_type),
+        content_id,
         skip=skip,
-        limit=limit,
-        content_type=ContentType(content_type)
+        limit=limit
     )
-    
-    # Фильтруем по content_id
-    filtered_reports = [r for r in reports if r.content_id == content_id]
-    
-    # Получаем детальную информацию для каждой жалобы
-    detailed_reports = []
-    for report in filtered_reports:
-        detailed_report = await ReportService(db)._get_detailed_report_info(report)
-        detailed_reports.append(detailed_report)
-    
-    return detailed_reports
\ No newline at end of file
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import DBDep
+from app.config import settings
+from app.services.search import SearchService
+from app.services.suggest import search_suggestions
+
+router = APIRouter(prefix="/api/search", tags=["Поиск"])
+
+LimitQuery = Query(None, ge=0, le=settings.SEARCH_MAX_RESULTS_PER_TYPE)
+
+
+@router.get("", summary="Поиск по постам, комментариям, сообществам и темам")
+async def search(
+    db: DBDep,
+    query: str = Query(..., min_length=1, max_length=200),
+    posts_limit: int | None = LimitQuery,
+    comments_limit: int | None = LimitQuery,
+    communities_limit: int | None = LimitQuery,
+    themes_limit: int | None = LimitQuery,
+) -> dict:
+    """
+    Результаты, сгруппированные по типам; группы ранжированы по качеству совпадения.
+    Лимит 0 отключает тип, без лимита - SEARCH_RESULTS_PER_TYPE.
+    """
+    limits = {
+        "posts": posts_limit,
+        "comments": comments_limit,
+        "communities": communities_limit,
+        "themes": themes_limit,
+    }
+    return await SearchService(db).search(
+        query,
+        {search_type: limit for search_type, limit in limits.items() if limit is not None},
+    )
+
+
+@router.get("/suggest", summary="Подсказки при вводе поиска")
+async def suggest(
+    query: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(5, ge=1, le=20),
+) -> dict:
+    """Сообщества, темы и популярные посты, у которых слово названия начинается с запроса (из памяти, без БД)"""
+    return search_suggestions.suggest(query, limit)
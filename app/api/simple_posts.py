@@ -3,8 +3,14 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from datetime import datetime
 
 from app.api.dependencies import DBDep, CurrentUserDep, UserIdDep, get_current_user_id
+from app.exceptions.content_filter import BannedContentError, BannedContentHTTPError
 from app.schemes.posts import SPostAdd
+from app.services.content_filter import banned_phrases
+from app.services.duplicates import DuplicatePostService
+from app.services.events import event_bus, TOPIC_POSTS
 from app.services.post_reactions import PostReactionService
+from app.services.ranking import RankingService
+from app.services.related_posts import RelatedPostService
 
 router = APIRouter(prefix="/api/v2/posts", tags=["Посты v2"])
 
@@ -16,6 +22,11 @@ async def create_post_v2(
     current_user: int = Depends(get_current_user_id),
 ):
     """Создание нового поста с использованием модели"""
+    try:
+        banned_phrases.ensure_clean(post_data.header, post_data.body)
+    except BannedContentError as e:
+        raise BannedContentHTTPError(e.phrases)
+
     try:
         print(f"Создание поста: {post_data.dict()}")
         print(f"Пользователь: {current_user if current_user else 'нет'}")
@@ -51,9 +62,18 @@ async def create_post_v2(
         )
         
         db.session.add(new_post)
-        await db.session.commit()
-        await db.session.refresh(new_post)
+        await db.session.flush()
         post_id = new_post.id
+        # Индексы поиска дубликатов и похожих постов - в той же транзакции, что и пост:
+        # пост не сохраняется без них, а ошибка индексации не оставляет записанный пост с ответом 500
+        await DuplicatePostService(db).index_post(post_id, new_post.header, new_post.body)
+        await RelatedPostService(db).index_post(post_id, new_post.header, new_post.body)
+        event = {
+            "action": "created",
+            "post": {"id": post_id, "header": new_post.header, "community_id": new_post.community_id},
+        }
+        db.on_commit(lambda: event_bus.publish(TOPIC_POSTS, event))
+        await db.commit()
 
         return {
             "status": "OK",
@@ -73,15 +93,27 @@ async def get_posts_v2(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     theme_id: Optional[int] = None,
+    sort: Optional[str] = Query(None, pattern="^(hot|top)$"),
+    window: str = Query("week", pattern="^(day|week|month|all)$"),
 ):
     """Получение постов с информацией о пользователях и темах"""
     try:
-        # Получаем посты с фильтрацией по теме
-        posts = await db.posts.get_filtered(
-            theme_id=theme_id,
-            offset=skip,
-            limit=limit
-        )
+        if sort:
+            # Ранжированная выдача по предвычисленному hot_score или лайкам за окно
+            posts = await RankingService(db).get_ranked_posts(
+                sort=sort,
+                window=window,
+                skip=skip,
+                limit=limit,
+                theme_id=theme_id
+            )
+        else:
+            # Получаем посты с фильтрацией по теме
+            posts = await db.posts.get_filtered(
+                theme_id=theme_id,
+                offset=skip,
+                limit=limit
+            )
 
         # Преобразуем в словари и добавляем информацию о пользователях и темах
         posts_list = []
@@ -99,6 +131,7 @@ async def get_posts_v2(
                 "user_id": post.user_id,
                 "likes": post.likes or 0,
                 "dislikes": post.dislikes or 0,
+                "hot_score": getattr(post, "hot_score", 0.0),
                 "created_at": post.created_at,
                 "user_name": user.name if user else "Аноним",
                 "theme_name": theme.name if theme else "Без темы"
@@ -349,8 +382,12 @@ async def delete_post_v2(
         if not (is_owner or is_moderator_or_admin):
             raise HTTPException(status_code=403, detail="Нет прав на удаление этого поста")
 
-        # Удаляем пост
+        # Удаляем пост вместе с его подписью и связями похожих постов
+        await db.post_signatures.delete_for_post(post_id)
+        await RelatedPostService(db).remove_post(post_id, post.header, post.body)
         await db.posts.delete(id=post_id)
+        event = {"action": "deleted", "post": {"id": post_id, "community_id": post.community_id}}
+        db.on_commit(lambda: event_bus.publish(TOPIC_POSTS, event))
 
         return {
             "status": "OK",
@@ -4,10 +4,10 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 import os
 from pathlib import Path
-from app.api.dependencies import DBDep, get_current_user_id, get_db, get_token, ModeratorOrAdminDep
+from app.api.dependencies import DBDep, get_current_user_id, get_optional_user_id, get_db, get_token, ModeratorOrAdminDep
 from app.services.auth import AuthService
 from app.services.posts import PostService
-from app.database.db_manager import DBManager
+from app.services.feed import FeedService
 from app.exceptions.auth import JWTTokenExpiredHTTPError
 from app.services.stats import StatsService
 from app.models.users import UserModel
@@ -19,29 +19,46 @@ current_file = Path(__file__).resolve()
 project_root = current_file.parent.parent.parent  # app/api/web.py → 3 уровня вверх
 TEMPLATES_DIR = project_root / "app" / "templates"
 
-# Для отладки
-print(f"=== DEBUG INFO ===")
-print(f"Templates directory: {TEMPLATES_DIR}")
-print(f"Directory exists: {TEMPLATES_DIR.exists()}")
-if TEMPLATES_DIR.exists():
-    print(f"Files in templates: {list(TEMPLATES_DIR.glob('*.html'))}")
-print(f"==================")
+_templates: Jinja2Templates | None = None
 
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+
+def get_templates() -> Jinja2Templates:
+    """Окружение шаблонов создается при старте приложения (lifespan) или при первом запросе"""
+    global _templates
+    if _templates is None:
+        _templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+    return _templates
+
+
+def warm_up_templates() -> int:
+    """Компиляция всех шаблонов заранее, чтобы первый запрос к странице не платил за разбор"""
+    if not TEMPLATES_DIR.exists():
+        raise RuntimeError(f"Не найдена папка шаблонов: {TEMPLATES_DIR}")
+    env = get_templates().env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
 
 # Главная страница
 @router.get("/", response_class=HTMLResponse)
-async def index(request: Request, db: 'DBDep' = None, theme_id: int = None):
-    async with DBManager() as db_manager:
+async def index(request: Request, db: DBDep, theme_id: int = None):
+    user_id = get_optional_user_id(request)
+    posts = []
+    if user_id:
+        # Авторизованному пользователю показываем ленту его сообществ
+        feed = await FeedService(db).get_feed(user_id=user_id, limit=10, theme_id=theme_id)
+        posts = feed["items"]
+    if not posts:
         # Получаем посты из базы данных с дополнительной информацией для веб-страницы
-        posts = await PostService(db_manager).get_posts_for_web(theme_id=theme_id, limit=10) # Получаем последние 10 постов
-        
-        # Получаем статистику для отображения на главной странице
-        stats_service = StatsService(db_manager)
-        forum_stats = await stats_service.get_forum_stats()
-        theme_stats = await stats_service.get_theme_stats()
+        posts = await PostService(db).get_posts_for_web(theme_id=theme_id, limit=10) # Получаем последние 10 постов
+    
+    # Получаем статистику для отображения на главной странице
+    stats_service = StatsService(db)
+    forum_stats = await stats_service.get_forum_stats()
+    theme_stats = await stats_service.get_theme_stats()
 
-    return templates.TemplateResponse("index.html", {
+    return get_templates().TemplateResponse("index.html", {
         "request": request,
         "posts": posts,
         "forum_stats": forum_stats,
@@ -72,7 +89,7 @@ async def post_detail(
     
     is_favorite = await favorites_service.is_favorite(user_id, post_id)
     
-    return templates.TemplateResponse("post_detail.html", {
+    return get_templates().TemplateResponse("post_detail.html", {
         "request": request,
         "post": post,
         "comments": post.get("comments", []),
@@ -83,20 +100,18 @@ async def post_detail(
 @router.get("/auth", response_class=HTMLResponse)
 async def auth_page(request: Request):
     print(f"Accessing auth.html from: {TEMPLATES_DIR / 'auth.html'}")  # Отладка
-    return templates.TemplateResponse("auth.html", {"request": request})
+    return get_templates().TemplateResponse("auth.html", {"request": request})
 
 # Страница сообществ
 @router.get("/communities", response_class=HTMLResponse)
-async def communities_page(request: Request, db: 'DBDep' = None):
+async def communities_page(request: Request, db: DBDep):
     from app.services.communities import CommunitiesService
-    from app.database.db_manager import DBManager
     
-    async with DBManager() as db_manager:
-        # Получаем сообщества из базы данных
-        communities = await CommunitiesService(db_manager).get_communities()
+    # Получаем сообщества из базы данных
+    communities = await CommunitiesService(db).get_communities()
     
     print(f"Accessing communities.html from: {TEMPLATES_DIR / 'communities.html'}")  # Отладка
-    return templates.TemplateResponse("communities.html", {
+    return get_templates().TemplateResponse("communities.html", {
         "request": request,
         "communities": communities
     })
@@ -104,24 +119,28 @@ async def communities_page(request: Request, db: 'DBDep' = None):
 
 # Страница отдельного сообщества
 @router.get("/communities/{community_id}", response_class=HTMLResponse)
-async def community_detail_page(request: Request, community_id: int, db: 'DBDep' = None):
+async def community_detail_page(request: Request, community_id: int, db: DBDep):
     from app.services.communities import CommunitiesService
-    from app.database.db_manager import DBManager
     from app.services.posts import PostService
     
-    async with DBManager() as db_manager:
-        # Получаем информацию о сообществе
-        community = await CommunitiesService(db_manager).get_community(community_id)
-        if not community:
-            raise HTTPException(status_code=404, detail="Сообщество не найдено")
-        
-        # Получаем посты, связанные с этим сообществом
-        posts = await PostService(db_manager).get_posts_for_web(community_id=community_id, limit=20)
+    user_id = get_optional_user_id(request)
+    communities_service = CommunitiesService(db)
+    # Получаем информацию о сообществе
+    community = await communities_service.get_community(community_id)
+    if not community:
+        raise HTTPException(status_code=404, detail="Сообщество не найдено")
+    
+    # Состоит ли пользователь в сообществе (один точечный запрос)
+    is_joined = await communities_service.is_member(community_id, user_id) if user_id else False
     
-    return templates.TemplateResponse("community_detail.html", {
+    # Получаем посты, связанные с этим сообществом
+    posts = await PostService(db).get_posts_for_web(community_id=community_id, limit=20)
+    
+    return get_templates().TemplateResponse("community_detail.html", {
         "request": request,
         "community": community,
-        "posts": posts
+        "posts": posts,
+        "is_joined": is_joined
     })
     
     
@@ -174,7 +193,7 @@ async def profile_page(
         else:
             user_data_dict['communities'] = []
         
-        return templates.TemplateResponse("profile.html", {
+        return get_templates().TemplateResponse("profile.html", {
             "request": request,
             "user": user_data_dict,
             "stats": user_stats,
@@ -210,12 +229,12 @@ async def admin_panel(
     from app.services.stats import StatsService
     from app.services.users import UserService
     from app.services.posts import PostService
-    from app.services.reports import ReportService
+    from app.services.moderation import ModerationService
     
     stats_service = StatsService(db)
     user_service = UserService(db)  # переопределяем для статистики
     post_service = PostService(db)
-    reports_service = ReportService(db)
+    moderation_service = ModerationService(db)
     
     # Получаем общую статистику
     forum_stats = await stats_service.get_forum_stats()
@@ -226,14 +245,14 @@ async def admin_panel(
     # Получаем последние посты
     recent_posts = await post_service.get_recent_posts(limit=10)
     
-    # Получаем открытые жалобы
-    open_reports = await reports_service.get_open_reports()
+    # Очередь модерации: открытые жалобы, сгруппированные по контенту
+    moderation_queue = await moderation_service.get_queue(limit=20)
     
-    return templates.TemplateResponse("admin_panel.html", {
+    return get_templates().TemplateResponse("admin_panel.html", {
         "request": request,
         "current_user": current_user,
         "forum_stats": forum_stats,
         "recent_users": recent_users,
         "recent_posts": recent_posts,
-        "open_reports": open_reports
+        "moderation_queue": moderation_queue
     })
@@ -1,19 +1,70 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Корень проекта: от него считаются .env и относительные пути к файлам из настроек
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
 class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     DB_NAME: str
+    # Пересчет "горячести" постов: как часто и за какой период
+    RANKING_REFRESH_INTERVAL_SECONDS: int = 300
+    RANKING_DECAY_WINDOW_DAYS: int = 30
+    # Живые обновления (SSE): лимит подключений на воркер, окно склейки событий, пинг
+    LIVE_MAX_CONNECTIONS_PER_WORKER: int = 500
+    LIVE_COALESCE_SECONDS: float = 0.5
+    LIVE_HEARTBEAT_SECONDS: int = 15
+    # Шина событий между воркерами: memory:// или redis://host:port/db
+    EVENT_BUS_URL: str = "memory://"
+    EVENT_BUS_CHANNEL_PREFIX: str = "forum:"
+    # Фоновые задачи (пересчет рейтинга) - при нескольких воркерах только в одном из них
+    RUN_BACKGROUND_TASKS: bool = True
+    # Отладка: заголовки Server-Timing/X-DB-Queries; порог медленного запроса для лога
+    DEBUG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    # Метрики Prometheus (/metrics) и размер пула потоков для bcrypt
+    METRICS_ENABLED: bool = True
+    BCRYPT_POOL_SIZE: int = 4
+    # Семплирующий профайлер: 1 из N запросов (0 - только по заголовку X-Profile от админа)
+    PROFILER_SAMPLE_RATE: int = 0
+    PROFILER_INTERVAL_MS: float = 5.0
+    PROFILER_OUTPUT_DIR: str = "profiles"
+    # Групповая запись комментариев: одна транзакция на пачку вместо транзакции на запрос
+    COMMENT_GROUP_COMMIT: bool = False
+    COMMENT_BATCH_MAX_SIZE: int = 200
+    COMMENT_BATCH_DELAY_MS: float = 2.0
+    COMMENT_WRITE_TIMEOUT_SECONDS: float = 5.0
+    COMMENT_QUEUE_MAX_SIZE: int = 5000
+    COMMENT_MAX_PENDING_PER_USER: int = 20
+    # Запрещенные фразы: файл списка и как часто проверять его изменение
+    BANNED_PHRASES_FILE: str = "banned_phrases.txt"
+    BANNED_PHRASES_CHECK_SECONDS: float = 5.0
+    # Почти-дубликаты постов: минимальное сходство MinHash-подписей
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.8
+    # Похожие обсуждения: сколько показывать и минимальное косинусное сходство TF-IDF
+    RELATED_POSTS_TOP_K: int = 5
+    RELATED_POSTS_MIN_SCORE: float = 0.1
+    # Общий поиск: сколько результатов каждого типа по умолчанию и максимум
+    SEARCH_RESULTS_PER_TYPE: int = 5
+    SEARCH_MAX_RESULTS_PER_TYPE: int = 50
+    # Подсказки поиска: сколько популярных постов держать в памяти и сколько ключей просматривать
+    SUGGEST_MAX_POSTS: int = 20000
+    SUGGEST_SCAN_LIMIT: int = 2000
     model_config = SettingsConfigDict(
-        env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
+        env_file=os.path.join(PROJECT_ROOT, ".env")
     )
     
     @property
     def get_db_url(self):
         return f"sqlite+aiosqlite:///{self.DB_NAME}"
 
+    @property
+    def banned_phrases_path(self) -> str:
+        """Файл запрещенных фраз; относительный путь - от корня проекта, а не от текущего каталога"""
+        return os.path.normpath(os.path.join(PROJECT_ROOT, self.BANNED_PHRASES_FILE))
+
     @property
     def auth_data(self):
         return {"secret_key": self.SECRET_KEY, "algorithm": self.ALGORITHM}
@@ -5,8 +5,7 @@ from .database import (
     create_tables,
     drop_tables,
     engine,
-    engine_null_pool,
-    async_session_maker_null_pool
+    import_models,
 )
 
 __all__ = [
@@ -16,6 +15,15 @@ __all__ = [
     "create_tables",
     "drop_tables",
     "engine",
+    "import_models",
     "engine_null_pool",
     "async_session_maker_null_pool"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    # Движок без пула создается лениво при первом обращении (см. database.__getattr__)
+    if name in ("engine_null_pool", "async_session_maker_null_pool"):
+        from . import database
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
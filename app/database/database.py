@@ -1,8 +1,9 @@
+import time
 from datetime import datetime
 from typing import TYPE_CHECKING, AsyncGenerator
 from pathlib import Path
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import AsyncAdaptedQueuePool, NullPool, event, func, text
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
@@ -11,22 +12,71 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
+from app.utils.metrics import CallbackMetric, Histogram
 
 BASE_DIR = Path(__file__).parent.parent
 
 DATABASE_URL = settings.get_db_url
 
-engine = create_async_engine(settings.get_db_url)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Ожидание соединения из пула БД",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
 
-engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
 
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Пул соединений, замеряющий время ожидания свободного соединения"""
 
-async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
-async_session_maker_null_pool = async_sessionmaker(
-    bind=engine_null_pool, expire_on_commit=False
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
+# Создание движка не открывает соединений: первое соединение открывается при прогреве в lifespan
+engine = create_async_engine(settings.get_db_url, poolclass=InstrumentedPool)
+
+CallbackMetric(
+    "db_pool_connections",
+    "Соединения пула БД по состоянию",
+    lambda: {("checked_out",): engine.pool.checkedout(), ("idle",): engine.pool.checkedin()},
+    labelnames=("state",),
 )
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Настройки каждого нового соединения: в режиме WAL достаточно synchronous=NORMAL"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode")
+    if cursor.fetchone()[0] == "wal":
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+# Движок без пула нужен только тестам и скриптам, поэтому создается при первом обращении
+_null_pool: dict = {}
+
+
+def __getattr__(name: str):
+    if name in ("engine_null_pool", "async_session_maker_null_pool"):
+        if not _null_pool:
+            null_engine = create_async_engine(settings.get_db_url, poolclass=NullPool)
+            event.listen(null_engine.sync_engine, "connect", _set_sqlite_pragmas)
+            _null_pool["engine_null_pool"] = null_engine
+            _null_pool["async_session_maker_null_pool"] = async_sessionmaker(
+                bind=null_engine, expire_on_commit=False
+            )
+        return _null_pool[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class Base(DeclarativeBase):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -42,9 +92,19 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def create_tables():
-    """Создание всех таблиц в базе данных"""
-    # Импортируем все модели для регистрации в Base до создания таблиц
+async def prepare_database():
+    """
+    Однократная подготовка файла БД перед запуском воркеров.
+    WAL сохраняется в самом файле и позволяет читать параллельно с записью
+    из нескольких процессов.
+    """
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    await engine.dispose()
+
+
+def import_models():
+    """Импорт всех моделей для регистрации в Base (нужен до create_all и configure_mappers)"""
     from app.models.users import UserModel
     from app.models.roles import RoleModel
     from app.models.posts import PostModel
@@ -54,6 +114,14 @@ async def create_tables():
     from app.models.themes import ThemeModel
     from app.models.reports import ReportModel
     from app.models.favorites import FavoritePostModel
+    from app.models.post_signatures import PostSignatureModel, PostLshBandModel
+    from app.models.related_posts import PostTermModel, TermDocumentsModel, RelatedPostModel
+    from app.models.search_index import TRIGRAM_INDEXES
+
+
+async def create_tables():
+    """Создание всех таблиц в базе данных"""
+    import_models()
     
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -62,16 +130,7 @@ async def create_tables():
 
 async def drop_tables():
     """Удаление всех таблиц из базы данных (для тестов)"""
-    # Импортируем все модели для регистрации в Base перед удалением таблиц
-    from app.models.users import UserModel
-    from app.models.roles import RoleModel
-    from app.models.posts import PostModel
-    from app.models.comments import CommentModel
-    from app.models.communities import CommunityModel
-    from app.models.user_communities import UserCommunityModel
-    from app.models.themes import ThemeModel
-    from app.models.reports import ReportModel
-    from app.models.favorites import FavoritePostModel
+    import_models()
     
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Callable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import async_session_maker
 from app.repositories.users import UsersRepository
 from app.repositories.roles import RolesRepository
 from app.repositories.posts import PostsRepository
+from app.repositories.post_signatures import PostSignaturesRepository
+from app.repositories.related_posts import RelatedPostsRepository
 from app.repositories.comments import CommentsRepository
 from app.repositories.communities import CommunitiesRepository
 from app.repositories.reports import ReportsRepository
@@ -17,11 +19,15 @@ class DBManager:
     def __init__(self, session_factory=async_session_maker):
         self.session_factory = session_factory
         self.session: Optional[AsyncSession] = None
+        # Действия, которые нужно выполнить только после успешного коммита
+        self._after_commit: list[Callable[[], None]] = []
         
         # Репозитории будут инициализированы при входе в контекст
         self.users: Optional[UsersRepository] = None
         self.roles: Optional[RolesRepository] = None
         self.posts: Optional[PostsRepository] = None
+        self.post_signatures: Optional[PostSignaturesRepository] = None
+        self.related_posts: Optional[RelatedPostsRepository] = None
         self.comments: Optional[CommentsRepository] = None
         self.communities: Optional[CommunitiesRepository] = None
         self.reports: Optional[ReportsRepository] = None
@@ -36,6 +42,8 @@ class DBManager:
         self.users = UsersRepository(self.session)
         self.roles = RolesRepository(self.session)
         self.posts = PostsRepository(self.session)
+        self.post_signatures = PostSignaturesRepository(self.session)
+        self.related_posts = RelatedPostsRepository(self.session)
         self.comments = CommentsRepository(self.session)
         self.post_reactions = None  # Initialize to None if it doesn't exist
         self.communities = CommunitiesRepository(self.session)
@@ -50,9 +58,11 @@ class DBManager:
         if exc_type is not None:
             # Если была ошибка - откатываем транзакцию
             await self.session.rollback()
+            self._after_commit.clear()
         else:
             # Если все хорошо - коммитим
             await self.session.commit()
+            self._run_after_commit()
         
         await self.session.close()
         
@@ -60,6 +70,8 @@ class DBManager:
         self.users = None
         self.roles = None
         self.posts = None
+        self.post_signatures = None
+        self.related_posts = None
         self.comments = None
         self.post_reactions = None
         self.communities = None
@@ -72,11 +84,31 @@ class DBManager:
         """Явный коммит транзакции"""
         if self.session:
             await self.session.commit()
+            self._run_after_commit()
 
     async def rollback(self):
         """Откат транзакции"""
         if self.session:
             await self.session.rollback()
+            self._after_commit.clear()
+
+    async def release(self):
+        """
+        Коммит и возврат соединения в пул до конца запроса: сессией можно
+        пользоваться и дальше, соединение будет взято заново при первом запросе к БД
+        """
+        if self.session:
+            await self.commit()
+            await self.session.close()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Отложить действие (например, публикацию события) до коммита транзакции"""
+        self._after_commit.append(callback)
+
+    def _run_after_commit(self):
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
 
     def get_repository(self, repository_type):
         """Получение репозитория по типу"""
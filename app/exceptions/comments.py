@@ -44,4 +44,35 @@ class CommentToDeletedPostHTTPError(HTTPException):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Нельзя добавить комментарий к удаленному посту"
-        )
\ No newline at end of file
+        )
+
+class CommentQueueFullError(MyAppError):
+    detail = "Очередь записи комментариев переполнена"
+    
+    def __init__(self, detail=None):
+        super().__init__(detail)
+
+
+class CommentQueueFullHTTPError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Слишком много комментариев, попробуйте еще раз через несколько секунд",
+            headers={"Retry-After": "5"}
+        )
+
+
+class CommentWriteTimeoutError(MyAppError):
+    detail = "Комментарий не был записан вовремя"
+    
+    def __init__(self, detail=None):
+        super().__init__(detail)
+
+
+class CommentWriteTimeoutHTTPError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервер перегружен, комментарий не сохранен. Попробуйте еще раз",
+            headers={"Retry-After": "5"}
+        )
@@ -0,0 +1,23 @@
+from fastapi import HTTPException, status
+from app.exceptions.base import MyAppError
+
+
+class BannedContentError(MyAppError):
+    detail = "Текст содержит запрещенные слова"
+    
+    def __init__(self, phrases: list[str] | None = None):
+        self.phrases = phrases or []
+        super().__init__(
+            f"{self.detail}: {', '.join(self.phrases)}" if self.phrases else None
+        )
+
+
+class BannedContentHTTPError(HTTPException):
+    def __init__(self, phrases: list[str] | None = None):
+        detail = BannedContentError.detail
+        if phrases:
+            detail = f"{detail}: {', '.join(phrases)}"
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail
+        )
@@ -0,0 +1,18 @@
+from fastapi import HTTPException, status
+from app.exceptions.base import MyAppError
+
+
+class LiveConnectionsLimitError(MyAppError):
+    detail = "Превышен лимит подключений к живым обновлениям"
+    
+    def __init__(self, detail=None):
+        super().__init__(detail)
+
+
+class LiveConnectionsLimitHTTPError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Слишком много подключений к живым обновлениям, попробуйте позже",
+            headers={"Retry-After": "30"}
+        )
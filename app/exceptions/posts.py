@@ -41,4 +41,19 @@ class PostAlreadyExistsHTTPError(HTTPException):
         super().__init__(
             status_code=status.HTTP_409_CONFLICT,
             detail="Пост с таким заголовком уже существует"
+        )
+
+
+class InvalidFeedCursorError(MyAppError):
+    detail = "Некорректный курсор ленты"
+    
+    def __init__(self, detail=None):
+        super().__init__(detail)
+
+
+class InvalidFeedCursorHTTPError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор ленты"
         )
\ No newline at end of file
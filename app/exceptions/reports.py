@@ -71,4 +71,18 @@ class OnlyModeratorAccessHTTPError(HTTPException):
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Только модераторы могут выполнять это действие"
-        )
\ No newline at end of file
+        )
+
+class NoPendingReportsError(MyAppError):
+    detail = "Нет открытых жалоб на этот контент"
+    
+    def __init__(self, detail=None):
+        super().__init__(detail)
+
+
+class NoPendingReportsHTTPError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Нет открытых жалоб на этот контент"
+        )
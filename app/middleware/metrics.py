@@ -0,0 +1,56 @@
+"""
+Метрики HTTP-запросов: гистограмма длительности по шаблону маршрута и число
+запросов в обработке. Шаблон маршрута (/api/v2/posts/{post_id}), а не реальный
+путь, держит число серий ограниченным.
+"""
+import time
+
+from app.utils.metrics import CallbackMetric, Histogram
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Длительность HTTP-запросов",
+    labelnames=("method", "route", "status"),
+)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ASGI middleware: несколько операций со словарем на запрос, без блокировок"""
+
+    in_flight = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        MetricsMiddleware.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_holder[0],
+            )
+            MetricsMiddleware.in_flight -= 1
+
+
+CallbackMetric(
+    "http_requests_in_flight", "HTTP-запросы в обработке", lambda: {(): MetricsMiddleware.in_flight}
+)
@@ -0,0 +1,118 @@
+"""
+Профилирование отдельных запросов в продакшене.
+
+Запрос профилируется, если:
+  - у него есть заголовок X-Profile и пользователь - администратор (require_admin);
+  - или он попал в случайную выборку 1 из PROFILER_SAMPLE_RATE (0 - выключено).
+Профиль (свернутые стеки для flamegraph) пишется в PROFILER_OUTPUT_DIR, имя файла
+возвращается в заголовке X-Profile-Id. Одновременно профилируется не больше
+одного запроса: профайлер снимает стек всего потока цикла событий.
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import uuid
+from datetime import datetime
+
+from app.config import settings
+from app.utils.profiler import SamplingProfiler
+
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_SUFFIX = ".folded"
+
+logger = logging.getLogger("app.profiler")
+
+
+def profile_name(method: str, path: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:60] or "root"
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}-{method}-{slug}{PROFILE_SUFFIX}"
+
+
+async def is_admin_request(scope) -> bool:
+    """Та же проверка, что и у зависимости require_admin, но без исключения наружу"""
+    from fastapi import HTTPException, Request
+
+    from app.api.dependencies import get_current_user_id, get_current_user_with_role, get_token, require_admin
+    from app.database.database import async_session_maker
+    from app.database.db_manager import DBManager
+
+    try:
+        user_id = get_current_user_id(get_token(Request(scope)))
+        async with DBManager(session_factory=async_session_maker) as db:
+            user = await get_current_user_with_role(db, user_id)
+            # Без роли check_permissions упал бы с AttributeError, а запрос - с 500
+            if user.role is None:
+                return False
+            await require_admin(user)
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilerMiddleware:
+    """ASGI middleware: семплирующий профайлер для запросов по заголовку админа или выборке"""
+
+    active = False
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        app,
+        output_dir: str | None = None,
+        sample_rate: int | None = None,
+        interval_ms: float | None = None,
+    ):
+        self.app = app
+        self.output_dir = output_dir or settings.PROFILER_OUTPUT_DIR
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.interval = (settings.PROFILER_INTERVAL_MS if interval_ms is None else interval_ms) / 1000
+
+    async def _should_profile(self, scope) -> bool:
+        if any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+            return await is_admin_request(scope)
+        return self.sample_rate > 0 and random.randrange(self.sample_rate) == 0
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if ProfilerMiddleware.active:
+                return False
+            ProfilerMiddleware.active = True
+            return True
+
+    def _write(self, profiler: SamplingProfiler, name: str) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        profiler.write(os.path.join(self.output_dir, name))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._should_profile(scope) or not self._acquire():
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_name(scope["method"], scope["path"])
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(PROFILE_ID_HEADER, name.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            ProfilerMiddleware.active = False
+            try:
+                # Запись файла - в потоке, чтобы не задерживать цикл событий
+                await asyncio.to_thread(self._write, profiler, name)
+            except OSError as e:
+                logger.warning("Не удалось записать профиль %s: %s", name, e)
+            else:
+                logger.info(
+                    "Профиль %s: %d семплов за %.1f ms", name, profiler.samples, profiler.duration * 1000
+                )
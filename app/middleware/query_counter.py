@@ -0,0 +1,124 @@
+"""
+Подсчет SQL-запросов и их времени на каждый HTTP-запрос.
+
+События SQLAlchemy before/after_cursor_execute складывают статистику в объект
+текущего запроса (contextvar). Middleware в режиме DEBUG отдает ее в заголовках
+Server-Timing и X-DB-Queries, а запросы дольше SLOW_QUERY_THRESHOLD_MS
+пишутся в лог вместе с маршрутом.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.metrics import Counter
+
+
+logger = logging.getLogger("app.slow_queries")
+
+DB_QUERIES = Counter("db_queries_total", "Выполненные SQL-запросы")
+DB_QUERY_SECONDS = Counter("db_query_seconds_total", "Суммарное время SQL-запросов")
+
+
+class QueryStats:
+    """Счетчик запросов одного HTTP-запроса (или блока кода в тестах)"""
+
+    __slots__ = ("scope", "count", "duration", "statements")
+
+    def __init__(self, scope: dict | None = None, record_statements: bool = False):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.statements: list[str] | None = [] if record_statements else None
+
+    @property
+    def route(self) -> str:
+        if not self.scope:
+            return "-"
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "-")
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+# Счетчики, которые видят все запросы процесса (для тестов: TestClient выполняет приложение в другом потоке)
+_global_collectors: list[QueryStats] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.inc(amount=elapsed)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+    for collector in _global_collectors:
+        collector.add(statement, elapsed)
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Медленный запрос %.1f ms [%s]: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else "-",
+            " ".join(statement.split()),
+        )
+
+
+@contextmanager
+def count_queries():
+    """Счетчик всех SQL-запросов процесса внутри блока (с текстами запросов)"""
+    stats = QueryStats(record_statements=True)
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+class QueryCounterMiddleware:
+    """ASGI middleware: статистика запросов к БД на каждый HTTP-запрос"""
+
+    def __init__(self, app, expose_headers: bool | None = None):
+        self.app = app
+        self.expose_headers = settings.DEBUG if expose_headers is None else expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                db_ms = stats.duration * 1000
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (
+                        b"server-timing",
+                        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'.encode(),
+                    ),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.expose_headers else send)
+        finally:
+            _current_stats.reset(token)
@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Float, ForeignKey, Index, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class PostSignatureModel(Base):
+    """MinHash-подпись поста (см. app/utils/minhash.py) и найденный почти-дубликат"""
+    __tablename__ = "post_signatures"
+    __table_args__ = (
+        Index("ix_post_signatures_duplicate_of", "duplicate_of_id"),
+    )
+
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Более ранний пост с самым похожим текстом (если сходство выше порога)
+    duplicate_of_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="SET NULL"), nullable=True
+    )
+    similarity: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class PostLshBandModel(Base):
+    """Индекс LSH: корзина (полоса, ключ) -> посты; поиск кандидатов по первичному ключу"""
+    __tablename__ = "post_lsh_bands"
+
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from datetime import datetime
 import json
-from sqlalchemy import String, ForeignKey, Integer, DateTime, Text
+from sqlalchemy import String, ForeignKey, Integer, DateTime, Text, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -14,6 +14,10 @@ if TYPE_CHECKING:
 
 class PostModel(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Диапазоны "новые посты сообщества" для персональной ленты
+        Index("ix_posts_community_created", "community_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -23,11 +27,14 @@ class PostModel(Base):
     header: Mapped[str] = mapped_column(String(255), unique=False, nullable=False)
     body: Mapped[str] = mapped_column(String(2500), unique=False, nullable=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     likes: Mapped[int] = mapped_column(Integer, default=0, nullable=True)
     dislikes: Mapped[int] = mapped_column(Integer, default=0, nullable=True)
 
+    # Предвычисленная "горячесть" поста (см. app/utils/ranking.py)
+    hot_score: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False, index=True)
+
     user: Mapped["UserModel"] = relationship(back_populates="posts")
     theme: Mapped["ThemeModel"] = relationship(back_populates="posts")
     comments: Mapped[list["CommentModel"]] = relationship(back_populates="post", cascade="all, delete-orphan")
@@ -0,0 +1,39 @@
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class PostTermModel(Base):
+    """Усеченный TF-IDF-вектор поста (см. app/utils/tfidf.py) - он же обратный индекс по словам"""
+    __tablename__ = "post_terms"
+    __table_args__ = (
+        # Самые тяжелые посты по слову - без чтения всего списка
+        Index("ix_post_terms_term_weight", "term", "weight"),
+    )
+
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    term: Mapped[str] = mapped_column(String(50), primary_key=True)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class TermDocumentsModel(Base):
+    """Число постов с каждым словом (df для idf); строка с пустым term - всего постов"""
+    __tablename__ = "term_documents"
+
+    term: Mapped[str] = mapped_column(String(50), primary_key=True)
+    documents: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RelatedPostModel(Base):
+    """Заранее посчитанные похожие посты: top-k соседей по косинусному сходству"""
+    __tablename__ = "related_posts"
+
+    post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_post_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Index, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 import enum
@@ -28,6 +28,15 @@ class ReportStatusEnum(enum.Enum):
 
 class ReportModel(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # Одна жалоба пользователя на единицу контента: дубликаты отсекает INSERT ... ON CONFLICT
+        Index("uq_reports_reporter_content", "reporter_id", "content_type", "content_id", unique=True),
+        # Статистика GROUP BY (status, content_type) читается только из индекса
+        Index("ix_reports_status_content_type", "status", "content_type"),
+        # "Мои жалобы" и жалобы на конкретный контент
+        Index("ix_reports_reporter_created", "reporter_id", "created_at"),
+        Index("ix_reports_content", "content_type", "content_id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     reporter_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -80,4 +89,28 @@ class ReportModel(Base):
     def content(self):
         """Возвращает связанный пост или комментарий"""
         # Эта связь будет определена динамически в сервисе
-        return None
\ No newline at end of file
+        return None
+
+
+class ReportContentStatsModel(Base):
+    """
+    Сводка жалоб на единицу контента, пересчитывается при любом изменении ее жалоб.
+    Строка с открытыми жалобами - элемент очереди модерации, упорядоченной по priority.
+    """
+    __tablename__ = "report_content_stats"
+    __table_args__ = (
+        Index("ix_report_content_stats_count", "reports_count"),
+        Index("ix_report_content_stats_priority", "priority"),
+    )
+    
+    content_type: Mapped[ReportContentTypeEnum] = mapped_column(Enum(ReportContentTypeEnum), primary_key=True)
+    content_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    reports_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    first_reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    pending_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Суммарная репутация авторов открытых жалоб
+    pending_reputation: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    first_pending_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # NULL, если открытых жалоб нет: такой контент не попадает в очередь
+    priority: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -0,0 +1,71 @@
+"""
+Полнотекстовые индексы FTS5 с токенизатором trigram.
+
+Таблицы внешнего содержимого (content=...): текст хранится только в исходной
+таблице, индекс - триграммы; триггеры обновляют индекс при вставке, удалении
+и изменении индексируемых колонок (лайки и "горячесть" постов индекс не трогают).
+Создаются вместе со схемой (create_all) и миграциями c9d4a1f7e538, d2f7b3c9e164;
+в миграциях DDL скопирован, поэтому его изменение требует новой миграции.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy import DDL, event
+
+from app.database.database import Base
+
+
+@dataclass(frozen=True)
+class TrigramIndex:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+    rowid: str = "id"
+
+    def create_statements(self) -> list[str]:
+        columns = ", ".join(self.columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5("
+            f"{columns}, content='{self.table}', content_rowid='{self.rowid}', tokenize='trigram')",
+            *self.trigger_statements(),
+        ]
+
+    def trigger_statements(self) -> list[str]:
+        columns = ", ".join(self.columns)
+        new_values = ", ".join(f"new.{column}" for column in self.columns)
+        old_values = ", ".join(f"old.{column}" for column in self.columns)
+        insert = f"INSERT INTO {self.name}(rowid, {columns}) VALUES (new.{self.rowid}, {new_values});"
+        delete = (
+            f"INSERT INTO {self.name}({self.name}, rowid, {columns}) "
+            f"VALUES ('delete', old.{self.rowid}, {old_values});"
+        )
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au AFTER UPDATE OF {columns} ON {self.table} "
+            f"BEGIN {delete} {insert} END",
+        ]
+
+    def rebuild_statement(self) -> str:
+        return f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+
+    def drop_trigger_statements(self) -> list[str]:
+        return [f"DROP TRIGGER IF EXISTS {self.name}_{suffix}" for suffix in ("ai", "ad", "au")]
+
+    def drop_statements(self) -> list[str]:
+        return [*self.drop_trigger_statements(), f"DROP TABLE IF EXISTS {self.name}"]
+
+
+POSTS_INDEX = TrigramIndex("posts_fts", "posts", ("header", "body"))
+COMMUNITIES_INDEX = TrigramIndex("communities_fts", "communities", ("name", "description"))
+THEMES_INDEX = TrigramIndex("themes_fts", "themes", ("name",))
+COMMENTS_INDEX = TrigramIndex("comments_fts", "comments", ("body",))
+# Словарь слов постов (term_documents) - кандидаты для исправления опечаток
+TERMS_INDEX = TrigramIndex("term_documents_fts", "term_documents", ("term",), rowid="rowid")
+
+TRIGRAM_INDEXES = (POSTS_INDEX, COMMUNITIES_INDEX, THEMES_INDEX, TERMS_INDEX, COMMENTS_INDEX)
+
+for _index in TRIGRAM_INDEXES:
+    for _statement in _index.create_statements():
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    for _statement in _index.drop_statements():
+        event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
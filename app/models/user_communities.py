@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey
+from sqlalchemy import Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -9,6 +9,11 @@ if TYPE_CHECKING:
  
 class UserCommunityModel(Base):
     __tablename__ = "user_communities"
+    __table_args__ = (
+        # Один пользователь состоит в сообществе не более одного раза (уникальный индекс,
+        # как в миграции c4f8a2e6d913 - SQLite не добавляет ограничения в существующую таблицу)
+        Index("uq_user_communities_user_community", "user_id", "community_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from typing import TypeVar, Generic
+from typing import AsyncIterator, TypeVar, Generic
 from pydantic import BaseModel
 from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
@@ -49,6 +49,39 @@ class BaseRepository(Generic[T]):
 
         return result
 
+    def stream_rows(
+        self,
+        *filter,
+        batch_size: int = 1000,
+        **filter_by,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Потоковое чтение строк таблицы через серверный курсор (session.stream).
+        Отдает пачки словарей по batch_size в порядке id, не загружая всю выборку в память.
+        Ключ filter_by, которого нет среди столбцов таблицы, - ошибка (ValueError сразу
+        при вызове), а не фильтр, который молча пропускается.
+        """
+        table = self.model.__table__
+        unknown = sorted(set(filter_by) - set(table.c.keys()))
+        if unknown:
+            raise ValueError(f"Нет столбцов {', '.join(unknown)} в таблице {table.name}")
+
+        query = select(table).order_by(table.c.id)
+        filter_ = [v for v in filter if v is not None]
+        if filter_:
+            query = query.where(*filter_)
+        for key, value in filter_by.items():
+            if value is not None:
+                query = query.where(table.c[key] == value)
+        return self._stream_partitions(query, batch_size)
+
+    async def _stream_partitions(self, query, batch_size: int) -> AsyncIterator[list[dict]]:
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.mappings().partitions(batch_size):
+            yield [dict(row) for row in partition]
+
     async def get_all(self) -> list[T]:
         """Возращает все записи в БД из связаной таблицы"""
         return await self.get_filtered()
@@ -103,9 +136,10 @@ class BaseRepository(Generic[T]):
         except IntegrityError as exc:
             raise ObjectAlreadyExistsError from exc
 
-    async def add_bulk(self, data: list[T]) -> None | T:
+    async def add_bulk(self, data: list[T], batch_size: int = 1000) -> None:
         """
-        Метод для множественного добавления данных в таблицу
+        Метод для множественного добавления данных в таблицу.
+        Вставка идет пачками через executemany, а не одним огромным VALUES.
         """
         # Check if items in data are Pydantic models or dictionaries
         if data and hasattr(data[0], 'model_dump'):
@@ -115,9 +149,20 @@ class BaseRepository(Generic[T]):
             # Items are dictionaries
             values = data
         
-        add_stmt = insert(self.model).values(values)
-        # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
-        await self.session.execute(add_stmt)
+        add_stmt = insert(self.model)
+        for start in range(0, len(values), batch_size):
+            await self.session.execute(add_stmt, values[start:start + batch_size])
+
+    async def add_many(self, values: list[dict]) -> list[int]:
+        """
+        Вставка нескольких строк одним запросом (INSERT ... RETURNING id).
+        Возвращает id новых строк в порядке values.
+        """
+        if not values:
+            return []
+        add_stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        result = await self.session.execute(add_stmt, values)
+        return list(result.scalars().all())
 
     async def delete(self, *filters, **filter_by) -> None:
         delete_stmt = delete(self.model)
@@ -3,15 +3,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 
 from app.models.comments import CommentModel
+from app.models.search_index import COMMENTS_INDEX
 from app.repositories.base import BaseRepository
+from app.repositories.trigram_search import TrigramSearchMixin
 from app.schemes.comments import SCommentGet
 
 
-class CommentsRepository(BaseRepository):
+class CommentsRepository(TrigramSearchMixin, BaseRepository):
     """Репозиторий для работы с комментариями"""
     
     model = CommentModel
     schema = SCommentGet
+    search_index = COMMENTS_INDEX
+    use_term_vocabulary = True
     
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -48,4 +52,14 @@ class CommentsRepository(BaseRepository):
             .limit(limit)
         )
         result = await self.session.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def search(
+        self,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[CommentModel]:
+        """Поиск комментариев по тексту: точно, по основам слов, с опечатками (новые первыми)"""
+        comments, _ = await self.search_models(search_term, skip, limit)
+        return comments
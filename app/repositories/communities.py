@@ -3,15 +3,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 
 from app.models.communities import CommunityModel
+from app.models.search_index import COMMUNITIES_INDEX
 from app.repositories.base import BaseRepository
+from app.repositories.trigram_search import TrigramSearchMixin
 from app.schemes.communities import SCommunityGet
 
 
-class CommunitiesRepository(BaseRepository):
+class CommunitiesRepository(TrigramSearchMixin, BaseRepository):
     """Репозиторий для работы с сообществами"""
     
     model = CommunityModel
     schema = SCommunityGet
+    search_index = COMMUNITIES_INDEX
+    search_order_by = "t.members_count DESC, f.rowid"
     
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -28,19 +32,9 @@ class CommunitiesRepository(BaseRepository):
         skip: int = 0, 
         limit: int = 100
     ) -> List[CommunityModel]:
-        """Поиск сообществ по названию или описанию"""
-        query = (
-            select(CommunityModel)
-            .where(
-                CommunityModel.name.ilike(f"%{search_term}%") |
-                CommunityModel.description.ilike(f"%{search_term}%")
-            )
-            .order_by(desc(CommunityModel.members_count))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        """Поиск сообществ по названию или описанию: точно, по основам слов, с опечатками"""
+        communities, _ = await self.search_models(search_term, skip, limit)
+        return communities
 
     async def get_popular(
         self, 
@@ -0,0 +1,116 @@
+from sqlalchemy import delete, desc, func, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.post_signatures import PostLshBandModel, PostSignatureModel
+from app.models.posts import PostModel
+from app.repositories.base import BaseRepository
+
+
+class PostSignaturesRepository(BaseRepository):
+    """MinHash-подписи постов и индекс LSH по корзинам"""
+
+    model = PostSignatureModel
+
+    def __init__(self, session):
+        self.session = session
+
+    async def find_candidates(
+        self,
+        band_keys: list[int],
+        before_post_id: int | None = None,
+        limit: int = 50
+    ) -> list[tuple[int, bytes]]:
+        """
+        Посты, попавшие хотя бы в одну из корзин (полоса, ключ), с их подписями.
+        Число поисков по индексу - LSH_BANDS, независимо от числа постов.
+        before_post_id - только посты, опубликованные раньше (с меньшим id).
+        """
+        buckets = list(enumerate(band_keys))
+        matched = select(PostLshBandModel.post_id).where(
+            tuple_(PostLshBandModel.band, PostLshBandModel.bucket).in_(buckets)
+        )
+        if before_post_id is not None:
+            matched = matched.where(PostLshBandModel.post_id < before_post_id)
+        # Больше общих полос - выше сходство: при переполненных корзинах проверяем лучших кандидатов
+        matched = (
+            matched
+            .group_by(PostLshBandModel.post_id)
+            .order_by(desc(func.count()))
+            .limit(limit)
+        )
+        query = (
+            select(PostSignatureModel.post_id, PostSignatureModel.signature)
+            .join(PostModel, PostModel.id == PostSignatureModel.post_id)
+            .where(PostSignatureModel.post_id.in_(matched))
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def save(
+        self,
+        post_id: int,
+        signature: bytes,
+        band_keys: list[int],
+        duplicate_of_id: int | None = None,
+        similarity: float | None = None
+    ) -> None:
+        """Подпись и корзины одного поста (повторный вызов заменяет старые)"""
+        values = {"signature": signature, "duplicate_of_id": duplicate_of_id, "similarity": similarity}
+        stmt = sqlite_insert(PostSignatureModel).values(post_id=post_id, **values)
+        await self.session.execute(stmt.on_conflict_do_update(index_elements=["post_id"], set_=values))
+        await self.session.execute(delete(PostLshBandModel).where(PostLshBandModel.post_id == post_id))
+        await self.session.execute(
+            sqlite_insert(PostLshBandModel),
+            [{"band": band, "bucket": key, "post_id": post_id} for band, key in enumerate(band_keys)]
+        )
+
+    async def save_many(self, rows: list[tuple[int, bytes, list[int]]]) -> None:
+        """Пакетная запись подписей без проверки дубликатов (для пересчета по всей базе)"""
+        if not rows:
+            return
+        await self.session.execute(
+            sqlite_insert(PostSignatureModel).on_conflict_do_nothing(index_elements=["post_id"]),
+            [{"post_id": post_id, "signature": signature} for post_id, signature, _ in rows]
+        )
+        await self.session.execute(
+            sqlite_insert(PostLshBandModel).on_conflict_do_nothing(),
+            [
+                {"band": band, "bucket": key, "post_id": post_id}
+                for post_id, _, keys in rows
+                for band, key in enumerate(keys)
+            ]
+        )
+
+    async def get_unsigned_posts(self, after_id: int, limit: int) -> list[tuple[int, str, str]]:
+        """Следующая пачка постов без подписи (по возрастанию id)"""
+        query = (
+            select(PostModel.id, PostModel.header, PostModel.body)
+            .outerjoin(PostSignatureModel, PostSignatureModel.post_id == PostModel.id)
+            .where(PostModel.id > after_id, PostSignatureModel.post_id.is_(None))
+            .order_by(PostModel.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_duplicates(self, skip: int = 0, limit: int = 50) -> list[PostSignatureModel]:
+        """Посты, отмеченные как почти-дубликаты, новые первыми"""
+        query = (
+            select(PostSignatureModel)
+            .where(PostSignatureModel.duplicate_of_id.is_not(None))
+            .order_by(desc(PostSignatureModel.post_id))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def delete_for_post(self, post_id: int) -> None:
+        """Удаление подписи и корзин поста (внешние ключи в SQLite по умолчанию не проверяются)"""
+        await self.session.execute(delete(PostLshBandModel).where(PostLshBandModel.post_id == post_id))
+        await self.session.execute(delete(PostSignatureModel).where(PostSignatureModel.post_id == post_id))
+        await self.session.execute(
+            PostSignatureModel.__table__.update()
+            .where(PostSignatureModel.duplicate_of_id == post_id)
+            .values(duplicate_of_id=None, similarity=None)
+        )
@@ -1,17 +1,26 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, update, bindparam, text, DateTime, Integer
 
 from app.models.posts import PostModel
+from app.models.comments import CommentModel
+from app.models.search_index import POSTS_INDEX
 from app.repositories.base import BaseRepository
+from app.repositories.trigram_search import TrigramSearchMixin
 from app.schemes.posts import SPostGet
+from app.utils.metrics import register_lru_cache
+from app.utils.ranking import calculate_hot_score
 
 
-class PostsRepository(BaseRepository):
+class PostsRepository(TrigramSearchMixin, BaseRepository):
     """Репозиторий для работы с постами"""
     
     model = PostModel
     schema = SPostGet
+    search_index = POSTS_INDEX
+    use_term_vocabulary = True
     
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -73,23 +82,9 @@ class PostsRepository(BaseRepository):
         skip: int = 0,
         limit: int = 100
     ) -> List[PostModel]:
-        """Поиск постов по заголовку или содержанию"""
-        from sqlalchemy import or_
-        # Используем % для обозначения любого количества символов до и после search_term
-        query = (
-            select(PostModel)
-            .where(
-                or_(
-                    PostModel.header.ilike(f"%{search_term}%"),
-                    PostModel.body.ilike(f"%{search_term}%")
-                )
-            )
-            .order_by(desc(PostModel.created_at))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        """Поиск постов по заголовку или содержанию: точно, по основам слов, с опечатками (новые первыми)"""
+        posts, _ = await self.search_models(search_term, skip, limit)
+        return posts
 
     async def get_recent_posts(self, limit: int = 10):
         """Получить последние созданные посты"""
@@ -97,18 +92,194 @@ class PostsRepository(BaseRepository):
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _community_ranges_sql(count: int, with_before: bool, with_theme: bool):
+        """
+        UNION ALL из count веток "новейшие посты сообщества" с параметрами :c0..:cN.
+        Текст собирается один раз на форму запроса - построение сотен веток через
+        выражения SQLAlchemy обходилось дороже самого запроса.
+        """
+        conditions = "community_id = :c{i}"
+        if with_before:
+            # Даты хранятся строками, и у одного момента бывает две записи: без дробной
+            # части (CURRENT_TIMESTAMP, старые записи) и с микросекундами (ORM). Граница
+            # сравнивается с обеими, иначе граничный пост вернулся бы в следующую страницу
+            conditions += (
+                " AND (created_at < :before_short"
+                " OR (created_at IN (:before_short, :before_long) AND id < :before_id))"
+            )
+        if with_theme:
+            conditions += " AND theme_id = :theme_id"
+        branch = (
+            "SELECT * FROM (SELECT community_id, created_at, id FROM posts "
+            f"WHERE {conditions} "
+            "ORDER BY created_at DESC, id DESC LIMIT :per_community)"
+        )
+        sql = " UNION ALL ".join(branch.format(i=i) for i in range(count))
+        return text(sql).columns(community_id=Integer, created_at=DateTime, id=Integer)
+
+    async def get_community_ranges(
+        self,
+        community_ids: list[int],
+        per_community: int,
+        before: tuple[datetime, int] | None = None,
+        theme_id: Optional[int] = None,
+        chunk_size: int = 100
+    ) -> dict[int, list[tuple[datetime, int]]]:
+        """
+        Ключи (created_at, id) новейших постов каждого сообщества по индексу (community_id, created_at).
+
+        Диапазоны запрашиваются через UNION ALL пачками по chunk_size сообществ, чтобы
+        не упираться в лимит составных SELECT в SQLite. Читаются только ключи из индекса,
+        без загрузки постов целиком. Каждый список отсортирован по убыванию.
+        """
+        ranges: dict[int, list[tuple[datetime, int]]] = {community_id: [] for community_id in community_ids}
+        for start in range(0, len(community_ids), chunk_size):
+            chunk = community_ids[start:start + chunk_size]
+            statement = self._community_ranges_sql(len(chunk), before is not None, theme_id is not None)
+            params = {f"c{i}": community_id for i, community_id in enumerate(chunk)}
+            params["per_community"] = per_community
+            if before is not None:
+                created_at, params["before_id"] = before
+                params["before_long"] = created_at.strftime("%Y-%m-%d %H:%M:%S.%f")
+                params["before_short"] = (
+                    created_at.strftime("%Y-%m-%d %H:%M:%S") if not created_at.microsecond
+                    else params["before_long"]
+                )
+            if theme_id is not None:
+                params["theme_id"] = theme_id
+            result = await self.session.execute(statement, params)
+            for community_id, created_at, post_id in result.all():
+                ranges[community_id].append((created_at, post_id))
+        return ranges
+
+    async def get_by_ids(self, post_ids: list[int]) -> List[PostModel]:
+        """Получение постов по списку ID в том же порядке"""
+        if not post_ids:
+            return []
+        query = select(PostModel).where(PostModel.id.in_(post_ids))
+        result = await self.session.execute(query)
+        posts = {post.id: post for post in result.scalars().all()}
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+
     async def get_popular(
         self, 
-        days: int = 7,
+        days: int | None = 7,
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        theme_id: int | None = None
     ) -> List[PostModel]:
-        """Получение популярных постов (по лайкам)"""
+        """Получение лучших постов за период (по лайкам)"""
+        query = select(PostModel)
+        if days is not None:
+            since = datetime.utcnow() - timedelta(days=days)
+            query = query.where(PostModel.created_at >= since)
+        if theme_id is not None:
+            query = query.where(PostModel.theme_id == theme_id)
         query = (
-            select(PostModel)
-            .order_by(desc(PostModel.likes))
+            query
+            .order_by(desc(PostModel.likes), desc(PostModel.id))
             .offset(skip)
             .limit(limit)
         )
         result = await self.session.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def get_hot(
+        self,
+        days: int | None = 7,
+        skip: int = 0,
+        limit: int = 100,
+        theme_id: int | None = None
+    ) -> List[PostModel]:
+        """Получение "горячих" постов по предвычисленному hot_score"""
+        query = select(PostModel)
+        if days is not None:
+            since = datetime.utcnow() - timedelta(days=days)
+            query = query.where(PostModel.created_at >= since)
+        if theme_id is not None:
+            query = query.where(PostModel.theme_id == theme_id)
+        query = (
+            query
+            .order_by(desc(PostModel.hot_score), desc(PostModel.id))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    def _ranking_inputs_query(self):
+        """Запрос исходных данных для расчета hot_score (с числом комментариев)"""
+        comments_count = (
+            select(func.count(CommentModel.id))
+            .where(CommentModel.post_id == PostModel.id)
+            .correlate(PostModel)
+            .scalar_subquery()
+        )
+        return select(
+            PostModel.id,
+            PostModel.likes,
+            PostModel.dislikes,
+            PostModel.created_at,
+            comments_count.label("comments_count"),
+        )
+
+    async def _save_hot_scores(self, scores: list[dict]) -> None:
+        """Пакетное сохранение hot_score (updated_at не трогаем - это не правка поста)"""
+        if not scores:
+            return
+        table = PostModel.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("post_id"))
+            .values(hot_score=bindparam("score"), updated_at=table.c.updated_at)
+        )
+        await self.session.execute(stmt, scores)
+
+    async def refresh_hot_score(self, post_id: int, now: datetime | None = None) -> float | None:
+        """Пересчет hot_score одного поста (после реакции или нового комментария)"""
+        query = self._ranking_inputs_query().where(PostModel.id == post_id)
+        row = (await self.session.execute(query)).one_or_none()
+        if row is None:
+            return None
+        score = calculate_hot_score(row.likes, row.dislikes, row.comments_count, row.created_at, now)
+        await self._save_hot_scores([{"post_id": post_id, "score": score}])
+        return score
+
+    async def refresh_hot_scores(
+        self,
+        since: datetime | None = None,
+        batch_size: int = 1000,
+        now: datetime | None = None
+    ) -> int:
+        """
+        Пересчет hot_score для всех постов, созданных после since (затухание по времени).
+        Обрабатывает посты пачками по id, чтобы не держать всю таблицу в памяти.
+        """
+        now = now or datetime.utcnow()
+        last_id = 0
+        processed = 0
+        while True:
+            query = self._ranking_inputs_query().where(PostModel.id > last_id)
+            if since is not None:
+                query = query.where(PostModel.created_at >= since)
+            query = query.order_by(PostModel.id).limit(batch_size)
+            rows = (await self.session.execute(query)).all()
+            if not rows:
+                break
+            await self._save_hot_scores([
+                {
+                    "post_id": row.id,
+                    "score": calculate_hot_score(
+                        row.likes, row.dislikes, row.comments_count, row.created_at, now
+                    ),
+                }
+                for row in rows
+            ])
+            processed += len(rows)
+            last_id = rows[-1].id
+        return processed
+
+
+register_lru_cache("feed_ranges_sql", PostsRepository._community_ranges_sql)
@@ -0,0 +1,218 @@
+from sqlalchemy import delete, desc, func, select, tuple_, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.posts import PostModel
+from app.models.related_posts import PostTermModel, RelatedPostModel, TermDocumentsModel
+from app.repositories.base import BaseRepository
+
+# Ключ строки term_documents с общим числом постов (пустое слово в тексте не встречается)
+DOCUMENTS_KEY = ""
+
+
+class RelatedPostsRepository(BaseRepository):
+    """TF-IDF-векторы постов, частоты слов и заранее посчитанные похожие посты"""
+
+    model = RelatedPostModel
+
+    def __init__(self, session):
+        self.session = session
+
+    async def get_document_counts(self, terms) -> tuple[int, dict[str, int]]:
+        """Общее число постов и число постов с каждым из слов"""
+        result = await self.session.execute(
+            select(TermDocumentsModel.term, TermDocumentsModel.documents)
+            .where(TermDocumentsModel.term.in_([DOCUMENTS_KEY, *terms]))
+        )
+        counts = dict(result.all())
+        return counts.pop(DOCUMENTS_KEY, 0), counts
+
+    async def change_document_counts(self, terms, delta: int) -> None:
+        """Пост с этими словами добавлен (delta=1) или удален (delta=-1)"""
+        keys = [DOCUMENTS_KEY, *terms]
+        stmt = sqlite_insert(TermDocumentsModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["term"],
+            set_={"documents": TermDocumentsModel.documents + stmt.excluded.documents}
+        )
+        await self.session.execute(stmt, [{"term": term, "documents": delta} for term in keys])
+        if delta < 0:
+            await self.session.execute(
+                delete(TermDocumentsModel)
+                .where(TermDocumentsModel.term.in_(keys), TermDocumentsModel.documents <= 0)
+            )
+
+    async def save_terms(self, post_id: int, vector: dict[str, float]) -> None:
+        """Вектор поста (повторный вызов заменяет старый)"""
+        await self.session.execute(delete(PostTermModel).where(PostTermModel.post_id == post_id))
+        if vector:
+            await self.session.execute(
+                sqlite_insert(PostTermModel),
+                [{"post_id": post_id, "term": term, "weight": weight} for term, weight in vector.items()]
+            )
+
+    async def find_similar(
+        self,
+        vector: dict[str, float],
+        exclude_post_id: int | None = None,
+        limit: int = 5,
+        postings_per_term: int = 200
+    ) -> list[tuple[int, float]]:
+        """
+        Посты с наибольшим скалярным произведением векторов.
+        По каждому слову читаются только postings_per_term постов с наибольшим
+        весом (индекс ix_post_terms_term_weight), так что запрос не зависит от
+        того, в скольких постах встречается слово.
+        """
+        if not vector:
+            return []
+        parts = []
+        for term, weight in vector.items():
+            top = select(PostTermModel.post_id, (PostTermModel.weight * weight).label("score")).where(
+                PostTermModel.term == term
+            )
+            if exclude_post_id is not None:
+                top = top.where(PostTermModel.post_id != exclude_post_id)
+            top = top.order_by(desc(PostTermModel.weight)).limit(postings_per_term).subquery()
+            parts.append(select(top.c.post_id, top.c.score))
+        matched = union_all(*parts).subquery()
+        score = func.sum(matched.c.score).label("score")
+        query = (
+            select(matched.c.post_id, score)
+            .group_by(matched.c.post_id)
+            .order_by(desc(score), matched.c.post_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def replace_related(self, post_id: int, related: list[tuple[int, float]]) -> None:
+        await self.session.execute(delete(RelatedPostModel).where(RelatedPostModel.post_id == post_id))
+        await self.save_related_many([(post_id, related_id, score) for related_id, score in related])
+
+    async def save_related_many(self, rows: list[tuple[int, int, float]]) -> None:
+        if rows:
+            await self.session.execute(
+                sqlite_insert(RelatedPostModel).on_conflict_do_nothing(),
+                [{"post_id": post_id, "related_post_id": related_id, "score": score}
+                 for post_id, related_id, score in rows]
+            )
+
+    async def add_backlinks(self, post_id: int, related: list[tuple[int, float]], top_k: int) -> None:
+        """
+        Новый пост попадает в списки своих соседей, если сходство выше их k-го;
+        списки соседей обрезаются до top_k одним запросом.
+        """
+        if not related:
+            return
+        stmt = sqlite_insert(RelatedPostModel)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["post_id", "related_post_id"], set_={"score": stmt.excluded.score}
+            ),
+            [{"post_id": related_id, "related_post_id": post_id, "score": score} for related_id, score in related]
+        )
+        ranked = (
+            select(
+                RelatedPostModel.post_id,
+                RelatedPostModel.related_post_id,
+                func.row_number().over(
+                    partition_by=RelatedPostModel.post_id,
+                    order_by=(desc(RelatedPostModel.score), RelatedPostModel.related_post_id)
+                ).label("position")
+            )
+            .where(RelatedPostModel.post_id.in_([related_id for related_id, _ in related]))
+            .subquery()
+        )
+        await self.session.execute(
+            delete(RelatedPostModel).where(
+                tuple_(RelatedPostModel.post_id, RelatedPostModel.related_post_id).in_(
+                    select(ranked.c.post_id, ranked.c.related_post_id).where(ranked.c.position > top_k)
+                )
+            )
+        )
+
+    async def get_related(self, post_id: int, limit: int = 5) -> list:
+        """Похожие посты одним поиском по первичному ключу related_posts"""
+        query = (
+            select(
+                RelatedPostModel.related_post_id.label("id"),
+                RelatedPostModel.score,
+                PostModel.header,
+                PostModel.community_id,
+                PostModel.created_at,
+            )
+            .join(PostModel, PostModel.id == RelatedPostModel.related_post_id)
+            .where(RelatedPostModel.post_id == post_id)
+            .order_by(desc(RelatedPostModel.score))
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def is_indexed(self, post_id: int) -> bool:
+        """Есть ли у поста вектор в post_terms (пост без слов не индексируется)"""
+        result = await self.session.execute(
+            select(PostTermModel.post_id).where(PostTermModel.post_id == post_id).limit(1)
+        )
+        return result.first() is not None
+
+    async def delete_for_post(self, post_id: int) -> None:
+        """Вектор поста и его связи в обе стороны (внешние ключи в SQLite по умолчанию не проверяются)"""
+        await self.session.execute(delete(PostTermModel).where(PostTermModel.post_id == post_id))
+        await self.session.execute(
+            delete(RelatedPostModel).where(
+                (RelatedPostModel.post_id == post_id) | (RelatedPostModel.related_post_id == post_id)
+            )
+        )
+
+    # Полный пересчет (app/tools/related.py)
+
+    async def clear(self) -> None:
+        for model in (RelatedPostModel, PostTermModel, TermDocumentsModel):
+            await self.session.execute(delete(model))
+
+    async def get_post_texts(self, after_id: int, limit: int) -> list[tuple[int, str, str]]:
+        """Следующая пачка постов по возрастанию id"""
+        result = await self.session.execute(
+            select(PostModel.id, PostModel.header, PostModel.body)
+            .where(PostModel.id > after_id)
+            .order_by(PostModel.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def save_document_counts(self, documents: int, counts: dict[str, int]) -> None:
+        await self.session.execute(
+            sqlite_insert(TermDocumentsModel),
+            [{"term": DOCUMENTS_KEY, "documents": documents}]
+            + [{"term": term, "documents": count} for term, count in counts.items()]
+        )
+
+    async def save_terms_many(self, vectors: dict[int, dict[str, float]]) -> None:
+        rows = [
+            {"post_id": post_id, "term": term, "weight": weight}
+            for post_id, vector in vectors.items()
+            for term, weight in vector.items()
+        ]
+        if rows:
+            # Пост, созданный во время пересчета, уже мог проиндексироваться сам
+            await self.session.execute(sqlite_insert(PostTermModel).on_conflict_do_nothing(), rows)
+
+    async def get_vectors(self, after_id: int, limit: int) -> dict[int, dict[str, float]]:
+        """Векторы следующей пачки проиндексированных постов"""
+        post_ids = (
+            select(PostTermModel.post_id)
+            .where(PostTermModel.post_id > after_id)
+            .group_by(PostTermModel.post_id)
+            .order_by(PostTermModel.post_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            select(PostTermModel.post_id, PostTermModel.term, PostTermModel.weight)
+            .where(PostTermModel.post_id.in_(post_ids))
+            .order_by(PostTermModel.post_id)
+        )
+        vectors: dict[int, dict[str, float]] = {}
+        for post_id, term, weight in result.all():
+            vectors.setdefault(post_id, {})[term] = weight
+        return vectors
@@ -7,11 +7,16 @@ from app.repositories.base import BaseRepository
 
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, delete, update, case, exists, func, literal, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from app.models.reports import ReportModel
+from app.models.comments import CommentModel
+from app.models.posts import PostModel
+from app.models.reports import ReportModel, ReportContentStatsModel, ReportContentTypeEnum
+from app.models.users import UserModel
 from app.repositories.base import BaseRepository
 from app.schemes.reports import SReportGet
+from app.utils.ranking import calculate_moderation_priority
 
 
 class ReportsRepository(BaseRepository):
@@ -44,12 +49,15 @@ class ReportsRepository(BaseRepository):
         self, 
         reporter_id: int,
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        status: ReportStatusEnum | None = None
     ) -> List[ReportModel]:
-        """Получение жалоб репортера"""
+        """Получение жалоб репортера (фильтр по статусу - тоже в SQL)"""
+        query = select(ReportModel).where(ReportModel.reporter_id == reporter_id)
+        if status is not None:
+            query = query.where(ReportModel.status == status)
         query = (
-            select(ReportModel)
-            .where(ReportModel.reporter_id == reporter_id)
+            query
             .order_by(desc(ReportModel.created_at))
             .offset(skip)
             .limit(limit)
@@ -60,7 +68,9 @@ class ReportsRepository(BaseRepository):
     async def get_by_content(
         self, 
         content_type: str,
-        content_id: int
+        content_id: int,
+        skip: int = 0,
+        limit: int | None = None
     ) -> List[ReportModel]:
         """Получение жалоб на конкретный контент"""
         query = (
@@ -70,10 +80,170 @@ class ReportsRepository(BaseRepository):
                 ReportModel.content_id == content_id
             )
             .order_by(desc(ReportModel.created_at))
+            .offset(skip)
+            .limit(limit)
         )
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def get_pending_reports(self) -> List[ReportModel]:
         """Получение всех жалоб в статусе 'pending'"""
-        return await self.get_by_status(ReportStatusEnum.PENDING)
\ No newline at end of file
+        return await self.get_by_status(ReportStatusEnum.PENDING)
+
+    @staticmethod
+    def _content_exists_clause(content_type: ReportContentTypeEnum, content_id: int):
+        model = PostModel if content_type == ReportContentTypeEnum.POST else CommentModel
+        return exists().where(model.id == content_id)
+
+    async def content_exists(self, content_type: ReportContentTypeEnum, content_id: int) -> bool:
+        """Проверка существования поста или комментария одним запросом EXISTS"""
+        result = await self.session.execute(select(self._content_exists_clause(content_type, content_id)))
+        return bool(result.scalar())
+
+    async def add_if_new(self, values: dict) -> int | None:
+        """
+        Добавляет жалобу одним запросом, если контент существует и этот
+        пользователь еще не жаловался на него:
+        INSERT ... SELECT ... WHERE EXISTS (...) ON CONFLICT DO NOTHING RETURNING id.
+        Возвращает id новой жалобы или None, если строка не вставлена.
+        """
+        columns = list(values)
+        table = ReportModel.__table__
+        source = select(
+            *(literal(values[column], table.c[column].type) for column in columns)
+        ).where(self._content_exists_clause(values["content_type"], values["content_id"]))
+        stmt = (
+            sqlite_insert(ReportModel)
+            .from_select(columns, source)
+            .on_conflict_do_nothing(index_elements=["reporter_id", "content_type", "content_id"])
+            .returning(ReportModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def count_by_status_and_type(self) -> list[tuple[ReportStatusEnum, ReportContentTypeEnum, int]]:
+        """Число жалоб по парам (статус, тип контента) одним GROUP BY"""
+        query = (
+            select(ReportModel.status, ReportModel.content_type, func.count())
+            .group_by(ReportModel.status, ReportModel.content_type)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def refresh_content_stats(self, content_type: ReportContentTypeEnum, content_id: int) -> None:
+        """
+        Пересчет сводки по одному контенту из его жалоб (по индексу ix_reports_content).
+        Вызывается после создания, изменения статуса и удаления жалоб.
+        """
+        is_pending = ReportModel.status == ReportStatusEnum.PENDING
+        query = (
+            select(
+                func.count().label("reports_count"),
+                func.min(ReportModel.created_at).label("first_reported_at"),
+                func.max(ReportModel.created_at).label("last_reported_at"),
+                func.coalesce(func.sum(case((is_pending, 1), else_=0)), 0).label("pending_count"),
+                func.coalesce(
+                    func.sum(case((is_pending, func.coalesce(UserModel.reputation, 0)), else_=0)), 0
+                ).label("pending_reputation"),
+                func.min(case((is_pending, ReportModel.created_at))).label("first_pending_at"),
+            )
+            .select_from(ReportModel)
+            .outerjoin(UserModel, UserModel.id == ReportModel.reporter_id)
+            .where(ReportModel.content_type == content_type, ReportModel.content_id == content_id)
+        )
+        row = (await self.session.execute(query)).one()
+        if not row.reports_count:
+            await self.session.execute(
+                delete(ReportContentStatsModel).where(
+                    ReportContentStatsModel.content_type == content_type,
+                    ReportContentStatsModel.content_id == content_id
+                )
+            )
+            return
+
+        values = dict(row._mapping)
+        values["priority"] = (
+            calculate_moderation_priority(row.pending_count, row.pending_reputation, row.first_pending_at)
+            if row.pending_count else None
+        )
+        stmt = sqlite_insert(ReportContentStatsModel).values(
+            content_type=content_type, content_id=content_id, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["content_type", "content_id"],
+            set_={**values, "updated_at": func.now()},
+        )
+        await self.session.execute(stmt)
+
+    async def get_content_stats(
+        self,
+        keys: list[tuple[ReportContentTypeEnum, int]]
+    ) -> dict[tuple[ReportContentTypeEnum, int], ReportContentStatsModel]:
+        """Сводки для набора (тип, id) контента одним запросом"""
+        if not keys:
+            return {}
+        query = select(ReportContentStatsModel).where(
+            tuple_(ReportContentStatsModel.content_type, ReportContentStatsModel.content_id).in_(keys)
+        )
+        result = await self.session.execute(query)
+        return {(row.content_type, row.content_id): row for row in result.scalars().all()}
+
+    async def get_most_reported(self, limit: int = 20) -> List[ReportContentStatsModel]:
+        """Контент с наибольшим числом жалоб (по индексу на reports_count)"""
+        query = (
+            select(ReportContentStatsModel)
+            .order_by(desc(ReportContentStatsModel.reports_count), desc(ReportContentStatsModel.last_reported_at))
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_moderation_queue(self, skip: int = 0, limit: int = 20) -> List[ReportContentStatsModel]:
+        """Контент с открытыми жалобами по убыванию приоритета (по индексу на priority)"""
+        query = (
+            select(ReportContentStatsModel)
+            .where(ReportContentStatsModel.priority.is_not(None))
+            .order_by(desc(ReportContentStatsModel.priority))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def count_pending_reasons(
+        self,
+        keys: list[tuple[ReportContentTypeEnum, int]]
+    ) -> list[tuple[ReportContentTypeEnum, int, str, int]]:
+        """Причины открытых жалоб с числом повторов для набора контента"""
+        if not keys:
+            return []
+        query = (
+            select(ReportModel.content_type, ReportModel.content_id, ReportModel.reason, func.count())
+            .where(
+                tuple_(ReportModel.content_type, ReportModel.content_id).in_(keys),
+                ReportModel.status == ReportStatusEnum.PENDING
+            )
+            .group_by(ReportModel.content_type, ReportModel.content_id, ReportModel.reason)
+            .order_by(desc(func.count()))
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def resolve_pending_for_content(
+        self,
+        content_type: ReportContentTypeEnum,
+        content_id: int,
+        values: dict
+    ) -> int:
+        """Обновляет все открытые жалобы на контент одним UPDATE. Возвращает их число"""
+        stmt = (
+            update(ReportModel)
+            .where(
+                ReportModel.content_type == content_type,
+                ReportModel.content_id == content_id,
+                ReportModel.status == ReportStatusEnum.PENDING
+            )
+            .values(**values)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
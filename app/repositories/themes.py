@@ -14,15 +14,19 @@ from sqlalchemy.orm import selectinload
 
 from app.models.themes import ThemeModel
 from app.models.posts import PostModel
+from app.models.search_index import THEMES_INDEX
 from app.repositories.base import BaseRepository
+from app.repositories.trigram_search import TrigramSearchMixin
 from app.schemes.themes import SThemeGet
 
 
-class ThemesRepository(BaseRepository):
+class ThemesRepository(TrigramSearchMixin, BaseRepository):
     """Репозиторий для работы с темами"""
     
     model = ThemeModel
     schema = SThemeGet
+    search_index = THEMES_INDEX
+    search_order_by = "t.name"
     
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -72,16 +76,9 @@ class ThemesRepository(BaseRepository):
         skip: int = 0, 
         limit: int = 100
     ) -> List[ThemeModel]:
-        """Поиск тем по названию"""
-        query = (
-            select(ThemeModel)
-            .where(ThemeModel.name.ilike(f"%{search_term}%"))
-            .order_by(ThemeModel.name)
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        """Поиск тем по названию: точно, по основам слов, с опечатками"""
+        themes, _ = await self.search_models(search_term, skip, limit)
+        return themes
 
     async def get_themes_with_stats(
         self,
@@ -0,0 +1,178 @@
+from collections import Counter
+from dataclasses import dataclass
+
+from sqlalchemy import select, text
+
+from app.models.search_index import TrigramIndex
+from app.utils.trigrams import (
+    MIN_MATCH_LENGTH,
+    MIN_WORD_SIMILARITY,
+    fold_yo,
+    fts_any,
+    fts_string,
+    fts_words,
+    inner_trigrams,
+    similarity,
+    search_stem,
+    words,
+)
+
+SEARCH_EXACT = "exact"
+SEARCH_PREFIX = "prefix"
+SEARCH_FUZZY = "fuzzy"
+
+# Сколько кандидатов для исправления слова читается из индекса (лучшие по bm25)
+WORD_CANDIDATES_LIMIT = 100
+
+
+@dataclass
+class SearchResult:
+    ids: list[int]
+    mode: str | None  # SEARCH_EXACT / SEARCH_PREFIX / SEARCH_FUZZY, None - ничего не найдено
+    query: str  # запрос, по которому найдены результаты (для fuzzy - с исправленными словами)
+
+
+class TrigramSearchMixin:
+    """
+    Поиск по индексу FTS5 trigram с цепочкой запасных вариантов:
+    1. exact - запрос из нескольких слов целиком как подстрока (без учета
+       регистра); для одного слова этап пропускается - его находит prefix
+       вместе с другими формами слова;
+    2. prefix - все слова запроса в любом порядке, каждое по основе (стеммер
+       Snowball): "дороги" находит "дорога" и "дорогой";
+    3. fuzzy - основы слов с опечатками заменяются самыми похожими по
+       триграммам основами из словаря (_stem_candidates), дальше как в prefix.
+    Первый вариант, давший результат, и возвращается. Слова короче трех
+    символов (предлоги) в prefix и fuzzy не участвуют.
+    """
+
+    search_index: TrigramIndex
+    # Порядок результатов: f - индекс, t - исходная таблица.
+    # "f.rowid DESC" индекс FTS5 отдает без сортировки, сразу по LIMIT
+    search_order_by: str = "f.rowid DESC"
+    # Кандидаты для исправления опечаток - из словаря основ постов (term_documents)
+    use_term_vocabulary: bool = False
+
+    async def search_ids(self, search_term: str, skip: int = 0, limit: int = 100) -> SearchResult:
+        phrase = " ".join(search_term.split())
+        if len(phrase) < MIN_MATCH_LENGTH:
+            ids = await self._substring_ids(phrase, skip, limit) if phrase else []
+            return SearchResult(ids, SEARCH_EXACT if ids else None, phrase)
+
+        long_words = [word for word in words(phrase) if len(word) >= MIN_MATCH_LENGTH]
+        stages = []
+        if len(long_words) != 1 or len(words(phrase)) > 1:
+            stages.append((SEARCH_EXACT, fts_string(phrase), phrase))
+        if long_words:
+            stages.append((SEARCH_PREFIX, fts_words([search_stem(word) for word in long_words]), phrase))
+
+        tried = set()
+        for mode, match, query in stages:
+            if match in tried:
+                continue
+            tried.add(match)
+            if ids := await self._stage_ids(match, skip, limit):
+                return SearchResult(ids, mode, query)
+
+        corrected = await self._correct_words(long_words)
+        if corrected:
+            match = fts_words([base for base, _ in corrected])
+            if match not in tried and (ids := await self._stage_ids(match, skip, limit)):
+                return SearchResult(ids, SEARCH_FUZZY, " ".join(word for _, word in corrected))
+        return SearchResult([], None, phrase)
+
+    async def search_models(self, search_term: str, skip: int = 0, limit: int = 100) -> tuple[list, SearchResult]:
+        """Найденные строки (в порядке поиска) и сведения о варианте поиска"""
+        found = await self.search_ids(search_term, skip, limit)
+        if not found.ids:
+            return [], found
+        result = await self.session.execute(select(self.model).where(self.model.id.in_(found.ids)))
+        by_id = {item.id: item for item in result.scalars().all()}
+        return [by_id[item_id] for item_id in found.ids if item_id in by_id], found
+
+    async def _stage_ids(self, match: str, skip: int, limit: int) -> list[int]:
+        ids = await self._match_ids(match, skip, limit)
+        # Страница за концом результатов не должна переключать на следующий вариант
+        if not ids and skip and await self._match_ids(match, 0, 1):
+            return []
+        return ids
+
+    async def _match_ids(self, match: str, skip: int, limit: int) -> list[int]:
+        index = self.search_index
+        result = await self.session.execute(
+            text(
+                f"SELECT f.rowid FROM {index.name} f JOIN {index.table} t ON t.{index.rowid} = f.rowid "
+                f"WHERE f.{index.name} MATCH :match ORDER BY {self.search_order_by} LIMIT :limit OFFSET :skip"
+            ),
+            {"match": match, "limit": limit, "skip": skip},
+        )
+        return result.scalars().all()
+
+    async def _substring_ids(self, phrase: str, skip: int, limit: int) -> list[int]:
+        """Запрос короче триграммы: LIKE без индекса (без учета регистра только для латиницы)"""
+        index = self.search_index
+        condition = " OR ".join(f"f.{column} LIKE :pattern ESCAPE '!'" for column in index.columns)
+        escaped = phrase.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        result = await self.session.execute(
+            text(
+                f"SELECT f.rowid FROM {index.name} f JOIN {index.table} t ON t.{index.rowid} = f.rowid "
+                f"WHERE ({condition}) ORDER BY {self.search_order_by} LIMIT :limit OFFSET :skip"
+            ),
+            {"pattern": f"%{escaped}%", "limit": limit, "skip": skip},
+        )
+        return result.scalars().all()
+
+    async def _correct_words(self, query_words: list[str]) -> list[tuple[str, str]]:
+        """
+        Основа каждого слова - самой похожей основой из словаря; слова без
+        похожих отбрасываются. Возвращает пары (основа, исправленное слово);
+        основы сравниваются с "ё" -> "е", как они хранятся в словаре.
+        """
+        corrected = []
+        for word in query_words:
+            base = fold_yo(search_stem(word))
+            best, best_key = None, None
+            for candidate, weight in (await self._stem_candidates(base)).items():
+                score = similarity(base, candidate)
+                # При равном сходстве - более частая основа
+                if score >= MIN_WORD_SIMILARITY and (best_key is None or (score, weight) > best_key):
+                    best, best_key = candidate, (score, weight)
+            if best is not None:
+                # Исправленная основа с окончанием из запроса: "садавой" -> "садовой"
+                corrected.append((best, best + word[len(base):]))
+        return corrected
+
+    async def _stem_candidates(self, base: str) -> dict[str, int]:
+        """
+        Основы-кандидаты с частотой, у которых больше всего общих с base триграмм.
+        Со словарем - из term_documents (основы слов всех постов); без него - из
+        строк самой таблицы, что годится только для небольших таблиц.
+        """
+        match = fts_any(inner_trigrams(base))
+        if self.use_term_vocabulary:
+            result = await self.session.execute(
+                text(
+                    "SELECT d.term, d.documents FROM term_documents_fts f "
+                    "JOIN term_documents d ON d.rowid = f.rowid "
+                    "WHERE f.term_documents_fts MATCH :match AND d.term != '' "
+                    "ORDER BY f.rank LIMIT :limit"
+                ),
+                {"match": match, "limit": WORD_CANDIDATES_LIMIT},
+            )
+            return dict(result.all())
+
+        index = self.search_index
+        result = await self.session.execute(
+            text(
+                f"SELECT {', '.join(index.columns)} FROM {index.name} WHERE {index.name} MATCH :match "
+                f"ORDER BY rank LIMIT :limit"
+            ),
+            {"match": match, "limit": WORD_CANDIDATES_LIMIT},
+        )
+        candidates = Counter()
+        for row in result.all():
+            for value in row:
+                candidates.update(
+                    fold_yo(search_stem(word)) for word in words(value or "") if len(word) >= MIN_MATCH_LENGTH
+                )
+        return dict(candidates)
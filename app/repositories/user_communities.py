@@ -1,3 +1,6 @@
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from app.models.user_communities import UserCommunityModel
 from app.repositories.base import BaseRepository
 from app.schemes.user_communities import SUserCommunityGet
@@ -10,4 +13,48 @@ class UserCommunitiesRepository(BaseRepository):
     schema = SUserCommunityGet
     
     def __init__(self, session):
-        self.session = session
\ No newline at end of file
+        self.session = session
+
+    async def get_community_ids(self, user_id: int) -> list[int]:
+        """ID сообществ, в которых состоит пользователь"""
+        query = (
+            select(UserCommunityModel.community_id)
+            .where(UserCommunityModel.user_id == user_id)
+            .order_by(UserCommunityModel.community_id)
+        )
+        result = await self.session.execute(query)
+        return list(dict.fromkeys(result.scalars().all()))
+
+
+    async def get_joined_ids(self, user_id: int, community_ids: list[int]) -> set[int]:
+        """Какие из переданных сообществ (например, текущей страницы) пользователь уже вступил"""
+        if not community_ids:
+            return set()
+        query = select(UserCommunityModel.community_id).where(
+            UserCommunityModel.user_id == user_id,
+            UserCommunityModel.community_id.in_(community_ids)
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def add_membership(self, user_id: int, community_id: int) -> bool:
+        """
+        Добавляет пользователя в сообщество одним INSERT ... ON CONFLICT DO NOTHING.
+        Возвращает True, если запись действительно добавлена.
+        """
+        stmt = (
+            sqlite_insert(UserCommunityModel)
+            .values(user_id=user_id, community_id=community_id)
+            .on_conflict_do_nothing(index_elements=["user_id", "community_id"])
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def remove_membership(self, user_id: int, community_id: int) -> bool:
+        """Удаляет пользователя из сообщества. Возвращает True, если запись была"""
+        stmt = delete(UserCommunityModel).where(
+            UserCommunityModel.user_id == user_id,
+            UserCommunityModel.community_id == community_id
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
@@ -61,4 +61,19 @@ class PostStatsResponse(BaseModel):
     dislikes: int
     total_liked_by: int
     total_disliked_by: int
-    total_reactions: int
\ No newline at end of file
+    total_reactions: int
+
+class SDuplicatePostRef(BaseModel):
+    id: int
+    header: Optional[str] = None
+    community_id: Optional[int] = None
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class SDuplicatePost(BaseModel):
+    """Пост, отмеченный как почти-дубликат более раннего"""
+    post: SDuplicatePostRef
+    original: SDuplicatePostRef
+    similarity: float
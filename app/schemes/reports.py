@@ -55,6 +55,18 @@ class SReportGet(BaseModel):
     content_preview: Optional[str] = None  # заголовок поста или текст комментария
     content_author_id: Optional[int] = None
     content_author_name: Optional[str] = None
+    content_reports_count: int = 0  # всего жалоб на этот контент
+
+
+class SReportedContent(BaseModel):
+    content_type: ContentType
+    content_id: int
+    reports_count: int
+    first_reported_at: datetime
+    last_reported_at: datetime
+    content_preview: Optional[str] = None
+    content_author_id: Optional[int] = None
+    content_author_name: Optional[str] = None
 
 
 class SReportStats(BaseModel):
@@ -63,4 +75,36 @@ class SReportStats(BaseModel):
     resolved_reports: int
     rejected_reports: int
     reports_on_posts: int
-    reports_on_comments: int
\ No newline at end of file
+    reports_on_comments: int
+
+
+class SReasonCount(BaseModel):
+    reason: str
+    count: int
+
+
+class SModerationItem(BaseModel):
+    """Элемент очереди модерации: все открытые жалобы на один контент"""
+    content_type: ContentType
+    content_id: int
+    priority: float
+    pending_count: int
+    reports_count: int
+    pending_reputation: int
+    first_pending_at: datetime
+    last_reported_at: datetime
+    reasons: list[SReasonCount] = []
+    content_preview: Optional[str] = None
+    content_author_id: Optional[int] = None
+    content_author_name: Optional[str] = None
+
+
+class SModerationResolve(BaseModel):
+    status: ReportStatus
+    moderator_comment: Optional[str] = Field(None, max_length=1000)
+    
+    @validator('status')
+    def status_is_final(cls, v):
+        if v == ReportStatus.PENDING:
+            raise ValueError('Новый статус не может быть pending')
+        return v
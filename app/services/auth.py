@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
 from app.config import settings
@@ -17,11 +19,27 @@ from app.schemes.users import (
 )
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.base import BaseService
+from app.utils.metrics import Gauge
 import jwt
 from passlib.context import CryptContext
 from pydantic import ValidationError
 
 
+# bcrypt занимает сотни миллисекунд CPU, поэтому выполняется в пуле потоков, а не в event loop
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_POOL_SIZE, thread_name_prefix="bcrypt")
+BCRYPT_QUEUE_DEPTH = Gauge(
+    "bcrypt_pool_queue_depth", "Задачи bcrypt в пуле потоков (ожидающие и выполняющиеся)"
+)
+
+
+async def run_in_bcrypt_pool(func, *args):
+    BCRYPT_QUEUE_DEPTH.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, func, *args)
+    finally:
+        BCRYPT_QUEUE_DEPTH.dec()
+
+
 class AuthService(BaseService):
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -55,7 +73,7 @@ class AuthService(BaseService):
     async def register_user(self, user_data: SUserAddRequest):
         try:
             # Проверяем валидность данных пользователя (Pydantic уже делает валидацию)
-            hashed_password: str = self.hash_password(user_data.password)
+            hashed_password: str = await run_in_bcrypt_pool(self.hash_password, user_data.password)
             new_user_data = SUserAdd(
                 email=user_data.email,
                 hashed_password=hashed_password,
@@ -74,7 +92,7 @@ class AuthService(BaseService):
         user = await self.db.users.get_one_or_none_with_role(email=user_data.email)
         if not user:
             raise UserNotFoundError
-        if not self.verify_password(user_data.password, user.hashed_password):
+        if not await run_in_bcrypt_pool(self.verify_password, user_data.password, user.hashed_password):
             raise InvalidPasswordError
             
         # Проверяем, что пользователь не заблокирован (не имеет роль с level 0)
@@ -0,0 +1,214 @@
+"""
+Групповая запись комментариев (group commit).
+
+При всплеске комментариев каждый запрос в своей транзакции ждет блокировку
+записи SQLite. Вместо этого запросы ставят комментарий в очередь, а одна
+фоновая задача записывает накопившуюся пачку одной транзакцией: одна проверка
+постов, один INSERT ... RETURNING, один пересчет "горячести" на пост и один
+коммит. Каждый вызывающий получает свой комментарий с новым id.
+
+Справедливость: очередь FIFO, а у одного пользователя не больше
+max_pending_per_user комментариев в очереди - поток от одного автора не
+вытесняет остальных. Если комментарий за timeout не попал в пачку,
+вызывающий получает CommentWriteTimeoutError, а комментарий снимается с
+очереди. Комментарий, уже взятый в пачку, дожидается ее коммита: иначе он
+был бы записан, а вызывающий по ошибке повторил бы запрос и создал дубль.
+"""
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.comments import (
+    CommentQueueFullError,
+    CommentToDeletedPostError,
+    CommentWriteTimeoutError,
+)
+from app.models.comments import CommentModel
+from app.models.posts import PostModel
+from app.models.users import UserModel
+from app.schemes.comments import SCommentAdd
+from app.services.events import event_bus, TOPIC_COMMENTS
+
+logger = logging.getLogger("app.comment_writer")
+
+
+@dataclass
+class PendingComment:
+    values: dict
+    future: asyncio.Future
+    # Взят в пачку: с этого момента таймаут его не отменяет
+    claimed: bool = False
+
+
+class CommentWriter:
+    """Очередь комментариев и задача, записывающая их пачками"""
+
+    def __init__(
+        self,
+        session_factory=async_session_maker,
+        max_batch_size: int | None = None,
+        batch_delay: float | None = None,
+        timeout: float | None = None,
+        max_queue_size: int | None = None,
+        max_pending_per_user: int | None = None,
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size or settings.COMMENT_BATCH_MAX_SIZE
+        self.batch_delay = (
+            settings.COMMENT_BATCH_DELAY_MS / 1000 if batch_delay is None else batch_delay
+        )
+        self.timeout = timeout or settings.COMMENT_WRITE_TIMEOUT_SECONDS
+        self.max_queue_size = max_queue_size or settings.COMMENT_QUEUE_MAX_SIZE
+        self.max_pending_per_user = max_pending_per_user or settings.COMMENT_MAX_PENDING_PER_USER
+        self.batches = 0
+        self.written = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending_by_user: Counter[int] = Counter()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._pending_by_user.clear()
+            self._task = loop.create_task(self._run())
+
+    async def create(self, comment_data: SCommentAdd, user_id: int) -> CommentModel:
+        """Ставит комментарий в очередь и ждет записи его пачки"""
+        values = comment_data.model_dump()
+        values.update(user_id=user_id, created_at=datetime.utcnow(), likes=0, dislikes=0)
+        comment_id = await self.submit(values)
+        return CommentModel(id=comment_id, **values)
+
+    async def submit(self, values: dict) -> int:
+        self._ensure_running()
+        user_id = values["user_id"]
+        if self._pending_by_user[user_id] >= self.max_pending_per_user:
+            raise CommentQueueFullError
+        item = PendingComment(values, self._loop.create_future())
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            raise CommentQueueFullError
+        self._pending_by_user[user_id] += 1
+        try:
+            # shield: по таймауту future не отменяется сам, решаем ниже
+            return await asyncio.wait_for(asyncio.shield(item.future), self.timeout)
+        except asyncio.TimeoutError:
+            if not item.claimed:
+                # Еще в очереди - снимаем: отмененный future писатель пропустит
+                item.future.cancel()
+                raise CommentWriteTimeoutError
+            # Уже в пачке - ждем ее коммита, а не отвечаем ошибкой на записанный комментарий
+            return await item.future
+        except asyncio.CancelledError:
+            if not item.claimed:
+                item.future.cancel()
+            raise
+        finally:
+            self._pending_by_user[user_id] -= 1
+            if not self._pending_by_user[user_id]:
+                del self._pending_by_user[user_id]
+
+    async def stop(self) -> None:
+        """Дописывает то, что уже в очереди, и останавливает задачу"""
+        if self._task is None or self._task.done() or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.put(None)
+        await self._task
+
+    async def _run(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+            # Короткая пауза, чтобы в пачку попали комментарии, пришедшие следом
+            if self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            batch = [item]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[PendingComment]) -> None:
+        pending = [item for item in batch if not item.future.done()]
+        if not pending:
+            return
+        for item in pending:
+            item.claimed = True
+        try:
+            async with DBManager(session_factory=self.session_factory) as db:
+                await self._insert(db, pending)
+        except Exception as e:
+            logger.exception("Не удалось записать пачку из %d комментариев", len(pending))
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        self.batches += 1
+
+    async def _insert(self, db: DBManager, pending: list[PendingComment]) -> None:
+        post_ids = {item.values["post_id"] for item in pending}
+        posts = dict((await db.session.execute(
+            select(PostModel.id, PostModel.community_id).where(PostModel.id.in_(post_ids))
+        )).all())
+
+        valid = []
+        for item in pending:
+            if item.values["post_id"] in posts:
+                valid.append(item)
+            else:
+                item.future.set_exception(CommentToDeletedPostError())
+        if not valid:
+            return
+
+        ids = await db.comments.add_many([item.values for item in valid])
+
+        # Горячесть пересчитывается один раз на пост, а не на каждый комментарий
+        for post_id in {item.values["post_id"] for item in valid}:
+            await db.posts.refresh_hot_score(post_id)
+
+        user_ids = {item.values["user_id"] for item in valid}
+        names = dict((await db.session.execute(
+            select(UserModel.id, UserModel.name).where(UserModel.id.in_(user_ids))
+        )).all())
+
+        def resolve():
+            self.written += len(valid)
+            for item, comment_id in zip(valid, ids):
+                values = item.values
+                event_bus.publish(TOPIC_COMMENTS, {
+                    "action": "created",
+                    "community_id": posts[values["post_id"]],
+                    "comment": {
+                        "id": comment_id,
+                        "post_id": values["post_id"],
+                        "user_id": values["user_id"],
+                        "user_name": names.get(values["user_id"]),
+                        "body": values["body"],
+                        "created_at": values["created_at"].isoformat(),
+                    },
+                })
+                if not item.future.done():
+                    item.future.set_result(comment_id)
+
+        # Вызывающие узнают id только после коммита пачки
+        db.on_commit(resolve)
+
+
+comment_writer = CommentWriter()
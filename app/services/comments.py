@@ -2,10 +2,14 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import select, update, delete, func
 
+from app.config import settings
 from app.models.comments import CommentModel
 from app.models.posts import PostModel
 from app.models.users import UserModel
 from app.schemes.comments import SCommentAdd, SCommentUpdate
+from app.services.comment_writer import comment_writer
+from app.services.content_filter import banned_phrases
+from app.services.events import event_bus, TOPIC_COMMENTS
 from app.exceptions.comments import (
     CommentNotFoundError,
     CommentAccessDeniedError,
@@ -19,6 +23,14 @@ class CommentService:
 
     async def create_comment(self, comment_data: SCommentAdd, user_id: int) -> CommentModel:
         """Создание нового комментария"""
+        banned_phrases.ensure_clean(comment_data.body)
+        
+        if settings.COMMENT_GROUP_COMMIT:
+            # Запись пачками через общую очередь (см. app.services.comment_writer).
+            # Пока запрос ждет пачку, его соединение нужнее писателю - отдаем его в пул
+            await self.db.release()
+            return await comment_writer.create(comment_data, user_id)
+        
         # Проверяем, существует ли пост
         post = await self.db.posts.get(comment_data.post_id)
         if not post:
@@ -31,6 +43,25 @@ class CommentService:
         comment_data_dict['dislikes'] = 0
         
         new_comment = await self.db.comments.add(comment_data_dict)
+        
+        # Новый комментарий повышает "горячесть" поста
+        await self.db.posts.refresh_hot_score(comment_data.post_id)
+        
+        # Событие о комментарии уходит в шину только после коммита транзакции
+        author = await self.db.users.get(user_id)
+        event = {
+            "action": "created",
+            "community_id": post.community_id,
+            "comment": {
+                "id": new_comment.id,
+                "post_id": new_comment.post_id,
+                "user_id": user_id,
+                "user_name": author.name if author else None,
+                "body": new_comment.body,
+                "created_at": new_comment.created_at.isoformat(),
+            },
+        }
+        self.db.on_commit(lambda: event_bus.publish(TOPIC_COMMENTS, event))
         return new_comment
 
     async def get_comment(self, comment_id: int) -> Optional[CommentModel]:
@@ -127,6 +158,7 @@ class CommentService:
             raise CommentAccessDeniedError
         
         await self.db.comments.delete(id=comment_id)
+        await self.db.posts.refresh_hot_score(comment.post_id)
 
     async def like_comment(self, comment_id: int, user_id: int) -> dict:
         """Добавление лайка комментарию пользователем"""
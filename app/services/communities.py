@@ -1,12 +1,13 @@
 from typing import Optional, List
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func
 
 from app.models.communities import CommunityModel
-from app.schemes.communities import SCommunityAdd, SCommunityUpdate
+from app.schemes.communities import SCommunityAdd, SCommunityUpdate, SCommunityGetWithMembership
 from app.exceptions.communities import (
     CommunityNotFoundError,
     CommunityAlreadyExistsError
 )
+from app.services.events import event_bus, TOPIC_COMMUNITIES
 
 
 class CommunitiesService:
@@ -29,6 +30,7 @@ class CommunitiesService:
         }
         
         new_community = await self.db.communities.add(community_data_dict)
+        self._publish("created", new_community)
         return new_community
 
     async def get_community(self, community_id: int) -> Optional[CommunityModel]:
@@ -59,21 +61,26 @@ class CommunitiesService:
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None
-    ) -> List[dict]:
+    ) -> List[SCommunityGetWithMembership]:
         """Получение списка сообществ с информацией о членстве пользователя"""
         communities = await self.get_communities(skip, limit, search)
         
-        # Получаем список сообществ, в которых состоит пользователь
-        user_community_records = await self.db.user_communities.get_filtered(user_id=user_id)
-        user_community_ids = {record.community_id for record in user_community_records}
-        
-        result = []
-        for community in communities:
-            community_dict = community.__dict__
-            community_dict['is_joined'] = community.id in user_community_ids
-            result.append(community_dict)
+        # Проверяем членство только для сообществ текущей страницы
+        joined_ids = await self.db.user_communities.get_joined_ids(
+            user_id, [community.id for community in communities]
+        )
         
-        return result
+        return [
+            SCommunityGetWithMembership.model_validate(
+                community, from_attributes=True
+            ).model_copy(update={"is_joined": community.id in joined_ids})
+            for community in communities
+        ]
+
+    async def is_member(self, community_id: int, user_id: int) -> bool:
+        """Состоит ли пользователь в сообществе"""
+        joined_ids = await self.db.user_communities.get_joined_ids(user_id, [community_id])
+        return community_id in joined_ids
 
     async def update_community(
         self,
@@ -102,6 +109,9 @@ class CommunitiesService:
                     raise CommunityAlreadyExistsError
             
             await self.db.communities.edit(update_data, id=community_id)
+            if 'name' in update_data:
+                community.name = update_data['name']
+                self._publish("updated", community)
 
     async def delete_community(self, community_id: int) -> None:
         """Удаление сообщества"""
@@ -110,6 +120,19 @@ class CommunitiesService:
             raise CommunityNotFoundError
         
         await self.db.communities.delete(id=community_id)
+        self._publish("deleted", community)
+
+    def _publish(self, action: str, community: CommunityModel) -> None:
+        """Событие об изменении сообщества уходит в шину после коммита (подсказки поиска)"""
+        event = {
+            "action": action,
+            "community": {
+                "id": community.id,
+                "name": community.name,
+                "members_count": community.members_count,
+            },
+        }
+        self.db.on_commit(lambda: event_bus.publish(TOPIC_COMMUNITIES, event))
 
     async def increment_posts_count(self, community_id: int) -> None:
         """Увеличение счетчика постов"""
@@ -127,17 +150,17 @@ class CommunitiesService:
 
     async def increment_members_count(self, community_id: int) -> None:
         """Увеличение счетчика участников"""
-        community = await self.db.communities.get(community_id)
-        if community:
-            update_data = {"members_count": (community.members_count or 0) + 1}
-            await self.db.communities.edit(update_data, id=community_id)
+        await self.db.communities.edit(
+            {"members_count": func.coalesce(CommunityModel.members_count, 0) + 1},
+            id=community_id
+        )
 
     async def decrement_members_count(self, community_id: int) -> None:
         """Уменьшение счетчика участников"""
-        community = await self.db.communities.get(community_id)
-        if community and community.members_count > 0:
-            update_data = {"members_count": community.members_count - 1}
-            await self.db.communities.edit(update_data, id=community_id)
+        await self.db.communities.edit(
+            {"members_count": func.max(func.coalesce(CommunityModel.members_count, 0) - 1, 0)},
+            id=community_id
+        )
 
     async def join_community(self, community_id: int, user_id: int) -> None:
         """Присоединение пользователя к сообществу"""
@@ -146,24 +169,12 @@ class CommunitiesService:
         if not community:
             raise CommunityNotFoundError
         
-        # Проверяем, не состоит ли пользователь уже в сообществе
-        existing_association = await self.db.user_communities.get_one_or_none(
-            user_id=user_id,
-            community_id=community_id
-        )
-        
-        if existing_association:
-            # Пользователь уже состоит в сообществе
-            return
+        # Вставка с ON CONFLICT DO NOTHING: повторное вступление (в т.ч. параллельное)
+        # не создает дубликат и не увеличивает счетчик
+        joined = await self.db.user_communities.add_membership(user_id, community_id)
         
-        # Создаем связь между пользователем и сообществом
-        await self.db.user_communities.add({
-            'user_id': user_id,
-            'community_id': community_id
-        })
-        
-        # Увеличиваем счетчик участников
-        await self.increment_members_count(community_id)
+        if joined:
+            await self.increment_members_count(community_id)
 
     async def leave_community(self, community_id: int, user_id: int) -> None:
         """Выход пользователя из сообщества"""
@@ -172,18 +183,7 @@ class CommunitiesService:
         if not community:
             raise CommunityNotFoundError
         
-        # Находим связь между пользователем и сообществом
-        association = await self.db.user_communities.get_one_or_none(
-            user_id=user_id,
-            community_id=community_id
-        )
-        
-        if not association:
-            # Пользователь не состоит в сообществе
-            return
-        
-        # Удаляем связь
-        await self.db.user_communities.delete(id=association.id)
+        left = await self.db.user_communities.remove_membership(user_id, community_id)
         
-        # Уменьшаем счетчик участников
-        await self.decrement_members_count(community_id)
\ No newline at end of file
+        if left:
+            await self.decrement_members_count(community_id)
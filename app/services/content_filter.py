@@ -0,0 +1,116 @@
+"""
+Фильтр запрещенных фраз для постов и комментариев.
+
+Список фраз - текстовый файл settings.BANNED_PHRASES_FILE (относительный
+путь - от корня проекта): одна фраза на
+строку, строки с "#" - комментарии, "*" в конце фразы - совпадение по началу
+слова. Автомат (app.utils.aho_corasick) строится при старте приложения.
+Изменения файла подхватываются без перезапуска: не чаще раза в
+BANNED_PHRASES_CHECK_SECONDS сравнивается время изменения файла, и при
+изменении автомат пересобирается в отдельном потоке и подменяется целиком -
+так список обновляется в каждом воркере. Пока идет сборка, проверки идут по
+прежнему автомату: запрос, заметивший изменение, не ждет пересборки.
+"""
+import asyncio
+import logging
+import os
+import time
+
+from app.config import settings
+from app.exceptions.content_filter import BannedContentError
+from app.utils.aho_corasick import PREFIX_MARK, AhoCorasick
+
+logger = logging.getLogger("app.content_filter")
+
+
+def read_phrases(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [
+            line.strip()
+            for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+class BannedPhrases:
+    """Текущий автомат запрещенных фраз с перезагрузкой по изменению файла"""
+
+    def __init__(self, path: str | None = None, check_interval: float | None = None):
+        self.path = path or settings.banned_phrases_path
+        self.check_interval = (
+            settings.BANNED_PHRASES_CHECK_SECONDS if check_interval is None else check_interval
+        )
+        self.loaded_mtime: float | None = None
+        self._matcher: AhoCorasick | None = None
+        self._checked_at = 0.0
+        self._reloading: asyncio.Task | None = None
+
+    def _mtime(self) -> float | None:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _build(self) -> tuple[AhoCorasick, float | None]:
+        mtime = self._mtime()
+        if mtime is None:
+            logger.warning("Файл запрещенных фраз %s не найден, фильтр пуст", self.path)
+        phrases = read_phrases(self.path) if mtime is not None else []
+        started = time.perf_counter()
+        matcher = AhoCorasick(phrases)
+        logger.info(
+            "Запрещенные фразы: %d из %s за %.0f ms",
+            len(matcher), self.path, (time.perf_counter() - started) * 1000
+        )
+        return matcher, mtime
+
+    def _install(self, matcher: AhoCorasick, mtime: float | None) -> AhoCorasick:
+        # Подмена одной ссылкой: проверки, уже идущие по старому автомату, не затрагиваются
+        self._matcher, self.loaded_mtime = matcher, mtime
+        self._checked_at = time.monotonic()
+        return matcher
+
+    def reload(self) -> AhoCorasick:
+        """Пересобирает автомат из файла (нет файла - пустой список)"""
+        return self._install(*self._build())
+
+    async def _reload_in_thread(self) -> None:
+        try:
+            self._install(*await asyncio.to_thread(self._build))
+        except Exception:
+            logger.exception("Не удалось перезагрузить запрещенные фразы из %s", self.path)
+
+    @property
+    def matcher(self) -> AhoCorasick:
+        if self._matcher is None:
+            return self.reload()
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            if self._mtime() != self.loaded_mtime:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    # Вне цикла событий (скрипты, тесты) ждать некому - собираем сразу
+                    return self.reload()
+                if self._reloading is None or self._reloading.done():
+                    self._reloading = loop.create_task(self._reload_in_thread())
+        return self._matcher
+
+    def ensure_clean(self, *texts: str | None) -> None:
+        """BannedContentError со списком найденных фраз, если они есть хотя бы в одном тексте"""
+        matcher = self.matcher
+        if not len(matcher):
+            return
+        found = []
+        for text in texts:
+            if text:
+                for match in matcher.iter_matches(text):
+                    phrase = match.phrase.rstrip(PREFIX_MARK)
+                    if phrase not in found:
+                        found.append(phrase)
+        if found:
+            raise BannedContentError(found)
+
+
+banned_phrases = BannedPhrases()
@@ -0,0 +1,114 @@
+"""
+Поиск почти одинаковых постов (повторные жалобы и спам в разных сообществах).
+
+Новый пост получает MinHash-подпись и попадает в корзины LSH
+(app.utils.minhash). Кандидаты - посты с общей корзиной хотя бы в одной
+полосе: LSH_BANDS поисков по индексу вместо сравнения со всеми постами.
+Самый похожий кандидат со сходством не ниже DUPLICATE_SIMILARITY_THRESHOLD
+записывается в duplicate_of_id; пост при этом публикуется, а модераторы видят
+его в /moderation/duplicates.
+"""
+from typing import Any
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.models.posts import PostModel
+from app.models.users import UserModel
+from app.utils.minhash import band_keys, pack, post_text, signature, similarity, unpack
+
+
+class DuplicatePostService:
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def index_post(
+        self,
+        post_id: int,
+        header: str | None,
+        body: str | None
+    ) -> tuple[int | None, float | None]:
+        """
+        Подпись поста и проверка на почти-дубликат среди более ранних постов
+        (при правке старый пост не становится копией нового).
+        Возвращает (id похожего поста, сходство) или (None, None).
+        """
+        sig = signature(post_text(header, body))
+        if sig is None:
+            await self.db.post_signatures.delete_for_post(post_id)
+            return None, None
+        keys = band_keys(sig)
+
+        best_id, best_score = None, 0.0
+        for candidate_id, data in await self.db.post_signatures.find_candidates(keys, before_post_id=post_id):
+            score = similarity(sig, unpack(data))
+            # При равном сходстве оригиналом считается более ранний пост
+            if score > best_score or (score == best_score and best_id is not None and candidate_id < best_id):
+                best_id, best_score = candidate_id, score
+        if best_score < settings.DUPLICATE_SIMILARITY_THRESHOLD:
+            best_id, best_score = None, None
+
+        await self.db.post_signatures.save(post_id, pack(sig), keys, best_id, best_score)
+        return best_id, best_score
+
+    async def get_duplicates(self, skip: int = 0, limit: int = 50) -> list[dict[str, Any]]:
+        """Отмеченные почти-дубликаты вместе с исходными постами"""
+        rows = await self.db.post_signatures.get_duplicates(skip, limit)
+        post_ids = {row.post_id for row in rows} | {row.duplicate_of_id for row in rows}
+        posts = {}
+        if post_ids:
+            result = await self.db.session.execute(
+                select(PostModel.id, PostModel.header, PostModel.community_id, PostModel.created_at,
+                       PostModel.user_id, UserModel.name)
+                .outerjoin(UserModel, UserModel.id == PostModel.user_id)
+                .where(PostModel.id.in_(post_ids))
+            )
+            posts = {row.id: row for row in result.all()}
+
+        def describe(post_id: int) -> dict[str, Any]:
+            post = posts.get(post_id)
+            return {
+                "id": post_id,
+                "header": post.header if post else None,
+                "community_id": post.community_id if post else None,
+                "user_id": post.user_id if post else None,
+                "user_name": post.name if post else None,
+                "created_at": post.created_at if post else None,
+            }
+
+        return [
+            {"post": describe(row.post_id), "original": describe(row.duplicate_of_id), "similarity": row.similarity}
+            for row in rows
+        ]
+
+
+async def backfill_signatures(
+    batch_size: int = 2000,
+    session_factory=async_session_maker,
+    progress=None
+) -> int:
+    """
+    Подписи для постов, у которых их еще нет, пачками по batch_size.
+    Каждая пачка - своя транзакция с пакетной вставкой (executemany) подписей и корзин.
+    Дубликаты среди старых постов не отмечаются: задача только строит индекс.
+    """
+    after_id = 0
+    total = 0
+    while True:
+        async with DBManager(session_factory=session_factory) as db:
+            posts = await db.post_signatures.get_unsigned_posts(after_id, batch_size)
+            if not posts:
+                break
+            rows = []
+            for post_id, header, body in posts:
+                sig = signature(post_text(header, body))
+                if sig is not None:
+                    rows.append((post_id, pack(sig), band_keys(sig)))
+            await db.post_signatures.save_many(rows)
+        after_id = posts[-1][0]
+        total += len(rows)
+        if progress:
+            progress(total)
+    return total
@@ -0,0 +1,185 @@
+"""
+Шина событий между процессами (воркерами) приложения.
+
+Сервисы публикуют события о сущностях в топик по типу сущности, а кеши,
+счетчики и живые каналы подписываются на нужные топики. Бэкенд выбирается
+настройкой EVENT_BUS_URL:
+    memory://                 - внутри одного процесса (по умолчанию)
+    redis://localhost:6379/0  - через Redis pub/sub, события видят все воркеры
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable
+
+from app.config import settings
+
+logger = logging.getLogger("app.events")
+
+
+# Топики по типу сущности
+TOPIC_POSTS = "posts"
+TOPIC_COMMENTS = "comments"
+TOPIC_REACTIONS = "reactions"
+TOPIC_COMMUNITIES = "communities"
+TOPIC_THEMES = "themes"
+
+EventHandler = Callable[[dict], None]
+
+
+class EventBus(ABC):
+    """
+    Интерфейс шины: publish не блокирует вызывающий код,
+    обработчики синхронные и должны быть быстрыми (обновить кеш, положить событие в очередь).
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[EventHandler]] = defaultdict(list)
+
+    def subscribe(self, topic: str, handler: EventHandler) -> None:
+        self._handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: EventHandler) -> None:
+        if handler in self._handlers.get(topic, ()):
+            self._handlers[topic].remove(handler)
+
+    def _dispatch(self, topic: str, event: dict) -> None:
+        for handler in list(self._handlers.get(topic, ())):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Ошибка в обработчике события %s", topic)
+
+    @abstractmethod
+    def publish(self, topic: str, event: dict) -> None:
+        ...
+
+    async def start(self) -> None:
+        """Подключение к бэкенду (вызывается при старте приложения)"""
+
+    async def stop(self) -> None:
+        """Отключение от бэкенда (вызывается при остановке приложения)"""
+
+
+class InMemoryEventBus(EventBus):
+    """Шина внутри процесса: обработчики вызываются сразу при публикации"""
+
+    def publish(self, topic: str, event: dict) -> None:
+        self._dispatch(topic, event)
+
+
+class RedisEventBus(EventBus):
+    """
+    Шина через Redis pub/sub (подходит любой сервер с протоколом Redis).
+
+    Публикация кладет событие в локальную очередь, отдельная задача отправляет его
+    в канал <prefix><topic>. Слушатель подписан на все каналы с префиксом и вызывает
+    локальные обработчики - в том числе для событий своего же процесса, поэтому
+    порядок доставки одинаков во всех воркерах.
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    CONNECT_TIMEOUT_SECONDS = 5.0
+    STOP_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self, url: str, channel_prefix: str = "forum:", client=None):
+        super().__init__()
+        self.url = url
+        self.channel_prefix = channel_prefix
+        self._client = client
+        self._outbox: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._ready = asyncio.Event()
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis  # опциональная зависимость, нужна только для этого бэкенда
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    def publish(self, topic: str, event: dict) -> None:
+        if self._outbox is None:
+            raise RuntimeError("RedisEventBus не запущена: вызовите start() при старте приложения")
+        self._outbox.put_nowait((topic, event))
+
+    async def start(self) -> None:
+        self._outbox = asyncio.Queue()
+        self._ready.clear()
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._send()),
+        ]
+        try:
+            await asyncio.wait_for(self._ready.wait(), self.CONNECT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Приложение стартует и без Redis, слушатель продолжит переподключаться
+            logger.warning("Шина событий: Redis %s недоступен, события будут доставлены после подключения", self.url)
+
+    async def stop(self) -> None:
+        if self._outbox is not None:
+            # Дожидаемся отправки уже опубликованных событий, но не дольше таймаута:
+            # при недоступном Redis отправка повторяется бесконечно
+            try:
+                await asyncio.wait_for(self._outbox.join(), self.STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Шина событий: Redis %s недоступен, при остановке отброшены "
+                    "неотправленные события (в очереди: %d)", self.url, self._outbox.qsize()
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send(self) -> None:
+        client = self._get_client()
+        while True:
+            topic, event = await self._outbox.get()
+            try:
+                data = json.dumps(event, ensure_ascii=False, default=str)
+                while True:
+                    try:
+                        await client.publish(self.channel_prefix + topic, data)
+                        break
+                    except Exception as e:
+                        logger.warning("Шина событий: ошибка публикации в Redis (%s), повтор", e)
+                        await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+            finally:
+                self._outbox.task_done()
+
+    async def _listen(self) -> None:
+        client = self._get_client()
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(self.channel_prefix + "*")
+                self._ready.set()
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    self._dispatch(channel[len(self.channel_prefix):], json.loads(message["data"]))
+            except Exception as e:
+                logger.warning("Шина событий: соединение с Redis потеряно (%s), переподключение", e)
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+
+def create_event_bus(url: str, channel_prefix: str = "forum:") -> EventBus:
+    """Шина по URL из настроек"""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisEventBus(url, channel_prefix=channel_prefix)
+    if url.startswith("memory://"):
+        return InMemoryEventBus()
+    raise ValueError(f"Неизвестный бэкенд шины событий: {url}")
+
+
+event_bus = create_event_bus(settings.EVENT_BUS_URL, settings.EVENT_BUS_CHANNEL_PREFIX)
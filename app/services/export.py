@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from app.models.posts import PostModel
+from app.models.reports import ReportContentTypeEnum, ReportModel, ReportStatusEnum
+from app.utils.ndjson import dumps_line
+
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _created_range(model, created_from: Optional[datetime], created_to: Optional[datetime]) -> list:
+    """Условия на диапазон created_at (границы необязательные, правая не включается)"""
+    conditions = []
+    if created_from is not None:
+        conditions.append(model.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(model.created_at < created_to)
+    return conditions
+
+
+class ExportService:
+    """
+    Потоковая выгрузка таблиц в NDJSON.
+
+    Строки читаются серверным курсором пачками и сразу отдаются наружу:
+    следующая пачка читается только после того, как предыдущая ушла клиенту,
+    поэтому расход памяти не зависит от размера таблицы.
+    """
+
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def _stream(self, repository, conditions: list, **filter_by) -> AsyncIterator[str]:
+        async for rows in repository.stream_rows(
+            *conditions,
+            batch_size=EXPORT_BATCH_SIZE,
+            **filter_by
+        ):
+            yield "".join(dumps_line(row) for row in rows)
+
+    def stream_posts(
+        self,
+        community_id: Optional[int] = None,
+        theme_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> AsyncIterator[str]:
+        """Посты в NDJSON с фильтрами по сообществу, теме, автору и дате создания"""
+        return self._stream(
+            self.db.posts,
+            _created_range(PostModel, created_from, created_to),
+            community_id=community_id,
+            theme_id=theme_id,
+            user_id=user_id,
+        )
+
+    def stream_reports(
+        self,
+        status: Optional[str] = None,
+        content_type: Optional[str] = None,
+        reporter_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> AsyncIterator[str]:
+        """Жалобы в NDJSON с фильтрами по статусу, типу контента, автору и дате создания"""
+        return self._stream(
+            self.db.reports,
+            _created_range(ReportModel, created_from, created_to),
+            status=ReportStatusEnum(status) if status else None,
+            content_type=ReportContentTypeEnum(content_type) if content_type else None,
+            reporter_id=reporter_id,
+        )
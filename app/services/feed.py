@@ -0,0 +1,77 @@
+import base64
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+from app.exceptions.posts import InvalidFeedCursorError
+from app.services.posts import PostService
+
+
+def encode_feed_cursor(created_at: datetime, post_id: int) -> str:
+    """Кодирует позицию в ленте (created_at, id) в непрозрачную строку"""
+    raw = f"{created_at.isoformat()}|{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor: str) -> tuple[datetime, int]:
+    """Разбирает курсор ленты, созданный encode_feed_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidFeedCursorError
+
+
+class FeedService:
+    """
+    Персональная лента: новейшие посты из сообществ пользователя.
+
+    Лента собирается при чтении (fan-out-on-read): для каждого сообщества берется
+    диапазон новейших постов по индексу (community_id, created_at), после чего
+    диапазоны сливаются k-way merge. Запросов к БД - O(число сообществ / 100),
+    а не O(число постов).
+    """
+
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def get_user_community_ids(self, user_id: int) -> list[int]:
+        """Список сообществ, в которых состоит пользователь"""
+        return await self.db.user_communities.get_community_ids(user_id)
+
+    async def get_feed(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        theme_id: Optional[int] = None
+    ) -> dict:
+        """Страница персональной ленты и курсор следующей страницы"""
+        community_ids = await self.get_user_community_ids(user_id)
+        if not community_ids:
+            return {"items": [], "next_cursor": None}
+        
+        before = decode_feed_cursor(cursor) if cursor else None
+        
+        # Каждому сообществу достаточно limit + 1 постов: больше в страницу не попадет
+        ranges = await self.db.posts.get_community_ranges(
+            community_ids,
+            per_community=limit + 1,
+            before=before,
+            theme_id=theme_id
+        )
+        
+        # Граница страницы отсечена в SQL, поэтому первые limit + 1 ключей слияния - ровно
+        # страница и признак следующей
+        keys = list(islice(heapq.merge(*ranges.values(), reverse=True), limit + 1))
+        
+        has_more = len(keys) > limit
+        keys = keys[:limit]
+        next_cursor = encode_feed_cursor(*keys[-1]) if has_more else None
+        
+        # Целиком загружаем только посты, попавшие в страницу
+        page = await self.db.posts.get_by_ids([post_id for _, post_id in keys])
+        items = await PostService(self.db).attach_web_details(page)
+        return {"items": items, "next_cursor": next_cursor}
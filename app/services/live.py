@@ -0,0 +1,168 @@
+"""
+Живые обновления страниц через Server-Sent Events.
+
+Сервисы публикуют события о сущностях в шину (app.services.events), хаб каждого
+воркера подписан на нее и раскладывает события по топикам (пост или сообщество),
+каждое SSE-подключение получает их через свою подписку. События склеиваются
+по ключу: пока подписчик ждет окно LIVE_COALESCE_SECONDS, новые события с тем же
+ключом заменяют старые, поэтому сотня лайков подряд уходит клиенту одним обновлением.
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator
+
+from app.config import settings
+from app.exceptions.live import LiveConnectionsLimitError
+from app.services.events import event_bus, TOPIC_POSTS, TOPIC_COMMENTS, TOPIC_REACTIONS
+
+
+# Сколько несклеиваемых событий держим на подписчика, дальше просим клиента перезагрузиться
+MAX_PENDING_EVENTS = 100
+
+
+def post_topic(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def community_topic(community_id: int) -> str:
+    return f"community:{community_id}"
+
+
+def format_sse(event: str, payload: Any) -> str:
+    """Кадр SSE: имя события и JSON в data"""
+    data = json.dumps(payload, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+class LiveSubscription:
+    """Подписка одного подключения: ожидающие события, склеенные по ключу"""
+
+    def __init__(self, topic: str):
+        self.topic = topic
+        self.pending: dict[str, tuple[str, Any]] = {}
+        self.overflow = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: str, payload: Any, key: str) -> None:
+        if key not in self.pending and len(self.pending) >= MAX_PENDING_EVENTS:
+            self.overflow = True
+        else:
+            self.pending[key] = (event, payload)
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float, coalesce_seconds: float) -> list[tuple[str, Any]] | None:
+        """
+        Ждет события не дольше timeout (None - пора отправить пинг),
+        затем выдерживает окно склейки и забирает все накопленное.
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if coalesce_seconds > 0:
+            await asyncio.sleep(coalesce_seconds)
+        self._wakeup.clear()
+        if self.overflow:
+            self.pending.clear()
+            self.overflow = False
+            return [("resync", {})]
+        batch = list(self.pending.values())
+        self.pending.clear()
+        return batch
+
+
+class LiveHub:
+    """Внутрипроцессная шина живых обновлений с лимитом подключений на воркер"""
+
+    def __init__(
+        self,
+        max_connections: int = settings.LIVE_MAX_CONNECTIONS_PER_WORKER,
+        coalesce_seconds: float = settings.LIVE_COALESCE_SECONDS,
+        heartbeat_seconds: float = settings.LIVE_HEARTBEAT_SECONDS,
+    ):
+        self.max_connections = max_connections
+        self.coalesce_seconds = coalesce_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._topics: dict[str, set[LiveSubscription]] = {}
+        self._connections = 0
+
+    @property
+    def connections(self) -> int:
+        return self._connections
+
+    def ensure_capacity(self) -> None:
+        if self._connections >= self.max_connections:
+            raise LiveConnectionsLimitError
+
+    def subscribe(self, topic: str) -> LiveSubscription:
+        self.ensure_capacity()
+        subscription = LiveSubscription(topic)
+        self._topics.setdefault(topic, set()).add(subscription)
+        self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        subscribers = self._topics.get(subscription.topic)
+        if not subscribers or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._topics[subscription.topic]
+        self._connections -= 1
+
+    def publish(self, topic: str, event: str, payload: Any, key: str | None = None) -> None:
+        """Неблокирующая публикация: событие кладется в очередь каждого подписчика топика"""
+        for subscription in self._topics.get(topic, ()):
+            subscription.push(event, payload, key or event)
+
+    async def stream(self, subscription: LiveSubscription) -> AsyncIterator[str]:
+        """
+        Поток кадров SSE для уже оформленной подписки (место занимается до
+        ответа, чтобы лимит проверялся до отправки заголовков); подписка
+        снимается при отключении клиента.
+        """
+        try:
+            yield f"retry: {int(self.heartbeat_seconds * 1000)}\n\n"
+            while True:
+                batch = await subscription.next_batch(self.heartbeat_seconds, self.coalesce_seconds)
+                if batch is None:
+                    yield ": ping\n\n"
+                    continue
+                yield "".join(format_sse(event, payload) for event, payload in batch)
+        finally:
+            self.unsubscribe(subscription)
+
+
+live_hub = LiveHub()
+
+
+def _on_reactions(event: dict) -> None:
+    counters = {"post_id": event["post_id"], "likes": event["likes"], "dislikes": event["dislikes"]}
+    live_hub.publish(post_topic(event["post_id"]), "reactions", counters)
+    if event.get("community_id"):
+        live_hub.publish(
+            community_topic(event["community_id"]), "post_reactions", counters, key=f"reactions:{event['post_id']}"
+        )
+
+
+def _on_comment(event: dict) -> None:
+    comment = event["comment"]
+    live_hub.publish(post_topic(comment["post_id"]), "comment", comment, key=f"comment:{comment['id']}")
+    if event.get("community_id"):
+        live_hub.publish(
+            community_topic(event["community_id"]),
+            "post_commented",
+            {"post_id": comment["post_id"]},
+            key=f"commented:{comment['post_id']}"
+        )
+
+
+def _on_post(event: dict) -> None:
+    post = event["post"]
+    if event.get("action") == "created" and post.get("community_id"):
+        live_hub.publish(community_topic(post["community_id"]), "post_created", post, key=f"post:{post['id']}")
+
+
+event_bus.subscribe(TOPIC_REACTIONS, _on_reactions)
+event_bus.subscribe(TOPIC_COMMENTS, _on_comment)
+event_bus.subscribe(TOPIC_POSTS, _on_post)
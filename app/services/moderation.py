@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.exceptions.reports import NoPendingReportsError
+from app.models.reports import ReportContentTypeEnum, ReportStatusEnum
+from app.schemes.reports import ContentType, ReportStatus
+from app.services.reports import ReportService
+
+
+class ModerationService:
+    """
+    Очередь модерации: открытые жалобы сгруппированы по контенту.
+
+    Каждая группа - строка report_content_stats с предвычисленным приоритетом
+    (число жалоб, репутация жалующихся, возраст первой жалобы, см.
+    calculate_moderation_priority). Страница очереди читается по индексу на
+    priority, а решение по группе закрывает все ее жалобы одним UPDATE.
+    """
+
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def get_queue(self, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+        """Страница очереди: группы по убыванию приоритета с причинами и информацией о контенте"""
+        rows = await self.db.reports.get_moderation_queue(skip, limit)
+        keys = [(row.content_type, row.content_id) for row in rows]
+        contents = await ReportService(self.db).get_contents_info(keys)
+
+        reasons: Dict[tuple, list] = {key: [] for key in keys}
+        for content_type, content_id, reason, count in await self.db.reports.count_pending_reasons(keys):
+            reasons[(content_type, content_id)].append({"reason": reason, "count": count})
+
+        return [
+            {
+                "content_type": row.content_type.value,
+                "content_id": row.content_id,
+                "priority": row.priority,
+                "pending_count": row.pending_count,
+                "reports_count": row.reports_count,
+                "pending_reputation": row.pending_reputation,
+                "first_pending_at": row.first_pending_at,
+                "last_reported_at": row.last_reported_at,
+                "reasons": reasons[(row.content_type, row.content_id)],
+                **contents[(row.content_type, row.content_id)]
+            }
+            for row in rows
+        ]
+
+    async def resolve(
+        self,
+        content_type: ContentType,
+        content_id: int,
+        status: ReportStatus,
+        moderator_id: int,
+        moderator_comment: Optional[str] = None
+    ) -> int:
+        """Решение по всем открытым жалобам на контент. Возвращает число закрытых жалоб"""
+        report_content_type = ReportContentTypeEnum(content_type.value)
+        values = {
+            "status": ReportStatusEnum(status.value),
+            "moderator_id": moderator_id,
+            "updated_at": datetime.utcnow()
+        }
+        if moderator_comment:
+            values["moderator_comment"] = moderator_comment
+
+        resolved = await self.db.reports.resolve_pending_for_content(report_content_type, content_id, values)
+        if not resolved:
+            raise NoPendingReportsError
+        await self.db.reports.refresh_content_stats(report_content_type, content_id)
+        return resolved
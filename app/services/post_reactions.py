@@ -1,6 +1,8 @@
 from sqlalchemy import select
 from fastapi import HTTPException
 from app.models.posts import PostModel
+from app.repositories.posts import PostsRepository
+from app.services.events import event_bus, TOPIC_REACTIONS
 
 class PostReactionService:
     @staticmethod
@@ -56,8 +58,19 @@ class PostReactionService:
                 post.add_dislike(user_id)
                 action = "changed"
         
+        # Пересчитываем "горячесть" поста в той же транзакции
+        await PostsRepository(db_session).refresh_hot_score(post_id)
+        
         await db_session.commit()
         
+        # Новые счетчики для живых обновлений и других воркеров
+        event_bus.publish(TOPIC_REACTIONS, {
+            "post_id": post_id,
+            "community_id": post.community_id,
+            "likes": post.likes or 0,
+            "dislikes": post.dislikes or 0,
+        })
+        
         return {
             "action": action,
             "likes": post.likes or 0,
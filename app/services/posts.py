@@ -3,6 +3,7 @@ from typing import Optional
 from sqlalchemy import select, update, delete, func
 
 from app.models.posts import PostModel
+from app.models.comments import CommentModel
 from app.models.users import UserModel
 from app.models.themes import ThemeModel
 from app.models.communities import CommunityModel
@@ -13,6 +14,10 @@ from app.exceptions.posts import (
     PostAlreadyExistsError
 )
 from app.services.comments import CommentService
+from app.services.content_filter import banned_phrases
+from app.services.duplicates import DuplicatePostService
+from app.services.events import event_bus, TOPIC_POSTS
+from app.services.related_posts import RelatedPostService
 
 
 class PostService:
@@ -130,7 +135,21 @@ class PostService:
         # Обновляем пост
         update_data = post_data.model_dump(exclude_unset=True)
         if update_data:
+            old_header, old_body = post.header, post.body
             await self.db.posts.edit(update_data, id=post_id)
+            if "header" in update_data or "body" in update_data:
+                header = update_data.get("header", old_header)
+                body = update_data.get("body", old_body)
+                await DuplicatePostService(self.db).index_post(post_id, header, body)
+                related = RelatedPostService(self.db)
+                await related.remove_post(post_id, old_header, old_body)
+                await related.index_post(post_id, header, body)
+            if "header" in update_data:
+                event = {
+                    "action": "updated",
+                    "post": {"id": post_id, "header": update_data["header"], "community_id": post.community_id},
+                }
+                self.db.on_commit(lambda: event_bus.publish(TOPIC_POSTS, event))
 
     async def delete_post(
         self,
@@ -150,7 +169,11 @@ class PostService:
         # Запоминаем ID сообщества перед удалением
         community_id = post.community_id
         
+        await self.db.post_signatures.delete_for_post(post_id)
+        await RelatedPostService(self.db).remove_post(post_id, post.header, post.body)
         await self.db.posts.delete(id=post_id)
+        event = {"action": "deleted", "post": {"id": post_id, "community_id": community_id}}
+        self.db.on_commit(lambda: event_bus.publish(TOPIC_POSTS, event))
         
         # Уменьшаем счетчик постов в сообществе
         if community_id:
@@ -252,6 +275,8 @@ class PostService:
 
     async def create_post_with_community_update(self, post_data: SPostAdd, user_id: int) -> PostModel:
         """Создание нового поста с обновлением счетчика в сообществе"""
+        banned_phrases.ensure_clean(post_data.header, post_data.body)
+        
         post_data_dict = post_data.model_dump()
         post_data_dict['user_id'] = user_id
         post_data_dict['created_at'] = datetime.utcnow()
@@ -260,11 +285,22 @@ class PostService:
         
         new_post = await self.db.posts.add(post_data_dict)
         
+        # Подпись для поиска почти-дубликатов: пост публикуется, но отмечается для модераторов
+        await DuplicatePostService(self.db).index_post(new_post.id, new_post.header, new_post.body)
+        await RelatedPostService(self.db).index_post(new_post.id, new_post.header, new_post.body)
+        
         # Увеличиваем счетчик постов в сообществе, если пост привязан к сообществу
         if post_data.community_id:
             from app.services.communities import CommunitiesService
             await CommunitiesService(self.db).increment_posts_count(post_data.community_id)
         
+        # Событие о новом посте уходит в шину только после коммита транзакции
+        event = {
+            "action": "created",
+            "post": {"id": new_post.id, "header": new_post.header, "community_id": new_post.community_id},
+        }
+        self.db.on_commit(lambda: event_bus.publish(TOPIC_POSTS, event))
+        
         return new_post
 
     async def get_posts_for_web(
@@ -290,24 +326,49 @@ class PostService:
             limit=limit
         )
         
-        # Для каждого поста получаем дополнительную информацию
+        # Автор, тема, сообщество и число комментариев - пачкой, а не запросами на каждый пост
+        return await self.attach_web_details(posts)
+
+    async def attach_web_details(self, posts: list) -> list[dict]:
+        """
+        Добавляет к постам автора, тему, сообщество и число комментариев.
+        Справочные данные загружаются пачкой (по одному запросу на таблицу), а не для каждого поста.
+        """
+        if not posts:
+            return []
+        
+        user_ids = {post.user_id for post in posts}
+        theme_ids = {post.theme_id for post in posts}
+        community_ids = {post.community_id for post in posts if post.community_id}
+        post_ids = [post.id for post in posts]
+        
+        session = self.db.session
+        user_names = dict((await session.execute(
+            select(UserModel.id, UserModel.name).where(UserModel.id.in_(user_ids))
+        )).all())
+        theme_names = dict((await session.execute(
+            select(ThemeModel.id, ThemeModel.name).where(ThemeModel.id.in_(theme_ids))
+        )).all())
+        community_names = dict((await session.execute(
+            select(CommunityModel.id, CommunityModel.name).where(CommunityModel.id.in_(community_ids))
+        )).all()) if community_ids else {}
+        comments_counts = dict((await session.execute(
+            select(CommentModel.post_id, func.count(CommentModel.id))
+            .where(CommentModel.post_id.in_(post_ids))
+            .group_by(CommentModel.post_id)
+        )).all())
+        
         result = []
         for post in posts:
-            user = await self.db.users.get(post.user_id)
-            theme = await self.db.themes.get(post.theme_id)
-            community = await self.db.communities.get(post.community_id) if post.community_id else None
-            
-            # Получаем количество комментариев к посту
-            comments = await self.db.comments.get_filtered(post_id=post.id)
-            comments_count = len(comments)
-            
-            post_dict = post.__dict__.copy()
-            post_dict["user_name"] = user.name if user else "Unknown"
-            post_dict["theme_name"] = theme.name if theme else "Unknown"
-            post_dict["community_name"] = community.name if community else "Unknown"
-            post_dict["comments_count"] = comments_count
+            post_dict = {
+                column.name: getattr(post, column.name, None)
+                for column in PostModel.__table__.columns
+            }
+            post_dict["user_name"] = user_names.get(post.user_id, "Unknown")
+            post_dict["theme_name"] = theme_names.get(post.theme_id, "Unknown")
+            post_dict["community_name"] = community_names.get(post.community_id, "Unknown")
+            post_dict["comments_count"] = comments_counts.get(post.id, 0)
             result.append(post_dict)
-            
         return result
 
     async def get_post_with_comments(self, post_id: int) -> Optional[dict]:
@@ -329,6 +390,7 @@ class PostService:
         post_data["theme_name"] = theme.name if theme else "Unknown"
         post_data["community_name"] = community.name if community else "Unknown"
         post_data["comments"] = comments
+        post_data["related_posts"] = await RelatedPostService(self.db).get_related(post_id)
         
         return post_data
 
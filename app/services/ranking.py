@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.utils.ranking import RANKING_WINDOWS
+
+logger = logging.getLogger("app.ranking")
+
+
+class RankingService:
+    """Сервис ранжирования постов (hot/top) с предвычисленным hot_score"""
+
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def get_ranked_posts(
+        self,
+        sort: str = "hot",
+        window: str = "week",
+        skip: int = 0,
+        limit: int = 100,
+        theme_id: int | None = None
+    ) -> list:
+        """Получение постов, отсортированных по горячести или по лайкам за окно (с фильтром по теме)"""
+        if window not in RANKING_WINDOWS:
+            raise ValueError(f"Неизвестное окно: {window}")
+        days = RANKING_WINDOWS[window]
+        if sort == "hot":
+            return await self.db.posts.get_hot(days=days, skip=skip, limit=limit, theme_id=theme_id)
+        if sort == "top":
+            return await self.db.posts.get_popular(days=days, skip=skip, limit=limit, theme_id=theme_id)
+        raise ValueError(f"Неизвестная сортировка: {sort}")
+
+    async def refresh_post(self, post_id: int) -> float | None:
+        """Инкрементальный пересчет после реакции или комментария"""
+        return await self.db.posts.refresh_hot_score(post_id)
+
+    async def refresh_recent(self, window_days: int | None = None) -> int:
+        """Периодический пересчет затухания для постов за последние window_days"""
+        window_days = window_days or settings.RANKING_DECAY_WINDOW_DAYS
+        since = datetime.utcnow() - timedelta(days=window_days)
+        return await self.db.posts.refresh_hot_scores(since=since)
+
+
+async def run_ranking_refresh_loop(interval_seconds: int | None = None) -> None:
+    """Фоновая задача: периодически пересчитывает hot_score свежих постов"""
+    interval_seconds = interval_seconds or settings.RANKING_REFRESH_INTERVAL_SECONDS
+    while True:
+        try:
+            async with DBManager() as db:
+                await RankingService(db).refresh_recent()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Задача работает все время жизни воркера: ошибка одного прохода ее не останавливает
+            logger.exception("Ошибка при пересчете рейтинга постов")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,129 @@
+"""
+Блок "Похожие обсуждения" на странице поста.
+
+Сходство постов - косинус TF-IDF-векторов заголовка и текста
+(app.utils.tfidf). Соседи считаются заранее и хранятся в related_posts, так
+что страница поста получает их одним поиском по индексу.
+
+Новый пост индексируется сразу: частоты слов обновляются, его вектор
+ищет соседей по обратному индексу post_terms, и пост добавляется в списки
+соседей, если похож на них сильнее их k-го поста. Веса старых постов при
+этом не пересчитываются (idf медленно "уплывает"); полный пересчет -
+python -m app.tools.related.
+"""
+from typing import Any
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.utils.minhash import post_text
+from app.utils.tfidf import terms, weights
+
+
+class RelatedPostService:
+    def __init__(self, db):
+        self.db = db  # DBManager instance
+
+    async def index_post(self, post_id: int, header: str | None, body: str | None) -> list[tuple[int, float]]:
+        """Вектор нового (или измененного - после remove_post) поста и его соседи"""
+        counts = terms(post_text(header, body))
+        if not counts:
+            await self.db.related_posts.delete_for_post(post_id)
+            return []
+        await self.db.related_posts.change_document_counts(counts, 1)
+        documents, term_documents = await self.db.related_posts.get_document_counts(counts)
+        vector = weights(counts, documents, term_documents)
+        await self.db.related_posts.save_terms(post_id, vector)
+
+        related = await self._find_related(post_id, vector)
+        await self.db.related_posts.replace_related(post_id, related)
+        await self.db.related_posts.add_backlinks(post_id, related, settings.RELATED_POSTS_TOP_K)
+        return related
+
+    async def remove_post(self, post_id: int, header: str | None, body: str | None) -> None:
+        """
+        Убирает пост из индекса; header и body - текст, с которым он
+        индексировался. Частоты слов уменьшаются, только если пост был
+        учтен в них (есть его вектор в post_terms).
+        """
+        counts = terms(post_text(header, body))
+        if counts and await self.db.related_posts.is_indexed(post_id):
+            await self.db.related_posts.change_document_counts(counts, -1)
+        await self.db.related_posts.delete_for_post(post_id)
+
+    async def get_related(self, post_id: int) -> list[dict[str, Any]]:
+        rows = await self.db.related_posts.get_related(post_id, settings.RELATED_POSTS_TOP_K)
+        return [dict(row._mapping) for row in rows]
+
+    async def _find_related(self, post_id: int, vector: dict[str, float]) -> list[tuple[int, float]]:
+        found = await self.db.related_posts.find_similar(
+            vector, exclude_post_id=post_id, limit=settings.RELATED_POSTS_TOP_K
+        )
+        return [(related_id, score) for related_id, score in found if score >= settings.RELATED_POSTS_MIN_SCORE]
+
+
+async def rebuild_related_posts(
+    batch_size: int = 2000,
+    session_factory=async_session_maker,
+    progress=None
+) -> int:
+    """
+    Полный пересчет индекса: частоты слов по всем постам, векторы с
+    актуальным idf и соседи каждого поста. Три прохода по постам пачками
+    по batch_size; векторы и соседи пишутся пакетными вставками.
+    """
+    async def posts_batches():
+        after_id = 0
+        while True:
+            async with DBManager(session_factory=session_factory) as db:
+                posts = await db.related_posts.get_post_texts(after_id, batch_size)
+            if not posts:
+                return
+            yield posts
+            after_id = posts[-1][0]
+
+    # 1. Частоты слов
+    documents = 0
+    term_documents: dict[str, int] = {}
+    async for posts in posts_batches():
+        for _, header, body in posts:
+            counts = terms(post_text(header, body))
+            if counts:
+                documents += 1
+                for term in counts:
+                    term_documents[term] = term_documents.get(term, 0) + 1
+
+    async with DBManager(session_factory=session_factory) as db:
+        await db.related_posts.clear()
+        if documents:
+            await db.related_posts.save_document_counts(documents, term_documents)
+
+    # 2. Векторы
+    async for posts in posts_batches():
+        vectors = {}
+        for post_id, header, body in posts:
+            counts = terms(post_text(header, body))
+            if counts:
+                vectors[post_id] = weights(counts, documents, term_documents)
+        async with DBManager(session_factory=session_factory) as db:
+            await db.related_posts.save_terms_many(vectors)
+
+    # 3. Соседи - тем же поиском по обратному индексу, что и для новых постов
+    after_id = 0
+    total = 0
+    while True:
+        async with DBManager(session_factory=session_factory) as db:
+            vectors = await db.related_posts.get_vectors(after_id, batch_size)
+            if not vectors:
+                break
+            service = RelatedPostService(db)
+            rows = []
+            for post_id, vector in vectors.items():
+                for related_id, score in await service._find_related(post_id, vector):
+                    rows.append((post_id, related_id, score))
+            await db.related_posts.save_related_many(rows)
+        after_id = max(vectors)
+        total += len(vectors)
+        if progress:
+            progress(total)
+    return total
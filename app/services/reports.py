@@ -20,41 +20,34 @@ class ReportService:
     def __init__(self, db):
         self.db = db  # DBManager instance
 
-    async def create_report(self, report_data: SReportCreate, reporter_id: int) -> ReportModel:
-        """Создание новой жалобы"""
-        # Проверяем существование контента
-        content_exists = await self._check_content_exists(
-            report_data.content_type,
-            report_data.content_id
-        )
-        if not content_exists:
-            raise ContentNotFoundError
-        
-        # Проверяем дубликаты
-        existing_reports = await self.db.reports.get_filtered(
-            filter_by={
-                'reporter_id': reporter_id,
-                'content_type': ReportContentTypeEnum(report_data.content_type.value),
-                'content_id': report_data.content_id
-            }
-        )
-        if existing_reports:
-            raise DuplicateReportError
-        
-        # Создаем жалобу
+    async def create_report(self, report_data: SReportCreate, reporter_id: int) -> int:
+        """
+        Создание новой жалобы. Проверка контента, проверка дубликата и вставка -
+        один запрос; дубликаты отсекает уникальный индекс (reporter_id, content_type, content_id),
+        поэтому одновременные одинаковые жалобы не проходят обе.
+        """
+        content_type = ReportContentTypeEnum(report_data.content_type.value)
+        now = datetime.utcnow()
         report_data_dict = {
             'reporter_id': reporter_id,
-            'content_type': ReportContentTypeEnum(report_data.content_type.value),
+            'content_type': content_type,
             'content_id': report_data.content_id,
             'reason': report_data.reason,
             'description': report_data.description,
             'status': ReportStatusEnum.PENDING,
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
         
-        new_report = await self.db.reports.add(report_data_dict)
-        return new_report
+        report_id = await self.db.reports.add_if_new(report_data_dict)
+        if report_id is None:
+            # Строка не вставлена: выясняем причину (только на неуспешном пути)
+            if not await self.db.reports.content_exists(content_type, report_data.content_id):
+                raise ContentNotFoundError
+            raise DuplicateReportError
+        
+        await self.db.reports.refresh_content_stats(content_type, report_data.content_id)
+        return report_id
 
     async def get_report(self, report_id: int) -> Optional[ReportModel]:
         """Получение жалобы по ID"""
@@ -124,26 +117,51 @@ class ReportService:
         self,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[ReportStatus] = None
+        status: Optional[ReportStatus] = None,
+        reporter_id: Optional[int] = None,
+        content_type: Optional[ContentType] = None
     ) -> List[Dict[str, Any]]:
-        """Получение жалоб с дополнительной информацией"""
-        filters = {}
-        if status:
-            filters['status'] = ReportStatusEnum(status.value)
-            
-        reports = await self.db.reports.get_filtered(
-            **filters,
-            offset=skip,
-            limit=limit
+        """Получение жалоб с дополнительной информацией (фильтры выполняются в SQL)"""
+        report_status = ReportStatusEnum(status.value) if status else None
+        if reporter_id is not None:
+            reports = await self.db.reports.get_by_reporter(reporter_id, skip, limit, report_status)
+        else:
+            reports = await self.db.reports.get_filtered(
+                status=report_status,
+                content_type=ReportContentTypeEnum(content_type.value) if content_type else None,
+                offset=skip,
+                limit=limit
+            )
+        return await self._attach_details(reports)
+
+    async def get_reports_for_content(
+        self,
+        content_type: ContentType,
+        content_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Жалобы на конкретный контент с дополнительной информацией"""
+        reports = await self.db.reports.get_by_content(
+            ReportContentTypeEnum(content_type.value), content_id, skip, limit
         )
-        
-        detailed_reports = []
-        for report in reports:
-            # Получаем детальную информацию для каждой жалобы
-            detailed_report = await self._get_detailed_report_info(report)
-            detailed_reports.append(detailed_report)
-        
-        return detailed_reports
+        return await self._attach_details(reports)
+
+    async def get_most_reported_content(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Контент с наибольшим числом жалоб из сводной таблицы"""
+        rows = await self.db.reports.get_most_reported(limit)
+        contents = await self.get_contents_info([(row.content_type, row.content_id) for row in rows])
+        return [
+            {
+                "content_type": row.content_type.value,
+                "content_id": row.content_id,
+                "reports_count": row.reports_count,
+                "first_reported_at": row.first_reported_at,
+                "last_reported_at": row.last_reported_at,
+                **contents[(row.content_type, row.content_id)]
+            }
+            for row in rows
+        ]
 
     async def update_report(
         self,
@@ -169,6 +187,10 @@ class ReportService:
             update_values["moderator_comment"] = report_data.moderator_comment
         
         await self.db.reports.edit(update_values, id=report_id)
+        if report_data.status:
+            # Статус влияет на очередь модерации
+            content_type = ReportContentTypeEnum(report.content_type.value)
+            await self.db.reports.refresh_content_stats(content_type, report.content_id)
 
     async def delete_report(self, report_id: int, user_id: int, is_admin: bool = False) -> None:
         """Удаление жалобы (только автор или админ)"""
@@ -181,15 +203,8 @@ class ReportService:
             raise ReportAccessDeniedError
         
         await self.db.reports.delete(id=report_id)
-
-    async def _check_content_exists(self, content_type: ContentType, content_id: int) -> bool:
-        """Проверка существования контента"""
-        if content_type == ContentType.POST:
-            post = await self.db.posts.get(content_id)
-            return post is not None
-        else:  # COMMENT
-            comment = await self.db.comments.get(content_id)
-            return comment is not None
+        content_type = ReportContentTypeEnum(report.content_type.value)
+        await self.db.reports.refresh_content_stats(content_type, report.content_id)
 
     async def _get_content_info(self, content_type: ReportContentTypeEnum, content_id: int) -> Dict[str, Any]:
         """Получение информации о контенте"""
@@ -251,35 +266,124 @@ class ReportService:
             **content_info
         }
 
-    async def get_report_stats(self) -> Dict[str, Any]:
-        """Получение статистики по жалобам"""
-        # Получаем все отчеты для подсчета статистики
-        all_reports = await self.db.reports.get_all()
-        total = len(all_reports)
-        
-        # Подсчитываем по статусам
-        pending = len([r for r in all_reports if r.status == ReportStatusEnum.PENDING])
-        resolved = len([r for r in all_reports if r.status == ReportStatusEnum.RESOLVED])
-        rejected = len([r for r in all_reports if r.status == ReportStatusEnum.REJECTED])
-        
-        # Подсчитываем по типам контента
-        posts_count = len([r for r in all_reports if r.content_type == ReportContentTypeEnum.POST])
-        comments_count = len([r for r in all_reports if r.content_type == ReportContentTypeEnum.COMMENT])
-        
-        return {
-            "total_reports": total,
-            "pending_reports": pending,
-            "resolved_reports": resolved,
-            "rejected_reports": rejected,
-            "reports_on_posts": posts_count,
-            "reports_on_comments": comments_count
+    async def get_contents_info(
+        self,
+        keys: List[Tuple[ReportContentTypeEnum, int]]
+    ) -> Dict[Tuple[ReportContentTypeEnum, int], Dict[str, Any]]:
+        """Информация о наборе постов и комментариев: по одному запросу на таблицу, а не на жалобу"""
+        post_ids = {content_id for content_type, content_id in keys if content_type == ReportContentTypeEnum.POST}
+        comment_ids = {content_id for content_type, content_id in keys if content_type == ReportContentTypeEnum.COMMENT}
+
+        posts = {}
+        if post_ids:
+            result = await self.db.session.execute(
+                select(PostModel.id, PostModel.user_id, PostModel.header, PostModel.body)
+                .where(PostModel.id.in_(post_ids))
+            )
+            posts = {row.id: row for row in result.all()}
+        comments = {}
+        if comment_ids:
+            result = await self.db.session.execute(
+                select(CommentModel.id, CommentModel.user_id, CommentModel.body)
+                .where(CommentModel.id.in_(comment_ids))
+            )
+            comments = {row.id: row for row in result.all()}
+
+        author_ids = {row.user_id for row in posts.values()} | {row.user_id for row in comments.values()}
+        names = await self._get_user_names(author_ids)
+
+        contents = {}
+        for key in keys:
+            content_type, content_id = key
+            if content_type == ReportContentTypeEnum.POST and content_id in posts:
+                post = posts[content_id]
+                contents[key] = {
+                    "content_preview": post.header[:100] if post.header else "",
+                    "content_body": post.body[:200] if post.body else "",
+                    "content_author_id": post.user_id,
+                    "content_author_name": names.get(post.user_id, "Unknown")
+                }
+            elif content_type == ReportContentTypeEnum.COMMENT and content_id in comments:
+                comment = comments[content_id]
+                contents[key] = {
+                    "content_preview": comment.body[:100] if comment.body else "",
+                    "content_body": comment.body[:200] if comment.body else "",
+                    "content_author_id": comment.user_id,
+                    "content_author_name": names.get(comment.user_id, "Unknown")
+                }
+            else:
+                contents[key] = {
+                    "content_preview": None,
+                    "content_body": None,
+                    "content_author_id": None,
+                    "content_author_name": None
+                }
+        return contents
+
+    async def _get_user_names(self, user_ids: set[int]) -> Dict[int, str]:
+        if not user_ids:
+            return {}
+        result = await self.db.session.execute(
+            select(UserModel.id, UserModel.name).where(UserModel.id.in_(user_ids))
+        )
+        return dict(result.all())
+
+    async def _attach_details(self, reports) -> List[Dict[str, Any]]:
+        """
+        Детальная информация для списка жалоб. Пользователи, контент и сводка
+        жалоб на контент загружаются пачками (IN), число запросов не зависит
+        от длины списка.
+        """
+        if not reports:
+            return []
+        keys = list(dict.fromkeys(
+            (ReportContentTypeEnum(report.content_type.value), report.content_id) for report in reports
+        ))
+        contents = await self.get_contents_info(keys)
+        content_stats = await self.db.reports.get_content_stats(keys)
+        user_ids = {report.reporter_id for report in reports} | {
+            report.moderator_id for report in reports if report.moderator_id
         }
+        names = await self._get_user_names(user_ids)
 
-    async def get_open_reports(self) -> list[dict]:
-        """Получение всех открытых (ожидающих рассмотрения) жалоб для админ-панели"""
-        reports = await self.db.reports.get_pending_reports()
         detailed_reports = []
         for report in reports:
-            detailed_report = await self._get_detailed_report_info(report)
-            detailed_reports.append(detailed_report)
-        return detailed_reports
\ No newline at end of file
+            key = (ReportContentTypeEnum(report.content_type.value), report.content_id)
+            stats = content_stats.get(key)
+            detailed_reports.append({
+                "id": report.id,
+                "reporter_id": report.reporter_id,
+                "reporter_name": names.get(report.reporter_id),
+                "content_type": report.content_type.value,
+                "content_id": report.content_id,
+                "reason": report.reason,
+                "description": report.description,
+                "status": report.status.value,
+                "moderator_id": report.moderator_id,
+                "moderator_name": names.get(report.moderator_id) if report.moderator_id else None,
+                "moderator_comment": report.moderator_comment,
+                "created_at": report.created_at,
+                "updated_at": report.updated_at,
+                "content_reports_count": stats.reports_count if stats else 0,
+                **contents[key]
+            })
+        return detailed_reports
+
+    async def get_report_stats(self) -> Dict[str, Any]:
+        """Получение статистики по жалобам одним запросом GROUP BY (status, content_type)"""
+        by_status: Dict[ReportStatusEnum, int] = {}
+        by_content_type: Dict[ReportContentTypeEnum, int] = {}
+        total = 0
+        for report_status, content_type, count in await self.db.reports.count_by_status_and_type():
+            total += count
+            by_status[report_status] = by_status.get(report_status, 0) + count
+            by_content_type[content_type] = by_content_type.get(content_type, 0) + count
+
+        return {
+            "total_reports": total,
+            "pending_reports": by_status.get(ReportStatusEnum.PENDING, 0),
+            "resolved_reports": by_status.get(ReportStatusEnum.RESOLVED, 0),
+            "rejected_reports": by_status.get(ReportStatusEnum.REJECTED, 0),
+            "reports_on_posts": by_content_type.get(ReportContentTypeEnum.POST, 0),
+            "reports_on_comments": by_content_type.get(ReportContentTypeEnum.COMMENT, 0)
+        }
@@ -0,0 +1,88 @@
+"""
+Общий поиск по постам, комментариям, сообществам и темам за один запрос.
+
+Каждый тип ищется по своему индексу FTS5 trigram (app.models.search_index) с
+одной и той же цепочкой exact -> prefix -> fuzzy; индексы обновляются
+триггерами при каждой записи. Результаты возвращаются группами: внутри
+группы - порядок ее репозитория (посты и комментарии - новые первыми,
+сообщества - по числу участников), сами группы ранжируются по качеству
+совпадения (точное выше совпадения по основам, оно выше исправленных
+опечаток), при равном - в порядке SEARCH_TYPES.
+"""
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.posts import PostModel
+from app.repositories.trigram_search import SEARCH_EXACT, SEARCH_FUZZY, SEARCH_PREFIX
+from app.services.base import BaseService
+
+SEARCH_TYPES = ("communities", "themes", "posts", "comments")
+MODE_RANK = {SEARCH_EXACT: 3, SEARCH_PREFIX: 2, SEARCH_FUZZY: 1}
+SNIPPET_LENGTH = 200
+
+
+def snippet(text: str | None) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH - 1].rstrip() + "…"
+
+
+class SearchService(BaseService):
+    """Поиск по всем типам содержимого с лимитом на каждый тип"""
+
+    def _repository(self, search_type: str):
+        return getattr(self.db, search_type)
+
+    async def search(self, query: str, limits: dict[str, int] | None = None) -> dict:
+        """
+        Группы результатов по типам. limits - число результатов каждого типа
+        (0 - тип не искать, нет в словаре - SEARCH_RESULTS_PER_TYPE).
+        """
+        query = " ".join(query.split())
+        limits = limits or {}
+        groups = []
+        if query:
+            for position, search_type in enumerate(SEARCH_TYPES):
+                limit = limits.get(search_type, settings.SEARCH_RESULTS_PER_TYPE)
+                if limit <= 0:
+                    continue
+                # Лишняя строка показывает, есть ли продолжение
+                models, found = await self._repository(search_type).search_models(query, 0, limit + 1)
+                if not models:
+                    continue
+                groups.append((MODE_RANK[found.mode], -position, {
+                    "type": search_type,
+                    "mode": found.mode,
+                    "query": found.query,
+                    "items": await self._items(search_type, models[:limit]),
+                    "has_more": len(models) > limit,
+                }))
+        groups.sort(key=lambda group: group[:2], reverse=True)
+        return {"query": query, "groups": [group for _, _, group in groups]}
+
+    async def _items(self, search_type: str, models: list) -> list[dict]:
+        if search_type == "communities":
+            return [
+                {"id": community.id, "name": community.name, "description": snippet(community.description),
+                 "members_count": community.members_count}
+                for community in models
+            ]
+        if search_type == "themes":
+            return [
+                {"id": theme.id, "name": theme.name, "posts_count": theme.posts_count}
+                for theme in models
+            ]
+        if search_type == "posts":
+            return [
+                {"id": post.id, "header": post.header, "body": snippet(post.body),
+                 "created_at": post.created_at}
+                for post in models
+            ]
+        # Комментарии - с заголовком поста, одним запросом на всю группу
+        headers = dict((await self.db.session.execute(
+            select(PostModel.id, PostModel.header).where(PostModel.id.in_({c.post_id for c in models}))
+        )).all())
+        return [
+            {"id": comment.id, "post_id": comment.post_id, "post_header": headers.get(comment.post_id),
+             "body": snippet(comment.body), "created_at": comment.created_at}
+            for comment in models
+        ]
@@ -0,0 +1,113 @@
+"""
+Подсказки при вводе поиска: названия сообществ, тем и заголовки популярных постов.
+
+Подсказки ищутся в памяти процесса (app.utils.prefix_index), без запроса к
+БД. Индекс строится при старте приложения, а дальше поддерживается
+событиями из шины (app.services.events): создание, переименование и
+удаление сообществ, тем и постов. В каждом воркере - свой индекс, события
+при Redis-шине доходят до всех воркеров.
+
+Постов в индексе не больше SUGGEST_MAX_POSTS - самые "горячие" на момент
+построения плюс новые; новый пост вытесняет пост с наименьшим весом. Вес -
+members_count для сообществ, posts_count для тем и hot_score для постов на
+момент построения (у новых постов - 0).
+"""
+import logging
+import time
+
+from sqlalchemy import desc, select
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.models.communities import CommunityModel
+from app.models.posts import PostModel
+from app.models.themes import ThemeModel
+from app.services.events import event_bus, TOPIC_COMMUNITIES, TOPIC_POSTS, TOPIC_THEMES
+from app.utils.prefix_index import PrefixIndex
+
+logger = logging.getLogger("app.suggest")
+
+KIND_COMMUNITY = 1
+KIND_THEME = 2
+KIND_POST = 3
+KIND_NAMES = {KIND_COMMUNITY: "communities", KIND_THEME: "themes", KIND_POST: "posts"}
+
+
+class SearchSuggestions:
+    """Индекс подсказок и обработчики событий, обновляющие его"""
+
+    def __init__(self, session_factory=async_session_maker, max_posts: int | None = None):
+        self.session_factory = session_factory
+        self.max_posts = max_posts or settings.SUGGEST_MAX_POSTS
+        self.index = PrefixIndex()
+        self.posts = 0
+
+    async def rebuild(self) -> None:
+        """Строит индекс заново из БД и подменяет текущий"""
+        started = time.perf_counter()
+        async with self.session_factory() as session:
+            communities = (await session.execute(
+                select(CommunityModel.id, CommunityModel.name, CommunityModel.members_count)
+            )).all()
+            themes = (await session.execute(
+                select(ThemeModel.id, ThemeModel.name, ThemeModel.posts_count)
+            )).all()
+            posts = (await session.execute(
+                select(PostModel.id, PostModel.header, PostModel.hot_score)
+                .order_by(desc(PostModel.hot_score), desc(PostModel.id))
+                .limit(self.max_posts)
+            )).all()
+        items = [(KIND_COMMUNITY, row[0], row[1], row[2] or 0) for row in communities]
+        items += [(KIND_THEME, row[0], row[1], row[2] or 0) for row in themes]
+        items += [(KIND_POST, row[0], row[1], row[2] or 0.0) for row in posts]
+        # Подмена одной ссылкой: запросы, идущие по старому индексу, не затрагиваются
+        self.index, self.posts = PrefixIndex(items), len(posts)
+        logger.info(
+            "Индекс подсказок: %d записей за %.0f ms", len(items), (time.perf_counter() - started) * 1000
+        )
+
+    def suggest(self, query: str, limit: int = 5) -> dict:
+        """Подсказки по началу слов, сгруппированные по типам, внутри типа - по весу"""
+        found = self.index.search(query, limit, settings.SUGGEST_SCAN_LIMIT)
+        return {
+            name: [{"id": item.item_id, "label": item.label} for item in found.get(kind, [])]
+            for kind, name in KIND_NAMES.items()
+        }
+
+    def on_community(self, event: dict) -> None:
+        community = event["community"]
+        if event["action"] == "deleted":
+            self.index.remove(KIND_COMMUNITY, community["id"])
+        else:
+            self.index.add(KIND_COMMUNITY, community["id"], community["name"], community.get("members_count") or 0)
+
+    def on_theme(self, event: dict) -> None:
+        theme = event["theme"]
+        if event["action"] == "deleted":
+            self.index.remove(KIND_THEME, theme["id"])
+        else:
+            self.index.add(KIND_THEME, theme["id"], theme["name"], theme.get("posts_count") or 0)
+
+    def on_post(self, event: dict) -> None:
+        post, action = event["post"], event.get("action")
+        key = (KIND_POST, post["id"])
+        if action == "deleted":
+            if self.index.remove(*key):
+                self.posts -= 1
+        elif action == "created" and key not in self.index:
+            # Новый пост вытесняет наименее "горячий"; его собственный вес пока 0
+            if self.posts >= self.max_posts and (lowest := self.index.lowest(KIND_POST)):
+                self.index.remove(KIND_POST, lowest[0])
+                self.posts -= 1
+            self.index.add(*key, post["header"], 0.0)
+            self.posts += 1
+        elif action == "updated" and "header" in post and (score := self.index.score(*key)) is not None:
+            # Переименованный пост остается в индексе с прежним весом
+            self.index.add(*key, post["header"], score)
+
+
+search_suggestions = SearchSuggestions()
+
+event_bus.subscribe(TOPIC_COMMUNITIES, search_suggestions.on_community)
+event_bus.subscribe(TOPIC_THEMES, search_suggestions.on_theme)
+event_bus.subscribe(TOPIC_POSTS, search_suggestions.on_post)
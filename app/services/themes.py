@@ -1,6 +1,7 @@
 from typing import List, Optional
 from app.models.themes import ThemeModel as Theme
 from app.schemes.themes import SThemeCreate, SThemeUpdate
+from app.services.events import event_bus, TOPIC_THEMES
 
 
 class ThemeService:
@@ -19,7 +20,9 @@ class ThemeService:
         """Создать новую тему"""
         theme_dict = theme_data.model_dump()
         theme_dict['posts_count'] = 0 # Новая тема не имеет постов
-        return await self.db.themes.add(theme_dict)
+        theme = await self.db.themes.add(theme_dict)
+        self._publish("created", theme)
+        return theme
 
     async def update_theme(self, theme_id: int, theme_data: SThemeUpdate) -> Optional[Theme]:
         """Обновить тему"""
@@ -31,7 +34,10 @@ class ThemeService:
         if update_data:
             await self.db.themes.edit(update_data, id=theme_id)
             
-        return await self.get_theme(theme_id)
+        theme = await self.get_theme(theme_id)
+        if 'name' in update_data:
+            self._publish("updated", theme)
+        return theme
 
     async def delete_theme(self, theme_id: int) -> bool:
         """Удалить тему"""
@@ -40,8 +46,14 @@ class ThemeService:
             return False
             
         await self.db.themes.delete(id=theme_id)
+        self._publish("deleted", theme)
         return True
 
+    def _publish(self, action: str, theme: Theme) -> None:
+        """Событие об изменении темы уходит в шину после коммита (подсказки поиска)"""
+        event = {"action": action, "theme": {"id": theme.id, "name": theme.name, "posts_count": theme.posts_count}}
+        self.db.on_commit(lambda: event_bus.publish(TOPIC_THEMES, event))
+
     async def get_theme_by_name(self, name: str) -> Optional[Theme]:
         """Получить тему по названию"""
         return await self.db.themes.get_by_name(name)
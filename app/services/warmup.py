@@ -0,0 +1,36 @@
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+
+from app.database.database import import_models
+from app.database.db_manager import DBManager
+from app.services.communities import CommunitiesService
+from app.services.posts import PostService
+from app.services.ranking import RankingService
+from app.services.stats import StatsService
+
+logger = logging.getLogger("app.warmup")
+
+
+def warm_up_mappers() -> None:
+    """Настройка всех мапперов SQLAlchemy заранее, а не на первом запросе"""
+    import_models()
+    configure_mappers()
+
+
+async def warm_up_queries() -> None:
+    """
+    Прогон типовых запросов главной страницы, ленты и сообществ: пул получает
+    первое соединение, а скомпилированные запросы попадают в кеш SQLAlchemy.
+    Прогрев не мешает запуску, если БД пустая или еще не создана (ошибка БД
+    пишется в лог); прочие ошибки - баги, и запуск на них падает.
+    """
+    try:
+        async with DBManager() as db:
+            await PostService(db).get_posts_for_web(limit=1)
+            await RankingService(db).get_ranked_posts(sort="hot", window="week", skip=0, limit=1)
+            await CommunitiesService(db).get_communities(skip=0, limit=1)
+            await StatsService(db).get_forum_stats()
+    except SQLAlchemyError:
+        logger.exception("Прогрев запросов пропущен")
@@ -1452,28 +1452,67 @@ function initSearch() {
     if (!searchInput) return;
     
     let searchTimeout;
+    let suggestTimeout;
+    const suggestionsList = document.getElementById('search-suggestions');
     
-    // Обработчик для поля ввода (поиск по мере ввода)
+    // Обработчик для поля ввода: по мере ввода - только подсказки из /api/search/suggest,
+    // полный поиск - по Enter, кнопке или выбору подсказки
     searchInput.addEventListener('input', function(e) {
         clearTimeout(searchTimeout);
+        clearTimeout(suggestTimeout);
         
         const searchTerm = e.target.value.trim();
-        console.log('Ввод поиска:', searchTerm); // Добавим лог для отладки
         
-        // Задержка в 300мс перед выполнением поиска
-        searchTimeout = setTimeout(() => {
-            if (searchTerm.length === 0) {
-                // Если поле пустое, показываем все посты
-                console.log('Сброс фильтров');
-                resetFilters();
-            } else {
-                // Выполняем поиск для любого запроса длиной 1 и более символов
-                console.log('Выполнение поиска:', searchTerm);
+        if (searchTerm.length === 0) {
+            // Если поле пустое, показываем все посты
+            searchTimeout = setTimeout(resetFilters, 300);
+            if (suggestionsList) suggestionsList.innerHTML = '';
+            return;
+        }
+        
+        // Выбранная подсказка ищется сразу
+        if (suggestionsList && Array.from(suggestionsList.options).some(option => option.value === searchTerm)) {
+            performSearch(searchTerm);
+            return;
+        }
+        
+        suggestTimeout = setTimeout(() => loadSuggestions(searchTerm), 150);
+    });
+    
+    searchInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            clearTimeout(suggestTimeout);
+            const searchTerm = searchInput.value.trim();
+            if (searchTerm.length > 0) {
                 performSearch(searchTerm);
+            } else {
+                resetFilters();
             }
-        }, 300);
+        }
     });
     
+    // Подсказки: названия сообществ и тем, заголовки популярных постов
+    async function loadSuggestions(searchTerm) {
+        if (!suggestionsList) return;
+        try {
+            const response = await fetch(`/api/search/suggest?query=${encodeURIComponent(searchTerm)}`);
+            if (!response.ok) return;
+            const data = await response.json();
+            // Ответ на устаревший запрос не показываем
+            if (searchInput.value.trim() !== searchTerm) return;
+            const labels = [...data.communities, ...data.themes, ...data.posts].map(item => item.label);
+            suggestionsList.innerHTML = '';
+            [...new Set(labels)].forEach(label => {
+                const option = document.createElement('option');
+                option.value = label;
+                suggestionsList.appendChild(option);
+            });
+        } catch (error) {
+            console.error('Ошибка загрузки подсказок:', error);
+        }
+    }
+    
     // Обработчик для кнопки поиска
     if (searchButton) {
         searchButton.addEventListener('click', function() {
@@ -0,0 +1,278 @@
+"""
+Массовый импорт и экспорт данных форума в NDJSON/CSV.
+
+Примеры:
+    python -m app.tools.bulk export posts -o posts.ndjson
+    python -m app.tools.bulk export users -o users.csv --format csv
+    python -m app.tools.bulk import posts -i posts.ndjson --batch-size 5000
+    python -m app.tools.bulk import comments -i comments.csv --rebuild-indexes
+
+Файлы читаются и пишутся построчно, вставка идет пачками через executemany
+внутри транзакций по несколько пачек, поэтому память не зависит от размера файла.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import Table, select, text
+
+from app.database.database import Base, engine, import_models
+from app.models.search_index import TRIGRAM_INDEXES, TrigramIndex
+from app.utils.ndjson import to_json_value
+
+
+ENTITIES = ("users", "communities", "posts", "comments")
+
+
+def get_table(entity: str) -> Table:
+    """Таблица SQLAlchemy для сущности"""
+    import_models()
+    return Base.metadata.tables[entity]
+
+
+def _converter(column):
+    """Функция приведения строкового значения (CSV/ISO-даты) к типу колонки"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+
+    def convert(value):
+        # В CSV NULL и пустая строка неразличимы: пустое значение nullable-колонки - NULL
+        if value is None or (value == "" and (python_type is not str or column.nullable)):
+            return None
+        if isinstance(value, python_type):
+            return value
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is bool:
+            return str(value).lower() in ("1", "true", "yes")
+        return python_type(value)
+
+    return convert
+
+
+class Progress:
+    """Печать прогресса и скорости обработки в stderr"""
+
+    def __init__(self, label: str, every: int = 50_000):
+        self.label = label
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+        self._next_report = every
+
+    def add(self, count: int) -> None:
+        self.count += count
+        if self.count >= self._next_report:
+            self._report()
+            self._next_report = self.count + self.every
+
+    def _report(self, final: bool = False) -> None:
+        elapsed = time.perf_counter() - self.started
+        rate = self.count / elapsed if elapsed else 0
+        prefix = "Готово" if final else "..."
+        print(
+            f"{prefix} {self.label}: {self.count} строк за {elapsed:.1f} с ({rate:,.0f} строк/с)",
+            file=sys.stderr,
+        )
+
+    def finish(self) -> None:
+        self._report(final=True)
+
+
+def read_rows(stream: Iterable[str], fmt: str) -> Iterator[dict]:
+    """Построчное чтение NDJSON или CSV"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def stream_table(entity: str, batch_size: int = 5000) -> AsyncIterator[dict]:
+    """Потоковое чтение таблицы по первичному ключу без загрузки всей таблицы"""
+    table = get_table(entity)
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            select(table).order_by(*table.primary_key.columns).execution_options(yield_per=batch_size)
+        )
+        async for row in result.mappings():
+            yield dict(row)
+
+
+async def export_entity(entity: str, output, fmt: str, batch_size: int = 5000) -> int:
+    table = get_table(entity)
+    progress = Progress(f"экспорт {entity}")
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(output, fieldnames=[column.name for column in table.columns])
+        writer.writeheader()
+    async for row in stream_table(entity, batch_size):
+        row = {key: to_json_value(value) for key, value in row.items()}
+        if writer:
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+        progress.add(1)
+    progress.finish()
+    return progress.count
+
+
+async def _drop_secondary_indexes(conn, table: Table) -> list:
+    """
+    Удаление неуникальных индексов перед загрузкой (уникальные нужны для проверки данных)
+    и триггеров полнотекстовых индексов таблицы: без них строки не индексируются по одной
+    """
+    dropped = [index for index in table.indexes if not index.unique]
+    for index in dropped:
+        await conn.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+    for trigram_index in TRIGRAM_INDEXES:
+        if trigram_index.table == table.name:
+            for statement in trigram_index.drop_trigger_statements():
+                await conn.execute(text(statement))
+            dropped.append(trigram_index)
+    return dropped
+
+
+async def _rebuild_indexes(conn, indexes: list) -> None:
+    for index in indexes:
+        if isinstance(index, TrigramIndex):
+            # Триггеры возвращаются, а индекс FTS5 пересобирается по таблице целиком
+            for statement in index.trigger_statements():
+                await conn.execute(text(statement))
+            await conn.execute(text(index.rebuild_statement()))
+        else:
+            await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+
+
+async def import_entity(
+    entity: str,
+    rows: Iterable[dict],
+    batch_size: int = 5000,
+    batches_per_commit: int = 10,
+    rebuild_indexes: bool = False,
+) -> int:
+    """
+    Загрузка строк в таблицу пачками по batch_size (executemany),
+    с фиксацией транзакции каждые batches_per_commit пачек.
+    """
+    table = get_table(entity)
+    converters = {column.name: _converter(column) for column in table.columns}
+    progress = Progress(f"импорт {entity}")
+    statement = table.insert()
+
+    dropped = []
+    if rebuild_indexes:
+        async with engine.begin() as conn:
+            dropped = await _drop_secondary_indexes(conn, table)
+
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            pending = 0
+            for chunk in chunked(rows, batch_size):
+                values = [
+                    {key: converters[key](value) for key, value in row.items() if key in converters}
+                    for row in chunk
+                ]
+                await conn.execute(statement, values)
+                progress.add(len(values))
+                pending += 1
+                if pending >= batches_per_commit:
+                    await transaction.commit()
+                    transaction = await conn.begin()
+                    pending = 0
+            await transaction.commit()
+    finally:
+        # Индексы восстанавливаются и при ошибке загрузки
+        if dropped:
+            started = time.perf_counter()
+            async with engine.begin() as index_conn:
+                await _rebuild_indexes(index_conn, dropped)
+            print(f"Индексы {entity} перестроены за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+
+    progress.finish()
+    return progress.count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.bulk", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Выгрузка таблицы")
+    export_parser.add_argument("entity", choices=ENTITIES)
+    export_parser.add_argument("-o", "--output", default="-", help="Файл (по умолчанию stdout)")
+    export_parser.add_argument("--format", choices=("ndjson", "csv"), default=None)
+    export_parser.add_argument("--batch-size", type=int, default=5000)
+
+    import_parser = subparsers.add_parser("import", help="Загрузка таблицы")
+    import_parser.add_argument("entity", choices=ENTITIES)
+    import_parser.add_argument("-i", "--input", default="-", help="Файл (по умолчанию stdin)")
+    import_parser.add_argument("--format", choices=("ndjson", "csv"), default=None)
+    import_parser.add_argument("--batch-size", type=int, default=5000)
+    import_parser.add_argument("--batches-per-commit", type=int, default=10)
+    import_parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="Удалить неуникальные индексы и триггеры полнотекстового поиска на время загрузки и перестроить после",
+    )
+    return parser
+
+
+def _detect_format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.endswith(".csv") else "ndjson"
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command == "export":
+        fmt = _detect_format(args.output, args.format)
+        if args.output == "-":
+            await export_entity(args.entity, sys.stdout, fmt, args.batch_size)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as output:
+                await export_entity(args.entity, output, fmt, args.batch_size)
+    else:
+        fmt = _detect_format(args.input, args.format)
+        if args.input == "-":
+            stream = sys.stdin
+        else:
+            stream = open(args.input, encoding="utf-8", newline="")
+        try:
+            await import_entity(
+                args.entity,
+                read_rows(stream, fmt),
+                batch_size=args.batch_size,
+                batches_per_commit=args.batches_per_commit,
+                rebuild_indexes=args.rebuild_indexes,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+"""
+Полный пересчет похожих обсуждений: частоты слов, TF-IDF-векторы и соседи всех постов.
+
+    python -m app.tools.related --batch-size 5000
+
+Новые посты индексируются приложением сами; пересчет нужен после миграции и
+периодически (например, раз в сутки), чтобы веса старых постов учитывали
+актуальные частоты слов. Посты, созданные во время пересчета, получают
+неточные веса до следующего запуска.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.database.database import engine
+from app.services.related_posts import rebuild_related_posts
+
+
+async def main(batch_size: int) -> None:
+    started = time.perf_counter()
+
+    def progress(count: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"... соседи для {count} постов за {elapsed:.1f} с", file=sys.stderr)
+
+    total = await rebuild_related_posts(batch_size=batch_size, progress=progress)
+    print(f"Готово: {total} постов за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,308 @@
+"""
+Запуск приложения в нескольких воркерах.
+
+Примеры:
+    python -m app.tools.serve
+    python -m app.tools.serve --workers 4 --preload
+    python -m app.tools.serve --host 0.0.0.0 --port 8000 --graceful-timeout 30
+
+Мастер-процесс один раз готовит БД (WAL), открывает сокет и запускает воркеров
+через fork, все воркеры принимают соединения с общего сокета. Фоновые задачи
+(пересчет рейтинга) работают только в воркере 0.
+
+Сигналы мастеру:
+    SIGTERM/SIGINT - плавная остановка: воркеры перестают принимать соединения
+                     и дорабатывают текущие запросы (не дольше --graceful-timeout)
+    SIGHUP         - поочередный перезапуск воркеров без простоя; без --preload
+                     воркеры заново импортируют код приложения
+Упавший воркер перезапускается автоматически: первый раз сразу, при повторных
+падениях - с паузой, которая растет вдвое от RESPAWN_DELAY до RESPAWN_MAX_DELAY
+секунд и сбрасывается, если воркер проработал RESPAWN_RESET_SECONDS.
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+
+APP_MODULE = "main"
+APP_IMPORT_STRING = "main:app"
+
+RESPAWN_DELAY = 0.5
+RESPAWN_MAX_DELAY = 30.0
+RESPAWN_RESET_SECONDS = 60.0
+
+
+def default_workers() -> int:
+    return int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+
+
+def import_app():
+    return importlib.import_module(APP_MODULE).app
+
+
+def respawn_delay(failures: int) -> float:
+    """Пауза перед перезапуском после failures падений подряд: первый - сразу, дальше вдвое дольше"""
+    if failures <= 1:
+        return 0.0
+    return min(RESPAWN_DELAY * 2 ** (failures - 2), RESPAWN_MAX_DELAY)
+
+
+def prepare_database() -> None:
+    from app.database.database import prepare_database as prepare
+    asyncio.run(prepare())
+
+
+class Arbiter:
+    """Мастер-процесс: запускает воркеров, следит за ними и передает им сигналы"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        preload: bool = False,
+        graceful_timeout: int = 30,
+        log_level: str = "info",
+        access_log: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.preload = preload
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.access_log = access_log
+        self.app = None
+        self.sock: socket.socket | None = None
+        self.children: dict[int, int] = {}  # pid -> номер воркера
+        self.started_at: dict[int, float] = {}  # номер воркера -> время запуска
+        self.failures: dict[int, int] = {}  # номер воркера -> падений подряд
+        self.respawn_at: dict[int, float] = {}  # номер воркера -> когда перезапустить
+        self.stopping = False
+        self.reload_requested = False
+
+    def log(self, message: str) -> None:
+        print(f"[master {os.getpid()}] {message}", file=sys.stderr, flush=True)
+
+    def run(self) -> None:
+        # Подготовка БД в отдельном процессе, чтобы мастер без --preload не держал модули приложения
+        self._run_in_child(prepare_database)
+        self.sock = self._bind()
+        if self.preload:
+            self.app = import_app()
+            self.log("Приложение загружено в мастер-процессе (--preload)")
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for index in range(self.workers):
+            self._spawn(index)
+        self.log(f"Слушаю http://{self.host}:{self.port}, воркеров: {self.workers}")
+
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload_requested = False
+                self._reload()
+            self._reap(respawn=True)
+            self._respawn_due()
+            time.sleep(0.2)
+        self._shutdown()
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _run_in_child(self, func) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                func()
+            except Exception as e:
+                print(f"Ошибка подготовки: {e}", file=sys.stderr)
+                code = 1
+            os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise SystemExit("Не удалось подготовить базу данных")
+
+    def _spawn(self, index: int, wait_ready: bool = False) -> int:
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            self._worker(index, ready_write)
+        os.close(ready_write)
+        self.children[pid] = index
+        self.started_at[index] = time.monotonic()
+        if wait_ready:
+            # Ждем, пока воркер выполнит lifespan-хуки и начнет принимать соединения
+            select.select([ready_read], [], [], self.graceful_timeout)
+        os.close(ready_read)
+        return pid
+
+    def _worker(self, index: int, ready_fd: int) -> None:
+        # Своя группа процессов: Ctrl+C в терминале получает только мастер и рассылает SIGTERM сам
+        os.setpgid(0, 0)
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        code = 0
+        try:
+            import uvicorn
+            from app.config import settings
+
+            app = self.app or import_app()
+            settings.RUN_BACKGROUND_TASKS = index == 0
+            config = uvicorn.Config(
+                app,
+                lifespan="on",
+                log_level=self.log_level,
+                access_log=self.access_log,
+                timeout_graceful_shutdown=self.graceful_timeout,
+            )
+            asyncio.run(self._serve(uvicorn.Server(config), ready_fd))
+        except Exception as e:
+            print(f"[worker {os.getpid()}] {e}", file=sys.stderr, flush=True)
+            code = 1
+        finally:
+            os._exit(code)
+
+    async def _serve(self, server, ready_fd: int) -> None:
+        task = asyncio.create_task(server.serve(sockets=[self.sock]))
+        while not server.started and not task.done():
+            await asyncio.sleep(0.05)
+        try:
+            os.write(ready_fd, b"1")
+        except OSError:
+            pass  # мастер не ждет готовности этого воркера
+        os.close(ready_fd)
+        await task
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self.reload_requested = True
+
+    def _reap(self, respawn: bool) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            index = self.children.pop(pid, None)
+            if index is None:
+                continue
+            if respawn and not self.stopping:
+                now = time.monotonic()
+                if now - self.started_at.get(index, now) >= RESPAWN_RESET_SECONDS:
+                    self.failures[index] = 0
+                self.failures[index] = self.failures.get(index, 0) + 1
+                delay = respawn_delay(self.failures[index])
+                self.log(
+                    f"Воркер {index} (pid {pid}) завершился с кодом {os.waitstatus_to_exitcode(status)}, "
+                    f"перезапуск через {delay:.1f} с"
+                )
+                self.respawn_at[index] = now + delay
+
+    def _respawn_due(self) -> None:
+        """Запускает упавших воркеров, у которых истекла пауза перед перезапуском"""
+        if self.stopping:
+            return
+        now = time.monotonic()
+        for index, due in list(self.respawn_at.items()):
+            if due <= now:
+                del self.respawn_at[index]
+                self._spawn(index)
+
+    def _reload(self) -> None:
+        """Поочередно: новый воркер стартует на общем сокете, затем старый плавно останавливается"""
+        self.log("Перезапуск воркеров")
+        for old_pid, index in list(self.children.items()):
+            self.children.pop(old_pid)
+            self._spawn(index, wait_ready=True)
+            os.kill(old_pid, signal.SIGTERM)
+            try:
+                os.waitpid(old_pid, 0)
+            except ChildProcessError:
+                pass
+
+    def _shutdown(self) -> None:
+        self.log("Плавная остановка воркеров")
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            self._reap(respawn=False)
+            time.sleep(0.1)
+        for pid in self.children:
+            self.log(f"Воркер pid {pid} не успел остановиться, SIGKILL")
+            os.kill(pid, signal.SIGKILL)
+        self.sock.close()
+        self.log("Остановлен")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Запуск форума в нескольких воркерах",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Число воркеров (по умолчанию WEB_CONCURRENCY или число ядер)")
+    parser.add_argument("--preload", action="store_true",
+                        help="Загрузить приложение в мастере до запуска воркеров (общая память при fork)")
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="Сколько секунд воркер дорабатывает текущие запросы при остановке")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    if not hasattr(os, "fork"):
+        # Windows: без fork используем встроенный менеджер процессов uvicorn
+        import uvicorn
+        prepare_database()
+        uvicorn.run(
+            APP_IMPORT_STRING,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level=args.log_level,
+            access_log=not args.no_access_log,
+            timeout_graceful_shutdown=args.graceful_timeout,
+        )
+        return
+    Arbiter(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        preload=args.preload,
+        graceful_timeout=args.graceful_timeout,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Пересчет MinHash-подписей и индекса LSH для постов без подписи.
+
+    python -m app.tools.signatures --batch-size 5000
+
+Можно запускать на работающей базе: посты, созданные во время пересчета,
+подписываются приложением сами, а уже подписанные пропускаются.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.database.database import engine
+from app.services.duplicates import backfill_signatures
+
+
+async def main(batch_size: int) -> None:
+    started = time.perf_counter()
+
+    def progress(count: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"... подписано {count} постов за {elapsed:.1f} с ({count / elapsed:,.0f} постов/с)", file=sys.stderr)
+
+    total = await backfill_signatures(batch_size=batch_size, progress=progress)
+    print(f"Готово: {total} постов за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,129 @@
+"""
+Поиск множества фраз в тексте за один проход (автомат Ахо-Корасик).
+
+Автомат строится один раз по списку фраз; проверка текста линейна по его
+длине плюс числу найденных вхождений и не зависит от числа фраз - в отличие от
+цикла по фразам или регулярного выражения с тысячами альтернатив.
+
+Текст и фразы приводятся к одному виду (normalize): нижний регистр, "ё" -> "е"
+и замена похожих латинских букв и цифр на кириллические ("cпaм", "CПAM" и
+"спам" совпадают). Замена посимвольная, поэтому позиции совпадений в
+нормализованном тексте совпадают с позициями в исходном.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# Латиница и цифры, которыми подменяют похожие кириллические буквы
+HOMOGLYPHS = {
+    "a": "а", "b": "в", "c": "с", "e": "е", "h": "н", "k": "к", "m": "м",
+    "o": "о", "p": "р", "t": "т", "x": "х", "y": "у",
+    "ё": "е", "0": "о", "3": "з", "4": "ч", "6": "б", "@": "а",
+}
+_TRANSLATION = str.maketrans(HOMOGLYPHS)
+
+# Суффикс фразы в списке: совпадение по началу слова ("спам*" найдет "спамеры")
+PREFIX_MARK = "*"
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр и замена похожих символов без изменения длины строки"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Редкие символы, у которых нижний регистр длиннее (например, "İ"), оставляем как есть
+        lowered = "".join(ch if len(low := ch.lower()) != 1 else low for ch in text)
+    return lowered.translate(_TRANSLATION)
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    phrase: str  # фраза из списка в исходном написании
+    start: int
+    end: int
+
+
+class AhoCorasick:
+    """Автомат для поиска всех вхождений набора фраз"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: list[str] = []
+        # Для каждой фразы: нормализованная длина и нужно ли совпадение по целому слову справа
+        self._lengths: list[int] = []
+        self._whole_word: list[bool] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._output: list[list[int]] = [[]]
+
+        for phrase in phrases:
+            self._add(phrase)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def _add(self, phrase: str) -> None:
+        whole_word = not phrase.endswith(PREFIX_MARK)
+        key = normalize(phrase.rstrip(PREFIX_MARK).strip())
+        if not key:
+            return
+        state = 0
+        for ch in key:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.phrases))
+        self.phrases.append(phrase)
+        self._lengths.append(len(key))
+        self._whole_word.append(whole_word)
+
+    def _build_links(self) -> None:
+        """Ссылки неудач и ссылки на ближайшее состояние с выходом (обход в ширину)"""
+        self._fail = [0] * len(self._goto)
+        self._output_link = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = fail
+                self._output_link[next_state] = fail if self._output[fail] else self._output_link[fail]
+                queue.append(next_state)
+
+    def iter_matches(self, text: str, whole_words: bool = True) -> Iterator[PhraseMatch]:
+        """
+        Все вхождения фраз в текст. С whole_words фраза должна стоять отдельным
+        словом (а фраза со "*" - в начале слова): "бан" не найдется в "банк".
+        """
+        normalized = normalize(text)
+        goto, fail, output, output_link = self._goto, self._fail, self._output, self._output_link
+        size = len(normalized)
+        state = 0
+        for end, ch in enumerate(normalized, start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            found = state if output[state] else output_link[state]
+            while found:
+                for index in output[found]:
+                    start = end - self._lengths[index]
+                    if whole_words and not self._at_word_boundary(normalized, start, end, size, index):
+                        continue
+                    yield PhraseMatch(self.phrases[index], start, end)
+                found = output_link[found]
+
+    def _at_word_boundary(self, text: str, start: int, end: int, size: int, index: int) -> bool:
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if self._whole_word[index] and end < size and text[end].isalnum():
+            return False
+        return True
+
+    def find(self, text: str, whole_words: bool = True) -> list[PhraseMatch]:
+        return list(self.iter_matches(text, whole_words))
+
+    def contains_any(self, text: str, whole_words: bool = True) -> bool:
+        return next(self.iter_matches(text, whole_words), None) is not None
@@ -0,0 +1,107 @@
+"""
+MinHash-подписи текстов и ключи LSH для поиска почти одинаковых постов.
+
+Текст разбивается на шинглы (тройки соседних слов после normalize), оценка
+сходства двух подписей приближает коэффициент Жаккара их множеств шинглов.
+
+Подпись строится одной перестановкой (one permutation hashing): каждый шингл
+хешируется один раз, старшие биты хеша выбирают ячейку, в ячейке остается
+минимум. Классический вариант с SIGNATURE_SIZE независимыми хеш-функциями
+требует SIGNATURE_SIZE хешей на шингл; здесь - один, что и делает пакетный
+пересчет тысяч постов дешевым без numpy. Пустые ячейки заполняются из
+ближайшей непустой справа (densification), чтобы оценка оставалась
+несмещенной и для коротких текстов.
+
+LSH: подпись делится на LSH_BANDS полос по LSH_ROWS значений, хеш полосы -
+ключ корзины. Посты с общей корзиной хотя бы в одной полосе - кандидаты, их
+сходство проверяется по подписям. При 16 x 4 пара со сходством 0.8 становится
+кандидатом с вероятностью ~0.9998, со сходством 0.3 - ~0.12.
+"""
+import hashlib
+import re
+import struct
+from typing import Iterable
+
+from app.utils.aho_corasick import normalize
+
+SIGNATURE_SIZE = 64
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+SHINGLE_WORDS = 3
+
+_HASH_BITS = 64
+_BIN_BITS = SIGNATURE_SIZE.bit_length() - 1  # SIGNATURE_SIZE - степень двойки
+_VALUE_MASK = (1 << (_HASH_BITS - _BIN_BITS)) - 1
+_EMPTY = _VALUE_MASK + 1
+_PACK = struct.Struct(f"<{SIGNATURE_SIZE}Q")
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def shingles(text: str) -> set[str]:
+    """Тройки соседних слов; короткий текст - одним шинглом"""
+    words = _WORD_RE.findall(normalize(text))
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def signature(text: str) -> list[int] | None:
+    """MinHash-подпись текста (None для текста без слов)"""
+    items = shingles(text)
+    if not items:
+        return None
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    shift = _HASH_BITS - _BIN_BITS
+    for item in items:
+        value = _hash64(item)
+        index = value >> shift
+        value &= _VALUE_MASK
+        if value < bins[index]:
+            bins[index] = value
+
+    # Densification: пустая ячейка берет значение ближайшей непустой справа (по кругу)
+    # со сдвигом на расстояние, чтобы совпадение таких ячеек у двух текстов не было случайным
+    if _EMPTY in bins:
+        filled = bins[:]
+        for index in range(SIGNATURE_SIZE):
+            if bins[index] != _EMPTY:
+                continue
+            distance = 1
+            while bins[(index + distance) % SIGNATURE_SIZE] == _EMPTY:
+                distance += 1
+            filled[index] = (bins[(index + distance) % SIGNATURE_SIZE] + distance * 0x9E3779B97F4A7C15) & _VALUE_MASK
+        bins = filled
+    return bins
+
+
+def similarity(first: list[int], second: list[int]) -> float:
+    """Оценка коэффициента Жаккара по двум подписям"""
+    return sum(a == b for a, b in zip(first, second)) / SIGNATURE_SIZE
+
+
+def band_keys(sig: list[int]) -> list[int]:
+    """Ключи корзин LSH по полосам (знаковые 64-битные, как INTEGER в SQLite)"""
+    keys = []
+    for band in range(LSH_BANDS):
+        chunk = sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{LSH_ROWS}Q", *chunk), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def pack(sig: Iterable[int]) -> bytes:
+    return _PACK.pack(*sig)
+
+
+def unpack(data: bytes) -> list[int]:
+    return list(_PACK.unpack(data))
+
+
+def post_text(header: str | None, body: str | None) -> str:
+    """Текст поста для подписи: заголовок и содержание"""
+    return f"{header or ''}\n{body or ''}"
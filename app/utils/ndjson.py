@@ -0,0 +1,21 @@
+import enum
+import json
+from datetime import date, datetime
+from typing import Any
+
+
+def to_json_value(value: Any) -> Any:
+    """Приведение значения колонки к типу, который понимает json"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def dumps_line(row: dict) -> str:
+    """Одна строка NDJSON (с переводом строки в конце)"""
+    return json.dumps(
+        {key: to_json_value(value) for key, value in row.items()},
+        ensure_ascii=False
+    ) + "\n"
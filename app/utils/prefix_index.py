@@ -0,0 +1,188 @@
+"""
+Индекс строк по началу слова для подсказок при вводе поиска.
+
+Для каждой записи хранится одна нормализованная строка ("северный район"), а
+ключи - позиции начала ее слов ("северный район", "район"): ссылка (номер
+записи, смещение) упакована в одно число массива array("Q"), отсортированного
+по тексту с этой позиции. Поиск - bisect по префиксу и просмотр соседних
+ссылок, пока текст с них начинается с префикса. Сами записи (тип, id, вес) -
+тоже в массивах array по номеру записи: на слово приходится 8 байт, а не
+отдельная строка.
+
+Добавление и удаление записи - вставка и удаление в отсортированном массиве
+(сдвиг памяти за O(n), но без Python-циклов), так что индекс поддерживается
+событиями записи без пересборки. Номера удаленных записей используются
+повторно. Для вытеснения записи с наименьшим весом по каждому типу ведется
+куча (вес, id): удаленные и перевзвешенные записи остаются в ней до тех пор,
+пока не окажутся на вершине, а при разрастании куча пересобирается.
+"""
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, NamedTuple
+
+from app.utils.aho_corasick import normalize
+
+# Сколько начальных слов строки становятся ключами, длина сравниваемой части и всей строки
+MAX_KEY_WORDS = 8
+MAX_KEY_LENGTH = 64
+MAX_TEXT_LENGTH = 1000
+
+_WORD_RE = re.compile(r"\w+")
+_OFFSET_BITS = 16
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+
+class Suggestion(NamedTuple):
+    kind: int
+    item_id: int
+    label: str
+    score: float
+
+
+def normalize_key(text: str) -> str:
+    """Нижний регистр, "ё" -> "е", слова через один пробел без знаков препинания"""
+    return " ".join(_WORD_RE.findall(normalize(text)))
+
+
+def _item_key(kind: int, item_id: int) -> int:
+    return item_id << 8 | kind
+
+
+def word_offsets(key: str) -> list[int]:
+    """Позиции начала первых MAX_KEY_WORDS слов нормализованной строки"""
+    if not key:
+        return []
+    return ([0] + [match.end() for match in re.finditer(" ", key)])[:MAX_KEY_WORDS]
+
+
+class PrefixIndex:
+    """Записи (kind, item_id) с подписью и весом, поиск по началу любого из первых слов подписи"""
+
+    def __init__(self, items: Iterable[tuple[int, int, str, float]] = ()):
+        self._refs = array("Q")
+        self._texts: list[str | None] = []
+        self._kinds = array("B")
+        self._ids = array("q")
+        self._scores = array("d")
+        self._labels: list[str | None] = []
+        # (kind, item_id) -> номер записи; ключ - одно число, а не кортеж
+        self._slots: dict[int, int] = {}
+        self._free: list[int] = []
+        # kind -> куча (вес, item_id); записи проверяются по _slots при извлечении
+        self._heaps: dict[int, list[tuple[float, int]]] = {}
+
+        # Начальное заполнение - одной сортировкой, а не вставками по одной
+        refs = []
+        for kind, item_id, label, score in items:
+            slot = self._new_slot(kind, item_id, label, score)
+            refs.extend(slot << _OFFSET_BITS | offset for offset in word_offsets(self._texts[slot]))
+        refs.sort(key=self._ref_key)
+        self._refs = array("Q", refs)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, item: tuple[int, int]) -> bool:
+        return _item_key(*item) in self._slots
+
+    def _ref_key(self, ref: int) -> str:
+        offset = ref & _OFFSET_MASK
+        return self._texts[ref >> _OFFSET_BITS][offset:offset + MAX_KEY_LENGTH]
+
+    def _new_slot(self, kind: int, item_id: int, label: str, score: float) -> int:
+        self.remove(kind, item_id)
+        text = normalize_key(label)[:MAX_TEXT_LENGTH]
+        if self._free:
+            slot = self._free.pop()
+            self._kinds[slot], self._ids[slot], self._scores[slot] = kind, item_id, score
+            self._labels[slot], self._texts[slot] = label, text
+        else:
+            slot = len(self._labels)
+            self._kinds.append(kind)
+            self._ids.append(item_id)
+            self._scores.append(score)
+            self._labels.append(label)
+            self._texts.append(text)
+        self._slots[_item_key(kind, item_id)] = slot
+        heap = self._heaps.setdefault(kind, [])
+        heapq.heappush(heap, (score, item_id))
+        if len(heap) > 2 * len(self._slots) + 64:
+            self._rebuild_heap(kind)
+        return slot
+
+    def _rebuild_heap(self, kind: int) -> None:
+        """Куча без устаревших элементов - за O(n), амортизированно по добавлениям"""
+        heap = [
+            (self._scores[slot], self._ids[slot]) for slot in self._slots.values() if self._kinds[slot] == kind
+        ]
+        heapq.heapify(heap)
+        self._heaps[kind] = heap
+
+    def _is_current(self, kind: int, score: float, item_id: int) -> bool:
+        slot = self._slots.get(_item_key(kind, item_id))
+        return slot is not None and self._scores[slot] == score
+
+    def add(self, kind: int, item_id: int, label: str, score: float = 0.0) -> None:
+        """Добавляет запись или заменяет прежнюю с тем же (kind, item_id)"""
+        slot = self._new_slot(kind, item_id, label, score)
+        for offset in word_offsets(self._texts[slot]):
+            ref = slot << _OFFSET_BITS | offset
+            self._refs.insert(bisect_right(self._refs, self._ref_key(ref), key=self._ref_key), ref)
+
+    def score(self, kind: int, item_id: int) -> float | None:
+        slot = self._slots.get(_item_key(kind, item_id))
+        return None if slot is None else self._scores[slot]
+
+    def remove(self, kind: int, item_id: int) -> bool:
+        slot = self._slots.pop(_item_key(kind, item_id), None)
+        if slot is None:
+            return False
+        for offset in word_offsets(self._texts[slot]):
+            ref = slot << _OFFSET_BITS | offset
+            position = bisect_left(self._refs, self._ref_key(ref), key=self._ref_key)
+            while self._refs[position] != ref:
+                position += 1
+            del self._refs[position]
+        self._labels[slot] = self._texts[slot] = None
+        self._free.append(slot)
+        return True
+
+    def lowest(self, kind: int) -> tuple[int, float] | None:
+        """Запись типа kind с наименьшим весом (для вытеснения при переполнении)"""
+        heap = self._heaps.get(kind)
+        while heap:
+            score, item_id = heap[0]
+            if self._is_current(kind, score, item_id):
+                return item_id, score
+            heapq.heappop(heap)
+        return None
+
+    def search(self, prefix: str, limit: int = 10, scan_limit: int = 2000) -> dict[int, list[Suggestion]]:
+        """
+        До limit записей каждого типа, у которых одно из первых слов подписи
+        начинается с prefix (для нескольких слов - подряд), по убыванию веса.
+        Просматривается не больше scan_limit ключей: короткий префикс с
+        десятками тысяч совпадений не замедляет ответ.
+        """
+        prefix = normalize_key(prefix)[:MAX_KEY_LENGTH]
+        if not prefix:
+            return {}
+        refs = self._refs
+        start = bisect_left(refs, prefix, key=self._ref_key)
+        end = min(bisect_left(refs, prefix + "\U0010ffff", start, key=self._ref_key), start + scan_limit)
+        # Сортировка по весу с ключом-методом массива идет без Python-кода на каждый элемент
+        scores, kinds = self._scores, self._kinds
+        ranked = sorted({ref >> _OFFSET_BITS for ref in refs[start:end]}, key=scores.__getitem__, reverse=True)
+        wanted = len(set(map(kinds.__getitem__, ranked))) * limit
+        found: dict[int, list[Suggestion]] = {}
+        taken = 0
+        for slot in ranked:
+            bucket = found.setdefault(kinds[slot], [])
+            if len(bucket) < limit:
+                bucket.append(Suggestion(kinds[slot], self._ids[slot], self._labels[slot], scores[slot]))
+                taken += 1
+                if taken == wanted:
+                    break
+        return found
@@ -0,0 +1,69 @@
+import math
+from datetime import datetime
+
+
+# Параметры формулы "горячести" поста
+HOT_GRAVITY = 1.5          # скорость затухания со временем
+HOT_AGE_OFFSET_HOURS = 2.0  # смещение, чтобы свежие посты не получали бесконечный вес
+COMMENT_WEIGHT = 2.0       # комментарий весит как два лайка
+DISLIKE_WEIGHT = 1.0
+
+# Параметры приоритета очереди модерации
+MODERATION_REPUTATION_PER_REPORT = 100  # суммарная репутация жалующихся, равная весу одной жалобы
+MODERATION_AGE_DOUBLING_HOURS = 6.0     # ожидание, равноценное удвоению числа жалоб
+MODERATION_EPOCH = datetime(2020, 1, 1)
+
+# Окна выборки для сортировок hot/top (в днях)
+RANKING_WINDOWS = {
+    "day": 1,
+    "week": 7,
+    "month": 30,
+    "all": None,
+}
+
+
+def calculate_hot_score(
+    likes: int | None,
+    dislikes: int | None,
+    comments_count: int | None,
+    created_at: datetime | None,
+    now: datetime | None = None
+) -> float:
+    """
+    Вычисляет "горячесть" поста с затуханием по времени.
+
+    Очки = лайки - дизлайки + вес комментариев, делённые на (возраст в часах + смещение)^gravity.
+    Деление на возраст даёт скорость набора реакций и комментариев, поэтому
+    старые посты постепенно опускаются, даже если у них много лайков.
+    """
+    now = now or datetime.utcnow()
+    points = (
+        (likes or 0)
+        - DISLIKE_WEIGHT * (dislikes or 0)
+        + COMMENT_WEIGHT * (comments_count or 0)
+    )
+    if created_at is None:
+        age_hours = 0.0
+    else:
+        age_hours = max((now - created_at).total_seconds() / 3600, 0.0)
+    return points / (age_hours + HOT_AGE_OFFSET_HOURS) ** HOT_GRAVITY
+
+
+def calculate_moderation_priority(
+    pending_count: int,
+    reporters_reputation: int | None,
+    first_pending_at: datetime
+) -> float:
+    """
+    Вычисляет приоритет группы открытых жалоб на один контент.
+
+    Приоритет = log2(вес) + возраст / MODERATION_AGE_DOUBLING_HOURS, где вес -
+    число жалоб плюс репутация жалующихся. Удвоение веса равноценно ожиданию
+    MODERATION_AGE_DOUBLING_HOURS часов. Возраст считается от постоянной эпохи
+    (чем раньше первая жалоба, тем больше значение), поэтому сохраненный
+    приоритет не устаревает: порядок групп со временем не меняется, и пересчет
+    нужен только при изменении самих жалоб.
+    """
+    weight = pending_count + max(reporters_reputation or 0, 0) / MODERATION_REPUTATION_PER_REPORT
+    hours_before_epoch = (MODERATION_EPOCH - first_pending_at).total_seconds() / 3600
+    return math.log2(max(weight, 1.0)) + hours_before_epoch / MODERATION_AGE_DOUBLING_HOURS
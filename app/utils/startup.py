@@ -0,0 +1,29 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTimings:
+    """Длительность фаз запуска приложения (импорт роутеров, прогрев и т.д.)"""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def as_dict(self) -> dict[str, float]:
+        """Длительности в миллисекундах"""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name} {ms} ms" for name, ms in self.as_dict().items())
+        return f"Запуск за {self.total * 1000:.0f} ms: {parts}"
@@ -0,0 +1,137 @@
+"""
+Стеммер Snowball для русского языка (https://snowballstem.org/algorithms/russian/stemmer.html).
+
+Отрезает окончания и суффиксы словоизменения: "дорога", "дороги", "дорогой",
+"дорогами" -> "дорог". Основа всегда - начало слова (с "ё" вместо "е"), поэтому
+ее можно искать как подстроку в исходном тексте.
+
+Форм слов в тексте форума немного по сравнению с числом их употреблений,
+поэтому результат кешируется (stem - lru_cache): при индексации большая часть
+слов берется из кеша.
+"""
+from functools import lru_cache
+
+from app.utils.metrics import register_lru_cache
+
+VOWELS = frozenset("аеиоуыэюя")
+
+PERFECTIVE_GERUND_1 = ("в", "вши", "вшись")  # после "а" или "я"
+PERFECTIVE_GERUND_2 = ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись")
+ADJECTIVE = (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+    "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+)
+PARTICIPLE_1 = ("ем", "нн", "вш", "ющ", "щ")  # после "а" или "я"
+PARTICIPLE_2 = ("ивш", "ывш", "ующ")
+REFLEXIVE = ("ся", "сь")
+VERB_1 = (  # после "а" или "я"
+    "ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно",
+)
+VERB_2 = (
+    "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+    "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю",
+)
+NOUN = (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей", "ой", "ий", "й",
+    "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я",
+)
+SUPERLATIVE = ("ейш", "ейше")
+DERIVATIONAL = ("ост", "ость")
+
+
+def _longest_first(*groups: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(sorted({ending for group in groups for ending in group}, key=len, reverse=True))
+
+
+_GERUND = _longest_first(PERFECTIVE_GERUND_1, PERFECTIVE_GERUND_2)
+_ADJECTIVE = _longest_first(ADJECTIVE)
+_PARTICIPLE = _longest_first(PARTICIPLE_1, PARTICIPLE_2)
+_REFLEXIVE = _longest_first(REFLEXIVE)
+_VERB = _longest_first(VERB_1, VERB_2)
+_NOUN = _longest_first(NOUN)
+_SUPERLATIVE = _longest_first(SUPERLATIVE)
+_DERIVATIONAL = _longest_first(DERIVATIONAL)
+
+
+def _regions(word: str) -> tuple[int, int]:
+    """Начало RV (после первой гласной) и R2 (R1 внутри R1)"""
+    size = len(word)
+    rv = next((i + 1 for i, ch in enumerate(word) if ch in VOWELS), size)
+
+    def after_vowel_consonant(start: int) -> int:
+        for i in range(start + 1, size):
+            if word[i] not in VOWELS and word[i - 1] in VOWELS:
+                return i + 1
+        return size
+
+    r1 = after_vowel_consonant(0)
+    return rv, after_vowel_consonant(r1)
+
+
+def _find(word: str, start: int, endings: tuple[str, ...]) -> str | None:
+    """Самое длинное из окончаний, целиком лежащее в области [start:]"""
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= start:
+            return ending
+    return None
+
+
+def _remove(word: str, rv: int, endings: tuple[str, ...], after_a: tuple[str, ...] = ()) -> str | None:
+    """
+    Удаление самого длинного окончания группы; окончания из after_a удаляются
+    только после "а"/"я" в RV. None - окончание не найдено или условие не выполнено.
+    """
+    ending = _find(word, rv, endings)
+    if ending is None:
+        return None
+    start = len(word) - len(ending)
+    if ending in after_a and not (start - 1 >= rv and word[start - 1] in "ая"):
+        return None
+    return word[:start]
+
+
+def _adjectival(word: str, rv: int) -> str | None:
+    word = _remove(word, rv, _ADJECTIVE)
+    if word is None:
+        return None
+    participle = _remove(word, rv, _PARTICIPLE, PARTICIPLE_1)
+    return word if participle is None else participle
+
+
+@lru_cache(maxsize=100_000)
+def stem(word: str) -> str:
+    """Основа слова в нижнем регистре"""
+    word = word.lower().replace("ё", "е")
+    rv, r2 = _regions(word)
+
+    # Шаг 1: деепричастие, иначе возвратная частица и прилагательное/глагол/существительное
+    result = _remove(word, rv, _GERUND, PERFECTIVE_GERUND_1)
+    if result is None:
+        result = _remove(word, rv, _REFLEXIVE) or word
+        result = (
+            _adjectival(result, rv)
+            or _remove(result, rv, _VERB, VERB_1)
+            or _remove(result, rv, _NOUN)
+            or result
+        )
+    word = result
+
+    # Шаг 2
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3: словообразовательный суффикс в R2
+    if ending := _find(word, max(rv, r2), _DERIVATIONAL):
+        word = word[:-len(ending)]
+
+    # Шаг 4: "нн" -> "н", превосходная степень, мягкий знак
+    if ending := _find(word, rv, _SUPERLATIVE):
+        word = word[:-len(ending)]
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif word.endswith("ь") and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+register_lru_cache("stemmer", stem)
@@ -0,0 +1,74 @@
+"""
+TF-IDF-векторы постов для блока "Похожие обсуждения".
+
+Слова приводятся к нижнему регистру с "ё" -> "е" и к основам
+(app.utils.stemmer), так что формы одного слова считаются одним словом и в
+векторах, и в словаре term_documents. Замена похожих символов из фильтра
+фраз (app.utils.aho_corasick) здесь не используется: она превращает числа и
+латиницу в кириллицу ("2024" -> "2о2ч").
+
+Вес слова в посте - (1 + log tf) * idf, где idf = log((1 + N) / (1 + df)) + 1
+(N - число постов, df - число постов со словом). Вектор нормируется по всем
+словам поста, а хранятся только TERMS_PER_POST самых тяжелых: скалярное
+произведение усеченных векторов - нижняя оценка косинусного сходства, а
+частые служебные слова, которые только раздувают списки постов по слову, не
+хранятся вовсе.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from operator import itemgetter
+
+from app.utils.stemmer import stem
+
+TERMS_PER_POST = 20
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 50
+
+# Служебные слова (уже с "ё" -> "е"); слова короче MIN_TERM_LENGTH отбрасываются и так
+STOPWORDS = frozenset((
+    "без", "более", "больше", "будет", "будто", "был", "была", "были", "было", "быть", "вам", "вас",
+    "ведь", "весь", "вот", "впрочем", "все", "всегда", "всего", "всех", "всю", "где", "даже", "для",
+    "его", "если", "есть", "еще", "зачем", "здесь", "или", "иногда", "как", "какая", "какой", "когда",
+    "конечно", "кто", "куда", "лучше", "между", "меня", "мне", "много", "может", "можно", "моя", "над",
+    "надо", "нас", "него", "нее", "нельзя", "нет", "ним", "них", "ничего", "однако", "она", "они", "опять",
+    "очень", "перед", "под", "после", "потом", "потому", "почему", "почти", "при", "про", "раз",
+    "разве", "сам", "себе", "себя", "сейчас", "совсем", "так", "такой", "там", "тебя", "тем", "теперь",
+    "того", "тогда", "тоже", "только", "том", "тот", "тут", "уже", "хоть", "чем", "через", "что", "чтоб",
+    "чтобы", "чуть", "эти", "этого", "этой", "этом", "этот", "эту", "это",
+))
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def terms(text: str) -> Counter[str]:
+    """Частоты основ значимых слов текста ("дорога" и "дороги" - одно слово)"""
+    return Counter(
+        stem(word) for word in _WORD_RE.findall(text.lower().replace("ё", "е"))
+        if MIN_TERM_LENGTH <= len(word) <= MAX_TERM_LENGTH and word not in STOPWORDS and not word.isdigit()
+    )
+
+
+def idf(documents: int, term_documents: int) -> float:
+    return math.log((1 + documents) / (1 + term_documents)) + 1
+
+
+def weights(counts: Counter[str], documents: int, term_documents: dict[str, int]) -> dict[str, float]:
+    """Нормированный TF-IDF-вектор, усеченный до TERMS_PER_POST слов"""
+    raw = {
+        term: (1 + math.log(count)) * idf(documents, term_documents.get(term, 0))
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in raw.values()))
+    if not norm:
+        return {}
+    top = heapq.nlargest(TERMS_PER_POST, raw.items(), key=itemgetter(1))
+    return {term: weight / norm for term, weight in top}
+
+
+def cosine(first: dict[str, float], second: dict[str, float]) -> float:
+    """Скалярное произведение разреженных векторов"""
+    if len(first) > len(second):
+        first, second = second, first
+    return sum(weight * second.get(term, 0.0) for term, weight in first.items())
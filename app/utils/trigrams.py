@@ -0,0 +1,79 @@
+"""
+Триграммы для поиска с опечатками.
+
+Полнотекстовые таблицы FTS5 с токенизатором trigram (app/models/search_index.py)
+находят подстроки без учета регистра по индексу. Здесь - разбор запроса на
+выражения MATCH и сходство слов по триграммам (как в pg_trgm): доля общих
+триграмм слов, дополненных пробелами по краям ("  ям", " ям", "ям ", ...),
+так что совпадение начала слова весит больше. Слова запроса сравниваются и
+ищутся по основам (app.utils.stemmer): "дороги" находит "дорога" и "дорогой".
+Токенизатор trigram не считает "е" и "ё" одной буквой, поэтому основы
+сравниваются с "ё" -> "е" (как в словаре term_documents), а в MATCH каждая
+основа ищется во всех вариантах написания (fts_words).
+"""
+import re
+
+from app.utils.stemmer import stem
+
+# Меньше трех символов токенизатор trigram не индексирует
+MIN_MATCH_LENGTH = 3
+# Минимальное сходство исправления с исходным словом (в pg_trgm по умолчанию 0.3; перестановка
+# соседних букв в слове из 6 букв дает ~0.27)
+MIN_WORD_SIMILARITY = 0.25
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Слова запроса в нижнем регистре (без повторов, в исходном порядке)"""
+    return list(dict.fromkeys(_WORD_RE.findall(text.lower())))
+
+
+def trigrams(word: str) -> set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(first: str, second: str) -> float:
+    """Сходство слов: общие триграммы / все триграммы обоих слов"""
+    a, b = trigrams(first), trigrams(second)
+    return len(a & b) / len(a | b)
+
+
+def inner_trigrams(word: str) -> list[str]:
+    """Триграммы внутри слова - то, что можно искать в индексе FTS5"""
+    return list(dict.fromkeys(word[i:i + 3] for i in range(len(word) - 2)))
+
+
+def search_stem(word: str) -> str:
+    """
+    Основа слова для поиска подстрокой: "улице" -> "улиц", "дорогой" -> "дорог".
+    Берется начало исходного слова (стеммер заменяет "ё"), а слишком короткая
+    для триграмм основа ("ямы" -> "ям") - не используется.
+    """
+    base = stem(word)
+    return word[:len(base)] if len(base) >= MIN_MATCH_LENGTH else word
+
+
+def fts_string(text: str) -> str:
+    """Строка FTS5 в кавычках: для trigram - поиск подстроки"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def fts_any(parts: list[str]) -> str:
+    return " OR ".join(fts_string(part) for part in parts)
+
+
+def fold_yo(word: str) -> str:
+    return word.replace("ё", "е")
+
+
+def yo_variants(word: str) -> list[str]:
+    """Слово с "е" и с "ё" на месте каждой "е" по отдельности (две "ё" в слове почти не встречаются)"""
+    folded = fold_yo(word)
+    return [folded] + [folded[:i] + "ё" + folded[i + 1:] for i, ch in enumerate(folded) if ch == "е"]
+
+
+def fts_words(parts: list[str]) -> str:
+    """Все части в любом порядке, каждая - в любом из вариантов yo_variants"""
+    return " AND ".join(f"({fts_any(yo_variants(part))})" for part in parts)
@@ -0,0 +1,108 @@
+"""
+Всплеск комментариев к одному посту: транзакция на запрос против групповой записи.
+
+Запуск:
+    python -m benchmarks.bench_comment_writer --comments 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench_comments.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ["DB_NAME"] = DB_PATH
+
+from app.database.database import create_tables, engine, prepare_database
+from app.database.db_manager import DBManager
+from app.schemes.comments import SCommentAdd
+from app.services.comment_writer import CommentWriter
+from app.services.comments import CommentService
+
+USERS = 1000
+
+
+def seed(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO roles (id, name, level) VALUES (1, 'user', 1)")
+    conn.execute("INSERT INTO themes (id, name, posts_count) VALUES (1, 'bench', 0)")
+    conn.executemany(
+        "INSERT INTO users (id, name, email, hashed_password, role_id) VALUES (?, ?, ?, 'x', 1)",
+        [(i, f"user{i}", f"user{i}@bench.ru") for i in range(1, USERS + 1)],
+    )
+    conn.execute(
+        "INSERT INTO posts (id, user_id, theme_id, header, body, created_at, likes, dislikes) "
+        "VALUES (1, 1, 1, 'Городской праздник', 'body', CURRENT_TIMESTAMP, 0, 0)"
+    )
+    conn.commit()
+    conn.close()
+
+
+async def per_request(index: int) -> None:
+    async with DBManager() as db:
+        await CommentService(db).create_comment(SCommentAdd(post_id=1, body=f"comment {index}"), 1 + index % USERS)
+
+
+def group_commit(writer: CommentWriter):
+    async def create(index: int) -> None:
+        await writer.create(SCommentAdd(post_id=1, body=f"comment {index}"), 1 + index % USERS)
+    return create
+
+
+async def drive(create, comments: int, concurrency: int) -> tuple[float, list[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await create(index)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(comments)))
+    return time.perf_counter() - started, sorted(latencies), errors
+
+
+def report(name: str, elapsed: float, latencies: list[float], errors: int) -> None:
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(
+        f"{name:<24} {len(latencies) / elapsed:8.0f} комментариев/с, "
+        f"p50 {p50:7.1f} ms, p99 {p99:7.1f} ms, ошибок {errors}"
+    )
+
+
+async def main(comments: int, concurrency: int) -> None:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    await create_tables()
+    await prepare_database()
+    seed(DB_PATH)
+    print(f"{comments} комментариев к одному посту, одновременно {concurrency}")
+
+    report("транзакция на запрос", *await drive(per_request, comments, concurrency))
+
+    writer = CommentWriter(timeout=60, max_pending_per_user=comments)
+    report("групповая запись", *await drive(group_commit(writer), comments, concurrency))
+    await writer.stop()
+    print(f"{'':<24} пачек: {writer.batches}, в среднем {writer.written / max(writer.batches, 1):.0f} комментариев")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--comments", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.comments, args.concurrency))
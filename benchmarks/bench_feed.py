@@ -0,0 +1,113 @@
+"""
+Бенчмарк персональной ленты для пользователей в 1, 50 и 500 сообществах.
+
+Запуск:
+    python -m benchmarks.bench_feed --posts 500000 --communities 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench_feed.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DB_NAME", DB_PATH)
+
+from app.database.database import create_tables, engine
+from app.database.db_manager import DBManager
+from app.services.feed import FeedService
+
+MEMBERSHIPS = (1, 50, 500)
+
+
+def seed(path: str, posts: int, communities: int, batch: int = 50_000) -> None:
+    """Сообщества, посты и пользователи с разным числом подписок"""
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("INSERT INTO roles (id, name, level) VALUES (1, 'user', 1)")
+    conn.execute("INSERT INTO themes (id, name, posts_count) VALUES (1, 'bench', 0)")
+    conn.executemany(
+        "INSERT INTO users (id, name, email, hashed_password, role_id) VALUES (?, ?, ?, 'x', 1)",
+        [(count, f"user{count}", f"user{count}@bench.ru") for count in MEMBERSHIPS],
+    )
+    conn.executemany(
+        "INSERT INTO communities (id, name, description, posts_count, members_count) VALUES (?, ?, '', 0, 0)",
+        [(i, f"community {i}") for i in range(1, communities + 1)],
+    )
+    for count in MEMBERSHIPS:
+        joined = rnd.sample(range(1, communities + 1), min(count, communities))
+        conn.executemany(
+            "INSERT INTO user_communities (user_id, community_id) VALUES (?, ?)",
+            [(count, community_id) for community_id in joined],
+        )
+    sql = (
+        "INSERT INTO posts (user_id, theme_id, community_id, header, body, created_at, likes, dislikes) "
+        "VALUES (1, 1, ?, ?, 'body', ?, 0, 0)"
+    )
+    for start in range(0, posts, batch):
+        rows = [
+            (
+                rnd.randint(1, communities),
+                f"post {i}",
+                now - timedelta(seconds=rnd.randint(0, 3600 * 24 * 365)),
+            )
+            for i in range(start, min(start + batch, posts))
+        ]
+        conn.executemany(sql, rows)
+        conn.commit()
+    conn.close()
+
+
+async def bench_user(user_id: int, pages: int, limit: int, repeat: int = 5) -> None:
+    first_page, deep_page = [], []
+    for _ in range(repeat):
+        cursor = None
+        async with DBManager() as db:
+            service = FeedService(db)
+            for page in range(pages):
+                started = time.perf_counter()
+                feed = await service.get_feed(user_id=user_id, cursor=cursor, limit=limit)
+                elapsed = (time.perf_counter() - started) * 1000
+                (first_page if page == 0 else deep_page).append(elapsed)
+                cursor = feed["next_cursor"]
+                if cursor is None:
+                    break
+    first_page.sort()
+    deep_page.sort()
+    deep = f"{deep_page[len(deep_page) // 2]:8.2f} ms" if deep_page else "     n/a"
+    print(
+        f"{user_id:>4} сообществ: первая страница {first_page[len(first_page) // 2]:8.2f} ms, "
+        f"следующие страницы {deep}"
+    )
+
+
+async def main(posts: int, communities: int, pages: int, limit: int) -> None:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    await create_tables()
+    started = time.perf_counter()
+    seed(DB_PATH, posts, communities)
+    print(f"Засеяно {posts} постов в {communities} сообществах за {time.perf_counter() - started:.1f} с")
+    for user_id in MEMBERSHIPS:
+        await bench_user(user_id, pages, limit)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=500_000)
+    parser.add_argument("--communities", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts, args.communities, args.pages, args.limit))
@@ -0,0 +1,69 @@
+"""
+Накладные расходы MetricsMiddleware на один запрос.
+
+Голое ASGI-приложение вызывается напрямую с middleware и без него,
+разница времени на вызов - стоимость инструментирования.
+
+Запуск:
+    python -m benchmarks.bench_metrics --requests 200000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DB_NAME", ":memory:")
+
+from app.middleware.metrics import MetricsMiddleware
+
+
+class _Route:
+    path = "/api/v2/posts/{post_id}"
+
+
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b""}
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request"}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_seconds(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/v2/posts/1"}
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def main(requests: int, repeat: int) -> None:
+    instrumented = MetricsMiddleware(bare_app)
+    bare, measured = [], []
+    for _ in range(repeat):
+        bare.append(await per_request_seconds(bare_app, requests))
+        measured.append(await per_request_seconds(instrumented, requests))
+    overhead = (min(measured) - min(bare)) * 1e6
+    print(f"Без метрик: {min(bare) * 1e6:.2f} мкс/запрос, с метриками: {min(measured) * 1e6:.2f} мкс/запрос")
+    print(f"Накладные расходы: {overhead:.2f} мкс/запрос")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.repeat))
@@ -0,0 +1,92 @@
+"""
+Проверка текста на запрещенные фразы: автомат Ахо-Корасик против цикла по фразам и регулярного выражения.
+
+Запуск:
+    python -m benchmarks.bench_phrase_filter --patterns 10000 --length 5000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.utils.aho_corasick import AhoCorasick, normalize
+from benchmarks.datagen import WORDS
+
+SYLLABLES = ("ка", "ра", "зо", "ме", "ли", "ту", "пы", "вё", "шо", "на", "ст", "до", "бу", "ще")
+
+
+def make_patterns(rnd: random.Random, count: int) -> list[str]:
+    patterns = set()
+    while len(patterns) < count:
+        words = ["".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))) for _ in range(rnd.randint(1, 2))]
+        patterns.add(" ".join(words))
+    return sorted(patterns)
+
+
+def make_body(rnd: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rnd.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def loop_check(patterns: list[str]):
+    """Наивный вариант: поиск каждой фразы отдельно"""
+    def check(text: str) -> bool:
+        normalized = normalize(text)
+        return any(pattern in normalized for pattern in patterns)
+    return check
+
+
+def regex_check(patterns: list[str]):
+    """Одно регулярное выражение из всех фраз, собранное заранее"""
+    regex = re.compile(r"\b(?:" + "|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)) + r")\b")
+
+    def check(text: str) -> bool:
+        return regex.search(normalize(text)) is not None
+    return check
+
+
+def measure(check, bodies: list[str], repeat: int) -> float:
+    """Лучшее время проверки одного текста, мкс"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in bodies:
+            check(body)
+        best = min(best, (time.perf_counter() - started) / len(bodies))
+    return best * 1e6
+
+
+def main(patterns_count: int, length: int, bodies_count: int, repeat: int) -> None:
+    rnd = random.Random(42)
+    patterns = [normalize(p) for p in make_patterns(rnd, patterns_count)]
+    bodies = [make_body(rnd, length) for _ in range(bodies_count)]
+    print(f"{patterns_count} фраз, {bodies_count} текстов по {length} символов (чистые - худший случай)")
+
+    started = time.perf_counter()
+    matcher = AhoCorasick(patterns)
+    print(f"Сборка автомата: {(time.perf_counter() - started) * 1000:.0f} ms, состояний: {len(matcher._goto)}")
+    started = time.perf_counter()
+    regex = regex_check(patterns)
+    print(f"Сборка регулярного выражения: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    for name, check in (
+        ("Ахо-Корасик", lambda text: matcher.contains_any(text)),
+        ("регулярное выражение", regex),
+        ("цикл по фразам", loop_check(patterns)),
+    ):
+        print(f"{name:<24} {measure(check, bodies, repeat):10.0f} мкс/текст")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", type=int, default=10_000)
+    parser.add_argument("--length", type=int, default=5_000)
+    parser.add_argument("--bodies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.patterns, args.length, args.bodies, args.repeat)
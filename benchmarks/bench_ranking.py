@@ -0,0 +1,109 @@
+"""
+Бенчмарк ранжирования постов (hot/top) на большом объеме данных.
+
+Запуск:
+    python -m benchmarks.bench_ranking --posts 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench_ranking.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DB_NAME", DB_PATH)
+
+from sqlalchemy import desc, select, text
+
+from app.database.database import async_session_maker, create_tables, engine
+from app.models.posts import PostModel
+from app.repositories.posts import PostsRepository
+
+
+def seed(path: str, posts: int, batch: int = 50_000) -> None:
+    """Заполнение базы постами напрямую через sqlite3 (executemany)"""
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("INSERT INTO roles (id, name, level) VALUES (1, 'user', 1)")
+    conn.execute("INSERT INTO users (id, name, email, hashed_password, role_id) VALUES (1, 'bench', 'b@b.b', 'x', 1)")
+    conn.execute("INSERT INTO themes (id, name, posts_count) VALUES (1, 'bench', 0)")
+    sql = (
+        "INSERT INTO posts (user_id, theme_id, header, body, created_at, likes, dislikes) "
+        "VALUES (1, 1, ?, 'body', ?, ?, ?)"
+    )
+    for start in range(0, posts, batch):
+        rows = [
+            (
+                f"post {i}",
+                now - timedelta(minutes=rnd.randint(0, 60 * 24 * 365)),
+                rnd.randint(0, 500),
+                rnd.randint(0, 100),
+            )
+            for i in range(start, min(start + batch, posts))
+        ]
+        conn.executemany(sql, rows)
+        conn.commit()
+    conn.close()
+
+
+async def timed(label: str, coro_factory, repeat: int = 5) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"{label:<45} median {timings[len(timings) // 2]:9.2f} ms   min {timings[0]:9.2f} ms")
+
+
+async def main(posts: int) -> None:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    await create_tables()
+
+    started = time.perf_counter()
+    seed(DB_PATH, posts)
+    print(f"Засеяно {posts} постов за {time.perf_counter() - started:.1f} с")
+
+    async with async_session_maker() as session:
+        repo = PostsRepository(session)
+
+        started = time.perf_counter()
+        refreshed = await repo.refresh_hot_scores(since=datetime.utcnow() - timedelta(days=30))
+        await session.commit()
+        print(f"Пересчет затухания за 30 дней: {refreshed} постов за {time.perf_counter() - started:.2f} с")
+
+        async def legacy_full_sort():
+            # Прежняя реализация get_popular: полная сортировка по likes
+            query = select(PostModel).order_by(desc(PostModel.likes)).limit(20)
+            await session.execute(query)
+
+        await timed("legacy: ORDER BY likes (полная сортировка)", legacy_full_sort)
+        await timed("hot, окно day (индекс hot_score)", lambda: repo.get_hot(days=1, limit=20))
+        await timed("hot, окно week (индекс hot_score)", lambda: repo.get_hot(days=7, limit=20))
+        await timed("top, окно day (индекс created_at)", lambda: repo.get_popular(days=1, limit=20))
+        await timed("top, окно week (индекс created_at)", lambda: repo.get_popular(days=7, limit=20))
+
+        plan = await session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM posts ORDER BY hot_score DESC LIMIT 20"
+        ))
+        print("План запроса hot:", [row[-1] for row in plan])
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts))
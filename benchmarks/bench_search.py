@@ -0,0 +1,137 @@
+"""
+Бенчмарк поиска постов: индекс FTS5 trigram с цепочкой exact -> prefix -> fuzzy против ILIKE.
+
+Запуск:
+    python -m benchmarks.bench_search --posts 500000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench_search.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DB_NAME", DB_PATH)
+
+from sqlalchemy import desc, or_, select
+
+from app.database.database import create_tables, engine
+from app.database.db_manager import DBManager
+from app.models.posts import PostModel
+from app.utils.tfidf import terms
+from benchmarks.datagen import WORDS
+
+STREETS = (
+    "Ленина", "Садовая", "Мира", "Гагарина", "Советская", "Пушкина", "Кирова", "Лесная",
+    "Молодежная", "Набережная", "Октябрьская", "Первомайская", "Чкалова", "Комсомольская",
+)
+SYLLABLES = ("ка", "ра", "зо", "ме", "ли", "ту", "пы", "ве", "шо", "на", "ст", "до", "бу", "ще")
+
+QUERIES = (
+    ("exact", "улица Ленина"),
+    ("prefix", "на улице Ленину"),
+    ("fuzzy", "улица Ленниа"),
+    ("fuzzy", "Гагрина"),
+    ("miss", "абракадабра"),
+)
+
+
+def seed(path: str, posts: int, batch: int = 50_000) -> None:
+    """Посты из частых слов, названий улиц и редких слов (словарь в десятки тысяч слов)"""
+    rnd = random.Random(42)
+    rare = ["".join(rnd.choices(SYLLABLES, k=rnd.randint(3, 5))) for _ in range(30_000)]
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("INSERT INTO roles (id, name, level) VALUES (1, 'user', 1)")
+    conn.execute("INSERT INTO themes (id, name, posts_count) VALUES (1, 'bench', 0)")
+    conn.execute("INSERT INTO users (id, name, email, hashed_password, role_id) VALUES (1, 'bench', 'b@b.ru', 'x', 1)")
+
+    def sentence(count: int) -> str:
+        words = rnd.choices(WORDS, k=count)
+        words[rnd.randrange(count)] = f"улица {rnd.choice(STREETS)}"
+        words[rnd.randrange(count)] = rnd.choice(rare)
+        return " ".join(words)
+
+    documents = 0
+    term_documents = Counter()
+    sql = (
+        "INSERT INTO posts (user_id, theme_id, header, body, created_at, likes, dislikes) "
+        "VALUES (1, 1, ?, ?, ?, 0, 0)"
+    )
+    for start in range(0, posts, batch):
+        rows = [
+            (sentence(rnd.randint(3, 6)).capitalize(), sentence(rnd.randint(15, 60)),
+             now - timedelta(seconds=rnd.randint(0, 3600 * 24 * 365)))
+            for _ in range(start, min(start + batch, posts))
+        ]
+        conn.executemany(sql, rows)
+        for header, body, _ in rows:
+            documents += 1
+            term_documents.update(terms(f"{header}\n{body}").keys())
+        conn.commit()
+    # Словарь слов, как его ведет RelatedPostService
+    conn.executemany(
+        "INSERT INTO term_documents (term, documents) VALUES (?, ?)",
+        [("", documents), *term_documents.items()],
+    )
+    conn.commit()
+    conn.close()
+
+
+async def median_ms(run, repeat: int) -> tuple[float, object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+async def main(posts: int, limit: int, repeat: int) -> None:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    await create_tables()
+    started = time.perf_counter()
+    seed(DB_PATH, posts)
+    print(f"Засеяно {posts} постов за {time.perf_counter() - started:.1f} с")
+
+    async with DBManager() as db:
+        for expected, query in QUERIES:
+            elapsed, found = await median_ms(lambda: db.posts.search_ids(query, 0, limit), repeat)
+            print(f"{query!r:<22} ожидается {expected:<7} -> {str(found.mode):<7} {len(found.ids):>3} постов "
+                  f"{elapsed:8.2f} ms  ({found.query})")
+
+        async def ilike(query: str):
+            result = await db.session.execute(
+                select(PostModel.id)
+                .where(or_(PostModel.header.ilike(f"%{query}%"), PostModel.body.ilike(f"%{query}%")))
+                .order_by(desc(PostModel.created_at))
+                .limit(limit)
+            )
+            return result.scalars().all()
+
+        for _, query in QUERIES[:1] + QUERIES[-1:]:
+            elapsed, ids = await median_ms(lambda: ilike(query), max(1, repeat // 5))
+            print(f"ILIKE {query!r:<16} {len(ids):>3} постов {elapsed:8.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=11)
+    args = parser.parse_args()
+    asyncio.run(main(args.posts, args.limit, args.repeat))
@@ -0,0 +1,66 @@
+"""
+Токенизация постов для индекса: слова -> основы (стеммер с кешем и без) на потоке синтетических постов.
+
+Считает посты в секунду для tfidf.terms, размер словаря до и после стемминга
+и долю попаданий в кеш основ.
+
+Запуск:
+    python -m benchmarks.bench_tokenizer --posts 1000000
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+
+from app.utils import tfidf
+from app.utils.aho_corasick import normalize
+from app.utils.stemmer import stem
+from benchmarks.datagen import WORDS
+
+# Окончания, чтобы в потоке были разные формы одних и тех же слов
+ENDINGS = ("", "а", "у", "ом", "е", "ы", "ов", "ами", "ах", "ой", "ая", "ую", "ые", "ых", "ить", "ает", "али")
+
+
+def make_posts(posts: int, seed: int = 42):
+    rnd = random.Random(seed)
+    for _ in range(posts):
+        words = [rnd.choice(WORDS) + rnd.choice(ENDINGS) for _ in range(rnd.randint(20, 70))]
+        yield " ".join(words)
+
+
+def tokenize(posts: int) -> tuple[float, Counter, Counter]:
+    words, stems = Counter(), Counter()
+    started = time.perf_counter()
+    for text in make_posts(posts):
+        stems.update(tfidf.terms(text).keys())
+    elapsed = time.perf_counter() - started
+    # Словарь словоформ - отдельным проходом, чтобы не влиять на замер
+    for text in make_posts(min(posts, 100_000)):
+        words.update(word for word in re.findall(r"\w+", normalize(text)) if len(word) >= tfidf.MIN_TERM_LENGTH)
+    return elapsed, words, stems
+
+
+def main(posts: int, uncached_posts: int) -> None:
+    stem.cache_clear()
+    elapsed, words, stems = tokenize(posts)
+    info = stem.cache_info()
+    print(f"С кешем:  {posts} постов за {elapsed:.1f} с, {posts / elapsed:,.0f} постов/с, "
+          f"попаданий в кеш {info.hits / max(1, info.hits + info.misses):.2%}")
+    print(f"Словоформ (первые 100k постов): {len(words)}, основ: {len(stems)}")
+
+    original = tfidf.stem
+    tfidf.stem = stem.__wrapped__
+    try:
+        elapsed, _, _ = tokenize(uncached_posts)
+    finally:
+        tfidf.stem = original
+    print(f"Без кеша: {uncached_posts} постов за {elapsed:.1f} с, {uncached_posts / elapsed:,.0f} постов/с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--uncached-posts", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.posts, args.uncached_posts)
@@ -0,0 +1,109 @@
+"""
+Пропускная способность ленты при 1..N воркерах (app.tools.serve).
+
+Запуск:
+    python -m benchmarks.bench_workers --workers 1 2 4 --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench_workers.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ["DB_NAME"] = DB_PATH
+
+import httpx
+
+from app.database.database import create_tables, engine
+from app.services.auth import AuthService
+from benchmarks.bench_feed import seed
+
+FEED_USER_ID = 50  # пользователь из 50 сообществ (см. bench_feed.MEMBERSHIPS)
+
+
+async def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Сервер {url} не запустился за {timeout} с")
+
+
+async def drive(url: str, token: str, concurrency: int, duration: float) -> tuple[int, list[float]]:
+    """concurrency клиентов в цикле запрашивают первую страницу ленты"""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(cookies={"access_token": token}, limits=limits, timeout=30) as client:
+        async def client_loop():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return errors, latencies
+
+
+async def bench(workers: int, port: int, concurrency: int, duration: float) -> None:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.tools.serve", "--workers", str(workers),
+         "--port", str(port), "--no-access-log", "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        await wait_until_ready(base_url + "/api/v2/posts")
+        token = AuthService.create_access_token({"user_id": FEED_USER_ID})
+        await drive(base_url + "/api/v2/feed", token, concurrency, 1.0)  # прогрев
+        errors, latencies = await drive(base_url + "/api/v2/feed", token, concurrency, duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies.sort()
+    rps = len(latencies) / duration
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{workers:>3} воркеров: {rps:8.0f} запросов/с, p50 {p50:7.1f} ms, p99 {p99:7.1f} ms, ошибок {errors}")
+
+
+async def main(workers: list[int], posts: int, port: int, concurrency: int, duration: float) -> None:
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    await create_tables()
+    await engine.dispose()
+    seed(DB_PATH, posts, communities=500)
+    print(f"Засеяно {posts} постов, ядер: {os.cpu_count()}, клиентов: {concurrency}")
+    for count in workers:
+        await bench(count, port, concurrency, duration)
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, max(cores // 2, 1), cores}))
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.posts, args.port, args.concurrency, args.duration))
@@ -0,0 +1,323 @@
+"""
+Детерминированный генератор синтетических данных форума.
+
+Пользователи, сообщества, темы, подписки, посты, комментарии, реакции и жалобы
+в пропорциях живого форума. Объем задается общим числом строк (--rows, от 10k
+до 10M); при одинаковых --rows и --seed получается одна и та же база.
+
+Запуск:
+    python -m benchmarks.datagen --rows 100000
+    python -m benchmarks.datagen --rows 10000000 --db /tmp/forum_10m.db
+
+Пользователь 1 - администратор, 2 - модератор, у всех пароль BENCH_PASSWORD.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "forum_bench.db")
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DB_NAME", DEFAULT_DB_PATH)
+
+BENCH_PASSWORD = "bench-password"
+# bcrypt-хеш BENCH_PASSWORD: один на всех, чтобы генерация не упиралась в bcrypt
+BENCH_PASSWORD_HASH = "$2b$12$FhVVEyLZpP4Fnns4YMunwOw4/KVXkv9KuOglUZBGoWM/Sg4Z1YLA6"
+
+ADMIN_USER_ID = 1
+MODERATOR_USER_ID = 2
+
+# Точка отсчета времени фиксирована: от текущей даты зависела бы "горячесть" и выдача
+BASE_TIME = datetime(2025, 1, 1)
+HISTORY_DAYS = 365
+
+THEMES = (
+    "Дороги", "Транспорт", "ЖКХ", "Благоустройство", "Экология", "Безопасность",
+    "Образование", "Здоровье", "Культура", "Спорт", "Торговля", "Работа",
+    "Недвижимость", "Животные", "Дети", "События", "Происшествия", "Администрация",
+    "Объявления", "Разное",
+)
+
+# Словарь для заголовков и текстов; из него же берутся поисковые запросы сценариев
+WORDS = (
+    "дорога", "яма", "светофор", "автобус", "маршрут", "остановка", "парковка",
+    "двор", "подъезд", "лифт", "отопление", "вода", "мусор", "контейнер", "парк",
+    "сквер", "детская", "площадка", "школа", "поликлиника", "аптека", "магазин",
+    "рынок", "ремонт", "благоустройство", "освещение", "фонарь", "тротуар", "снег",
+    "гололед", "уборка", "собака", "кошка", "концерт", "праздник", "ярмарка",
+    "стадион", "бассейн", "библиотека", "музей", "театр", "мост", "набережная",
+    "река", "пляж", "велодорожка", "шум", "стройка", "администрация", "жалоба",
+)
+
+REPORT_REASONS = ("Спам и реклама", "Оскорбления", "Недостоверная информация", "Не по теме", "Флуд")
+REPORT_STATUSES = ("pending", "pending", "pending", "reviewed", "resolved", "rejected")
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Число строк каждой таблицы для заданного общего объема"""
+
+    users: int
+    communities: int
+    memberships: int
+    posts: int
+    comments: int
+    reactions: int
+    reports: int
+
+    @classmethod
+    def for_rows(cls, rows: int) -> "Scale":
+        users = max(rows // 20, 10)
+        communities = max(rows // 1000, 5)
+        return cls(
+            users=users,
+            communities=communities,
+            memberships=min(rows // 25, users * communities),
+            posts=max(rows // 4, 10),
+            comments=rows // 2,
+            reactions=rows * 3 // 20,
+            reports=rows // 100,
+        )
+
+    @property
+    def total(self) -> int:
+        return sum(asdict(self).values())
+
+
+def _text(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choices(WORDS, k=words))
+
+
+def _timestamp(rnd: random.Random) -> datetime:
+    return BASE_TIME - timedelta(seconds=rnd.randrange(HISTORY_DAYS * 24 * 3600))
+
+
+def _insert_batched(conn: sqlite3.Connection, sql: str, rows, batch: int) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            conn.executemany(sql, chunk)
+            chunk.clear()
+    if chunk:
+        conn.executemany(sql, chunk)
+    conn.commit()
+
+
+def _users(rnd: random.Random, scale: Scale):
+    for user_id in range(1, scale.users + 1):
+        role_id = 3 if user_id == ADMIN_USER_ID else 2 if user_id == MODERATOR_USER_ID else 1
+        yield user_id, f"user{user_id}", f"user{user_id}@bench.ru", BENCH_PASSWORD_HASH, role_id, _timestamp(rnd)
+
+
+def _memberships(rnd: random.Random, scale: Scale):
+    # Подписки распределены неравномерно: популярные сообщества собирают больше участников
+    seen = set()
+    while len(seen) < scale.memberships:
+        pair = (rnd.randint(1, scale.users), min(int(rnd.paretovariate(1.2)), scale.communities))
+        if pair not in seen:
+            seen.add(pair)
+            yield pair
+
+
+def _posts(rnd: random.Random, scale: Scale):
+    reactions_per_post = scale.reactions / scale.posts
+    for post_id in range(1, scale.posts + 1):
+        # Реакции хранятся в посте (reactions_data), число - по экспоненциальному закону
+        count = min(int(rnd.expovariate(1 / reactions_per_post)) if reactions_per_post else 0, scale.users)
+        voters = rnd.sample(range(1, scale.users + 1), count)
+        split = int(count * 0.8)
+        liked_by, disliked_by = voters[:split], voters[split:]
+        yield (
+            post_id,
+            rnd.randint(1, scale.users),
+            rnd.randint(1, len(THEMES)),
+            min(int(rnd.paretovariate(1.2)), scale.communities),
+            _text(rnd, rnd.randint(3, 8)).capitalize(),
+            _text(rnd, rnd.randint(20, 120)),
+            _timestamp(rnd),
+            len(liked_by),
+            len(disliked_by),
+            json.dumps({"liked_by": liked_by, "disliked_by": disliked_by}),
+        )
+
+
+def _comments(rnd: random.Random, scale: Scale):
+    for comment_id in range(1, scale.comments + 1):
+        yield (
+            comment_id,
+            rnd.randint(1, scale.users),
+            rnd.randint(1, scale.posts),
+            _text(rnd, rnd.randint(5, 40)),
+            _timestamp(rnd),
+        )
+
+
+def _reports(rnd: random.Random, scale: Scale):
+    # Пользователь жалуется на контент не больше одного раза (уникальный индекс)
+    seen = set()
+    for report_id in range(1, scale.reports + 1):
+        is_post = rnd.random() < 0.7
+        created_at = _timestamp(rnd)
+        status = rnd.choice(REPORT_STATUSES)
+        key = None
+        while key is None or key in seen:
+            key = (
+                rnd.randint(3, max(scale.users, 3)),
+                "POST" if is_post else "COMMENT",
+                rnd.randint(1, scale.posts if is_post else max(scale.comments, 1)),
+            )
+        seen.add(key)
+        yield (
+            report_id,
+            *key,
+            rnd.choice(REPORT_REASONS),
+            status.upper(),
+            created_at,
+            created_at,
+            None if status == "pending" else MODERATOR_USER_ID,
+        )
+
+
+def generate(path: str, rows: int, seed: int = 42, batch: int = 50_000) -> Scale:
+    """Заполняет пустую базу (таблицы уже созданы) синтетическими данными"""
+    scale = Scale.for_rows(rows)
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    conn.executemany(
+        "INSERT INTO roles (id, name, level) VALUES (?, ?, ?)",
+        [(1, "user", 1), (2, "moderator", 2), (3, "admin", 3)],
+    )
+    conn.executemany(
+        "INSERT INTO themes (id, name, posts_count) VALUES (?, ?, 0)",
+        list(enumerate(THEMES, start=1)),
+    )
+    conn.executemany(
+        "INSERT INTO communities (id, name, description, posts_count, members_count) VALUES (?, ?, ?, 0, 0)",
+        [(i, f"Район {i}", _text(rnd, 10)) for i in range(1, scale.communities + 1)],
+    )
+    _insert_batched(
+        conn,
+        "INSERT INTO users (id, name, email, hashed_password, role_id, reputation, posts_count, comments_count, created_at) "
+        "VALUES (?, ?, ?, ?, ?, 0, 0, 0, ?)",
+        _users(rnd, scale),
+        batch,
+    )
+    _insert_batched(
+        conn, "INSERT INTO user_communities (user_id, community_id) VALUES (?, ?)", _memberships(rnd, scale), batch
+    )
+    _insert_batched(
+        conn,
+        "INSERT INTO posts (id, user_id, theme_id, community_id, header, body, created_at, likes, dislikes, reactions_data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _posts(rnd, scale),
+        batch,
+    )
+    _insert_batched(
+        conn,
+        "INSERT INTO comments (id, user_id, post_id, body, created_at, likes, dislikes) VALUES (?, ?, ?, ?, ?, 0, 0)",
+        _comments(rnd, scale),
+        batch,
+    )
+    _insert_batched(
+        conn,
+        "INSERT INTO reports (id, reporter_id, content_type, content_id, reason, status, created_at, updated_at, moderator_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _reports(rnd, scale),
+        batch,
+    )
+
+    # Денормализованные счетчики - как их поддерживает приложение
+    conn.executescript("""
+        UPDATE communities SET
+            posts_count = (SELECT COUNT(*) FROM posts WHERE posts.community_id = communities.id),
+            members_count = (SELECT COUNT(*) FROM user_communities uc WHERE uc.community_id = communities.id);
+        UPDATE themes SET posts_count = (SELECT COUNT(*) FROM posts WHERE posts.theme_id = themes.id);
+        UPDATE users SET
+            posts_count = (SELECT COUNT(*) FROM posts WHERE posts.user_id = users.id),
+            comments_count = (SELECT COUNT(*) FROM comments WHERE comments.user_id = users.id);
+    """)
+    _fill_report_content_stats(conn)
+    conn.commit()
+    conn.close()
+    return scale
+
+
+def _fill_report_content_stats(conn: sqlite3.Connection) -> None:
+    """Сводка жалоб по контенту и очередь модерации (как ReportsRepository.refresh_content_stats)"""
+    from app.utils.ranking import calculate_moderation_priority
+
+    rows = conn.execute("""
+        SELECT r.content_type, r.content_id, COUNT(*), MIN(r.created_at), MAX(r.created_at),
+            SUM(r.status = 'PENDING'),
+            SUM(CASE WHEN r.status = 'PENDING' THEN COALESCE(u.reputation, 0) ELSE 0 END),
+            MIN(CASE WHEN r.status = 'PENDING' THEN r.created_at END)
+        FROM reports r LEFT JOIN users u ON u.id = r.reporter_id
+        GROUP BY r.content_type, r.content_id
+    """).fetchall()
+    stats = []
+    for row in rows:
+        pending_count, reputation, first_pending_at = row[5:]
+        priority = None
+        if pending_count:
+            priority = calculate_moderation_priority(
+                pending_count, reputation, datetime.fromisoformat(first_pending_at)
+            )
+        stats.append((*row, priority))
+    conn.executemany(
+        "INSERT INTO report_content_stats (content_type, content_id, reports_count, first_reported_at, "
+        "last_reported_at, pending_count, pending_reputation, first_pending_at, priority) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        stats,
+    )
+
+
+async def create_database(path: str) -> None:
+    """Пустая база со схемой приложения и "горячестью" постов после заполнения"""
+    if os.path.exists(path):
+        os.remove(path)
+    os.environ["DB_NAME"] = path
+    from app.database.database import create_tables, engine
+    await create_tables()
+    await engine.dispose()
+
+
+async def refresh_hot_scores(path: str) -> None:
+    from app.database.database import engine
+    from app.database.db_manager import DBManager
+
+    async with DBManager() as db:
+        await db.posts.refresh_hot_scores(now=BASE_TIME, batch_size=10_000)
+        await db.commit()
+    await engine.dispose()
+
+
+def main(path: str, rows: int, seed: int) -> None:
+    asyncio.run(create_database(path))
+    started = time.perf_counter()
+    scale = generate(path, rows, seed)
+    asyncio.run(refresh_hot_scores(path))
+    print(f"База {path}: {scale.total} строк за {time.perf_counter() - started:.1f} с")
+    for table, count in asdict(scale).items():
+        print(f"  {table:<12} {count:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Общее число строк (10k..10M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+    main(args.db, args.rows, args.seed)
@@ -0,0 +1,224 @@
+"""
+Нагрузочный прогон сценариев форума на httpx: p50/p95/p99 и RPS по запросам.
+
+Запуск (база из benchmarks.datagen, сервер поднимается на время прогона):
+    python -m benchmarks.datagen --rows 100000
+    python -m benchmarks.load --serve --workers 2 --output results/HEAD.json
+    python -m benchmarks.load --serve --compare results/main.json
+
+Против уже запущенного сервера (тот же SECRET_KEY, что и у сервера - для токенов):
+    python -m benchmarks.load --url http://127.0.0.1:8000 --db /tmp/forum_bench.db
+
+Отчет --output - JSON с коммитом и параметрами прогона; --compare печатает
+изменение задержек и RPS относительно такого отчета.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.datagen import DEFAULT_DB_PATH  # задает переменные окружения до импорта app
+from benchmarks.scenarios import SCENARIOS, Dataset, RequestSpec, pick_user
+
+import httpx
+
+from app.services.auth import AuthService
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+class LoadRunner:
+    """Виртуальные пользователи в цикле выбирают сценарий по весу и выполняют его запросы"""
+
+    def __init__(self, base_url: str, data: Dataset, concurrency: int, seed: int = 42):
+        self.base_url = base_url
+        self.data = data
+        self.concurrency = concurrency
+        self.seed = seed
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    async def _request(self, client: httpx.AsyncClient, spec: RequestSpec) -> None:
+        name = f"{spec.method} {spec.name or spec.url}"
+        started = time.perf_counter()
+        try:
+            response = await client.request(spec.method, spec.url, json=spec.json)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        elapsed = time.perf_counter() - started
+        if self.recording:
+            self.latencies[name].append(elapsed)
+            if failed:
+                self.errors[name] += 1
+
+    async def _virtual_user(self, index: int, deadline: float, limits: httpx.Limits) -> None:
+        rnd = random.Random(self.seed * 1000 + index)
+        weights = [scenario.weight for scenario in SCENARIOS]
+        tokens: dict[int, str] = {}
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=30) as client:
+            while time.monotonic() < deadline:
+                scenario = rnd.choices(SCENARIOS, weights)[0]
+                user_id = pick_user(rnd, self.data, scenario)
+                if user_id not in tokens:
+                    tokens[user_id] = AuthService.create_access_token({"user_id": user_id})
+                client.cookies.set("access_token", tokens[user_id])
+                for spec in scenario.build(rnd, self.data):
+                    await self._request(client, spec)
+
+    async def run(self, duration: float, warmup: float = 2.0) -> dict:
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        started = time.monotonic()
+        deadline = started + warmup + duration
+
+        async def start_recording():
+            await asyncio.sleep(warmup)
+            self.recording = True
+
+        await asyncio.gather(
+            start_recording(),
+            *(self._virtual_user(index, deadline, limits) for index in range(self.concurrency)),
+        )
+        measured = time.monotonic() - started - warmup
+
+        requests = {
+            name: summarize(latencies, self.errors[name], measured)
+            for name, latencies in sorted(self.latencies.items())
+        }
+        total = summarize(
+            [value for latencies in self.latencies.values() for value in latencies],
+            sum(self.errors.values()),
+            measured,
+        )
+        return {"requests": requests, "total": total}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict) -> None:
+    print(f"{'запрос':<48} {'всего':>7} {'ошибок':>7} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(report["requests"].items()) + [("ИТОГО", report["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<48} {stats['requests']:>7} {stats['errors']:>7} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+
+
+def print_comparison(report: dict, baseline: dict) -> None:
+    """Изменение в процентах: для задержек рост - хуже, для RPS - лучше"""
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+7.1f}%" if old else "     n/a"
+
+    print(f"\nСравнение с {baseline.get('commit') or 'базовым прогоном'}:")
+    print(f"{'запрос':<48} {'RPS':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    rows = list(report["requests"].items()) + [("ИТОГО", report["total"])]
+    for name, stats in rows:
+        old = baseline["total"] if name == "ИТОГО" else baseline["requests"].get(name)
+        if old is None:
+            print(f"{name:<48} {'(нет в базовом прогоне)':>39}")
+            continue
+        print(
+            f"{name:<48} {change(stats['rps'], old['rps']):>9} {change(stats['p50_ms'], old['p50_ms']):>9} "
+            f"{change(stats['p95_ms'], old['p95_ms']):>9} {change(stats['p99_ms'], old['p99_ms']):>9}"
+        )
+
+
+async def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Сервер {url} не запустился за {timeout} с")
+
+
+async def main(args) -> None:
+    data = Dataset.from_db(args.db)
+    if not data.posts:
+        raise SystemExit(f"В базе {args.db} нет данных: сначала python -m benchmarks.datagen")
+
+    server = None
+    base_url = args.url
+    if args.serve:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.tools.serve", "--workers", str(args.workers),
+             "--port", str(args.port), "--no-access-log", "--log-level", "warning"],
+            env={**os.environ, "DB_NAME": args.db},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        await wait_until_ready(base_url + "/themes")
+        report = await LoadRunner(base_url, data, args.concurrency, args.seed).run(args.duration, args.warmup)
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    report = {
+        "commit": git_commit(),
+        "dataset": {"users": data.users, "posts": data.posts, "communities": data.communities},
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "workers": args.workers if args.serve else None,
+        **report,
+    }
+    print_report(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="База из benchmarks.datagen")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="Запустить сервер (app.tools.serve) на время прогона")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--concurrency", type=int, default=32, help="Число виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Сохранить отчет в JSON")
+    parser.add_argument("--compare", help="Сравнить с отчетом из JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,48 @@
+"""
+Сценарии benchmarks.scenarios для locust (pip install -e ".[benchmarks]"):
+
+    python -m benchmarks.datagen --rows 1000000
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 --users 200 --spawn-rate 20
+
+BENCH_DB - путь к базе из benchmarks.datagen (нужны диапазоны id),
+SECRET_KEY - тот же, что у сервера: токены подписываются локально.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from locust import HttpUser, between
+
+from benchmarks.datagen import DEFAULT_DB_PATH
+from benchmarks.scenarios import SCENARIOS, Dataset, Scenario, pick_user
+
+from app.services.auth import AuthService
+
+DATASET = Dataset.from_db(os.environ.get("BENCH_DB", DEFAULT_DB_PATH))
+
+
+def make_task(scenario: Scenario):
+    def run_scenario(user: "ForumUser") -> None:
+        user_id = pick_user(user.rnd, DATASET, scenario)
+        user.client.cookies.set("access_token", user.token(user_id))
+        for spec in scenario.build(user.rnd, DATASET):
+            user.client.request(spec.method, spec.url, json=spec.json, name=spec.name or spec.url)
+
+    run_scenario.__name__ = scenario.name
+    return run_scenario
+
+
+class ForumUser(HttpUser):
+    wait_time = between(0.5, 2)
+    tasks = {make_task(scenario): scenario.weight for scenario in SCENARIOS}
+
+    def on_start(self) -> None:
+        self.rnd = random.Random()
+        self.tokens: dict[int, str] = {}
+
+    def token(self, user_id: int) -> str:
+        if user_id not in self.tokens:
+            self.tokens[user_id] = AuthService.create_access_token({"user_id": user_id})
+        return self.tokens[user_id]
@@ -0,0 +1,22 @@
+"""
+Микробенчмарки репозиториев.
+
+    python -m benchmarks.micro.gate
+"""
+
+
+def test_get_filtered_posts_by_community(benchmark, backend):
+    async def get_page():
+        async with backend.db() as db:
+            return await db.posts.get_filtered(community_id=1, limit=20, offset=0)
+
+    posts = benchmark(backend.run, get_page)
+    assert len(posts) == 20
+
+
+def test_get_filtered_comments_by_post(benchmark, backend):
+    async def get_comments():
+        async with backend.db() as db:
+            return await db.comments.get_filtered(post_id=1)
+
+    benchmark(backend.run, get_comments)
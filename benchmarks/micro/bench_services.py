@@ -0,0 +1,46 @@
+"""
+Микробенчмарки сервисов на горячих путях веб-страниц, реакций, модерации и статистики.
+
+    python -m benchmarks.micro.gate
+"""
+from app.schemes.reports import ReportStatus
+from app.services.post_reactions import PostReactionService
+from app.services.posts import PostService
+from app.services.reports import ReportService
+from app.services.stats import StatsService
+
+
+def test_get_posts_for_web(benchmark, backend):
+    async def get_posts():
+        async with backend.db() as db:
+            return await PostService(db).get_posts_for_web(limit=20)
+
+    posts = benchmark(backend.run, get_posts)
+    assert len(posts) == 20
+
+
+def test_toggle_reaction(benchmark, backend):
+    # Пользователь 3 по очереди ставит и снимает лайк: состояние базы не накапливается
+    async def toggle():
+        async with backend.db() as db:
+            return await PostReactionService.toggle_reaction(db.session, user_id=3, post_id=1, reaction_type="like")
+
+    result = benchmark(backend.run, toggle)
+    assert result["action"] in ("added", "removed")
+
+
+def test_get_reports_with_details(benchmark, backend):
+    async def get_reports():
+        async with backend.db() as db:
+            return await ReportService(db).get_reports_with_details(limit=50, status=ReportStatus.PENDING)
+
+    benchmark(backend.run, get_reports)
+
+
+def test_get_forum_stats(benchmark, backend):
+    async def get_stats():
+        async with backend.db() as db:
+            return await StatsService(db).get_forum_stats()
+
+    stats = benchmark(backend.run, get_stats)
+    assert stats
@@ -0,0 +1,86 @@
+"""
+Фикстуры микробенчмарков: засеянная база в памяти и на диске.
+
+Модули приложения импортируются внутри фикстур: обычный прогон pytest
+заходит в этот каталог и загружает conftest, но бенчмарков (bench_*.py) не собирает.
+"""
+import asyncio
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+MICRO_ROWS = int(os.environ.get("MICRO_BENCH_ROWS", 20_000))
+MEMORY_URI = "file:forum_micro_bench?mode=memory&cache=shared"
+
+
+class Backend:
+    """Отдельный движок SQLAlchemy над засеянной базой и цикл событий для синхронного pytest-benchmark"""
+
+    def __init__(self, name: str, url: str, loop: asyncio.AbstractEventLoop):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.name = name
+        self.loop = loop
+        self.engine = create_async_engine(url)
+        self.session_maker = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def db(self):
+        from app.database.db_manager import DBManager
+        return DBManager(session_factory=self.session_maker)
+
+    def run(self, make_coroutine):
+        return self.loop.run_until_complete(make_coroutine())
+
+    def dispose(self) -> None:
+        self.loop.run_until_complete(self.engine.dispose())
+
+
+@pytest.fixture(scope="session")
+def event_loop_for_bench():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def seeded_db_path(tmp_path_factory, event_loop_for_bench):
+    """Схема приложения + данные benchmarks.datagen (MICRO_BENCH_ROWS строк)"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.database.database import Base, import_models
+    from benchmarks.datagen import generate
+
+    path = str(tmp_path_factory.mktemp("micro") / "seed.db")
+    import_models()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    event_loop_for_bench.run_until_complete(create_schema())
+    generate(path, MICRO_ROWS)
+    return path
+
+
+@pytest.fixture(scope="session", params=["memory", "disk"])
+def backend(request, seeded_db_path, tmp_path_factory, event_loop_for_bench):
+    if request.param == "memory":
+        # Общий кеш: база в памяти живет, пока открыто соединение keeper
+        keeper = sqlite3.connect(MEMORY_URI, uri=True)
+        source = sqlite3.connect(seeded_db_path)
+        source.backup(keeper)
+        source.close()
+        backend = Backend("memory", f"sqlite+aiosqlite:///{MEMORY_URI}&uri=true", event_loop_for_bench)
+    else:
+        keeper = None
+        path = str(tmp_path_factory.mktemp("disk") / "forum.db")
+        shutil.copy(seeded_db_path, path)
+        backend = Backend("disk", f"sqlite+aiosqlite:///{path}", event_loop_for_bench)
+    yield backend
+    backend.dispose()
+    if keeper is not None:
+        keeper.close()
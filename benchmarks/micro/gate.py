@@ -0,0 +1,162 @@
+"""
+Микробенчмарки (pip install -e ".[benchmarks]") с сохраненными базовыми значениями и порогом регрессии.
+
+    python -m benchmarks.micro.gate                   # прогон и сравнение с baselines/baseline.json
+    python -m benchmarks.micro.gate --threshold 0.3   # допустимое замедление 30%
+    python -m benchmarks.micro.gate --min-delta-ms 1  # и не меньше 1 ms
+    python -m benchmarks.micro.gate --save            # обновить базовые значения
+
+Сравнивается минимальное время: оно меньше всего зависит от фонового шума
+машины, в отличие от среднего и медианы. Код выхода 1, если хотя бы один отслеживаемый путь
+(есть в базовом файле) стал медленнее больше чем на threshold и при этом больше чем на
+min-delta-ms: на путях около миллисекунды 20% - это уже шум. Но и минимум одного прогона
+бывает завышен, если машина была занята весь прогон, поэтому замедлившиеся бенчмарки
+перезапускаются (--retries) и берется лучшее время из всех прогонов; базовые значения
+при --save - тоже лучшее из 1 + retries прогонов.
+Базовые значения зависят от машины: сохраняйте их на той же, где проверяете.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+MICRO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(MICRO_DIR, "baselines", "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA_MS = 0.5
+DEFAULT_RETRIES = 2
+
+
+def run_benchmarks(pytest_args: list[str], node_ids: list[str] | None = None) -> dict[str, tuple[float, str]]:
+    """Минимальное время (секунды) и id для перезапуска по каждому бенчмарку (все или node_ids)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "benchmarks.json")
+        code = pytest.main([
+            *(node_ids or [MICRO_DIR]),
+            "-q",
+            "-o", "python_files=bench_*.py",
+            "-p", "no:cacheprovider",
+            "--benchmark-warmup=on",
+            f"--benchmark-json={output}",
+            *pytest_args,
+        ])
+        if code != 0:
+            raise SystemExit(f"Микробенчмарки завершились с ошибкой (pytest: {code})")
+        with open(output, encoding="utf-8") as f:
+            report = json.load(f)
+    return {
+        bench["name"]: (
+            bench["stats"]["min"],
+            os.path.join(MICRO_DIR, os.path.basename(bench["fullname"].split("::")[0])) + "::" + bench["name"],
+        )
+        for bench in report["benchmarks"]
+    }
+
+
+def min_seconds(results: dict[str, tuple[float, str]]) -> dict[str, float]:
+    return {name: seconds for name, (seconds, _) in results.items()}
+
+
+def keep_best(results: dict[str, tuple[float, str]], more: dict[str, tuple[float, str]]) -> None:
+    """Лучшее время по каждому бенчмарку из нескольких прогонов"""
+    for name, (seconds, node_id) in more.items():
+        if name not in results or seconds < results[name][0]:
+            results[name] = (seconds, node_id)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_baseline(path: str, timings: dict[str, float]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "machine": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+                "min_seconds": dict(sorted(timings.items())),
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+        f.write("\n")
+    print(f"Базовые значения сохранены: {path}")
+
+
+def compare(
+    timings: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[str]:
+    """Печатает таблицу сравнения и возвращает имена замедлившихся бенчмарков"""
+    regressions = []
+    print(f"\n{'бенчмарк':<48} {'было ms':>10} {'стало ms':>10} {'изменение':>10}")
+    for name, old in sorted(baseline.items()):
+        new = timings.get(name)
+        if new is None:
+            print(f"{name:<48} {old * 1000:>10.3f} {'нет':>10}")
+            continue
+        change = new / old - 1
+        mark = ""
+        if change > threshold and (new - old) * 1000 > min_delta_ms:
+            regressions.append(name)
+            mark = "  РЕГРЕССИЯ"
+        print(f"{name:<48} {old * 1000:>10.3f} {new * 1000:>10.3f} {change * 100:>+9.1f}%{mark}")
+    for name in sorted(set(timings) - set(baseline)):
+        print(f"{name:<48} {'новый':>10} {timings[name] * 1000:>10.3f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимое замедление (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Замедление меньше этого (ms) не считается регрессией")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="Сколько раз перезапускать замедлившиеся бенчмарки (и прогонять все при --save)")
+    parser.add_argument("--save", action="store_true", help="Записать результаты как базовые")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    results = run_benchmarks(pytest_args)
+    if args.save:
+        for _ in range(args.retries):
+            keep_best(results, run_benchmarks(pytest_args))
+        save_baseline(args.baseline, min_seconds(results))
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Нет базовых значений {args.baseline}: запустите с --save")
+        return 1
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["min_seconds"]
+
+    regressions = compare(min_seconds(results), baseline, args.threshold, args.min_delta_ms)
+    for attempt in range(1, args.retries + 1):
+        if not regressions:
+            break
+        print(f"\nПовторный прогон {attempt}/{args.retries}: {', '.join(regressions)}")
+        keep_best(results, run_benchmarks(pytest_args, [results[name][1] for name in regressions]))
+        regressions = compare(min_seconds(results), baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\nЗамедление больше {args.threshold:.0%} и {args.min_delta_ms} ms: {', '.join(regressions)}")
+        return 1
+    print(f"\nРегрессий нет (порог {args.threshold:.0%}, не меньше {args.min_delta_ms} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Сценарии нагрузки: общие для httpx-прогона (benchmarks.load) и locust (benchmarks/locustfile.py).
+
+Сценарий - это последовательность HTTP-запросов одного виртуального
+пользователя; вес задает долю сценария в смеси.
+"""
+import random
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable
+
+from benchmarks.datagen import ADMIN_USER_ID, WORDS
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Диапазоны id в сгенерированной базе"""
+
+    users: int
+    posts: int
+    communities: int
+
+    @classmethod
+    def from_db(cls, path: str) -> "Dataset":
+        conn = sqlite3.connect(path)
+        try:
+            users, posts, communities = (
+                conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+                for table in ("users", "posts", "communities")
+            )
+        finally:
+            conn.close()
+        return cls(users=users, posts=posts, communities=communities)
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    method: str
+    url: str
+    json: dict | None = None
+    # Имя для статистики: шаблон пути, а не конкретный id
+    name: str | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    weight: int
+    build: Callable[[random.Random, Dataset], list[RequestSpec]]
+    admin: bool = False
+
+
+def browse_feed(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    return [
+        RequestSpec("GET", "/api/v2/feed?limit=20", name="/api/v2/feed"),
+        RequestSpec("GET", "/api/v2/posts?sort=hot&window=week&limit=20", name="/api/v2/posts?sort=hot"),
+    ]
+
+
+def open_post(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    post_id = rnd.randint(1, data.posts)
+    return [
+        RequestSpec("GET", f"/web/post/{post_id}", name="/web/post/{post_id}"),
+        RequestSpec("GET", f"/api/v2/posts/{post_id}/reaction", name="/api/v2/posts/{post_id}/reaction"),
+    ]
+
+
+def react(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    post_id = rnd.randint(1, data.posts)
+    reaction = rnd.choice(("like", "like", "like", "dislike"))
+    return [RequestSpec("POST", f"/api/v2/posts/{post_id}/{reaction}", name=f"/api/v2/posts/{{post_id}}/{reaction}")]
+
+
+def comment(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    post_id = rnd.randint(1, data.posts)
+    body = " ".join(rnd.choices(WORDS, k=rnd.randint(5, 20)))
+    return [RequestSpec("POST", "/comments", json={"post_id": post_id, "body": body})]
+
+
+def search(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    return [RequestSpec("GET", f"/api/v2/posts/search?query={rnd.choice(WORDS)}&limit=20", name="/api/v2/posts/search")]
+
+
+def admin_panel(rnd: random.Random, data: Dataset) -> list[RequestSpec]:
+    return [
+        RequestSpec("GET", "/web/admin"),
+        RequestSpec("GET", "/moderation/queue?limit=20", name="/moderation/queue"),
+        RequestSpec("GET", "/reports?status=pending&limit=50", name="/reports?status=pending"),
+        RequestSpec("GET", "/reports/stats/summary"),
+    ]
+
+
+SCENARIOS = (
+    Scenario("browse_feed", 40, browse_feed),
+    Scenario("open_post", 30, open_post),
+    Scenario("react", 12, react),
+    Scenario("comment", 6, comment),
+    Scenario("search", 10, search),
+    Scenario("admin_panel", 2, admin_panel, admin=True),
+)
+
+
+def pick_user(rnd: random.Random, data: Dataset, scenario: Scenario) -> int:
+    """Администратор для админских сценариев, иначе случайный обычный пользователь"""
+    if scenario.admin:
+        return ADMIN_USER_ID
+    return rnd.randint(min(3, data.users), data.users)
@@ -1,35 +1,108 @@
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.exc import SQLAlchemyError
 
-# Импортируем все модели для регистрации в Base до инициализации приложения
-from app.models.users import UserModel
-from app.models.roles import RoleModel
-from app.models.posts import PostModel
-from app.models.comments import CommentModel
-from app.models.communities import CommunityModel
-from app.models.user_communities import UserCommunityModel
-from app.models.themes import ThemeModel
-from app.models.reports import ReportModel
-from app.models.favorites import FavoritePostModel
-
-from app.api.sample import router as sample_router
-from app.api.auth import router as auth_router
-from app.api.roles import router as role_router
-from app.api.web import router as web_router
-from app.api.communities import router as community_router
-from app.api.comments import router as comment_router
-from app.api.reports import router as report_router
-from app.api.themes import router as theme_router
-from app.api.simple_posts import router as simple_post_router
-from app.api.favorites import router as favorites_router
-from app.api.stats import router as stats_router
-from app.api.users import router as users_router
-
+from app.config import settings
 from app.exceptions.auth import JWTTokenExpiredHTTPError
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.query_counter import QueryCounterMiddleware
+from app.utils.startup import StartupTimings
+
+# Роутеры подключаются по имени модуля: импорт сервисов, моделей и шаблонов
+# выполняется в include_routers и попадает в замер фаз запуска
+ROUTERS = (
+    "app.api.sample",
+    "app.api.auth",
+    "app.api.roles",
+    "app.api.web",
+    "app.api.communities",
+    "app.api.comments",
+    "app.api.reports",
+    "app.api.moderation",
+    "app.api.themes",
+    "app.api.simple_posts",
+    "app.api.favorites",
+    "app.api.stats",
+    "app.api.users",
+    "app.api.feed",
+    "app.api.search",
+    "app.api.export",
+    "app.api.live",
+    "app.api.profiler",
+)
+
+logger = logging.getLogger("app.startup")
+
+startup_timings = StartupTimings()
+
+
+def include_routers(app: FastAPI) -> None:
+    for module_name in ROUTERS:
+        app.include_router(importlib.import_module(module_name).router)
+    if settings.METRICS_ENABLED:
+        app.include_router(importlib.import_module("app.api.metrics").router)
+
 
-app = FastAPI(title="Форум 'Мой Город'", version="0.0.1")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Запуск: прогрев мапперов, шаблонов и запросов, фоновые задачи; остановка - в обратном порядке"""
+    from app.api.web import warm_up_templates
+    from app.database.database import engine
+    from app.services.comment_writer import comment_writer
+    from app.services.content_filter import banned_phrases
+    from app.services.events import event_bus
+    from app.services.ranking import run_ranking_refresh_loop
+    from app.services.suggest import search_suggestions
+    from app.services.warmup import warm_up_mappers, warm_up_queries
+
+    with startup_timings.phase("mappers"):
+        warm_up_mappers()
+    with startup_timings.phase("templates"):
+        warm_up_templates()
+    with startup_timings.phase("queries"):
+        await warm_up_queries()
+    with startup_timings.phase("banned_phrases"):
+        # Автомат запрещенных фраз собирается до первого запроса
+        banned_phrases.reload()
+    with startup_timings.phase("suggestions"):
+        # Индекс подсказок поиска строится до первого запроса, дальше - по событиям.
+        # Недоступная или не мигрированная БД не мешает запуску: индекс наполнится
+        # событиями; прочие ошибки - баги, и запуск на них падает
+        try:
+            await search_suggestions.rebuild()
+        except SQLAlchemyError:
+            logger.exception("Индекс подсказок не построен")
+    with startup_timings.phase("event_bus"):
+        # Шина событий между воркерами (живые обновления и т.п.)
+        await event_bus.start()
+
+    # Фоновый пересчет "горячести" постов (затухание по времени)
+    ranking_task = None
+    if settings.RUN_BACKGROUND_TASKS:
+        ranking_task = asyncio.create_task(run_ranking_refresh_loop())
+
+    app.state.startup_timings = startup_timings.as_dict()
+    print(startup_timings.summary())
+    try:
+        yield
+    finally:
+        if ranking_task:
+            ranking_task.cancel()
+        # Дописываем комментарии, уже стоящие в очереди групповой записи
+        await comment_writer.stop()
+        await event_bus.stop()
+        await engine.dispose()
+
+
+app = FastAPI(title="Форум 'Мой Город'", version="0.0.1", lifespan=lifespan)
 
 # Глобальный обработчик исключений для истекших токенов
 @app.exception_handler(JWTTokenExpiredHTTPError)
@@ -45,20 +118,17 @@ async def handle_expired_token(request, exc: JWTTokenExpiredHTTPError):
     )
 
 
+app.add_middleware(QueryCounterMiddleware)
+# Профилирование по заголовку X-Profile (админ) или 1 из PROFILER_SAMPLE_RATE запросов
+app.add_middleware(ProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.mount("/static", StaticFiles(directory="app/static"), "static")
 
-app.include_router(sample_router)
-app.include_router(auth_router)
-app.include_router(role_router)
-app.include_router(web_router)
-app.include_router(community_router)
-app.include_router(comment_router)
-app.include_router(report_router)
-app.include_router(theme_router)
-app.include_router(simple_post_router)
-app.include_router(favorites_router)
-app.include_router(stats_router)
-app.include_router(users_router)
+with startup_timings.phase("routers"):
+    include_routers(app)
+
 
 @app.get("/")
 async def root_redirect():
@@ -67,4 +137,3 @@ async def root_redirect():
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
-
@@ -16,6 +16,10 @@ from app.models.comments import CommentModel
 from app.models.communities import CommunityModel
 from app.models.roles import RoleModel
 from app.models.themes import ThemeModel
+from app.models.post_signatures import PostSignatureModel, PostLshBandModel
+from app.models.related_posts import PostTermModel, TermDocumentsModel, RelatedPostModel
+from app.models.search_index import TRIGRAM_INDEXES
+from app.models.reports import ReportModel, ReportContentStatsModel
 
 # TODO Добавить сюда импорт созданных моделей
 # Пример:
@@ -38,6 +42,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+FTS_TABLES = {index.name for index in TRIGRAM_INDEXES}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Таблицы FTS5 и их служебные таблицы (posts_fts_data, ...) создаются миграциями вручную"""
+    if type_ == "table" and (name in FTS_TABLES or name.rsplit("_", 1)[0] in FTS_TABLES):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -62,6 +76,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -69,7 +84,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,32 @@
+"""add hot_score column and ranking indexes to posts
+
+Revision ID: a3c91e5f7b20
+Revises: 80a5f95d4473
+Create Date: 2026-10-19 10:12:41.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e5f7b20'
+down_revision: Union[str, Sequence[str], None] = '80a5f95d4473'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('hot_score', sa.Float(), nullable=False, server_default='0'))
+    op.create_index('ix_posts_hot_score', 'posts', ['hot_score'], unique=False)
+    op.create_index('ix_posts_created_at', 'posts', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_created_at', table_name='posts')
+    op.drop_index('ix_posts_hot_score', table_name='posts')
+    op.drop_column('posts', 'hot_score')
@@ -0,0 +1,51 @@
+"""post MinHash signatures and LSH band index
+
+Revision ID: a8d2f6b4c017
+Revises: f2b8d4c6e915
+Create Date: 2026-10-19 16:40:51.318942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2f6b4c017'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d4c6e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_signatures',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('duplicate_of_id', sa.Integer(), nullable=True),
+    sa.Column('similarity', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['duplicate_of_id'], ['posts.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_post_signatures_duplicate_of', 'post_signatures', ['duplicate_of_id'], unique=False)
+    op.create_table('post_lsh_bands',
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'post_id')
+    )
+    # Подписи существующих постов: python -m app.tools.signatures
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('post_lsh_bands')
+    op.drop_index('ix_post_signatures_duplicate_of', table_name='post_signatures')
+    op.drop_table('post_signatures')
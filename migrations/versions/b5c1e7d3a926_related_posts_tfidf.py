@@ -0,0 +1,58 @@
+"""related posts: TF-IDF terms, document counts and top-k neighbors
+
+Revision ID: b5c1e7d3a926
+Revises: a8d2f6b4c017
+Create Date: 2026-10-19 17:25:12.604377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c1e7d3a926'
+down_revision: Union[str, Sequence[str], None] = 'a8d2f6b4c017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_terms',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=50), nullable=False),
+    sa.Column('weight', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'term')
+    )
+    op.create_index('ix_post_terms_term_weight', 'post_terms', ['term', 'weight'], unique=False)
+    op.create_table('term_documents',
+    sa.Column('term', sa.String(length=50), nullable=False),
+    sa.Column('documents', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('term')
+    )
+    op.create_table('related_posts',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('related_post_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'related_post_id')
+    )
+    # Индекс для существующих постов: python -m app.tools.related
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('related_posts')
+    op.drop_table('term_documents')
+    op.drop_index('ix_post_terms_term_weight', table_name='post_terms')
+    op.drop_table('post_terms')
@@ -0,0 +1,28 @@
+"""add (community_id, created_at) index to posts for personal feed
+
+Revision ID: b7e2d4a91c35
+Revises: a3c91e5f7b20
+Create Date: 2026-10-19 11:03:17.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4a91c35'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e5f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_posts_community_created', 'posts', ['community_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_community_created', table_name='posts')
@@ -0,0 +1,49 @@
+"""unique (user_id, community_id) on user_communities
+
+Revision ID: c4f8a2e6d913
+Revises: b7e2d4a91c35
+Create Date: 2026-10-19 12:21:40.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2e6d913'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4a91c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    
+    # Удаляем дубликаты членства, оставляя самую раннюю запись
+    connection.execute(sa.text(
+        "DELETE FROM user_communities WHERE id NOT IN ("
+        "SELECT MIN(id) FROM user_communities GROUP BY user_id, community_id"
+        ");"
+    ))
+    
+    # Пересчитываем счетчики участников после удаления дубликатов
+    connection.execute(sa.text(
+        "UPDATE communities SET members_count = ("
+        "SELECT COUNT(*) FROM user_communities uc WHERE uc.community_id = communities.id"
+        ");"
+    ))
+    
+    op.create_index(
+        'uq_user_communities_user_community',
+        'user_communities',
+        ['user_id', 'community_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_user_communities_user_community', table_name='user_communities')
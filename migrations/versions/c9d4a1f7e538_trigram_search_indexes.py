@@ -0,0 +1,139 @@
+"""trigram FTS5 indexes for posts, communities, themes and the word vocabulary
+
+Revision ID: c9d4a1f7e538
+Revises: b5c1e7d3a926
+Create Date: 2026-10-19 19:02:37.215840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d4a1f7e538'
+down_revision: Union[str, Sequence[str], None] = 'b5c1e7d3a926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL зафиксирован в миграции (а не берется из app.models.search_index): миграция
+# должна выполнять ровно то, что было на момент ее создания. Индексы FTS5 с
+# внешним содержимым, триггеры синхронизации и 'rebuild' - индекс по уже
+# существующим строкам
+UPGRADE_STATEMENTS = [
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+        "header, body, content='posts', content_rowid='id', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+        "INSERT INTO posts_fts(rowid, header, body) VALUES (new.id, new.header, new.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+        "INSERT INTO posts_fts(posts_fts, rowid, header, body) VALUES ('delete', old.id, old.header, old.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF header, body ON posts BEGIN "
+        "INSERT INTO posts_fts(posts_fts, rowid, header, body) VALUES ('delete', old.id, old.header, old.body); "
+        "INSERT INTO posts_fts(rowid, header, body) VALUES (new.id, new.header, new.body); "
+        "END"
+    ),
+    "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')",
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS communities_fts USING fts5("
+        "name, description, content='communities', content_rowid='id', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS communities_fts_ai AFTER INSERT ON communities BEGIN "
+        "INSERT INTO communities_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS communities_fts_ad AFTER DELETE ON communities BEGIN "
+        "INSERT INTO communities_fts(communities_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS communities_fts_au AFTER UPDATE OF name, description ON communities BEGIN "
+        "INSERT INTO communities_fts(communities_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO communities_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+        "END"
+    ),
+    "INSERT INTO communities_fts(communities_fts) VALUES ('rebuild')",
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS themes_fts USING fts5("
+        "name, content='themes', content_rowid='id', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS themes_fts_ai AFTER INSERT ON themes BEGIN "
+        "INSERT INTO themes_fts(rowid, name) VALUES (new.id, new.name); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS themes_fts_ad AFTER DELETE ON themes BEGIN "
+        "INSERT INTO themes_fts(themes_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS themes_fts_au AFTER UPDATE OF name ON themes BEGIN "
+        "INSERT INTO themes_fts(themes_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "INSERT INTO themes_fts(rowid, name) VALUES (new.id, new.name); "
+        "END"
+    ),
+    "INSERT INTO themes_fts(themes_fts) VALUES ('rebuild')",
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS term_documents_fts USING fts5("
+        "term, content='term_documents', content_rowid='rowid', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS term_documents_fts_ai AFTER INSERT ON term_documents BEGIN "
+        "INSERT INTO term_documents_fts(rowid, term) VALUES (new.rowid, new.term); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS term_documents_fts_ad AFTER DELETE ON term_documents BEGIN "
+        "INSERT INTO term_documents_fts(term_documents_fts, rowid, term) VALUES ('delete', old.rowid, old.term); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS term_documents_fts_au AFTER UPDATE OF term ON term_documents BEGIN "
+        "INSERT INTO term_documents_fts(term_documents_fts, rowid, term) VALUES ('delete', old.rowid, old.term); "
+        "INSERT INTO term_documents_fts(rowid, term) VALUES (new.rowid, new.term); "
+        "END"
+    ),
+    "INSERT INTO term_documents_fts(term_documents_fts) VALUES ('rebuild')",
+]
+
+DOWNGRADE_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS term_documents_fts_ai",
+    "DROP TRIGGER IF EXISTS term_documents_fts_ad",
+    "DROP TRIGGER IF EXISTS term_documents_fts_au",
+    "DROP TABLE IF EXISTS term_documents_fts",
+    "DROP TRIGGER IF EXISTS themes_fts_ai",
+    "DROP TRIGGER IF EXISTS themes_fts_ad",
+    "DROP TRIGGER IF EXISTS themes_fts_au",
+    "DROP TABLE IF EXISTS themes_fts",
+    "DROP TRIGGER IF EXISTS communities_fts_ai",
+    "DROP TRIGGER IF EXISTS communities_fts_ad",
+    "DROP TRIGGER IF EXISTS communities_fts_au",
+    "DROP TABLE IF EXISTS communities_fts",
+    "DROP TRIGGER IF EXISTS posts_fts_ai",
+    "DROP TRIGGER IF EXISTS posts_fts_ad",
+    "DROP TRIGGER IF EXISTS posts_fts_au",
+    "DROP TABLE IF EXISTS posts_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in UPGRADE_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in DOWNGRADE_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,63 @@
+"""trigram FTS5 index for comments
+
+Revision ID: d2f7b3c9e164
+Revises: c9d4a1f7e538
+Create Date: 2026-10-19 21:14:08.533196
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7b3c9e164'
+down_revision: Union[str, Sequence[str], None] = 'c9d4a1f7e538'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Тот же вид индекса, что и в c9d4a1f7e538, DDL зафиксирован здесь же
+UPGRADE_STATEMENTS = [
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5("
+        "body, content='comments', content_rowid='id', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS comments_fts_ai AFTER INSERT ON comments BEGIN "
+        "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS comments_fts_ad AFTER DELETE ON comments BEGIN "
+        "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS comments_fts_au AFTER UPDATE OF body ON comments BEGIN "
+        "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+        "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+        "END"
+    ),
+    "INSERT INTO comments_fts(comments_fts) VALUES ('rebuild')",
+]
+
+DOWNGRADE_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS comments_fts_ai",
+    "DROP TRIGGER IF EXISTS comments_fts_ad",
+    "DROP TRIGGER IF EXISTS comments_fts_au",
+    "DROP TABLE IF EXISTS comments_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in UPGRADE_STATEMENTS:
+        op.execute(statement)
+    # Словарь term_documents и векторы постов теперь хранят основы слов:
+    # python -m app.tools.related пересчитывает их после обновления
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in DOWNGRADE_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,59 @@
+"""report indexes and report_content_stats
+
+Revision ID: d5a9e1f3b742
+Revises: c4f8a2e6d913
+Create Date: 2026-10-19 14:05:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e1f3b742'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a2e6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_content_stats',
+    sa.Column('content_type', sa.Enum('POST', 'COMMENT', name='reportcontenttypeenum'), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('reports_count', sa.Integer(), nullable=False),
+    sa.Column('first_reported_at', sa.DateTime(), nullable=False),
+    sa.Column('last_reported_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('content_type', 'content_id')
+    )
+    op.create_index('ix_report_content_stats_count', 'report_content_stats', ['reports_count'])
+    
+    # Таблица жалоб создается при старте приложения (create_all) и может отсутствовать
+    if not sa.inspect(op.get_bind()).has_table('reports'):
+        return
+    
+    op.create_index('ix_reports_status_content_type', 'reports', ['status', 'content_type'])
+    op.create_index('ix_reports_reporter_created', 'reports', ['reporter_id', 'created_at'])
+    op.create_index('ix_reports_content', 'reports', ['content_type', 'content_id'])
+    
+    # Заполняем сводку по уже существующим жалобам
+    op.get_bind().execute(sa.text(
+        "INSERT INTO report_content_stats "
+        "(content_type, content_id, reports_count, first_reported_at, last_reported_at) "
+        "SELECT content_type, content_id, COUNT(*), MIN(created_at), MAX(created_at) "
+        "FROM reports GROUP BY content_type, content_id;"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('reports'):
+        op.drop_index('ix_reports_content', table_name='reports')
+        op.drop_index('ix_reports_reporter_created', table_name='reports')
+        op.drop_index('ix_reports_status_content_type', table_name='reports')
+    op.drop_index('ix_report_content_stats_count', table_name='report_content_stats')
+    op.drop_table('report_content_stats')
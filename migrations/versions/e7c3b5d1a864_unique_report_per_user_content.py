@@ -0,0 +1,55 @@
+"""unique (reporter_id, content_type, content_id) on reports
+
+Revision ID: e7c3b5d1a864
+Revises: d5a9e1f3b742
+Create Date: 2026-10-19 14:48:37.291604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3b5d1a864'
+down_revision: Union[str, Sequence[str], None] = 'd5a9e1f3b742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    # Таблица жалоб создается при старте приложения (create_all) и может отсутствовать
+    if not sa.inspect(connection).has_table('reports'):
+        return
+    
+    # Удаляем повторные жалобы пользователя на тот же контент, оставляя самую раннюю
+    connection.execute(sa.text(
+        "DELETE FROM reports WHERE id NOT IN ("
+        "SELECT MIN(id) FROM reports GROUP BY reporter_id, content_type, content_id"
+        ");"
+    ))
+    
+    # Пересчитываем сводку по контенту после удаления дубликатов
+    connection.execute(sa.text("DELETE FROM report_content_stats;"))
+    connection.execute(sa.text(
+        "INSERT INTO report_content_stats "
+        "(content_type, content_id, reports_count, first_reported_at, last_reported_at) "
+        "SELECT content_type, content_id, COUNT(*), MIN(created_at), MAX(created_at) "
+        "FROM reports GROUP BY content_type, content_id;"
+    ))
+    
+    op.create_index(
+        'uq_reports_reporter_content',
+        'reports',
+        ['reporter_id', 'content_type', 'content_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('reports'):
+        op.drop_index('uq_reports_reporter_content', table_name='reports')
@@ -0,0 +1,78 @@
+"""moderation queue columns on report_content_stats
+
+Revision ID: f2b8d4c6e915
+Revises: e7c3b5d1a864
+Create Date: 2026-10-19 15:32:08.661470
+
+"""
+import math
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4c6e915'
+down_revision: Union[str, Sequence[str], None] = 'e7c3b5d1a864'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Формула приоритета на момент миграции (копия app.utils.ranking.calculate_moderation_priority):
+# миграция не зависит от кода приложения и от его будущих изменений
+REPUTATION_PER_REPORT = 100
+AGE_DOUBLING_HOURS = 6.0
+EPOCH = datetime(2020, 1, 1)
+
+
+def moderation_priority(pending_count: int, reputation: int, first_pending_at: datetime) -> float:
+    weight = pending_count + max(reputation or 0, 0) / REPUTATION_PER_REPORT
+    hours_before_epoch = (EPOCH - first_pending_at).total_seconds() / 3600
+    return math.log2(max(weight, 1.0)) + hours_before_epoch / AGE_DOUBLING_HOURS
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('report_content_stats', sa.Column('pending_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('report_content_stats', sa.Column('pending_reputation', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('report_content_stats', sa.Column('first_pending_at', sa.DateTime(), nullable=True))
+    op.add_column('report_content_stats', sa.Column('priority', sa.Float(), nullable=True))
+    op.create_index('ix_report_content_stats_priority', 'report_content_stats', ['priority'], unique=False)
+    
+    connection = op.get_bind()
+    if not sa.inspect(connection).has_table('reports'):
+        return
+    
+    # Заполняем очередь по открытым жалобам; приоритет считается в Python (log2 в SQLite может отсутствовать)
+    rows = connection.execute(sa.text(
+        "SELECT r.content_type, r.content_id, COUNT(*), COALESCE(SUM(COALESCE(u.reputation, 0)), 0), MIN(r.created_at) "
+        "FROM reports r LEFT JOIN users u ON u.id = r.reporter_id "
+        "WHERE r.status = 'PENDING' GROUP BY r.content_type, r.content_id;"
+    )).all()
+    for content_type, content_id, pending_count, reputation, first_pending_at in rows:
+        first_pending_at = datetime.fromisoformat(str(first_pending_at))
+        connection.execute(
+            sa.text(
+                "UPDATE report_content_stats SET pending_count = :pending_count, "
+                "pending_reputation = :reputation, first_pending_at = :first_pending_at, priority = :priority "
+                "WHERE content_type = :content_type AND content_id = :content_id;"
+            ),
+            {
+                "pending_count": pending_count,
+                "reputation": reputation,
+                "first_pending_at": first_pending_at,
+                "priority": moderation_priority(pending_count, reputation, first_pending_at),
+                "content_type": content_type,
+                "content_id": content_id,
+            }
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_report_content_stats_priority', table_name='report_content_stats')
+    op.drop_column('report_content_stats', 'priority')
+    op.drop_column('report_content_stats', 'first_pending_at')
+    op.drop_column('report_content_stats', 'pending_reputation')
+    op.drop_column('report_content_stats', 'pending_count')
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import Base, import_models
+from app.middleware.query_counter import count_queries
+
+
+async def make_session_factory(path: str, **engine_kwargs):
+    """
+    Временная база со схемой и начальными данными: роль 1, тема 1 "Дороги",
+    пользователи 1-3, пост 1 пользователя 1 и комментарий 1 пользователя 2 к нему.
+    engine_kwargs передаются в create_async_engine (например, размер пула)
+    """
+    import_models()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", **engine_kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("INSERT INTO roles (id, name, level) VALUES (1, 'user', 1)"))
+        await conn.execute(text("INSERT INTO themes (id, name, posts_count) VALUES (1, 'Дороги', 0)"))
+        await conn.execute(text(
+            "INSERT INTO users (id, name, email, hashed_password, role_id) VALUES "
+            "(1, 'u1', 'u1@test.ru', 'x', 1), (2, 'u2', 'u2@test.ru', 'x', 1), (3, 'u3', 'u3@test.ru', 'x', 1)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO posts (id, user_id, theme_id, header, body, created_at, likes, dislikes) "
+            "VALUES (1, 1, 1, 'Пост', 'Текст', CURRENT_TIMESTAMP, 0, 0)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO comments (id, user_id, post_id, body, created_at, likes, dislikes) "
+            "VALUES (1, 2, 1, 'Комментарий', CURRENT_TIMESTAMP, 0, 0)"
+        ))
+    return engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def add_post(db, post_id: int, body: str, header: str = "Мусор") -> None:
+    await db.session.execute(text(
+        "INSERT INTO posts (id, user_id, theme_id, header, body, created_at, likes, dislikes) "
+        "VALUES (:id, 1, 1, :header, :body, CURRENT_TIMESTAMP, 0, 0)"
+    ), {"id": post_id, "header": header, "body": body})
+
+
+def temp_db_runner():
+    """
+    run(check, **engine_kwargs): новая временная база на каждый вызов,
+    check(session_factory) выполняется в одном цикле событий с движком
+    """
+    def run(check, **engine_kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            async def main():
+                engine, session_factory = await make_session_factory(
+                    os.path.join(tmp, "test.db"), **engine_kwargs
+                )
+                try:
+                    return await check(session_factory)
+                finally:
+                    await engine.dispose()
+            return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def run_with_db():
+    return temp_db_runner()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Бюджет SQL-запросов для блока кода:
+
+        with assert_max_queries(3):
+            client.get("/api/v2/posts?limit=1")
+    """
+    @contextmanager
+    def check(limit: int):
+        with count_queries() as stats:
+            yield stats
+        statements = "\n".join(f"  {i}. {s}" for i, s in enumerate(stats.statements, 1))
+        assert stats.count <= limit, (
+            f"Ожидалось не больше {limit} запросов к БД, выполнено {stats.count}:\n{statements}"
+        )
+
+    return check
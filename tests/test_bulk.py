@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Тесты массового импорта и экспорта (app.tools.bulk) на отдельной временной базе
+"""
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import select, text
+
+from app.tools import bulk
+from tests.conftest import temp_db_runner
+
+
+def post_rows(start: int, count: int) -> list[dict]:
+    return [
+        {"id": post_id, "user_id": 1, "theme_id": 1, "header": f"Импорт {post_id}",
+         "body": f"Текст про трамвай номер {post_id}", "created_at": "2025-01-01T12:00:00",
+         "likes": 0, "dislikes": 0}
+        for post_id in range(start, start + count)
+    ]
+
+
+async def schema_names(session_factory, kind: str) -> set[str]:
+    async with session_factory() as session:
+        rows = await session.execute(text("SELECT name FROM sqlite_master WHERE type = :kind"), {"kind": kind})
+        return set(rows.scalars().all())
+
+
+async def table_rows(session_factory, entity: str) -> list[tuple]:
+    """Строки таблицы с приведением типов колонок (даты - datetime, а не строки SQLite)"""
+    table = bulk.get_table(entity)
+    async with session_factory() as session:
+        return (await session.execute(select(table).order_by(table.c.id))).all()
+
+
+def test_export_import_roundtrip(run_with_db, monkeypatch):
+    """Выгрузка и загрузка обратно через CLI (NDJSON и CSV) восстанавливают строки без изменений"""
+    async def check(session_factory):
+        monkeypatch.setattr(bulk, "engine", session_factory.kw["bind"])
+        await bulk.import_entity("posts", post_rows(100, 30), batch_size=7, batches_per_commit=2)
+        posts, comments = await table_rows(session_factory, "posts"), await table_rows(session_factory, "comments")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix in ("ndjson", "csv"):
+                posts_file, comments_file = os.path.join(tmp, f"posts.{suffix}"), os.path.join(tmp, f"comments.{suffix}")
+                await bulk.main(["export", "posts", "-o", posts_file, "--batch-size", "10"])
+                await bulk.main(["export", "comments", "-o", comments_file])
+                async with session_factory() as session:
+                    await session.execute(text("DELETE FROM comments"))
+                    await session.execute(text("DELETE FROM posts"))
+                    await session.commit()
+
+                await bulk.main(["import", "posts", "-i", posts_file, "--batch-size", "8", "--rebuild-indexes"])
+                await bulk.main(["import", "comments", "-i", comments_file])
+                print(f"{suffix}: постов {len(await table_rows(session_factory, 'posts'))}")
+                assert await table_rows(session_factory, "posts") == posts
+                assert await table_rows(session_factory, "comments") == comments
+
+        async with session_factory() as session:
+            found = (await session.execute(text(
+                "SELECT count(*) FROM posts_fts WHERE posts_fts MATCH 'трамвай'"
+            ))).scalar()
+        assert found == 30
+
+    run_with_db(check)
+
+
+def test_rebuild_indexes_restores_fts_triggers(run_with_db, monkeypatch):
+    """--rebuild-indexes снимает индексы и триггеры FTS на время загрузки, затем возвращает их и пересобирает FTS"""
+    async def check(session_factory):
+        monkeypatch.setattr(bulk, "engine", session_factory.kw["bind"])
+        indexes, triggers = await schema_names(session_factory, "index"), await schema_names(session_factory, "trigger")
+        assert {"posts_fts_ai", "posts_fts_ad", "posts_fts_au"} <= triggers
+
+        async with bulk.engine.begin() as conn:
+            dropped = await bulk._drop_secondary_indexes(conn, bulk.get_table("posts"))
+        assert not {"posts_fts_ai", "posts_fts_ad", "posts_fts_au"} & await schema_names(session_factory, "trigger")
+        assert "ix_posts_community_created" not in await schema_names(session_factory, "index")
+        async with bulk.engine.begin() as conn:
+            await bulk._rebuild_indexes(conn, dropped)
+
+        count = await bulk.import_entity("posts", post_rows(100, 50), batch_size=20, rebuild_indexes=True)
+        assert count == 50
+        assert await schema_names(session_factory, "index") == indexes
+        assert await schema_names(session_factory, "trigger") == triggers
+
+        async with session_factory() as session:
+            found = (await session.execute(text(
+                "SELECT count(*) FROM posts_fts WHERE posts_fts MATCH 'трамвай'"
+            ))).scalar()
+            await session.execute(text(
+                "INSERT INTO posts_fts(posts_fts, rank) VALUES ('integrity-check', 1)"
+            ))
+        print(f"Найдено в FTS после импорта: {found}")
+        assert found == 50
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_export_import_roundtrip(temp_db_runner(), monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_rebuild_indexes_restores_fts_triggers(temp_db_runner(), monkeypatch)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Тесты групповой записи комментариев на отдельной временной базе
+"""
+import asyncio
+from datetime import datetime
+
+import httpx
+from sqlalchemy import func, select
+
+from app.api.dependencies import get_db
+from app.config import settings
+from app.database.db_manager import DBManager
+from app.exceptions.comments import (
+    CommentQueueFullError,
+    CommentToDeletedPostError,
+    CommentWriteTimeoutError,
+)
+from app.models.comments import CommentModel
+from app.services.auth import AuthService
+from app.services.comment_writer import CommentWriter, comment_writer
+from tests.conftest import temp_db_runner
+
+
+def comment(user_id: int, post_id: int = 1) -> dict:
+    return {"post_id": post_id, "user_id": user_id, "body": "Текст", "created_at": datetime.utcnow(),
+            "likes": 0, "dislikes": 0}
+
+
+async def count_comments(session_factory) -> int:
+    """Комментарии, записанные тестом (без комментария из начальных данных)"""
+    async with session_factory() as session:
+        return (await session.execute(
+            select(func.count(CommentModel.id)).where(CommentModel.body == "Текст")
+        )).scalar()
+
+
+def test_concurrent_comments_are_written_in_batches(run_with_db):
+    """Одновременные комментарии записываются несколькими пачками, каждый получает свой id"""
+    async def check(session_factory):
+        writer = CommentWriter(session_factory, batch_delay=0.005, max_pending_per_user=100)
+        ids = await asyncio.gather(*(writer.submit(comment(1 + i % 2)) for i in range(100)))
+        await writer.stop()
+        print(f"Комментариев: {writer.written}, пачек: {writer.batches}")
+        assert len(set(ids)) == 100
+        assert writer.batches < 10
+        assert await count_comments(session_factory) == 100
+
+    run_with_db(check)
+
+
+def test_comment_to_missing_post_fails_only_its_caller(run_with_db):
+    """Комментарий к несуществующему посту не мешает остальным в той же пачке"""
+    async def check(session_factory):
+        writer = CommentWriter(session_factory, batch_delay=0.005)
+        results = await asyncio.gather(
+            writer.submit(comment(1)), writer.submit(comment(1, post_id=999)), writer.submit(comment(2)),
+            return_exceptions=True,
+        )
+        await writer.stop()
+        assert isinstance(results[0], int) and isinstance(results[2], int)
+        assert isinstance(results[1], CommentToDeletedPostError)
+        assert await count_comments(session_factory) == 2
+
+    run_with_db(check)
+
+
+def test_user_pending_limit_and_timeout(run_with_db):
+    """Лимит очереди на пользователя и таймаут: не записанный вовремя комментарий не сохраняется"""
+    async def check(session_factory):
+        writer = CommentWriter(session_factory, batch_delay=0.2, timeout=0.05, max_pending_per_user=2)
+        results = await asyncio.gather(*(writer.submit(comment(1)) for _ in range(3)), return_exceptions=True)
+        await writer.stop()
+        print(results)
+        assert sum(isinstance(r, CommentQueueFullError) for r in results) == 1
+        assert sum(isinstance(r, CommentWriteTimeoutError) for r in results) == 2
+        assert await count_comments(session_factory) == 0
+
+    run_with_db(check)
+
+
+def test_timeout_after_pickup_waits_for_commit(run_with_db):
+    """Комментарий, уже взятый в пачку, не получает таймаут: он будет записан, повтор дал бы дубль"""
+    async def check(session_factory):
+        writer = CommentWriter(session_factory, batch_delay=0, timeout=0.05)
+        insert = writer._insert
+
+        async def slow_insert(db, pending):
+            await asyncio.sleep(0.2)
+            await insert(db, pending)
+
+        writer._insert = slow_insert
+        comment_id = await writer.submit(comment(1))
+        await writer.stop()
+        assert isinstance(comment_id, int)
+        assert await count_comments(session_factory) == 1
+
+    run_with_db(check)
+
+
+def test_http_burst_does_not_exhaust_pool(run_with_db, monkeypatch):
+    """
+    Всплеск POST /comments при пуле из 3 соединений: запросы не держат свою
+    сессию, пока ждут пачку, поэтому писателю всегда хватает соединения
+    """
+    from main import app
+
+    async def check(session_factory):
+        async def temp_db():
+            async with DBManager(session_factory=session_factory) as db:
+                yield db
+
+        app.dependency_overrides[get_db] = temp_db
+        monkeypatch.setattr(settings, "COMMENT_GROUP_COMMIT", True)
+        monkeypatch.setattr(comment_writer, "session_factory", session_factory)
+        monkeypatch.setattr(comment_writer, "timeout", 3.0)
+        # Три автора, чтобы не упереться в лимит очереди на пользователя
+        clients = [
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test",
+                cookies={"access_token": AuthService.create_access_token({"user_id": user_id})},
+            )
+            for user_id in (1, 2, 3)
+        ]
+        try:
+            responses = await asyncio.gather(*(
+                clients[i % 3].post("/comments", json={"post_id": 1, "body": "Текст"}) for i in range(40)
+            ))
+            await comment_writer.stop()
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            for client in clients:
+                await client.aclose()
+        statuses = [response.status_code for response in responses]
+        print(f"Ответы: {sorted(set(statuses))}, пачек: {comment_writer.batches}")
+        assert statuses.count(200) == 40
+        assert await count_comments(session_factory) == 40
+
+    run_with_db(check, pool_size=3, max_overflow=0, pool_timeout=2)
+
+
+if __name__ == "__main__":
+    test_concurrent_comments_are_written_in_batches(temp_db_runner())
+    test_comment_to_missing_post_fails_only_its_caller(temp_db_runner())
+    test_user_pending_limit_and_timeout(temp_db_runner())
+    test_timeout_after_pickup_waits_for_commit(temp_db_runner())
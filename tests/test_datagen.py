@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Тесты генератора синтетических данных для бенчмарков
+"""
+import random
+
+from benchmarks.datagen import Scale, _posts, _reports
+
+
+def test_scale_matches_requested_rows():
+    """Сумма строк по таблицам близка к запрошенному объему на всем диапазоне 10k..10M"""
+    for rows in (10_000, 1_000_000, 10_000_000):
+        scale = Scale.for_rows(rows)
+        print(rows, scale)
+        assert abs(scale.total - rows) / rows < 0.01
+
+
+def test_generation_is_deterministic():
+    """Один и тот же seed дает одни и те же строки"""
+    scale = Scale.for_rows(10_000)
+    first = list(_posts(random.Random(7), scale)) + list(_reports(random.Random(7), scale))
+    second = list(_posts(random.Random(7), scale)) + list(_reports(random.Random(7), scale))
+    assert first == second
+    assert len(first) == scale.posts + scale.reports
+
+
+if __name__ == "__main__":
+    test_scale_matches_requested_rows()
+    test_generation_is_deterministic()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Тесты поиска почти одинаковых постов (MinHash + LSH)
+"""
+import random
+
+from sqlalchemy import func, select, text
+
+from app.database.db_manager import DBManager
+from app.models.post_signatures import PostLshBandModel, PostSignatureModel
+from app.services.duplicates import DuplicatePostService, backfill_signatures
+from app.utils.minhash import LSH_BANDS, band_keys, shingles, signature, similarity
+from benchmarks.datagen import WORDS
+from tests.conftest import add_post, temp_db_runner
+
+COMPLAINT = (
+    "Уже третью неделю на улице Ленина возле дома 15 не вывозят мусор, контейнеры переполнены, "
+    "пакеты лежат прямо на тротуаре, пахнет на весь двор. Управляющая компания на звонки не отвечает, "
+    "прошу администрацию района разобраться и наказать подрядчика."
+)
+
+
+def test_signature_similarity_tracks_jaccard():
+    """Оценка по подписям близка к коэффициенту Жаккара шинглов"""
+    rnd = random.Random(3)
+    words = [rnd.choice(WORDS) for _ in range(120)]
+    changed = words[:]
+    for index in rnd.sample(range(120), 6):
+        changed[index] = "изменено"
+    first, second = " ".join(words), " ".join(changed)
+    jaccard = len(shingles(first) & shingles(second)) / len(shingles(first) | shingles(second))
+    estimate = similarity(signature(first), signature(second))
+    print(f"Жаккар {jaccard:.2f}, оценка {estimate:.2f}")
+    assert abs(jaccard - estimate) < 0.15
+    assert signature("") is None
+    assert signature("Мусор НЕ вывозят!") == signature("мусор не вывозят")
+    assert len(band_keys(signature(first))) == LSH_BANDS
+
+
+def test_new_post_is_flagged_as_near_duplicate(run_with_db):
+    """Перепост с мелкими правками отмечается, непохожий пост - нет"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            service = DuplicatePostService(db)
+            await add_post(db, 2, COMPLAINT)
+            assert await service.index_post(2, "Мусор", COMPLAINT) == (None, None)
+
+            repost = COMPLAINT.replace("третью", "ТРЕТЬЮ").replace("района", "района!!!")
+            await add_post(db, 3, repost)
+            duplicate_of, score = await service.index_post(3, "Мусор", repost)
+            print(duplicate_of, score)
+            assert duplicate_of == 2 and score >= 0.8
+
+            other = "Во дворе на Садовой отремонтировали детскую площадку, поставили новые качели и горку."
+            await add_post(db, 4, other)
+            assert await service.index_post(4, "Площадка", other) == (None, None)
+
+            duplicates = await service.get_duplicates()
+            assert [(d["post"]["id"], d["original"]["id"]) for d in duplicates] == [(3, 2)]
+
+            # Удаление исходного поста снимает отметку
+            await db.post_signatures.delete_for_post(2)
+            assert await service.get_duplicates() == []
+
+    run_with_db(check)
+
+
+def test_edited_post_is_compared_only_with_earlier_posts(run_with_db):
+    """После правки старый пост не отмечается копией более нового"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            service = DuplicatePostService(db)
+            other = "Во дворе на Садовой отремонтировали детскую площадку, поставили новые качели и горку."
+            await add_post(db, 2, other)
+            await service.index_post(2, "Площадка", other)
+            await add_post(db, 3, COMPLAINT)
+            await service.index_post(3, "Мусор", COMPLAINT)
+
+            # Пост 2 правят и делают почти таким же, как пост 3
+            assert await service.index_post(2, "Мусор", COMPLAINT) == (None, None)
+            assert await service.get_duplicates() == []
+            # Повторная подпись поста 3 находит в нем копию исправленного поста 2
+            duplicate_of, _ = await service.index_post(3, "Мусор", COMPLAINT)
+            assert duplicate_of == 2
+
+    run_with_db(check)
+
+
+def test_backfill_signs_only_unsigned_posts(run_with_db):
+    """Пакетный пересчет подписывает посты без подписи и не трогает остальные"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            for post_id in range(2, 12):
+                await add_post(db, post_id, f"{COMPLAINT} Пост номер {post_id}.")
+            await DuplicatePostService(db).index_post(2, "Мусор", f"{COMPLAINT} Пост номер 2.")
+
+        signed = await backfill_signatures(batch_size=3, session_factory=session_factory)
+        assert signed == 10
+        async with DBManager(session_factory=session_factory) as db:
+            signatures = (await db.session.execute(select(func.count()).select_from(PostSignatureModel))).scalar()
+            bands = (await db.session.execute(select(func.count()).select_from(PostLshBandModel))).scalar()
+            assert signatures == 11 and bands == 11 * LSH_BANDS
+        assert await backfill_signatures(session_factory=session_factory) == 0
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_signature_similarity_tracks_jaccard()
+    test_new_post_is_flagged_as_near_duplicate(temp_db_runner())
+    test_edited_post_is_compared_only_with_earlier_posts(temp_db_runner())
+    test_backfill_signs_only_unsigned_posts(temp_db_runner())
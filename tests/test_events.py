@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Тесты шины событий: внутрипроцессный бэкенд и бэкенд с протоколом Redis
+"""
+import asyncio
+import logging
+
+import pytest
+
+from app.services.events import InMemoryEventBus, RedisEventBus, create_event_bus
+
+
+def test_in_memory_bus_delivers_by_topic():
+    """Обработчик получает только события своего топика"""
+    bus = InMemoryEventBus()
+    received = []
+    bus.subscribe("reactions", received.append)
+    bus.publish("reactions", {"post_id": 1, "likes": 5})
+    bus.publish("comments", {"id": 2})
+    bus.unsubscribe("reactions", received.append)
+    bus.publish("reactions", {"post_id": 1, "likes": 6})
+    print(f"Получено: {received}")
+    assert received == [{"post_id": 1, "likes": 5}]
+
+
+def test_handler_error_is_logged_and_others_still_run():
+    """Упавший обработчик пишется в лог с трассировкой и не мешает остальным"""
+    bus = InMemoryEventBus()
+    received, records = [], []
+
+    def broken(event):
+        raise ValueError("сломанный обработчик")
+
+    handler = logging.Handler()
+    handler.emit = records.append
+    logging.getLogger("app.events").addHandler(handler)
+    try:
+        bus.subscribe("posts", broken)
+        bus.subscribe("posts", received.append)
+        bus.publish("posts", {"id": 1})
+    finally:
+        logging.getLogger("app.events").removeHandler(handler)
+    assert received == [{"id": 1}]
+    assert len(records) == 1 and isinstance(records[0].exc_info[1], ValueError)
+
+
+def test_redis_bus_crosses_processes():
+    """Событие одной шины доходит до другой через общий сервер Redis (как между воркерами)"""
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        worker_a = RedisEventBus("redis://test", client=fakeredis.FakeAsyncRedis(server=server))
+        worker_b = RedisEventBus("redis://test", client=fakeredis.FakeAsyncRedis(server=server))
+        received_a, received_b = [], []
+        worker_a.subscribe("posts", received_a.append)
+        worker_b.subscribe("posts", received_b.append)
+        await worker_a.start()
+        await worker_b.start()
+
+        worker_a.publish("posts", {"action": "created", "post": {"id": 1}})
+        for _ in range(100):
+            if received_a and received_b:
+                break
+            await asyncio.sleep(0.01)
+
+        await worker_a.stop()
+        await worker_b.stop()
+        return received_a, received_b
+
+    received_a, received_b = asyncio.run(scenario())
+    print(f"Воркер A: {received_a}, воркер B: {received_b}")
+    assert received_a == received_b == [{"action": "created", "post": {"id": 1}}]
+
+
+def test_redis_bus_stop_is_bounded_when_publish_fails():
+    """Остановка не зависает, если Redis не принимает публикации: очередь отбрасывается по таймауту"""
+    fakeredis = pytest.importorskip("fakeredis")
+
+    class BrokenRedis(fakeredis.FakeAsyncRedis):
+        async def publish(self, channel, message):
+            raise ConnectionError("Redis недоступен")
+
+    async def scenario():
+        bus = RedisEventBus("redis://test", client=BrokenRedis(server=fakeredis.FakeServer()))
+        bus.RECONNECT_DELAY_SECONDS = 0.01
+        bus.STOP_TIMEOUT_SECONDS = 0.1
+        await bus.start()
+        bus.publish("posts", {"action": "created", "post": {"id": 1}})
+        bus.publish("posts", {"action": "created", "post": {"id": 2}})
+        await asyncio.wait_for(bus.stop(), 2)
+        return bus
+
+    bus = asyncio.run(scenario())
+    assert bus._tasks == []
+
+
+def test_create_event_bus_by_url():
+    assert isinstance(create_event_bus("memory://"), InMemoryEventBus)
+    assert isinstance(create_event_bus("redis://localhost:6379/0"), RedisEventBus)
+    with pytest.raises(ValueError):
+        create_event_bus("kafka://localhost")
+
+
+if __name__ == "__main__":
+    test_in_memory_bus_delivers_by_topic()
+    test_handler_error_is_logged_and_others_still_run()
+    test_redis_bus_crosses_processes()
+    test_redis_bus_stop_is_bounded_when_publish_fails()
+    test_create_event_bus_by_url()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Тесты потоковой выгрузки в NDJSON: сериализация строк и эндпоинты /export на временной базе
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.api import export
+from app.api.dependencies import get_db
+from app.database.db_manager import DBManager
+from app.models.reports import ReportContentTypeEnum, ReportStatusEnum
+from app.repositories.posts import PostsRepository
+from app.services.auth import AuthService
+from app.utils.ndjson import dumps_line
+from main import app
+from tests.conftest import add_post, make_session_factory
+from tests.test_report_stats import add_report
+
+POST = ReportContentTypeEnum.POST
+MODERATOR_ID = 4
+
+
+@pytest.fixture(scope="module")
+def client_for(tmp_path_factory):
+    """
+    client_for(user_id): клиент с токеном пользователя на временной базе с модератором 4,
+    постами 1-3 (пост 3 - в теме 2, из 2025 года) и тремя жалобами
+    """
+    path = tmp_path_factory.mktemp("export") / "test.db"
+
+    async def prepare():
+        engine, session_factory = await make_session_factory(str(path), poolclass=NullPool)
+        async with DBManager(session_factory=session_factory) as db:
+            await db.session.execute(text(
+                "INSERT INTO roles (id, name, level) VALUES (2, 'moderator', 2)"
+            ))
+            await db.session.execute(text(
+                "INSERT INTO users (id, name, email, hashed_password, role_id) "
+                "VALUES (4, 'u4', 'u4@test.ru', 'x', 2)"
+            ))
+            await db.session.execute(text("INSERT INTO themes (id, name, posts_count) VALUES (2, 'Парки', 0)"))
+            await add_post(db, 2, "Второй пост")
+            await add_post(db, 3, "Пост о сквере", header="Сквер")
+            await db.session.execute(text(
+                "UPDATE posts SET theme_id = 2, user_id = 2, created_at = '2025-06-01 10:00:00' WHERE id = 3"
+            ))
+            await add_report(db, 1, POST, 1, minutes=1)
+            await add_report(db, 2, POST, 1, ReportStatusEnum.RESOLVED, minutes=2)
+            await add_report(db, 3, ReportContentTypeEnum.COMMENT, 1, minutes=3)
+        return session_factory
+
+    session_factory = asyncio.run(prepare())
+
+    async def temp_db():
+        async with DBManager(session_factory=session_factory) as db:
+            yield db
+
+    def client_for(user_id: int) -> TestClient:
+        client = TestClient(app)
+        client.cookies.set("access_token", AuthService.create_access_token({"user_id": user_id}))
+        return client
+
+    app.dependency_overrides[get_db] = temp_db
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(export, "async_session_maker", session_factory)
+        yield client_for
+    app.dependency_overrides.pop(get_db, None)
+
+
+def read_ndjson(response) -> list[dict]:
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_dumps_line_serializes_enums_and_dates():
+    """Enum выгружается значением, дата - в ISO, каждая запись - одна строка"""
+    line = dumps_line({
+        "id": 1,
+        "content_type": ReportContentTypeEnum.POST,
+        "status": ReportStatusEnum.PENDING,
+        "reason": "Спам\nв две строки",
+        "created_at": datetime(2025, 12, 19, 14, 30),
+    })
+    print(line)
+    assert line.endswith("\n") and line.count("\n") == 1
+    assert json.loads(line) == {
+        "id": 1,
+        "content_type": "post",
+        "status": "pending",
+        "reason": "Спам\nв две строки",
+        "created_at": "2025-12-19T14:30:00",
+    }
+
+
+def test_export_requires_moderator(client_for):
+    """Без авторизации - 401, обычному пользователю - 403"""
+    assert TestClient(app).get("/export/posts.ndjson").status_code == 401
+    assert client_for(2).get("/export/posts.ndjson").status_code == 403
+    assert client_for(2).get("/export/reports.ndjson").status_code == 403
+
+
+def test_export_posts_streams_ndjson_with_filters(client_for):
+    """Каждый пост - строка NDJSON, фильтры по теме, автору и периоду сужают выгрузку"""
+    client = client_for(MODERATOR_ID)
+    posts = read_ndjson(client.get("/export/posts.ndjson"))
+    print(posts)
+    assert [post["id"] for post in posts] == [1, 2, 3]
+    assert posts[2]["header"] == "Сквер" and posts[2]["created_at"] == "2025-06-01T10:00:00"
+
+    assert [post["id"] for post in read_ndjson(client.get("/export/posts.ndjson", params={"theme_id": 2}))] == [3]
+    assert [post["id"] for post in read_ndjson(client.get("/export/posts.ndjson", params={"user_id": 1}))] == [1, 2]
+    in_2025 = client.get("/export/posts.ndjson", params={
+        "created_from": "2025-01-01T00:00:00", "created_to": "2026-01-01T00:00:00",
+    })
+    assert [post["id"] for post in read_ndjson(in_2025)] == [3]
+
+
+def test_export_reports_filters_by_status_and_type(client_for):
+    """Жалобы выгружаются со значениями enum, фильтры по статусу, типу и автору"""
+    client = client_for(MODERATOR_ID)
+    reports = read_ndjson(client.get("/export/reports.ndjson"))
+    assert [(report["content_type"], report["status"]) for report in reports] == [
+        ("post", "pending"), ("post", "resolved"), ("comment", "pending"),
+    ]
+    pending = read_ndjson(client.get("/export/reports.ndjson", params={"status": "pending"}))
+    assert [report["reporter_id"] for report in pending] == [1, 3]
+    comments = read_ndjson(client.get("/export/reports.ndjson", params={"content_type": "comment"}))
+    assert [report["reporter_id"] for report in comments] == [3]
+    assert read_ndjson(client.get("/export/reports.ndjson", params={"reporter_id": 2}))[0]["status"] == "resolved"
+    assert client.get("/export/reports.ndjson", params={"status": "unknown"}).status_code == 422
+
+
+def test_stream_rows_rejects_unknown_filter():
+    """Фильтр по несуществующему столбцу - ошибка при вызове, а не выгрузка всей таблицы"""
+    with pytest.raises(ValueError, match="comunity_id"):
+        PostsRepository(session=None).stream_rows(comunity_id=1)
+
+
+if __name__ == "__main__":
+    test_dumps_line_serializes_enums_and_dates()
+    test_stream_rows_rejects_unknown_filter()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Тесты персональной ленты: курсоры, диапазоны сообществ и слияние страниц
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.exceptions.posts import InvalidFeedCursorError
+from app.middleware.query_counter import count_queries
+from app.services.feed import FeedService, decode_feed_cursor, encode_feed_cursor
+from app.services.posts import PostService
+from tests.conftest import temp_db_runner
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+# Посты сообществ: id -> (сообщество, минуты от BASE_TIME)
+FEED_POSTS = {
+    10: (1, 50), 11: (1, 40), 12: (1, 30), 13: (1, 20), 14: (1, 10),
+    20: (2, 45), 21: (2, 35),
+    30: (3, 60),
+}
+
+
+def test_feed_cursor_roundtrip():
+    """Курсор однозначно восстанавливает позицию (created_at, id)"""
+    position = (datetime(2025, 12, 19, 14, 30, 5, 123456), 42)
+    cursor = encode_feed_cursor(*position)
+    print(f"Курсор: {cursor}")
+    assert decode_feed_cursor(cursor) == position
+
+
+def test_feed_cursor_rejects_garbage():
+    """Некорректный курсор приводит к доменной ошибке, а не к 500"""
+    with pytest.raises(InvalidFeedCursorError):
+        decode_feed_cursor("не-курсор")
+
+
+async def add_feed_data(db) -> None:
+    """
+    Три сообщества: пользователь 2 состоит в 1 и 2, пользователь 3 - только в 1.
+    Даты - без микросекунд, как у CURRENT_TIMESTAMP
+    """
+    await db.session.execute(text(
+        "INSERT INTO communities (id, name, description, posts_count, members_count) VALUES "
+        "(1, 'Центр', '', 0, 0), (2, 'Север', '', 0, 0), (3, 'Юг', '', 0, 0)"
+    ))
+    await db.session.execute(text(
+        "INSERT INTO user_communities (user_id, community_id) VALUES (2, 1), (2, 2), (3, 1)"
+    ))
+    for post_id, (community_id, minutes) in FEED_POSTS.items():
+        created_at = (BASE_TIME + timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M:%S")
+        await db.session.execute(text(
+            "INSERT INTO posts (id, user_id, theme_id, community_id, header, body, created_at, likes, dislikes) "
+            "VALUES (:id, 1, 1, :community_id, 'Пост', 'Текст', :created_at, 0, 0)"
+        ), {"id": post_id, "community_id": community_id, "created_at": created_at})
+
+
+def with_feed(check):
+    async def seeded(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_feed_data(db)
+        async with DBManager(session_factory=session_factory) as db:
+            await check(db)
+    return seeded
+
+
+def test_community_ranges_are_limited_and_sorted(run_with_db):
+    """Диапазон каждого сообщества - не больше per_community новейших ключей, по убыванию"""
+    async def check(db):
+        ranges = await db.posts.get_community_ranges([1, 2, 5], per_community=3)
+        assert [post_id for _, post_id in ranges[1]] == [10, 11, 12]
+        assert [post_id for _, post_id in ranges[2]] == [20, 21]
+        assert ranges[5] == []
+        assert ranges[1][0][0] == BASE_TIME + timedelta(minutes=50)
+
+        # Граница (created_at, id) - строго "раньше", даже если дата хранится без микросекунд
+        ranges = await db.posts.get_community_ranges([1], per_community=10, before=ranges[1][1])
+        assert [post_id for _, post_id in ranges[1]] == [12, 13, 14]
+
+    run_with_db(with_feed(check))
+
+
+def test_feed_pages_merge_communities_in_order(run_with_db):
+    """Страницы ленты идут по убыванию даты через все сообщества, без пропусков и повторов"""
+    async def check(db):
+        feed = FeedService(db)
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await feed.get_feed(user_id=2, cursor=cursor, limit=2)
+            seen += [item["id"] for item in page["items"]]
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        print(f"Лента: {seen} за {pages} страниц")
+        # Пост 30 из сообщества, в котором пользователь не состоит, в ленту не попадает
+        assert seen == [10, 20, 11, 21, 12, 13, 14]
+        assert pages == 4
+
+    run_with_db(with_feed(check))
+
+
+def test_feed_has_more_on_exact_page_boundary(run_with_db):
+    """has_more: курсор есть, пока остались посты, и нет на последней полной странице"""
+    async def check(db):
+        feed = FeedService(db)
+        first = await feed.get_feed(user_id=2, limit=5)
+        assert [item["id"] for item in first["items"]] == [10, 20, 11, 21, 12]
+        second = await feed.get_feed(user_id=2, cursor=first["next_cursor"], limit=2)
+        assert [item["id"] for item in second["items"]] == [13, 14]
+        assert second["next_cursor"] is None
+        assert (await feed.get_feed(user_id=1))["items"] == []
+
+        # Одно сообщество: граничный пост не занимает место в запрошенных limit + 1
+        first = await feed.get_feed(user_id=3, limit=2)
+        second = await feed.get_feed(user_id=3, cursor=first["next_cursor"], limit=2)
+        assert [item["id"] for item in second["items"]] == [12, 13]
+        assert second["next_cursor"] is not None
+        third = await feed.get_feed(user_id=3, cursor=second["next_cursor"], limit=2)
+        assert [item["id"] for item in third["items"]] == [14]
+        assert third["next_cursor"] is None
+
+    run_with_db(with_feed(check))
+
+
+def test_posts_for_web_load_details_in_batches(run_with_db):
+    """Список постов для страниц: автор, сообщество и комментарии - без запросов на каждый пост"""
+    async def check(db):
+        with count_queries() as stats:
+            posts = await PostService(db).get_posts_for_web(limit=20)
+        print(f"Постов: {len(posts)}, запросов: {stats.count}")
+        assert len(posts) == len(FEED_POSTS) + 1 and stats.count <= 5
+        by_id = {post["id"]: post for post in posts}
+        assert by_id[1]["comments_count"] == 1 and by_id[1]["community_name"] == "Unknown"
+        assert by_id[20]["community_name"] == "Север" and by_id[20]["user_name"] == "u1"
+        assert by_id[20]["theme_name"] == "Дороги" and by_id[20]["comments_count"] == 0
+
+    run_with_db(with_feed(check))
+
+
+if __name__ == "__main__":
+    test_feed_cursor_roundtrip()
+    test_feed_cursor_rejects_garbage()
+    test_community_ranges_are_limited_and_sorted(temp_db_runner())
+    test_feed_pages_merge_communities_in_order(temp_db_runner())
+    test_feed_has_more_on_exact_page_boundary(temp_db_runner())
+    test_posts_for_web_load_details_in_batches(temp_db_runner())
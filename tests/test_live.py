@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Тесты хаба живых обновлений (SSE)
+"""
+import asyncio
+
+import pytest
+
+from app.exceptions.live import LiveConnectionsLimitError
+from app.services.live import LiveHub, format_sse, post_topic
+
+
+def test_burst_of_reactions_is_coalesced():
+    """Сотня лайков в окне склейки уходит подписчику одним событием с последними счетчиками"""
+    async def scenario():
+        hub = LiveHub(max_connections=10, coalesce_seconds=0.05, heartbeat_seconds=1)
+        subscription = hub.subscribe(post_topic(1))
+        for likes in range(1, 101):
+            hub.publish(post_topic(1), "reactions", {"likes": likes, "dislikes": 0})
+        hub.publish(post_topic(1), "comment", {"id": 7}, key="comment:7")
+        hub.publish(post_topic(2), "reactions", {"likes": 999, "dislikes": 0})
+        return await subscription.next_batch(hub.heartbeat_seconds, hub.coalesce_seconds)
+
+    batch = asyncio.run(scenario())
+    print(f"Пачка событий: {batch}")
+    assert batch == [("reactions", {"likes": 100, "dislikes": 0}), ("comment", {"id": 7})]
+
+
+def test_connections_are_capped_per_worker():
+    """Подключения сверх лимита отклоняются, отписка освобождает место"""
+    hub = LiveHub(max_connections=2)
+    first = hub.subscribe(post_topic(1))
+    hub.subscribe(post_topic(1))
+    with pytest.raises(LiveConnectionsLimitError):
+        hub.subscribe(post_topic(2))
+    hub.unsubscribe(first)
+    hub.unsubscribe(first)
+    assert hub.connections == 1
+    hub.subscribe(post_topic(2))
+
+
+def test_endpoint_reserves_slot_before_response(monkeypatch):
+    """Место занимается до отправки заголовков: лишнее подключение получает 503, поток освобождает место"""
+    from app.api import live as live_api
+    from app.exceptions.live import LiveConnectionsLimitHTTPError
+
+    hub = LiveHub(max_connections=1, heartbeat_seconds=0.01)
+    monkeypatch.setattr(live_api, "live_hub", hub)
+
+    async def scenario():
+        response = live_api._sse_response(post_topic(1))
+        assert hub.connections == 1
+        with pytest.raises(LiveConnectionsLimitHTTPError):
+            live_api._sse_response(post_topic(2))
+        assert await response.body_iterator.__anext__() == "retry: 10\n\n"
+        await response.body_iterator.aclose()
+        assert hub.connections == 0
+
+    asyncio.run(scenario())
+
+
+def test_format_sse_frame():
+    assert format_sse("reactions", {"likes": 1}) == 'event: reactions\ndata: {"likes": 1}\n\n'
+
+
+if __name__ == "__main__":
+    test_burst_of_reactions_is_coalesced()
+    test_connections_are_capped_per_worker()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_endpoint_reserves_slot_before_response(monkeypatch)
+    test_format_sse_frame()
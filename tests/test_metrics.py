@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Тесты метрик в формате Prometheus
+"""
+from fastapi.testclient import TestClient
+
+from app.utils.metrics import Counter, Histogram, Registry
+from main import app
+
+
+def test_histogram_exposition_is_cumulative():
+    """Корзины накопительные, +Inf равна count, метки экранируются"""
+    registry = Registry()
+    histogram = Histogram("latency_seconds", "Задержка", ("route",), buckets=(0.1, 1.0), registry=registry)
+    histogram.observe(0.05, '/a"b')
+    histogram.observe(0.5, '/a"b')
+    histogram.observe(5.0, '/a"b')
+    counter = Counter("hits_total", "Попадания", registry=registry)
+    counter.inc(amount=3)
+
+    text = registry.render()
+    print(text)
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a\\"b"} 3' in text
+    assert "hits_total 3" in text
+
+
+def test_metrics_endpoint_reports_route_templates():
+    """Запросы учитываются по шаблону маршрута, а не по фактическому пути"""
+    client = TestClient(app)
+    client.get("/api/v2/posts/123456/reaction")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v2/posts/{post_id}/reaction"' in response.text
+    assert "/123456" not in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+if __name__ == "__main__":
+    test_histogram_exposition_is_cumulative()
+    test_metrics_endpoint_reports_route_templates()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Тесты порога регрессии микробенчмарков
+"""
+from benchmarks.micro.gate import compare
+
+
+def test_compare_flags_only_slowdowns_over_threshold():
+    """Замедление больше порога - регрессия; ускорение, новые и пропавшие бенчмарки - нет"""
+    baseline = {"fast": 0.010, "slow": 0.010, "same": 0.010, "removed": 0.010}
+    timings = {"fast": 0.005, "slow": 0.0125, "same": 0.0119, "added": 0.001}
+    regressions = compare(timings, baseline, threshold=0.2)
+    print(f"Регрессии: {regressions}")
+    assert regressions == ["slow"]
+
+
+def test_compare_ignores_small_absolute_slowdowns():
+    """На путях около миллисекунды замедление меньше min_delta_ms - шум, а не регрессия"""
+    baseline = {"tiny": 0.0010, "small": 0.0010, "big": 0.0100}
+    timings = {"tiny": 0.0014, "small": 0.0016, "big": 0.0130}
+    assert compare(timings, baseline, threshold=0.2, min_delta_ms=0.5) == ["big", "small"]
+    assert compare(timings, baseline, threshold=0.2, min_delta_ms=0) == ["big", "small", "tiny"]
+
+
+if __name__ == "__main__":
+    test_compare_flags_only_slowdowns_over_threshold()
+    test_compare_ignores_small_absolute_slowdowns()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Тесты очереди модерации: группировка жалоб по контенту, приоритет и решение по группе
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.exceptions.reports import NoPendingReportsError
+from app.models.reports import ReportContentTypeEnum, ReportStatusEnum
+from app.schemes.reports import ContentType, ReportStatus
+from app.services.moderation import ModerationService
+from app.utils.ranking import MODERATION_AGE_DOUBLING_HOURS, calculate_moderation_priority
+from tests.conftest import temp_db_runner
+from tests.test_report_stats import BASE_TIME, add_report
+
+POST = ReportContentTypeEnum.POST
+COMMENT = ReportContentTypeEnum.COMMENT
+
+
+def test_priority_weighs_count_against_age():
+    """Удвоение числа жалоб равноценно ожиданию MODERATION_AGE_DOUBLING_HOURS часов"""
+    older = calculate_moderation_priority(1, 0, BASE_TIME)
+    newer_doubled = calculate_moderation_priority(2, 0, BASE_TIME + timedelta(hours=MODERATION_AGE_DOUBLING_HOURS))
+    assert abs(older - newer_doubled) < 1e-9
+    assert calculate_moderation_priority(1, 100, BASE_TIME) > older
+    assert calculate_moderation_priority(3, 0, BASE_TIME) > older
+
+
+def with_queue(check):
+    """check(db) на базе с тремя жалобами на пост 1 и одной (позже) на комментарий 1"""
+    async def seeded(session_factory):
+        async with session_factory() as session:
+            await session.execute(text("UPDATE users SET reputation = 500 WHERE id = 3"))
+            await session.commit()
+        async with DBManager(session_factory=session_factory) as db:
+            # Три жалобы на пост, одна (от пользователя с репутацией) - на комментарий, позже
+            await add_report(db, 1, POST, 1, minutes=0)
+            await add_report(db, 2, POST, 1, minutes=1)
+            await add_report(db, 3, POST, 1, ReportStatusEnum.REJECTED, minutes=2)
+            await add_report(db, 3, COMMENT, 1, minutes=3)
+        async with DBManager(session_factory=session_factory) as db:
+            await check(db)
+    return seeded
+
+
+def test_queue_groups_reports_by_content(run_with_db):
+    """Одна строка очереди на контент, только открытые жалобы, порядок по приоритету"""
+    async def check(db):
+        queue = await ModerationService(db).get_queue()
+        print([(item["content_type"], item["pending_count"], round(item["priority"], 2)) for item in queue])
+        assert [(item["content_type"], item["content_id"]) for item in queue] == [("comment", 1), ("post", 1)]
+        post = queue[1]
+        assert post["pending_count"] == 2 and post["reports_count"] == 3
+        assert post["first_pending_at"] == BASE_TIME
+        assert post["reasons"] == [{"reason": "Нарушение правил", "count": 2}]
+        assert post["content_author_name"] == "u1"
+        assert queue[0]["pending_reputation"] == 500
+
+    run_with_db(with_queue(check))
+
+
+def test_resolve_closes_whole_group(run_with_db):
+    """Решение по контенту закрывает все его открытые жалобы и убирает его из очереди"""
+    async def check(db):
+        service = ModerationService(db)
+        resolved = await service.resolve(ContentType.POST, 1, ReportStatus.RESOLVED, moderator_id=1,
+                                         moderator_comment="Пост удален")
+        assert resolved == 2
+        queue = await service.get_queue()
+        assert [(item["content_type"], item["content_id"]) for item in queue] == [("comment", 1)]
+
+        reports = await db.reports.get_by_content(POST, 1)
+        assert sorted(r.status.value for r in reports) == ["rejected", "resolved", "resolved"]
+        assert {r.moderator_id for r in reports if r.status == ReportStatusEnum.RESOLVED} == {1}
+
+        try:
+            await service.resolve(ContentType.POST, 1, ReportStatus.REJECTED, moderator_id=1)
+        except NoPendingReportsError:
+            pass
+        else:
+            raise AssertionError("Повторное решение должно завершиться NoPendingReportsError")
+
+    run_with_db(with_queue(check))
+
+
+if __name__ == "__main__":
+    test_priority_weighs_count_against_age()
+    test_queue_groups_reports_by_content(temp_db_runner())
+    test_resolve_closes_whole_group(temp_db_runner())
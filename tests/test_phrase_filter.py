@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Тесты фильтра запрещенных фраз (автомат Ахо-Корасик и перезагрузка списка)
+"""
+import asyncio
+import os
+import tempfile
+
+from app.config import PROJECT_ROOT
+from app.exceptions.content_filter import BannedContentError
+from app.services.content_filter import BannedPhrases
+from app.utils.aho_corasick import AhoCorasick, normalize
+
+
+def test_finds_all_overlapping_phrases():
+    """Все вхождения, в том числе вложенные и перекрывающиеся, с позициями в исходном тексте"""
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    text = "ushers"
+    found = sorted((m.phrase, m.start, m.end) for m in matcher.find(text, whole_words=False))
+    print(found)
+    assert found == [("he", 2, 4), ("hers", 2, 6), ("she", 1, 4)]
+
+
+def test_case_folding_and_homoglyphs():
+    """Регистр, "ё" и латинские двойники кириллических букв не мешают совпадению"""
+    matcher = AhoCorasick(["спам", "ёлка"])
+    text = "Тут CПAM и eЛКА"
+    assert len(normalize(text)) == len(text)
+    found = [(m.phrase, text[m.start:m.end]) for m in matcher.find(text)]
+    assert found == [("спам", "CПAM"), ("ёлка", "eЛКА")]
+
+
+def test_whole_words_and_prefix_phrases():
+    """Фраза не находится внутри слова; фраза со "*" находит слова с этим началом"""
+    matcher = AhoCorasick(["бан", "казино*", "ставки на спорт"])
+    assert not matcher.contains_any("Банк открылся на Садовой")
+    assert matcher.contains_any("Дали бан, обидно")
+    assert [m.phrase for m in matcher.find("Казиношный клуб и СТАВКИ на спорт")] == ["казино*", "ставки на спорт"]
+    assert not matcher.contains_any("скидки на спортивные товары")
+
+
+def test_hot_reload_and_ensure_clean():
+    """Изменение файла подхватывается без перезапуска, ensure_clean называет найденные фразы"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "phrases.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# комментарий\nспам\n\n")
+        phrases = BannedPhrases(path, check_interval=0)
+        phrases.ensure_clean("Обычный текст", None)
+        try:
+            phrases.ensure_clean("Заголовок", "Это спам")
+        except BannedContentError as e:
+            assert e.phrases == ["спам"]
+        else:
+            raise AssertionError("Ожидалась BannedContentError")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("реклама\n")
+        os.utime(path, (1, 1))
+        phrases.ensure_clean("Это спам")
+        assert len(phrases.matcher) == 1
+        try:
+            phrases.ensure_clean("Платная РЕКЛАМА")
+        except BannedContentError as e:
+            print(e)
+            assert e.phrases == ["реклама"]
+        else:
+            raise AssertionError("Ожидалась BannedContentError")
+
+        os.remove(path)
+        phrases.ensure_clean("реклама")
+        assert len(phrases.matcher) == 0
+
+
+def test_reload_inside_event_loop_does_not_block_request():
+    """В цикле событий изменение файла не пересобирает автомат в запросе: сборка идет в потоке"""
+    async def scenario(path):
+        phrases = BannedPhrases(path, check_interval=0)
+        phrases.reload()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("спам\nреклама\n")
+        os.utime(path, (1, 1))
+        # Запрос, заметивший изменение, проверяется по прежнему автомату
+        assert len(phrases.matcher) == 1
+        await phrases._reloading
+        assert len(phrases.matcher) == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "phrases.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("спам\n")
+        asyncio.run(scenario(path))
+
+
+def test_default_file_is_resolved_from_project_root(monkeypatch):
+    """Файл по умолчанию ищется от корня проекта, из какого бы каталога ни был запущен сервер"""
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.chdir(tmp)
+        phrases = BannedPhrases(check_interval=0)
+        assert os.path.dirname(phrases.path) == os.path.normpath(PROJECT_ROOT)
+        assert os.path.exists(phrases.path)
+        assert len(phrases.matcher) > 0
+
+
+if __name__ == "__main__":
+    test_finds_all_overlapping_phrases()
+    test_case_folding_and_homoglyphs()
+    test_whole_words_and_prefix_phrases()
+    test_hot_reload_and_ensure_clean()
+    test_reload_inside_event_loop_does_not_block_request()
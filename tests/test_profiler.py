@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Тесты семплирующего профайлера и middleware профилирования запросов
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.database import database
+from app.middleware.profiler import ProfilerMiddleware
+from app.services.auth import AuthService
+from app.utils.profiler import SamplingProfiler
+from tests.conftest import make_session_factory
+
+
+def busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def make_app(output_dir: str, sample_rate: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        busy_loop(0.1)
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware, output_dir=output_dir, sample_rate=sample_rate, interval_ms=1)
+    return app
+
+
+def test_sampling_profiler_collects_folded_stacks():
+    """Стеки свернуты в строки "корень;...;лист число", горячая функция видна в профиле"""
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_loop(0.2)
+    profiler.stop()
+
+    lines = profiler.collapsed().splitlines()
+    print(f"Семплов: {profiler.samples}, уникальных стеков: {len(lines)}")
+    assert profiler.samples > 10
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+    assert any("busy_loop (tests/test_profiler.py" in line for line in lines)
+
+
+def test_sampled_request_writes_profile():
+    """Запрос из выборки (1 из 1) профилируется, имя файла - в заголовке X-Profile-Id"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        response = TestClient(make_app(output_dir, sample_rate=1)).get("/work")
+        assert response.status_code == 200
+        name = response.headers["x-profile-id"]
+        print(f"Профиль: {name}")
+        with open(os.path.join(output_dir, name), encoding="utf-8") as f:
+            assert "busy_loop" in f.read()
+
+
+def test_profile_header_requires_admin():
+    """Заголовок X-Profile без авторизации администратора игнорируется"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        response = TestClient(make_app(output_dir, sample_rate=0)).get("/work", headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert os.listdir(output_dir) == []
+
+
+def test_profile_header_from_user_without_role(monkeypatch):
+    """Пользователь без роли с заголовком X-Profile получает обычный ответ, а не 500"""
+    with tempfile.TemporaryDirectory() as tmp:
+        async def prepare():
+            engine, session_factory = await make_session_factory(os.path.join(tmp, "test.db"), poolclass=NullPool)
+            async with engine.begin() as conn:
+                # Роль 99 не существует: user.role - None
+                await conn.execute(text(
+                    "INSERT INTO users (id, name, email, hashed_password, role_id) "
+                    "VALUES (4, 'u4', 'u4@test.ru', 'x', 99)"
+                ))
+            return session_factory
+
+        monkeypatch.setattr(database, "async_session_maker", asyncio.run(prepare()))
+        output_dir = os.path.join(tmp, "profiles")
+        client = TestClient(make_app(output_dir, sample_rate=0))
+        client.cookies.set("access_token", AuthService.create_access_token({"user_id": 4}))
+        response = client.get("/work", headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert not os.path.exists(output_dir)
+
+
+if __name__ == "__main__":
+    test_sampling_profiler_collects_folded_stacks()
+    test_sampled_request_writes_profile()
+    test_profile_header_requires_admin()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_profile_header_from_user_without_role(monkeypatch)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Бюджеты SQL-запросов для эндпоинтов (фикстура assert_max_queries из conftest.py)
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import NullPool
+
+from app.api.dependencies import get_db
+from app.database.db_manager import DBManager
+from app.middleware.query_counter import count_queries
+from main import app
+from tests.conftest import make_session_factory
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """
+    Клиент на временной базе: зависимость DBDep подменяется на ее сессии.
+    NullPool - TestClient выполняет запросы в разных циклах событий
+    """
+    path = tmp_path_factory.mktemp("query_budget") / "test.db"
+    engine, session_factory = asyncio.run(make_session_factory(str(path), poolclass=NullPool))
+
+    async def temp_db():
+        async with DBManager(session_factory=session_factory) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = temp_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_count_queries_records_statements(client):
+    with count_queries() as stats:
+        client.get("/themes")
+    print(f"Запросов: {stats.count}, {stats.statements}")
+    assert stats.count == len(stats.statements) >= 1
+
+
+def test_themes_query_budget(client, assert_max_queries):
+    with assert_max_queries(1):
+        assert client.get("/themes").status_code == 200
+
+
+def test_communities_page_query_budget(client, assert_max_queries):
+    with assert_max_queries(1):
+        assert client.get("/web/communities").status_code == 200
+
+
+def test_index_page_query_budget(client, assert_max_queries):
+    """Главная без входа: посты с деталями пачками (4 запроса) и статистика форума и тем (7)"""
+    with assert_max_queries(11):
+        assert client.get("/web/").status_code == 200
+
+
+def test_posts_page_of_one_query_budget(client, assert_max_queries):
+    with assert_max_queries(3):
+        assert client.get("/api/v2/posts", params={"limit": 1}).status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Тесты формулы "горячести" постов
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.services.ranking import RankingService
+from app.utils.ranking import calculate_hot_score
+from tests.conftest import add_post, temp_db_runner
+
+
+NOW = datetime(2025, 12, 20, 12, 0, 0)
+
+
+def test_hot_score_decays_with_age():
+    """Одинаковые реакции: свежий пост горячее старого"""
+    fresh = calculate_hot_score(10, 0, 0, NOW - timedelta(hours=1), NOW)
+    old = calculate_hot_score(10, 0, 0, NOW - timedelta(days=3), NOW)
+    print(f"Свежий: {fresh:.4f}, старый: {old:.4f}")
+    assert fresh > old > 0
+
+
+def test_hot_score_counts_comments_and_dislikes():
+    """Комментарии повышают, дизлайки понижают горячесть"""
+    created_at = NOW - timedelta(hours=5)
+    base = calculate_hot_score(5, 0, 0, created_at, NOW)
+    assert calculate_hot_score(5, 0, 3, created_at, NOW) > base
+    assert calculate_hot_score(5, 4, 0, created_at, NOW) < base
+    assert calculate_hot_score(0, 5, 0, created_at, NOW) < 0
+
+
+def test_hot_score_handles_missing_values():
+    """Пустые счетчики и дата не ломают расчет"""
+    assert calculate_hot_score(None, None, None, None, NOW) == 0
+
+
+def test_ranked_posts_filtered_by_theme(run_with_db):
+    """Сортировки hot и top учитывают фильтр по теме"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await db.session.execute(text("INSERT INTO themes (id, name, posts_count) VALUES (2, 'Парки', 0)"))
+            await add_post(db, 2, "Яма на дороге")
+            await add_post(db, 3, "Новый сквер")
+            await db.session.execute(text(
+                "UPDATE posts SET theme_id = 2, likes = 10, hot_score = 10 WHERE id = 3"
+            ))
+        async with DBManager(session_factory=session_factory) as db:
+            ranking = RankingService(db)
+            for sort in ("hot", "top"):
+                all_posts = await ranking.get_ranked_posts(sort=sort, window="all")
+                roads = await ranking.get_ranked_posts(sort=sort, window="all", theme_id=1)
+                parks = await ranking.get_ranked_posts(sort=sort, window="all", theme_id=2)
+                assert [post.id for post in all_posts][0] == 3
+                assert sorted(post.id for post in roads) == [1, 2]
+                assert [post.id for post in parks] == [3]
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_hot_score_decays_with_age()
+    test_hot_score_counts_comments_and_dislikes()
+    test_hot_score_handles_missing_values()
+    test_ranked_posts_filtered_by_theme(temp_db_runner())
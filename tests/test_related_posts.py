@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Тесты похожих обсуждений (TF-IDF, заранее посчитанные соседи)
+"""
+from sqlalchemy import func, select
+
+from app.database.db_manager import DBManager
+from app.models.related_posts import PostTermModel, TermDocumentsModel
+from app.services.related_posts import RelatedPostService, rebuild_related_posts
+from app.utils.tfidf import TERMS_PER_POST, cosine, terms, weights
+from tests.conftest import add_post, temp_db_runner
+
+POSTS = {
+    2: ("Яма на дороге", "На улице Ленина огромная яма на дороге, машины пробивают колеса, асфальт разбит."),
+    3: ("Разбитый асфальт", "Асфальт на Ленина опять разбит, яма растет, колеса пробиты уже у троих соседей."),
+    4: ("Отключили горячую воду", "В доме на Садовой третий день нет горячей воды, управляющая компания молчит."),
+    5: ("Нет горячей воды", "Горячей воды нет на Садовой и соседних домах, когда включат - непонятно."),
+}
+
+
+def test_weights_are_normalized_and_truncated():
+    """Вектор нормирован, усечен до TERMS_PER_POST слов, служебные слова и числа отброшены"""
+    counts = terms("Это очень ОЧЕНЬ длинный текст про 15 " + " ".join(f"слово{i}" for i in range(40)))
+    assert "это" not in counts and "очень" not in counts and "15" not in counts
+    vector = weights(counts, documents=100, term_documents={"текст": 90})
+    assert len(vector) == TERMS_PER_POST
+    assert "текст" not in vector  # частое слово легче редких
+    assert cosine(vector, vector) <= 1.0 + 1e-9
+    assert weights(terms(""), 1, {}) == {}
+
+
+def test_terms_keep_numbers_and_latin_intact():
+    """Числа отбрасываются, латиница не превращается в кириллицу, "ё" и "е" - одно слово"""
+    counts = terms("В 2024 году 300 машин: Stop parking у Ёлки и елки")
+    assert set(counts) == {"год", "машин", "stop", "parking", "елк"}
+    assert counts["елк"] == 2
+
+
+def test_new_posts_find_related_and_update_neighbors(run_with_db):
+    """Новый пост находит похожие и попадает в их списки; удаление убирает связи"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            service = RelatedPostService(db)
+            for post_id, (header, body) in POSTS.items():
+                await add_post(db, post_id, body, header)
+                await service.index_post(post_id, header, body)
+
+            related = {post_id: [row["id"] for row in await service.get_related(post_id)] for post_id in POSTS}
+            print(related)
+            assert related[3][0] == 2 and related[2][0] == 3  # 2 индексировался раньше 3, но получил обратную ссылку
+            assert related[5][0] == 4 and related[4][0] == 5
+
+            await service.remove_post(3, *POSTS[3])
+            assert 3 not in [row["id"] for row in await service.get_related(2)]
+            documents = await db.session.scalar(
+                select(TermDocumentsModel.documents).where(TermDocumentsModel.term == "")
+            )
+            assert documents == 3
+
+    run_with_db(check)
+
+
+def test_removing_unindexed_post_keeps_document_counts(run_with_db):
+    """Удаление поста, который не попал в индекс, не уменьшает частоты слов"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            service = RelatedPostService(db)
+            for post_id in (2, 3):
+                await add_post(db, post_id, POSTS[post_id][1], POSTS[post_id][0])
+                await service.index_post(post_id, *POSTS[post_id])
+            before = dict((await db.session.execute(select(TermDocumentsModel.term, TermDocumentsModel.documents))).all())
+
+            # Пост 4 есть в базе, но не индексировался (например, создан до включения индекса)
+            await add_post(db, 4, POSTS[4][1], POSTS[4][0])
+            await service.remove_post(4, *POSTS[4])
+            await service.remove_post(4, *POSTS[4])
+            after = dict((await db.session.execute(select(TermDocumentsModel.term, TermDocumentsModel.documents))).all())
+            print(f"Постов в индексе: {before['']} -> {after['']}")
+            assert after == before
+
+            # Повторное удаление проиндексированного поста тоже учитывается один раз
+            await service.remove_post(3, *POSTS[3])
+            await service.remove_post(3, *POSTS[3])
+            assert await db.session.scalar(
+                select(TermDocumentsModel.documents).where(TermDocumentsModel.term == "")
+            ) == before[""] - 1
+
+    run_with_db(check)
+
+
+def test_rebuild_matches_incremental_neighbors(run_with_db):
+    """Полный пересчет строит тот же индекс для всех постов"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            for post_id, (header, body) in POSTS.items():
+                await add_post(db, post_id, body, header)
+
+        # Пост 1 из общей базы тестов ("Пост" / "Текст") тоже индексируется
+        assert await rebuild_related_posts(batch_size=2, session_factory=session_factory) == 5
+        async with DBManager(session_factory=session_factory) as db:
+            service = RelatedPostService(db)
+            assert (await service.get_related(2))[0]["id"] == 3
+            assert (await service.get_related(4))[0]["id"] == 5
+            indexed = await db.session.scalar(select(func.count(func.distinct(PostTermModel.post_id))))
+            assert indexed == 5
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_weights_are_normalized_and_truncated()
+    test_terms_keep_numbers_and_latin_intact()
+    test_new_posts_find_related_and_update_neighbors(temp_db_runner())
+    test_removing_unindexed_post_keeps_document_counts(temp_db_runner())
+    test_rebuild_matches_incremental_neighbors(temp_db_runner())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Тесты создания жалоб и агрегатов по ним (GROUP BY и сводка по контенту) на отдельной временной базе
+"""
+from datetime import datetime, timedelta
+
+from app.database.db_manager import DBManager
+from app.exceptions.reports import ContentNotFoundError, DuplicateReportError
+from app.models.reports import ReportContentTypeEnum, ReportStatusEnum
+from app.schemes.reports import ContentType, ReportStatus, SReportCreate
+from app.services.reports import ReportService
+from tests.conftest import temp_db_runner
+
+POST = ReportContentTypeEnum.POST
+COMMENT = ReportContentTypeEnum.COMMENT
+BASE_TIME = datetime(2025, 1, 1)
+
+
+async def add_report(db, reporter_id, content_type, content_id, status=ReportStatusEnum.PENDING, minutes=0):
+    created_at = BASE_TIME + timedelta(minutes=minutes)
+    report = await db.reports.add({
+        "reporter_id": reporter_id, "content_type": content_type, "content_id": content_id,
+        "reason": "Нарушение правил", "status": status, "created_at": created_at, "updated_at": created_at,
+    })
+    await db.reports.refresh_content_stats(content_type, content_id)
+    return report
+
+
+def with_reports(check):
+    """check(db) на базе с четырьмя жалобами: три на пост 1 и одна на комментарий 1"""
+    async def seeded(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_report(db, 1, POST, 1, minutes=1)
+            await add_report(db, 2, POST, 1, ReportStatusEnum.RESOLVED, minutes=2)
+            await add_report(db, 3, POST, 1, minutes=3)
+            await add_report(db, 3, COMMENT, 1, ReportStatusEnum.REJECTED, minutes=4)
+        async with DBManager(session_factory=session_factory) as db:
+            await check(db)
+    return seeded
+
+
+def test_report_stats_are_grouped_in_sql(run_with_db):
+    """Статистика совпадает с подсчетом по строкам"""
+    async def check(db):
+        stats = await ReportService(db).get_report_stats()
+        print(stats)
+        assert stats == {
+            "total_reports": 4, "pending_reports": 2, "resolved_reports": 1, "rejected_reports": 1,
+            "reports_on_posts": 3, "reports_on_comments": 1,
+        }
+
+    run_with_db(with_reports(check))
+
+
+def test_my_reports_and_content_stats(run_with_db):
+    """Фильтр по автору жалобы в SQL и число жалоб на контент в деталях"""
+    async def check(db):
+        service = ReportService(db)
+        mine = await service.get_reports_with_details(reporter_id=3)
+        assert {(r["content_type"], r["content_id"]) for r in mine} == {("post", 1), ("comment", 1)}
+        pending = await service.get_reports_with_details(reporter_id=3, status=ReportStatus.PENDING)
+        assert [r["content_type"] for r in pending] == ["post"]
+
+        for_post = await service.get_reports_for_content(ContentType.POST, 1)
+        assert len(for_post) == 3
+        assert all(r["content_reports_count"] == 3 and r["content_author_name"] == "u1" for r in for_post)
+
+        top = await service.get_most_reported_content(limit=1)
+        assert top[0]["content_id"] == 1 and top[0]["reports_count"] == 3
+        assert top[0]["first_reported_at"] == BASE_TIME + timedelta(minutes=1)
+        assert top[0]["last_reported_at"] == BASE_TIME + timedelta(minutes=3)
+
+    run_with_db(with_reports(check))
+
+
+def test_content_stats_refresh_after_delete(run_with_db):
+    """После удаления жалобы сводка пересчитывается, пустая сводка удаляется"""
+    async def check(db):
+        service = ReportService(db)
+        last = (await service.get_reports_for_content(ContentType.POST, 1))[0]
+        await service.delete_report(last["id"], user_id=last["reporter_id"])
+        stats = await db.reports.get_content_stats([(POST, 1)])
+        assert stats[(POST, 1)].reports_count == 2
+        assert stats[(POST, 1)].last_reported_at == BASE_TIME + timedelta(minutes=2)
+
+        comment_report = (await service.get_reports_for_content(ContentType.COMMENT, 1))[0]
+        await service.delete_report(comment_report["id"], user_id=3)
+        assert await db.reports.get_content_stats([(COMMENT, 1)]) == {}
+
+    run_with_db(with_reports(check))
+
+
+def test_create_report_rejects_duplicates_and_missing_content(run_with_db):
+    """Повтор жалобы и жалоба на несуществующий контент не вставляют строк"""
+    async def check(db):
+        service = ReportService(db)
+        data = SReportCreate(content_type=ContentType.COMMENT, content_id=1, reason="Оскорбления")
+        report_id = await service.create_report(data, reporter_id=2)
+        assert (await service.get_report(report_id)).reporter_id == 2
+
+        errors = []
+        for reporter_id, content_id in ((2, 1), (3, 1), (2, 999)):
+            try:
+                await service.create_report(data.model_copy(update={"content_id": content_id}), reporter_id)
+            except (DuplicateReportError, ContentNotFoundError) as e:
+                errors.append(type(e))
+        print(errors)
+        assert errors == [DuplicateReportError, DuplicateReportError, ContentNotFoundError]
+
+        stats = await db.reports.get_content_stats([(COMMENT, 1)])
+        assert stats[(COMMENT, 1)].reports_count == 2
+        assert (await service.get_report_stats())["total_reports"] == 5
+
+    run_with_db(with_reports(check))
+
+
+if __name__ == "__main__":
+    test_report_stats_are_grouped_in_sql(temp_db_runner())
+    test_my_reports_and_content_stats(temp_db_runner())
+    test_content_stats_refresh_after_delete(temp_db_runner())
+    test_create_report_rejects_duplicates_and_missing_content(temp_db_runner())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Тесты общего поиска: группы по типам, лимиты на тип и ранжирование групп
+"""
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.services.search import SearchService
+from tests.conftest import add_post, temp_db_runner
+
+
+async def add_content(db) -> None:
+    await db.session.execute(text(
+        "INSERT INTO communities (id, name, description, posts_count, members_count) VALUES "
+        "(1, 'Северный район', 'Дороги и дворы севера', 0, 50), (2, 'Велосипедисты', 'Велодорожки', 0, 5)"
+    ))
+    for post_id in range(2, 6):
+        await add_post(db, post_id, f"Яма на дороге номер {post_id}", "Ремонт дорог")
+    await db.session.execute(text(
+        "INSERT INTO comments (id, post_id, user_id, body, created_at, likes, dislikes) VALUES "
+        "(101, 2, 2, 'На Северной дороге тоже яма', CURRENT_TIMESTAMP, 0, 0)"
+    ))
+
+
+def test_grouped_results_with_limits(run_with_db):
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_content(db)
+            result = await SearchService(db).search("  дорогами ", {"posts": 2, "themes": 0})
+            groups = {group["type"]: group for group in result["groups"]}
+            print(result)
+            assert result["query"] == "дорогами"
+            assert set(groups) == {"posts", "comments", "communities"}
+            assert [item["id"] for item in groups["posts"]["items"]] == [5, 4]
+            assert groups["posts"]["has_more"] and not groups["comments"]["has_more"]
+            assert groups["comments"]["items"][0]["post_header"] == "Ремонт дорог"
+            assert groups["communities"]["items"][0]["name"] == "Северный район"
+
+            assert await SearchService(db).search("   ") == {"query": "", "groups": []}
+
+    run_with_db(check)
+
+
+def test_groups_ranked_by_match_quality(run_with_db):
+    """Точное совпадение фразы выше совпадения по основам, при равном - порядок SEARCH_TYPES"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_content(db)
+            result = await SearchService(db).search("северной дороге")
+            assert [(group["type"], group["mode"]) for group in result["groups"]] == [
+                ("comments", "exact"), ("communities", "prefix"), ("themes", "fuzzy"),
+            ]
+            result = await SearchService(db).search("дороги")
+            assert [group["type"] for group in result["groups"]] == ["communities", "themes", "posts", "comments"]
+
+            result = await SearchService(db).search("велосипидисты")
+            assert [(group["type"], group["mode"]) for group in result["groups"]] == [("communities", "fuzzy")]
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_grouped_results_with_limits(temp_db_runner())
+    test_groups_ranked_by_match_quality(temp_db_runner())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Тесты перезапуска упавших воркеров в app.tools.serve (без fork: запуск воркера подменен)
+"""
+import types
+
+import pytest
+
+from app.tools import serve
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def make_arbiter(monkeypatch):
+    """Arbiter с подмененными fork (_spawn), waitpid и часами"""
+    clock = FakeClock()
+    monkeypatch.setattr(serve, "time", types.SimpleNamespace(monotonic=clock.monotonic, sleep=lambda _: None))
+    arbiter = serve.Arbiter("127.0.0.1", 0, workers=1)
+    arbiter.log = lambda message: None
+    pids = iter(range(100, 1000))
+    spawned = []
+
+    def spawn(index, wait_ready=False):
+        pid = next(pids)
+        arbiter.children[pid] = index
+        arbiter.started_at[index] = clock.now
+        spawned.append(index)
+        return pid
+
+    exited = []
+
+    def waitpid(pid, options):
+        return (exited.pop(), 1 << 8) if exited else (0, 0)
+
+    monkeypatch.setattr(arbiter, "_spawn", spawn)
+    monkeypatch.setattr(serve.os, "waitpid", waitpid)
+
+    def crash():
+        """Текущий процесс воркера 0 завершается с кодом 1, мастер делает один проход цикла"""
+        exited.append(next(pid for pid, index in arbiter.children.items() if index == 0))
+        arbiter._reap(respawn=True)
+        arbiter._respawn_due()
+
+    return arbiter, clock, spawned, crash
+
+
+def test_respawn_delay_grows_and_is_capped():
+    delays = [serve.respawn_delay(failures) for failures in range(1, 10)]
+    print(f"Паузы: {delays}")
+    assert delays[:4] == [0.0, serve.RESPAWN_DELAY, serve.RESPAWN_DELAY * 2, serve.RESPAWN_DELAY * 4]
+    assert max(delays) == serve.RESPAWN_MAX_DELAY
+    assert delays == sorted(delays)
+
+
+def test_crash_loop_backs_off(monkeypatch):
+    """Воркер, падающий сразу после запуска, перезапускается все реже, а не в цикле без пауз"""
+    arbiter, clock, spawned, crash = make_arbiter(monkeypatch)
+    arbiter._spawn(0)
+
+    crash()
+    assert spawned == [0, 0], "первое падение - перезапуск сразу"
+
+    crash()
+    assert spawned == [0, 0] and 0 in arbiter.respawn_at, "второе падение подряд - с паузой"
+    clock.now += serve.RESPAWN_DELAY / 2
+    arbiter._respawn_due()
+    assert spawned == [0, 0]
+    clock.now += serve.RESPAWN_DELAY / 2
+    arbiter._respawn_due()
+    assert spawned == [0, 0, 0]
+
+    crash()
+    assert arbiter.respawn_at[0] - clock.now == serve.RESPAWN_DELAY * 2
+
+
+def test_backoff_resets_after_stable_run(monkeypatch):
+    """Воркер, проработавший RESPAWN_RESET_SECONDS, после падения снова перезапускается сразу"""
+    arbiter, clock, spawned, crash = make_arbiter(monkeypatch)
+    arbiter._spawn(0)
+    crash()
+    crash()
+    clock.now += serve.RESPAWN_DELAY
+    arbiter._respawn_due()
+    assert arbiter.failures[0] == 2
+
+    clock.now += serve.RESPAWN_RESET_SECONDS
+    crash()
+    assert arbiter.failures[0] == 1
+    assert spawned == [0, 0, 0, 0] and not arbiter.respawn_at
+
+
+def test_no_respawn_while_stopping(monkeypatch):
+    """Во время остановки отложенный перезапуск не выполняется"""
+    arbiter, clock, spawned, crash = make_arbiter(monkeypatch)
+    arbiter._spawn(0)
+    crash()
+    crash()
+    arbiter.stopping = True
+    clock.now += serve.RESPAWN_MAX_DELAY
+    arbiter._respawn_due()
+    assert spawned == [0, 0]
+
+
+if __name__ == "__main__":
+    test_respawn_delay_grows_and_is_capped()
+    for test in (test_crash_loop_backs_off, test_backoff_resets_after_stable_run, test_no_respawn_while_stopping):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test(monkeypatch)
+    print("OK")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Тесты запуска: холодный старт укладывается в бюджет, ошибки фаз lifespan обрабатываются
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tests.conftest import make_session_factory
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Бюджет холодного старта отдельного процесса: импорт + прогрев в lifespan
+COLD_START_BUDGET_SECONDS = 5.0
+
+COLD_START_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+import main
+with TestClient(main.app) as client:
+    elapsed = time.perf_counter() - started
+    status = client.get("/web/auth").status_code
+print(json.dumps({"elapsed": elapsed, "status": status, "phases": main.app.state.startup_timings}))
+"""
+
+# Построение подсказок падает с ошибкой БД ("db") или с ошибкой в коде ("bug")
+SUGGESTIONS_ERROR_SCRIPT = """
+import json, logging, sys
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+import main
+from app.services.suggest import search_suggestions
+
+async def rebuild():
+    if sys.argv[1] == "db":
+        raise OperationalError("SELECT 1", {}, Exception("no such table: communities"))
+    raise RuntimeError("ошибка в коде индекса")
+
+records = []
+handler = logging.Handler()
+handler.emit = records.append
+logging.getLogger("app.startup").addHandler(handler)
+search_suggestions.rebuild = rebuild
+status = error = None
+try:
+    with TestClient(main.app) as client:
+        status = client.get("/web/auth").status_code
+except Exception as e:
+    error = repr(e)
+print(json.dumps({"status": status, "error": error, "logged": [str(r.exc_info[1].orig) for r in records if r.exc_info]}))
+"""
+
+
+def run_app_script(script: str, db_path: str, *args: str) -> dict:
+    """Скрипт в новом процессе на базе db_path; результат - JSON из последней строки вывода"""
+    env = os.environ.copy()
+    env.setdefault("SECRET_KEY", "test")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    env["DB_NAME"] = db_path
+
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_under_budget():
+    """Новый процесс поднимает приложение (с прогревом) быстрее бюджета"""
+    report = run_app_script(COLD_START_SCRIPT, os.path.join(tempfile.mkdtemp(), "cold_start.db"))
+    print(f"Холодный старт: {report['elapsed']:.2f} с, фазы: {report['phases']}")
+
+    assert report["status"] == 200
+    assert {"routers", "mappers", "templates", "queries"} <= set(report["phases"])
+    assert report["elapsed"] < COLD_START_BUDGET_SECONDS
+
+
+def test_suggestions_phase_errors():
+    """Ошибка БД при построении подсказок пишется в лог с трассировкой, прочие ошибки прерывают запуск"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.db")
+
+        async def create():
+            engine, _ = await make_session_factory(path)
+            await engine.dispose()
+
+        asyncio.run(create())
+        db_error, bug = [run_app_script(SUGGESTIONS_ERROR_SCRIPT, path, failure) for failure in ("db", "bug")]
+
+        print(f"Ошибка БД: {db_error}, ошибка в коде: {bug}")
+        assert db_error["status"] == 200 and db_error["error"] is None
+        assert db_error["logged"] == ["no such table: communities"]
+        assert bug["status"] is None and "ошибка в коде индекса" in bug["error"]
+
+
+if __name__ == "__main__":
+    test_cold_start_under_budget()
+    test_suggestions_phase_errors()
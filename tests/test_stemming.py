@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Тесты стемминга: формы слова сводятся к одной основе, поиск по основам находит разные формы
+"""
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.services.related_posts import RelatedPostService
+from app.utils.stemmer import stem
+from app.utils.tfidf import terms
+from tests.conftest import add_post, temp_db_runner
+
+STEM_GROUPS = (
+    ("дорога", "дороги", "дороге", "дорогу", "дорогой", "дорогами"),
+    ("улица", "улицы", "улице", "улицу", "улицей", "улицах"),
+    ("горячая", "горячей", "горячую", "горячих"),
+    ("отключили", "отключить", "отключил"),
+    ("фонарь", "фонари", "фонарей", "фонарями"),
+)
+
+POSTS = {
+    2: ("Ремонт дороги", "Дорогу на Садовой ремонтируют вторую неделю, объезд через двор."),
+    3: ("Ямы на дорогах", "После зимы на дорогах района ямы, колеса пробивают."),
+    4: ("Отключили горячую воду", "В доме на улице Мира нет горячей воды с понедельника."),
+    5: ("Горячая линия управы", "Телефон горячей линии не отвечает, как сообщить о проблеме?"),
+    6: ("Не горят фонари", "На улицах Северного района темно, фонарей не хватает."),
+    7: ("Новый фонарь у школы", "У школы поставили фонарь, стало светлее."),
+    8: ("Концерт в парке", "В субботу концерт, вход свободный, приходите всей семьей."),
+}
+
+# Запрос -> посты, которые пользователь ожидает увидеть
+RELEVANCE = (
+    ("дорога", {2, 3}),
+    ("ремонт дорог", {2}),
+    ("горячей воды", {4}),
+    ("горячая", {4, 5}),
+    ("фонарями", {6, 7}),
+    ("на улице темно", {6}),
+    ("концерты", {8}),
+    ("отключить горячую воду", {4}),
+)
+MIN_PRECISION = 0.9
+
+
+def test_word_forms_share_stem():
+    for group in STEM_GROUPS:
+        stems = {stem(word) for word in group}
+        print(group, "->", stems)
+        assert len(stems) == 1
+    assert stem("дорога") != stem("дом")
+    # В векторах TF-IDF формы слова считаются одним словом, "ё" приводится к "е"
+    assert terms("Дороги, дорога и дорогам") == {"дорог": 3}
+    assert terms("Ёлки и ёлка") == {"елк": 2}
+
+
+def test_search_relevance_set(run_with_db):
+    """Полнота 1.0 и точность не ниже MIN_PRECISION на наборе запросов в разных формах слов"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            related = RelatedPostService(db)
+            await db.session.execute(text("DELETE FROM posts"))
+            for post_id, (header, body) in POSTS.items():
+                await add_post(db, post_id, body, header)
+                await related.index_post(post_id, header, body)
+
+            found_total = relevant_found = 0
+            for query, expected in RELEVANCE:
+                found = set((await db.posts.search_ids(query)).ids)
+                print(f"{query!r}: {sorted(found)} (ожидается {sorted(expected)})")
+                assert expected <= found, query
+                found_total += len(found)
+                relevant_found += len(found & expected)
+            precision = relevant_found / found_total
+            print(f"Точность: {precision:.2f}")
+            assert precision >= MIN_PRECISION
+
+    run_with_db(check)
+
+
+def test_comment_search_by_stems(run_with_db):
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await db.session.execute(text(
+                "INSERT INTO comments (id, post_id, user_id, body, created_at, likes, dislikes) VALUES "
+                "(101, 1, 1, 'Дорогу так и не починили', CURRENT_TIMESTAMP, 0, 0), "
+                "(102, 1, 2, 'Фонари на нашей улице горят', CURRENT_TIMESTAMP, 0, 0)"
+            ))
+            assert [comment.id for comment in await db.comments.search("дороги")] == [101]
+            assert [comment.id for comment in await db.comments.search("уличные фонарь")] == []
+            assert [comment.id for comment in await db.comments.search("фонарей на улицах")] == [102]
+            await db.session.execute(text("DELETE FROM comments WHERE id = 101"))
+            assert await db.comments.search("дорогу") == []
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_word_forms_share_stem()
+    test_search_relevance_set(temp_db_runner())
+    test_comment_search_by_stems(temp_db_runner())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Тесты подсказок поиска: индекс по началу слов и его обновление событиями
+"""
+import random
+import time
+
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.schemes.communities import SCommunityAdd, SCommunityUpdate
+from app.services.communities import CommunitiesService
+from app.services.suggest import KIND_POST, SearchSuggestions, search_suggestions
+from app.utils.prefix_index import PrefixIndex
+from tests.conftest import add_post, temp_db_runner
+
+
+def test_prefix_index_add_remove_and_ranking():
+    index = PrefixIndex([(1, 1, "Северный район", 50), (1, 2, "Южный район", 80), (2, 1, "Дороги", 3)])
+    found = index.search("РАЙ")
+    assert [item.item_id for item in found[1]] == [2, 1]
+    assert [item.label for item in index.search("северный р")[1]] == ["Северный район"]
+    assert index.search("ёж") == {} and index.search("  ") == {}
+
+    index.add(1, 3, "Ёжики района", 10)
+    index.add(1, 2, "Южные кварталы", 80)  # переименование заменяет ключи
+    assert [item.item_id for item in index.search("район")[1]] == [1, 3]
+    assert [item.item_id for item in index.search("ежик")[1]] == [3]
+    assert index.remove(1, 1) and not index.remove(1, 1)
+    assert [item.item_id for item in index.search("рай")[1]] == [3]
+    assert index.search("дор", limit=1)[2][0].label == "Дороги"
+    assert len(index) == 3
+
+
+def test_suggest_latency():
+    """Ответ из индекса на 100k записей - меньше миллисекунды"""
+    words = ("улица", "ремонт", "двор", "парк", "школа", "дорога", "мост", "фонарь", "концерт", "яма")
+    index = PrefixIndex(
+        (3, item_id, f"{words[item_id % 10]} {words[item_id // 10 % 10]} номер {item_id}", item_id)
+        for item_id in range(100_000)
+    )
+    for prefix in ("у", "ре", "пар", "мост ш", "номер 123"):
+        started = time.perf_counter()
+        for _ in range(100):
+            found = index.search(prefix, 5)
+        elapsed_ms = (time.perf_counter() - started) * 10
+        print(f"{prefix!r}: {elapsed_ms:.3f} ms")
+        assert found and elapsed_ms < 1
+
+
+def test_prefix_index_lowest_follows_changes():
+    """lowest совпадает с полным перебором после добавлений, перевзвешиваний и удалений"""
+    rng = random.Random(7)
+    index = PrefixIndex((3, item_id, f"пост {item_id}", rng.random()) for item_id in range(200))
+    expected = {item_id: index.score(3, item_id) for item_id in range(200)}
+    index.add(1, 1, "Сообщество", -1.0)  # записи другого типа не мешают
+    for step in range(5000):
+        item_id = rng.randrange(300)
+        if rng.random() < 0.3:
+            index.remove(3, item_id)
+            expected.pop(item_id, None)
+        else:
+            expected[item_id] = rng.choice([0.0, rng.random()])
+            index.add(3, item_id, f"пост {item_id}", expected[item_id])
+        if step % 50 == 0:
+            lowest = index.lowest(3)
+            assert lowest is not None and lowest[1] == min(expected.values())
+            assert expected[lowest[0]] == lowest[1]
+    assert sum(map(len, index._heaps.values())) <= 2 * len(index) + 64 + 1
+
+
+def test_post_eviction_latency():
+    """Вытеснение при полном индексе не перебирает все записи: 1000 новых постов при 100k в индексе"""
+    index = PrefixIndex((3, item_id, f"пост номер {item_id}", item_id) for item_id in range(100_000))
+    suggestions = SearchSuggestions(session_factory=None, max_posts=100_000)
+    suggestions.index, suggestions.posts = index, 100_000
+    started = time.perf_counter()
+    for item_id in range(100_000, 101_000):
+        suggestions.on_post({"action": "created", "post": {"id": item_id, "header": f"новый пост {item_id}"}})
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"1000 постов с вытеснением: {elapsed_ms:.0f} ms")
+    assert suggestions.posts == 100_000 and (3, 0) not in index and (3, 100_999) in index
+    assert elapsed_ms < 1000
+
+
+def test_suggestions_follow_write_events(run_with_db):
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_post(db, 2, "Текст", "Ремонт моста на Садовой")
+            await db.session.execute(text("UPDATE posts SET hot_score = 2 WHERE id = 2"))
+
+        suggestions = SearchSuggestions(session_factory, max_posts=2)
+        await suggestions.rebuild()
+        assert suggestions.suggest("рем")["posts"] == [{"id": 2, "label": "Ремонт моста на Садовой"}]
+        assert suggestions.suggest("дор")["themes"] == [{"id": 1, "label": "Дороги"}]
+
+        # Индекс приложения обновляется сервисами после коммита
+        app_index, search_suggestions.index = search_suggestions.index, suggestions.index
+        try:
+            async with DBManager(session_factory=session_factory) as db:
+                community = await CommunitiesService(db).create_community(
+                    SCommunityAdd(name="Садовый квартал", description="Жители")
+                )
+                assert suggestions.suggest("садов")["communities"] == []
+            assert suggestions.suggest("садов")["communities"] == [{"id": community.id, "label": "Садовый квартал"}]
+            async with DBManager(session_factory=session_factory) as db:
+                await CommunitiesService(db).update_community(community.id, SCommunityUpdate(name="Новый квартал"))
+            assert suggestions.suggest("садов")["communities"] == []
+            assert suggestions.suggest("кварт")["communities"][0]["label"] == "Новый квартал"
+        finally:
+            search_suggestions.index = app_index
+
+        # Новые посты вытесняют наименее "горячий" при переполнении
+        suggestions.on_post({"action": "created", "post": {"id": 3, "header": "Мост закрыт"}})
+        suggestions.on_post({"action": "created", "post": {"id": 4, "header": "Мост открыт"}})
+        assert [item["id"] for item in suggestions.suggest("мост")["posts"]] == [2, 4]
+        suggestions.on_post({"action": "deleted", "post": {"id": 2}})
+        assert (KIND_POST, 2) not in suggestions.index and suggestions.posts == 1
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_prefix_index_add_remove_and_ranking()
+    test_suggest_latency()
+    test_prefix_index_lowest_follows_changes()
+    test_post_eviction_latency()
+    test_suggestions_follow_write_events(temp_db_runner())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Тесты поиска по триграммам: точно -> по основам слов -> с опечатками
+"""
+from sqlalchemy import text
+
+from app.database.db_manager import DBManager
+from app.repositories.trigram_search import SEARCH_EXACT, SEARCH_FUZZY, SEARCH_PREFIX
+from app.services.related_posts import RelatedPostService
+from app.utils.trigrams import search_stem, similarity
+from tests.conftest import add_post, temp_db_runner
+
+POSTS = {
+    2: ("Яма на улице Ленина", "Огромная яма на проезжей части, колеса пробивают каждый день."),
+    3: ("Не горят фонари", "На Садовой улице вторую неделю темно, фонари не горят."),
+    4: ("Концерт в парке", "В субботу в Центральном парке концерт, вход свободный."),
+}
+
+
+async def add_posts(db) -> None:
+    related = RelatedPostService(db)
+    for post_id, (header, body) in POSTS.items():
+        await add_post(db, post_id, body, header)
+        # Словарь слов для исправления опечаток пополняется при индексации поста
+        await related.index_post(post_id, header, body)
+
+
+def test_word_similarity_and_prefix():
+    assert similarity("ленина", "ленина") == 1.0
+    assert similarity("лениан", "ленина") > similarity("лениан", "садовой")
+    assert search_stem("улице") == "улиц" and search_stem("ленину") == "ленин" and search_stem("яма") == "яма"
+
+
+def test_fallback_chain_for_posts(run_with_db):
+    """Точное совпадение без учета регистра, затем основы слов в любом порядке, затем опечатки"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_posts(db)
+
+            found = await db.posts.search_ids("на улице ЛЕНИНА")
+            assert (found.ids, found.mode) == ([2], SEARCH_EXACT)
+            # Одно слово ищется сразу по основе
+            found = await db.posts.search_ids("ЛЕНИНА")
+            assert (found.ids, found.mode) == ([2], SEARCH_PREFIX)
+
+            found = await db.posts.search_ids("Ленину улица")
+            assert (found.ids, found.mode) == ([2], SEARCH_PREFIX)
+
+            found = await db.posts.search_ids("фанари на садавой")
+            assert (found.ids, found.mode, found.query) == ([3], SEARCH_FUZZY, "фонари садовой")
+
+            assert (await db.posts.search_ids("абракадабра")).mode is None
+            # Страница за концом точных результатов не переключает на следующий вариант
+            assert (await db.posts.search_ids("парк", skip=10)).ids == []
+            assert [post.id for post in await db.posts.search("улиц")] == [3, 2]
+
+    run_with_db(check)
+
+
+def test_yo_and_latin_words(run_with_db):
+    """"ё" и "е" - одна буква и в поиске по основам, и в исправлении опечаток; латиница исправляется как есть"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            related = RelatedPostService(db)
+            for post_id, (header, body) in {
+                2: ("Ёлка во дворе", "Поставили ёлку у школы"),
+                3: ("Parking problem", "No parking near the school"),
+            }.items():
+                await add_post(db, post_id, body, header)
+                await related.index_post(post_id, header, body)
+
+            assert (await db.posts.search_ids("елка")).ids == [2]
+            assert (await db.posts.search_ids("Ёлку")).ids == [2]
+            found = await db.posts.search_ids("ёлкп")
+            assert (found.ids, found.mode) == ([2], SEARCH_FUZZY)
+            found = await db.posts.search_ids("parkinf")
+            assert (found.ids, found.mode, found.query) == ([3], SEARCH_FUZZY, "parking")
+
+    run_with_db(check)
+
+
+def test_index_follows_updates_and_short_queries(run_with_db):
+    """Триггеры обновляют индекс при изменении и удалении; короткий запрос ищется подстрокой"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await add_posts(db)
+            await db.session.execute(text("UPDATE posts SET header = 'Яма на Мира' WHERE id = 2"))
+            await db.session.execute(text("UPDATE posts SET likes = 5 WHERE id = 3"))
+            await db.session.execute(text("DELETE FROM posts WHERE id = 4"))
+
+            assert (await db.posts.search_ids("Ленина")).ids == []
+            assert (await db.posts.search_ids("мира")).ids == [2]
+            assert (await db.posts.search_ids("фонари")).ids == [3]
+            assert (await db.posts.search_ids("концерт")).ids == []
+            assert (await db.posts.search_ids("Яма")).ids == [2]
+            assert (await db.posts.search_ids("Я")).ids == [2]
+
+    run_with_db(check)
+
+
+def test_communities_and_themes_search(run_with_db):
+    """Опечатки в небольших таблицах исправляются по словам самих строк"""
+    async def check(session_factory):
+        async with DBManager(session_factory=session_factory) as db:
+            await db.session.execute(text(
+                "INSERT INTO communities (id, name, description, posts_count, members_count) VALUES "
+                "(1, 'Центр', 'Жители центра города', 0, 10), (2, 'Северный район', 'Север', 0, 50)"
+            ))
+            communities = await db.communities.search("цнтр")
+            assert [community.id for community in communities] == [1]
+            assert [community.id for community in await db.communities.search("РАЙОН")] == [2]
+
+            themes = await db.themes.search_themes("дорги")
+            assert [theme.name for theme in themes] == ["Дороги"]
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_word_similarity_and_prefix()
+    test_fallback_chain_for_posts(temp_db_runner())
+    test_yo_and_latin_words(temp_db_runner())
+    test_index_follows_updates_and_short_queries(temp_db_runner())
+    test_communities_and_themes_search(temp_db_runner())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Тесты членства в сообществах: вступление и выход, идемпотентность ON CONFLICT и счетчики участников
+"""
+import asyncio
+
+from sqlalchemy import func, select, text
+
+from app.database.db_manager import DBManager
+from app.models.communities import CommunityModel
+from app.models.user_communities import UserCommunityModel
+from app.services.communities import CommunitiesService
+from tests.conftest import temp_db_runner
+
+
+async def add_community(session_factory) -> None:
+    async with DBManager(session_factory=session_factory) as db:
+        await db.session.execute(text(
+            "INSERT INTO communities (id, name, description, posts_count, members_count) "
+            "VALUES (1, 'Центр', '', 0, 0)"
+        ))
+
+
+async def membership(session_factory, community_id: int = 1) -> tuple[int, int]:
+    """(строк членства, members_count) сообщества"""
+    async with session_factory() as session:
+        rows = (await session.execute(
+            select(func.count(UserCommunityModel.id)).where(UserCommunityModel.community_id == community_id)
+        )).scalar()
+        members = (await session.execute(
+            select(CommunityModel.members_count).where(CommunityModel.id == community_id)
+        )).scalar()
+    return rows, members
+
+
+def test_unique_index_matches_migration(run_with_db):
+    """Схема из моделей создает тот же уникальный индекс, что и миграция"""
+    async def check(session_factory):
+        async with session_factory() as session:
+            indexes = (await session.execute(text("PRAGMA index_list('user_communities')"))).all()
+        unique = {row[1] for row in indexes if row[2]}
+        assert "uq_user_communities_user_community" in unique
+
+    run_with_db(check)
+
+
+def test_join_and_leave_are_idempotent(run_with_db):
+    """Повторное вступление и повторный выход не меняют членство и счетчик"""
+    async def check(session_factory):
+        await add_community(session_factory)
+        for _ in range(2):
+            async with DBManager(session_factory=session_factory) as db:
+                await CommunitiesService(db).join_community(1, user_id=2)
+        assert await membership(session_factory) == (1, 1)
+
+        async with DBManager(session_factory=session_factory) as db:
+            await CommunitiesService(db).join_community(1, user_id=3)
+        assert await membership(session_factory) == (2, 2)
+
+        for _ in range(2):
+            async with DBManager(session_factory=session_factory) as db:
+                await CommunitiesService(db).leave_community(1, user_id=2)
+        assert await membership(session_factory) == (1, 1)
+
+    run_with_db(check)
+
+
+def test_add_membership_on_conflict_does_nothing(run_with_db):
+    """INSERT ... ON CONFLICT DO NOTHING сообщает, добавлена ли запись"""
+    async def check(session_factory):
+        await add_community(session_factory)
+        async with DBManager(session_factory=session_factory) as db:
+            assert await db.user_communities.add_membership(2, 1) is True
+            assert await db.user_communities.add_membership(2, 1) is False
+            assert await db.user_communities.remove_membership(2, 1) is True
+            assert await db.user_communities.remove_membership(2, 1) is False
+
+    run_with_db(check)
+
+
+def test_concurrent_joins_count_once(run_with_db):
+    """Одновременные вступления одного пользователя дают одну запись и +1 к счетчику"""
+    async def check(session_factory):
+        await add_community(session_factory)
+
+        async def join():
+            async with DBManager(session_factory=session_factory) as db:
+                await CommunitiesService(db).join_community(1, user_id=2)
+
+        await asyncio.gather(*(join() for _ in range(5)))
+        rows, members = await membership(session_factory)
+        print(f"Строк членства: {rows}, участников: {members}")
+        assert (rows, members) == (1, 1)
+
+    run_with_db(check)
+
+
+if __name__ == "__main__":
+    test_unique_index_matches_migration(temp_db_runner())
+    test_join_and_leave_are_idempotent(temp_db_runner())
+    test_add_membership_on_conflict_does_nothing(temp_db_runner())
+    test_concurrent_joins_count_once(temp_db_runner())